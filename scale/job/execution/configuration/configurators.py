@@ -38,7 +38,9 @@ logger = logging.getLogger(__name__)
 
 
 class QueuedExecutionConfigurator(object):
-    """Configurator that creates execution configurations when a job execution is queued
+    """Configurator that creates execution configurations when a job execution is queued. The parts of a configuration
+    that only depend on the job type or job type revision are cached, so they are only parsed once when configuring
+    many jobs of the same type.
     """
 
     def __init__(self, input_files):
@@ -50,6 +52,10 @@ class QueuedExecutionConfigurator(object):
         """
 
         self._input_files = input_files
+        self._cached_input_interfaces = {}  # {Job type ID: Input interface}
+        self._cached_job_configurations = {}  # {Job type ID: Job type configuration}
+        self._cached_job_interfaces = {}  # {Job type revision ID: Job interface}
+        self._cached_output_names = {}  # {Job type ID: File output names}
         self._cached_workspace_names = {}  # {ID: Name}
 
     def configure_queued_job(self, job):
@@ -71,23 +77,7 @@ class QueuedExecutionConfigurator(object):
 
         # Set up env vars for job's input data
         input_values = data.get_injected_input_values(input_files_dict)
-        interface = None
-        if JobInterfaceSunset.is_seed_dict(job.job_type.manifest):
-            interface = SeedManifest(job.job_type.manifest, do_validate=False).get_input_interface()
-        elif job.job_type.manifest and 'input_data' in job.job_type.manifest:
-            # TODO: This can be removed when support for legacy job types is removed
-            interface = Interface()
-            for input_dict in job.job_type.manifest['input_data']:
-                media_types = input_dict['media_types'] if 'media_types' in input_dict else []
-                required = input_dict['required'] if 'required' in input_dict else True
-                if input_dict['type'] == 'file':
-                    param = FileParameter(input_dict['name'], media_types, required, False)
-                    interface.add_parameter(param)
-                elif input_dict['type'] == 'files':
-                    param = FileParameter(input_dict['name'], media_types, required, True)
-                    interface.add_parameter(param)
-                elif input_dict['type'] == 'property':
-                    interface.add_parameter(JsonParameter(input_dict['name'], 'string', required))
+        interface = self._get_input_interface(job.job_type)
 
         env_vars = {}
         if isinstance(data, JobData):
@@ -114,16 +104,15 @@ class QueuedExecutionConfigurator(object):
             else:
                 # Set output workspaces from job configuration
                 output_workspaces = {}
-                job_config = job.get_job_configuration()
-                interface = JobInterfaceSunset.create(job.job_type.manifest, do_validate=False)
-                for output_name in interface.get_file_output_names():
+                job_config = self._get_job_configuration(job)
+                for output_name in self._get_output_names(job.job_type):
                     output_workspace = job_config.get_output_workspace(output_name)
                     if output_workspace:
                         output_workspaces[output_name] = output_workspace
                 config.set_output_workspaces(output_workspaces)
 
         # Create main task with fields populated from input data
-        args = job.get_job_interface().get_injected_command_args(input_values, env_vars)
+        args = self._get_job_interface(job).get_injected_command_args(input_values, env_vars)
         config.create_tasks(['main'])
         config.add_to_task('main', args=args, env_vars=env_vars, workspaces=task_workspaces)
         return config
@@ -145,6 +134,84 @@ class QueuedExecutionConfigurator(object):
             for workspace in Workspace.objects.filter(id__in=ids).iterator():
                 self._cached_workspace_names[workspace.id] = workspace.name
 
+    def _get_input_interface(self, job_type):
+        """Returns the input interface for the given job type, possibly None
+
+        :param job_type: The job type model
+        :type job_type: :class:`job.models.JobType`
+        :returns: The input interface
+        :rtype: :class:`data.interface.interface.Interface`
+        """
+
+        if job_type.id in self._cached_input_interfaces:
+            return self._cached_input_interfaces[job_type.id]
+
+        interface = None
+        if JobInterfaceSunset.is_seed_dict(job_type.manifest):
+            interface = SeedManifest(job_type.manifest, do_validate=False).get_input_interface()
+        elif job_type.manifest and 'input_data' in job_type.manifest:
+            # TODO: This can be removed when support for legacy job types is removed
+            interface = Interface()
+            for input_dict in job_type.manifest['input_data']:
+                media_types = input_dict['media_types'] if 'media_types' in input_dict else []
+                required = input_dict['required'] if 'required' in input_dict else True
+                if input_dict['type'] == 'file':
+                    param = FileParameter(input_dict['name'], media_types, required, False)
+                    interface.add_parameter(param)
+                elif input_dict['type'] == 'files':
+                    param = FileParameter(input_dict['name'], media_types, required, True)
+                    interface.add_parameter(param)
+                elif input_dict['type'] == 'property':
+                    interface.add_parameter(JsonParameter(input_dict['name'], 'string', required))
+
+        self._cached_input_interfaces[job_type.id] = interface
+        return interface
+
+    def _get_job_configuration(self, job):
+        """Returns the job configuration for the given job, which is only cached for jobs that use their job type's
+        configuration
+
+        :param job: The queued job model
+        :type job: :class:`job.models.Job`
+        :returns: The job configuration
+        :rtype: :class:`job.configuration.configuration.JobConfiguration`
+        """
+
+        if job.configuration:
+            return job.get_job_configuration()
+
+        if job.job_type_id not in self._cached_job_configurations:
+            self._cached_job_configurations[job.job_type_id] = job.job_type.get_job_configuration()
+        return self._cached_job_configurations[job.job_type_id]
+
+    def _get_job_interface(self, job):
+        """Returns the job interface for the given job's job type revision
+
+        :param job: The queued job model
+        :type job: :class:`job.models.Job`
+        :returns: The job interface
+        :rtype: :class:`job.configuration.interface.job_interface.JobInterface` or
+                :class:`job.seed.manifest.SeedManifest`
+        """
+
+        if job.job_type_rev_id not in self._cached_job_interfaces:
+            self._cached_job_interfaces[job.job_type_rev_id] = job.get_job_interface()
+        return self._cached_job_interfaces[job.job_type_rev_id]
+
+    def _get_output_names(self, job_type):
+        """Returns the names of the file outputs for the given job type
+
+        :param job_type: The job type model
+        :type job_type: :class:`job.models.JobType`
+        :returns: The file output names
+        :rtype: list
+        """
+
+        if job_type.id not in self._cached_output_names:
+            interface = JobInterfaceSunset.create(job_type.manifest, do_validate=False)
+            self._cached_output_names[job_type.id] = interface.get_file_output_names()
+        return self._cached_output_names[job_type.id]
+
     def _create_input_file_dict(self, job_data):
         """Creates the dict storing lists of input files by input name
 
@@ -379,6 +379,20 @@ class ExecutionConfiguration(object):
                     return task_dict['env_vars']
         return {}
 
+    def get_input_file_ids(self):
+        """Returns a list of the IDs of all input files
+
+        :returns: The list of the IDs of all input files
+        :rtype: list
+        """
+
+        file_ids = set()
+        if 'input_files' in self._configuration:
+            for file_list in self._configuration['input_files'].values():
+                for file_dict in file_list:
+                    file_ids.add(file_dict['id'])
+        return list(file_ids)
+
     def get_input_workspace_names(self):
         """Returns a list of the names of all input workspaces
 
@@ -38,6 +38,9 @@ class PullTask(JobExecutionTask):
         self.task_type = 'pull'
         self.timeout_error_name = 'pull-timeout'
 
+        # The job's Docker image that this task pulls
+        self.pulled_image = job_exe.docker_image
+
         # Private fields for this class
         self._resources = configuration.get_resources('pull')
 
@@ -79,6 +79,24 @@ class BlockedJobs(CommandMessage):
 
         return self._count < MAX_NUM
 
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        # Only updates with the same status change time are equivalent when executed together
+        if self.status_change != message.status_change:
+            return False
+
+        new_job_ids = set(message._blocked_job_ids) - set(self._blocked_job_ids)
+        if self._count + len(new_job_ids) > MAX_NUM:
+            return False
+
+        for job_id in message._blocked_job_ids:
+            if job_id in new_job_ids:
+                self.add_job(job_id)
+                new_job_ids.remove(job_id)
+        return True
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
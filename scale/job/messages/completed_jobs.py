@@ -119,6 +119,27 @@ class CompletedJobs(CommandMessage):
 
         return len(self._completed_jobs) < MAX_NUM
 
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        # Only updates with the same end time are equivalent when executed together
+        if self.ended != message.ended:
+            return False
+
+        existing_jobs = set(self._completed_jobs)
+        new_completed_jobs = []
+        for completed_job in message._completed_jobs:
+            if completed_job not in existing_jobs:
+                existing_jobs.add(completed_job)
+                new_completed_jobs.append(completed_job)
+        if len(self._completed_jobs) + len(new_completed_jobs) > MAX_NUM:
+            return False
+
+        for completed_job in new_completed_jobs:
+            self.add_completed_job(completed_job)
+        return True
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
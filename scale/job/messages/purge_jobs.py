@@ -7,7 +7,8 @@ from django.db import transaction
 from django.db.models import F
 
 from batch.models import BatchJob
-from job.models import Job, JobExecution, JobExecutionEnd, JobExecutionOutput, JobInputFile, TaskUpdate
+from job.models import (Job, JobExecution, JobExecutionEnd, JobExecutionOutput, JobInputFile, JobLoadCount,
+                        JobTypeStatusSummary, TaskUpdate)
 from messaging.messages.message import CommandMessage
 from product.models import FileAncestryLink
 from queue.models import Queue
@@ -139,6 +140,8 @@ class PurgeJobs(CommandMessage):
             RecipeNode.objects.filter(job__in=self._purge_job_ids).delete()
             JobInputFile.objects.filter(job__in=self._purge_job_ids).delete()
             Queue.objects.filter(job__in=self._purge_job_ids).delete()
+            JobLoadCount.objects.add_deleted_jobs(self._purge_job_ids)
+            JobTypeStatusSummary.objects.add_deleted_jobs(self._purge_job_ids)
             Job.objects.filter(id__in=self._purge_job_ids).delete()
 
             # Update results
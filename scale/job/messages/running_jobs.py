@@ -93,6 +93,35 @@ class RunningJobs(CommandMessage):
 
         return self._count < MAX_NUM
 
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        # Only updates with the same start time are equivalent when executed together
+        if self._started != message._started:
+            return False
+
+        job_nodes = {}  # {(Job ID, Execution Number): Node ID}
+        for node_id, job_list in self._running_jobs.items():
+            for job_tuple in job_list:
+                job_nodes[job_tuple] = node_id
+
+        new_running_jobs = []
+        for node_id, job_list in message._running_jobs.items():
+            for job_tuple in job_list:
+                if job_tuple in job_nodes:
+                    if job_nodes[job_tuple] != node_id:
+                        return False  # Conflicting node for the same job execution, execute separately
+                    continue
+                job_nodes[job_tuple] = node_id
+                new_running_jobs.append((job_tuple, node_id))
+        if self._count + len(new_running_jobs) > MAX_NUM:
+            return False
+
+        for job_tuple, node_id in new_running_jobs:
+            self.add_running_job(job_tuple[0], job_tuple[1], node_id)
+        return True
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0053_jobtype_unmet_resources'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobLoadCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('job_type', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='job.JobType')),
+            ],
+            options={
+                'db_table': 'job_load_count',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobloadcount',
+            unique_together=set([('job_type', 'status')]),
+        ),
+    ]
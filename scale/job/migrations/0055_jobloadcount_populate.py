@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0054_jobloadcount'),
+    ]
+
+    def populate_job_load_count(apps, schema_editor):
+        # Count the current jobs in each job load status by job type
+        Job = apps.get_model('job', 'Job')
+        JobLoadCount = apps.get_model('job', 'JobLoadCount')
+
+        job_qry = Job.objects.filter(status__in=['PENDING', 'QUEUED', 'RUNNING']).values('job_type_id', 'status')
+        counts = []
+        for job_dict in job_qry.annotate(count=models.Count('id')).iterator():
+            counts.append(JobLoadCount(job_type_id=job_dict['job_type_id'], status=job_dict['status'],
+                                       count=job_dict['count']))
+        JobLoadCount.objects.bulk_create(counts)
+
+        print 'Created %s job load count(s).' % str(len(counts))
+
+    operations = [
+        migrations.RunPython(populate_job_load_count),
+    ]
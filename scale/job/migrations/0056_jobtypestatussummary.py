@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('error', '0005_auto_20180621_2110'),
+        ('job', '0055_jobloadcount_populate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobTypeStatusSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=50)),
+                ('hour', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('count', models.IntegerField(default=0)),
+                ('first_status_change', models.DateTimeField(blank=True, null=True)),
+                ('last_status_change', models.DateTimeField(blank=True, null=True)),
+                ('error', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, to='error.Error')),
+                ('job_type', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='job.JobType')),
+            ],
+            options={
+                'db_table': 'job_type_status_summary',
+            },
+        ),
+        # Unique index that treats a null error and a null hour as values so that concurrent inserts of the same
+        # summary conflict
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX job_type_status_summary_key ON job_type_status_summary "
+                "(job_type_id, status, COALESCE(error_id, 0), COALESCE(hour, '1970-01-01 00:00:00+00'))",
+            reverse_sql="DROP INDEX job_type_status_summary_key",
+        ),
+    ]
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models.functions import TruncHour
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0056_jobtypestatussummary'),
+    ]
+
+    def populate_job_type_status_summary(apps, schema_editor):
+        # Summarize the current jobs by job type, status, error, and hour of their last status change
+        Job = apps.get_model('job', 'Job')
+        JobTypeStatusSummary = apps.get_model('job', 'JobTypeStatusSummary')
+
+        job_qry = Job.objects.annotate(hour=TruncHour('last_status_change'))
+        job_qry = job_qry.values('job_type_id', 'status', 'error_id', 'hour')
+        job_qry = job_qry.annotate(count=models.Count('id'), first_status_change=models.Min('last_status_change'),
+                                   latest_status_change=models.Max('last_status_change'))
+        summaries = []
+        for job_dict in job_qry.order_by().iterator():
+            summaries.append(JobTypeStatusSummary(job_type_id=job_dict['job_type_id'], status=job_dict['status'],
+                                                  error_id=job_dict['error_id'], hour=job_dict['hour'],
+                                                  count=job_dict['count'],
+                                                  first_status_change=job_dict['first_status_change'],
+                                                  last_status_change=job_dict['latest_status_change']))
+        JobTypeStatusSummary.objects.bulk_create(summaries, batch_size=1000)
+
+        print 'Created %s job type status summaries.' % str(len(summaries))
+
+    operations = [
+        migrations.RunPython(populate_job_type_status_summary),
+    ]
@@ -14,8 +14,9 @@ from collections import namedtuple
 import django.contrib.postgres.fields
 import django.utils.html
 from django.conf import settings
-from django.db import connection, models, transaction
+from django.db import connection, IntegrityError, models, transaction
 from django.db.models import F, Q
+from django.db.models.functions import TruncHour
 from django.utils import dateparse, timezone
 
 import util.parse
@@ -68,6 +69,9 @@ MIN_RESOURCE = {
 
 INPUT_FILE_BATCH_SIZE = 500  # Maximum batch size for creating JobInputFile models
 
+# Job statuses that are counted by the job load counts
+JOB_LOAD_STATUSES = ['PENDING', 'QUEUED', 'RUNNING']
+
 # IMPORTANT NOTE: Locking order
 # Always adhere to the following model order for obtaining row locks via select_for_update() in order to prevent
 # deadlocks and ensure query efficiency
@@ -969,6 +973,7 @@ class JobManager(models.Manager):
             if job.can_be_blocked():
                 job_ids.append(job.id)
 
+        self._update_status_counts(jobs, job_ids, 'BLOCKED', when)
         self.filter(id__in=job_ids).update(status='BLOCKED', last_status_change=when, last_modified=timezone.now())
         return job_ids
 
@@ -990,6 +995,7 @@ class JobManager(models.Manager):
             if job.can_be_canceled():
                 job_ids.append(job.id)
 
+        self._update_status_counts(jobs, job_ids, 'CANCELED', when)
         self.filter(id__in=job_ids).update(status='CANCELED', error=None, node=None, last_status_change=when,
                                            last_modified=timezone.now())
         return job_ids
@@ -1006,12 +1012,14 @@ class JobManager(models.Manager):
         :type when: :class:`datetime.datetime`
         """
 
+        locked_jobs = self.get_locked_jobs(job_ids)
         jobs_to_update = []
-        for locked_job in self.get_locked_jobs(job_ids):
+        for locked_job in locked_jobs:
             if locked_job.status not in ['COMPLETED', 'CANCELED']:
                 jobs_to_update.append(locked_job.id)
 
         if jobs_to_update:
+            self._update_status_counts(locked_jobs, jobs_to_update, 'CANCELED', when)
             # Update job models in database
             self.filter(id__in=jobs_to_update).update(status='CANCELED', error=None, node=None, last_status_change=when,
                                                       last_modified=timezone.now())
@@ -1034,6 +1042,7 @@ class JobManager(models.Manager):
             if job.can_be_completed():
                 job_ids.append(job.id)
 
+        self._update_status_counts(jobs, job_ids, 'COMPLETED', when)
         self.filter(id__in=job_ids).update(status='COMPLETED', ended=when, last_status_change=when,
                                            last_modified=timezone.now())
         return job_ids
@@ -1058,6 +1067,7 @@ class JobManager(models.Manager):
             if job.can_be_failed():
                 job_ids.append(job.id)
 
+        self._update_status_counts(jobs, job_ids, 'FAILED', when, error_id)
         self.filter(id__in=job_ids).update(status='FAILED', error_id=error_id, ended=when, last_status_change=when,
                                            last_modified=timezone.now())
         return job_ids
@@ -1080,6 +1090,7 @@ class JobManager(models.Manager):
             if job.can_be_pending():
                 job_ids.append(job.id)
 
+        self._update_status_counts(jobs, job_ids, 'PENDING', when)
         self.filter(id__in=job_ids).update(status='PENDING', last_status_change=when, last_modified=timezone.now())
         return job_ids
 
@@ -1107,6 +1118,7 @@ class JobManager(models.Manager):
                 if job.can_be_queued():
                     job_ids.append(job.id)
 
+        self._update_status_counts(jobs, job_ids, 'QUEUED', when_queued)
         self.filter(id__in=job_ids).update(status='QUEUED', node=None, error=None, queued=when_queued, started=None,
                                            ended=None, last_status_change=when_queued,
                                            num_exes=models.F('num_exes') + 1, last_modified=timezone.now())
@@ -1130,6 +1142,7 @@ class JobManager(models.Manager):
             if job.can_be_running():
                 job_ids.append(job.id)
 
+        self._update_status_counts(jobs, job_ids, 'RUNNING', when)
         self.filter(id__in=job_ids).update(status='RUNNING', last_status_change=when, last_modified=timezone.now())
         return job_ids
 
@@ -1158,6 +1171,10 @@ class JobManager(models.Manager):
         ended = when if status in Job.FINAL_STATUSES else None
         modified = timezone.now()
 
+        # Update the job counts while the job models still have their old status
+        JobLoadCount.objects.add_status_changes(jobs, status)
+        JobTypeStatusSummary.objects.add_status_changes(jobs, status, when, error.id if error else None)
+
         # Update job models in memory and collect job IDs
         job_ids = set()
         for job in jobs:
@@ -1178,6 +1195,27 @@ class JobManager(models.Manager):
             self.filter(id__in=job_ids).update(status=status, last_status_change=when, ended=ended, error=error,
                                                last_modified=modified)
 
+    def _update_status_counts(self, jobs, job_ids, status, when, error_id=None):
+        """Updates the job load counts and job type status summaries for the jobs with the given IDs changing to the
+        given status
+
+        :param jobs: The job models, which must still have their old status
+        :type jobs: list
+        :param job_ids: The IDs of the jobs that are changing status
+        :type job_ids: list
+        :param status: The new status
+        :type status: string
+        :param when: The time of the status change
+        :type when: :class:`datetime.datetime`
+        :param error_id: The ID of the error that caused the failure, possibly None
+        :type error_id: int
+        """
+
+        job_ids = set(job_ids)
+        changed_jobs = [job for job in jobs if job.id in job_ids]
+        JobLoadCount.objects.add_status_changes(changed_jobs, status)
+        JobTypeStatusSummary.objects.add_status_changes(changed_jobs, status, when, error_id)
+
     # TODO: remove this function when API REST v5 is removed
     def _merge_job_data(self, job_interface_dict, job_data_dict, job_files):
         """Merges data for a single job instance with its job interface to produce a mapping of key/values.
@@ -1557,21 +1595,27 @@ class Job(models.Model):
 
         return rest_utils.strip_schema_version(convert_data_to_v6_json(self.get_output_data()).get_dict())
 
-    def get_resources(self):
-        """Returns the resources required for this job
+    def get_resources(self, job_type_resources=None, job_type_interface=None):
+        """Returns the resources required for this job. The resources and interface of the job type can be passed in
+        when they have already been calculated for another job of the same type.
 
+        :param job_type_resources: The resources required for jobs of this job's type, possibly None
+        :type job_type_resources: :class:`node.resources.node_resources.NodeResources`
+        :param job_type_interface: The interface of this job's type, possibly None
+        :type job_type_interface: :class:`job.configuration.interface.job_interface.JobInterface` or
+                :class:`job.seed.manifest.SeedManifest`
         :returns: The required resources
         :rtype: :class:`node.resources.node_resources.NodeResources`
         """
 
-        resources = self.job_type.get_resources()
+        resources = job_type_resources.copy() if job_type_resources else self.job_type.get_resources()
 
         # Input File Size in MiB
         input_file_size = self.input_file_size
         if not input_file_size:
             input_file_size = 0.0
 
-        interface = self.job_type.get_job_interface()
+        interface = job_type_interface if job_type_interface else self.job_type.get_job_interface()
 
         # TODO: remove legacy code branch in v6
         if not isinstance(interface, SeedManifest):
@@ -3245,7 +3289,8 @@ class JobTypeManager(models.Manager):
     def get_status(self, started, ended=None, is_operational=None):
         """Returns a list of job types with counts broken down by job status.
 
-        Note that all running job types are counted regardless of date/time filters.
+        Note that all running job types are counted regardless of date/time filters. The counts are read from the job
+        type status summaries, so the date/time filters are applied to whole hours.
 
         :param started: Query job types updated after this amount of time.
         :type started: :class:`datetime.datetime`
@@ -3264,23 +3309,24 @@ class JobTypeManager(models.Manager):
         status_dict = {job_type.id: JobTypeStatus(job_type, []) for job_type in job_types}
 
         # Build up the filters based on inputs and all running jobs
+        started_hour = started.replace(minute=0, second=0, microsecond=0)
         count_filters = Q(status='RUNNING')
         if ended:
-            count_filters = count_filters | Q(last_status_change__gte=started, last_status_change__lte=ended)
+            count_filters = count_filters | Q(hour__gte=started_hour, hour__lte=ended)
         else:
-            count_filters = count_filters | Q(last_status_change__gte=started)
+            count_filters = count_filters | Q(hour__gte=started_hour)
 
         # Fetch a count of all jobs grouped by status counts
-        count_dicts = Job.objects.values('job_type__id', 'status', 'error__category').filter(count_filters)
+        count_dicts = JobTypeStatusSummary.objects.get_summaries().filter(count_filters)
+        count_dicts = count_dicts.values('job_type__id', 'status', 'error__category')
         if is_operational is not None:
             count_dicts = count_dicts.filter(job_type__is_operational=is_operational)
-        count_dicts = count_dicts.annotate(count=models.Count('job_type'),
-                                           most_recent=models.Max('last_status_change'))
+        count_dicts = count_dicts.annotate(total=models.Sum('count'), most_recent=models.Max('last_status_change'))
 
         # Collect the status and counts by job type
-        for count_dict in count_dicts:
+        for count_dict in count_dicts.order_by():
             status = status_dict[count_dict['job_type__id']]
-            counts = JobTypeStatusCounts(count_dict['status'], count_dict['count'],
+            counts = JobTypeStatusCounts(count_dict['status'], count_dict['total'],
                                          count_dict['most_recent'], count_dict['error__category'])
             status.job_counts.append(counts)
 
@@ -3298,10 +3344,10 @@ class JobTypeManager(models.Manager):
 
         # Fetch a count of all pending jobs with type information
         # We have to specify values to workaround the JSON fields throwing an error when used with annotate
-        job_dicts = Job.objects.values(*['job_type__%s' % f for f in JobType.BASE_FIELDS])
-        job_dicts = job_dicts.filter(status='PENDING')
-        job_dicts = job_dicts.annotate(count=models.Count('job_type'),
-                                       longest_pending=models.Min('last_status_change'))
+        job_dicts = JobTypeStatusSummary.objects.get_summaries().filter(status='PENDING')
+        job_dicts = job_dicts.values(*['job_type__%s' % f for f in JobType.BASE_FIELDS])
+        job_dicts = job_dicts.annotate(total=models.Sum('count'),
+                                       longest_pending=models.Min('first_status_change'))
         job_dicts = job_dicts.order_by('longest_pending')
 
         # Convert each result to a real job type model with added statistics
@@ -3310,7 +3356,7 @@ class JobTypeManager(models.Manager):
             job_type_dict = {f: job_dict['job_type__%s' % f] for f in JobType.BASE_FIELDS}
             job_type = JobType(**job_type_dict)
 
-            status = JobTypePendingStatus(job_type, job_dict['count'], job_dict['longest_pending'])
+            status = JobTypePendingStatus(job_type, job_dict['total'], job_dict['longest_pending'])
             results.append(status)
         return results
 
@@ -3326,10 +3372,10 @@ class JobTypeManager(models.Manager):
 
         # Fetch a count of all running jobs with type information
         # We have to specify values to workaround the JSON fields throwing an error when used with annotate
-        job_dicts = Job.objects.values(*['job_type__%s' % f for f in JobType.BASE_FIELDS])
-        job_dicts = job_dicts.filter(status='RUNNING')
-        job_dicts = job_dicts.annotate(count=models.Count('job_type'),
-                                       longest_running=models.Min('last_status_change'))
+        job_dicts = JobTypeStatusSummary.objects.get_summaries().filter(status='RUNNING')
+        job_dicts = job_dicts.values(*['job_type__%s' % f for f in JobType.BASE_FIELDS])
+        job_dicts = job_dicts.annotate(total=models.Sum('count'),
+                                       longest_running=models.Min('first_status_change'))
         job_dicts = job_dicts.order_by('longest_running')
 
         # Convert each result to a real job type model with added statistics
@@ -3338,7 +3384,7 @@ class JobTypeManager(models.Manager):
             job_type_dict = {f: job_dict['job_type__%s' % f] for f in JobType.BASE_FIELDS}
             job_type = JobType(**job_type_dict)
 
-            status = JobTypeRunningStatus(job_type, job_dict['count'], job_dict['longest_running'])
+            status = JobTypeRunningStatus(job_type, job_dict['total'], job_dict['longest_running'])
             results.append(status)
         return results
 
@@ -3361,10 +3407,10 @@ class JobTypeManager(models.Manager):
         query_fields.extend(['error__%s' % f for f in error_fields])
 
         # Fetch a count of all running jobs with type information
-        job_dicts = Job.objects.values(*query_fields)
-        job_dicts = job_dicts.filter(status='FAILED', error__category='SYSTEM')
-        job_dicts = job_dicts.annotate(count=models.Count('job_type'),
-                                       first_error=models.Min('last_status_change'),
+        job_dicts = JobTypeStatusSummary.objects.get_summaries().filter(status='FAILED', error__category='SYSTEM')
+        job_dicts = job_dicts.values(*query_fields)
+        job_dicts = job_dicts.annotate(total=models.Sum('count'),
+                                       first_error=models.Min('first_status_change'),
                                        last_error=models.Max('last_status_change'))
         job_dicts = job_dicts.order_by('-last_error')
 
@@ -3377,7 +3423,7 @@ class JobTypeManager(models.Manager):
             error_dict = {f: job_dict['error__%s' % f] for f in error_fields}
             error = Error(**error_dict)
 
-            status = JobTypeFailedStatus(job_type, error, job_dict['count'], job_dict['first_error'],
+            status = JobTypeFailedStatus(job_type, error, job_dict['total'], job_dict['first_error'],
                                          job_dict['last_error'])
             results.append(status)
         return results
@@ -4331,3 +4377,426 @@ class JobTypeTag(models.Model):
     class Meta(object):
         """meta information for the db"""
         db_table = 'job_type_tag'
+
+
+class JobLoadCountManager(models.Manager):
+    """Provides additional methods for maintaining the job load counts. The counts are updated incrementally in the
+    same transaction as the job status changes, and periodically reconciled with the job table to correct any drift.
+    """
+
+    def add_deleted_jobs(self, job_ids):
+        """Removes the given jobs, which are about to be deleted, from the counts
+
+        :param job_ids: The IDs of the jobs being deleted
+        :type job_ids: list
+        """
+
+        deltas = {}
+        job_qry = Job.objects.filter(id__in=job_ids, status__in=JOB_LOAD_STATUSES).values('job_type_id', 'status')
+        for job_dict in job_qry.annotate(count=models.Count('id')):
+            deltas[(job_dict['job_type_id'], job_dict['status'])] = -job_dict['count']
+        self._apply_deltas(deltas)
+
+    def add_new_jobs(self, jobs):
+        """Adds the given newly created jobs to the counts
+
+        :param jobs: The new job models
+        :type jobs: list
+        """
+
+        deltas = {}
+        for job in jobs:
+            key = (job.job_type_id, job.status)
+            deltas[key] = deltas.get(key, 0) + 1
+        self._apply_deltas(deltas)
+
+    def add_status_changes(self, jobs, status):
+        """Moves the given jobs from their current status to the given status in the counts. The job models must still
+        have the status they had before the change.
+
+        :param jobs: The job models that are changing status
+        :type jobs: list
+        :param status: The new status
+        :type status: string
+        """
+
+        deltas = {}
+        for job in jobs:
+            if job.status == status:
+                continue
+            old_key = (job.job_type_id, job.status)
+            new_key = (job.job_type_id, status)
+            deltas[old_key] = deltas.get(old_key, 0) - 1
+            deltas[new_key] = deltas.get(new_key, 0) + 1
+        self._apply_deltas(deltas)
+
+    def get_counts(self):
+        """Returns a snapshot of the current job load counts
+
+        :returns: The counts stored by job type ID and then by status, only including positive counts
+        :rtype: dict
+        """
+
+        counts = {}
+        for job_type_id, status, count in self.filter(count__gt=0).values_list('job_type_id', 'status', 'count'):
+            counts.setdefault(job_type_id, {})[status] = count
+        return counts
+
+    def reconcile(self):
+        """Reconciles the counts with the job table, correcting any counts that have drifted. Each job type is
+        reconciled in its own short transaction that only locks the counts of that job type, so status changes of other
+        job types are never blocked.
+
+        :returns: The number of counts that were corrected
+        :rtype: int
+        """
+
+        num_corrected = 0
+        for job_type_id in list(JobType.objects.order_by('id').values_list('id', flat=True)):
+            num_corrected += self._reconcile_job_type(job_type_id)
+
+        if num_corrected:
+            logger.warning('Corrected %d job load count(s) that had drifted from the job table', num_corrected)
+        return num_corrected
+
+    def _apply_deltas(self, deltas):
+        """Applies the given changes to the counts, ignoring statuses that are not counted
+
+        :param deltas: The change to each count stored by (job type ID, status)
+        :type deltas: dict
+        """
+
+        # Update in a consistent order, which only orders the row locks taken within this call. Transactions that apply
+        # several batches of changes, or lock other rows in between, may still deadlock and are then aborted by the
+        # database.
+        for key in sorted(deltas.keys()):
+            job_type_id, status = key
+            delta = deltas[key]
+            if not delta or status not in JOB_LOAD_STATUSES:
+                continue
+            count_qry = self.filter(job_type_id=job_type_id, status=status)
+            if count_qry.update(count=F('count') + delta):
+                continue
+            try:
+                with transaction.atomic():
+                    self.create(job_type_id=job_type_id, status=status, count=delta)
+            except IntegrityError:
+                # Another transaction created the count first
+                count_qry.update(count=F('count') + delta)
+
+    @transaction.atomic
+    def _reconcile_job_type(self, job_type_id):
+        """Reconciles the counts of the given job type with the job table
+
+        :param job_type_id: The ID of the job type
+        :type job_type_id: int
+        :returns: The number of counts that were corrected
+        :rtype: int
+        """
+
+        # Lock the job type's counts so that none of its status changes are counted while its jobs are counted. They are
+        # locked in the same order that _apply_deltas() updates them.
+        count_qry = self.select_for_update().filter(job_type_id=job_type_id).order_by('status')
+        counts = {count.status: count for count in count_qry}
+
+        job_qry = Job.objects.filter(job_type_id=job_type_id, status__in=JOB_LOAD_STATUSES).values('status')
+        actual_counts = {job_dict['status']: job_dict['count'] for job_dict in
+                         job_qry.annotate(count=models.Count('id')).order_by()}
+
+        num_corrected = 0
+        for status, count in counts.items():
+            actual_count = actual_counts.pop(status, 0)
+            if count.count != actual_count:
+                self.filter(id=count.id).update(count=actual_count)
+                num_corrected += 1
+
+        for status, actual_count in actual_counts.items():
+            try:
+                with transaction.atomic():
+                    self.create(job_type_id=job_type_id, status=status, count=actual_count)
+            except IntegrityError:
+                # A concurrent status change created the count after the jobs were counted, so it already differs from
+                # the one computed here and is left for the next reconciliation to check
+                continue
+            num_corrected += 1
+
+        return num_corrected
+
+
+class JobLoadCount(models.Model):
+    """Stores the number of jobs of a job type that currently have a job load status (PENDING, QUEUED, or RUNNING)
+
+    :keyword job_type: The job type
+    :type job_type: :class:`django.db.models.ForeignKey`
+    :keyword status: The job status
+    :type status: :class:`django.db.models.CharField`
+    :keyword count: The number of jobs of the job type with the status
+    :type count: :class:`django.db.models.IntegerField`
+    """
+
+    job_type = models.ForeignKey('job.JobType', on_delete=models.PROTECT)
+    status = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    objects = JobLoadCountManager()
+
+    class Meta(object):
+        """meta information for the db"""
+        db_table = 'job_load_count'
+        unique_together = ('job_type', 'status')
+
+
+class JobTypeStatusSummaryManager(models.Manager):
+    """Provides additional methods for maintaining the job type status summaries. The summaries are updated
+    incrementally in the same transaction as the job status changes, and periodically reconciled with the job table to
+    correct any drift.
+    """
+
+    def add_deleted_jobs(self, job_ids):
+        """Removes the given jobs, which are about to be deleted, from the summaries
+
+        :param job_ids: The IDs of the jobs being deleted
+        :type job_ids: list
+        """
+
+        deltas = {}
+        job_qry = Job.objects.filter(id__in=job_ids)
+        for job_type_id, status, error_id, last_status_change in job_qry.values_list('job_type_id', 'status',
+                                                                                     'error_id', 'last_status_change'):
+            self._add_delta(deltas, (job_type_id, status, error_id, self._get_hour(last_status_change)), -1)
+        self._apply_deltas(deltas)
+
+    def add_new_jobs(self, jobs):
+        """Adds the given newly created jobs to the summaries
+
+        :param jobs: The new job models
+        :type jobs: list
+        """
+
+        deltas = {}
+        for job in jobs:
+            key = (job.job_type_id, job.status, job.error_id, self._get_hour(job.last_status_change))
+            self._add_delta(deltas, key, 1, job.last_status_change)
+        self._apply_deltas(deltas)
+
+    def add_status_changes(self, jobs, status, when, error_id=None):
+        """Moves the given jobs from their current status to the given status in the summaries. The job models must
+        still have the status, error, and last status change they had before the change.
+
+        :param jobs: The job models that are changing status
+        :type jobs: list
+        :param status: The new status
+        :type status: string
+        :param when: The time of the status change
+        :type when: :class:`datetime.datetime`
+        :param error_id: The ID of the error that caused the failure, possibly None
+        :type error_id: int
+        """
+
+        deltas = {}
+        for job in jobs:
+            if job.status == status:
+                continue
+            old_key = (job.job_type_id, job.status, job.error_id, self._get_hour(job.last_status_change))
+            new_key = (job.job_type_id, status, error_id, self._get_hour(when))
+            self._add_delta(deltas, old_key, -1)
+            self._add_delta(deltas, new_key, 1, when)
+        self._apply_deltas(deltas)
+
+    def get_summaries(self):
+        """Returns a query for the summaries that currently have jobs
+
+        :returns: The query for the non-empty summaries
+        :rtype: :class:`django.db.models.QuerySet`
+        """
+
+        return self.filter(count__gt=0)
+
+    def reconcile(self):
+        """Reconciles the summaries with the job table, correcting any summaries that have drifted and removing the
+        empty ones. Each job type is reconciled in its own short transaction that only locks the summaries of that job
+        type, so status changes of other job types are never blocked.
+
+        :returns: The number of summaries that were corrected
+        :rtype: int
+        """
+
+        num_corrected = 0
+        for job_type_id in list(JobType.objects.order_by('id').values_list('id', flat=True)):
+            num_corrected += self._reconcile_job_type(job_type_id)
+
+        if num_corrected:
+            logger.warning('Corrected %d job type status summaries that had drifted from the job table', num_corrected)
+        return num_corrected
+
+    def _add_delta(self, deltas, key, delta, when=None):
+        """Adds a change to the given summary key, extending the key's status change range by the given time
+
+        :param deltas: The changes stored by summary key
+        :type deltas: dict
+        :param key: The summary key (job type ID, status, error ID, hour)
+        :type key: tuple
+        :param delta: The change in the job count
+        :type delta: int
+        :param when: The status change time of an added job, possibly None
+        :type when: :class:`datetime.datetime`
+        """
+
+        count, first, last = deltas.get(key, (0, None, None))
+        if when:
+            first = when if not first or when < first else first
+            last = when if not last or when > last else last
+        deltas[key] = (count + delta, first, last)
+
+    def _apply_deltas(self, deltas):
+        """Applies the given changes to the summaries
+
+        :param deltas: The changes stored by summary key, each a tuple of (count change, first added time, last added
+            time)
+        :type deltas: dict
+        """
+
+        # Update in a consistent order, which only orders the row locks taken within this call. Transactions that apply
+        # several batches of changes, or lock other rows in between, may still deadlock and are then aborted by the
+        # database. None sorts first since datetimes cannot be compared with None.
+        for key in sorted(deltas.keys(), key=lambda k: (k[0], k[1], k[2], k[3] is not None, k[3])):
+            job_type_id, status, error_id, hour = key
+            delta, first, last = deltas[key]
+            if not delta:
+                continue
+            updates = {'count': F('count') + delta}
+            if first:
+                # An empty summary starts a new range, otherwise the range is extended by the added jobs
+                first_filter = Q(count__lte=0) | Q(first_status_change__isnull=True) | Q(first_status_change__gt=first)
+                last_filter = Q(count__lte=0) | Q(last_status_change__isnull=True) | Q(last_status_change__lt=last)
+                updates['first_status_change'] = models.Case(models.When(first_filter, then=models.Value(first)),
+                                                             default=F('first_status_change'),
+                                                             output_field=models.DateTimeField())
+                updates['last_status_change'] = models.Case(models.When(last_filter, then=models.Value(last)),
+                                                            default=F('last_status_change'),
+                                                            output_field=models.DateTimeField())
+            summary_qry = self.filter(job_type_id=job_type_id, status=status, error_id=error_id, hour=hour)
+            if summary_qry.update(**updates):
+                continue
+            try:
+                with transaction.atomic():
+                    self.create(job_type_id=job_type_id, status=status, error_id=error_id, hour=hour, count=delta,
+                                first_status_change=first, last_status_change=last)
+            except IntegrityError:
+                # Another transaction created the summary first
+                summary_qry.update(**updates)
+
+    def _get_hour(self, when):
+        """Returns the hour bucket for the given status change time
+
+        :param when: The status change time, possibly None
+        :type when: :class:`datetime.datetime`
+        :returns: The start of the hour, possibly None
+        :rtype: :class:`datetime.datetime`
+        """
+
+        if not when:
+            return None
+        return when.replace(minute=0, second=0, microsecond=0)
+
+    @transaction.atomic
+    def _reconcile_job_type(self, job_type_id):
+        """Reconciles the summaries of the given job type with the job table
+
+        :param job_type_id: The ID of the job type
+        :type job_type_id: int
+        :returns: The number of summaries that were corrected
+        :rtype: int
+        """
+
+        # Lock the job type's summaries so that none of its status changes are summarized while its jobs are summarized.
+        # They are locked in the same order that _apply_deltas() updates them.
+        summary_qry = self.select_for_update().filter(job_type_id=job_type_id)
+        summary_qry = summary_qry.order_by('status', F('error_id').asc(nulls_first=True),
+                                           F('hour').asc(nulls_first=True))
+        summaries = {}
+        for summary in summary_qry.iterator():
+            summaries[(summary.status, summary.error_id, summary.hour)] = summary
+
+        job_qry = Job.objects.filter(job_type_id=job_type_id).annotate(hour=TruncHour('last_status_change'))
+        job_qry = job_qry.values('status', 'error_id', 'hour')
+        job_qry = job_qry.annotate(count=models.Count('id'), first_status_change=models.Min('last_status_change'),
+                                   latest_status_change=models.Max('last_status_change'))
+        actual_summaries = {}
+        for job_dict in job_qry.order_by().iterator():
+            actual_summaries[(job_dict['status'], job_dict['error_id'], job_dict['hour'])] = job_dict
+
+        num_corrected = 0
+        empty_ids = []
+        for key, summary in summaries.items():
+            job_dict = actual_summaries.pop(key, None)
+            if not job_dict:
+                if summary.count:
+                    num_corrected += 1
+                empty_ids.append(summary.id)
+                continue
+            if (summary.count != job_dict['count'] or
+                    summary.first_status_change != job_dict['first_status_change'] or
+                    summary.last_status_change != job_dict['latest_status_change']):
+                self.filter(id=summary.id).update(count=job_dict['count'],
+                                                  first_status_change=job_dict['first_status_change'],
+                                                  last_status_change=job_dict['latest_status_change'])
+                num_corrected += 1
+        if empty_ids:
+            self.filter(id__in=empty_ids).delete()
+
+        for key, job_dict in actual_summaries.items():
+            status, error_id, hour = key
+            try:
+                with transaction.atomic():
+                    self.create(job_type_id=job_type_id, status=status, error_id=error_id, hour=hour,
+                                count=job_dict['count'], first_status_change=job_dict['first_status_change'],
+                                last_status_change=job_dict['latest_status_change'])
+            except IntegrityError:
+                # A concurrent status change created the summary after the jobs were counted, so its count already
+                # differs from the one computed here and is left for the next reconciliation to check
+                continue
+            num_corrected += 1
+
+        return num_corrected
+
+
+class JobTypeStatusSummary(models.Model):
+    """Summarizes the jobs of a job type that currently have a given status and error and whose last status change
+    occurred within a given hour. The summaries back the job type status views so that they do not need to aggregate
+    the entire job table. Since jobs leaving a summary do not shrink its status change range, the first and last status
+    change times are only accurate to within the hour.
+
+    :keyword job_type: The job type
+    :type job_type: :class:`django.db.models.ForeignKey`
+    :keyword status: The job status
+    :type status: :class:`django.db.models.CharField`
+    :keyword error: The error that caused the jobs to fail, possibly None
+    :type error: :class:`django.db.models.ForeignKey`
+    :keyword hour: The start of the hour in which the jobs last changed status, None for jobs that have not had a status
+        change
+    :type hour: :class:`django.db.models.DateTimeField`
+
+    :keyword count: The number of jobs
+    :type count: :class:`django.db.models.IntegerField`
+    :keyword first_status_change: The earliest last status change of the jobs
+    :type first_status_change: :class:`django.db.models.DateTimeField`
+    :keyword last_status_change: The latest last status change of the jobs
+    :type last_status_change: :class:`django.db.models.DateTimeField`
+    """
+
+    job_type = models.ForeignKey('job.JobType', on_delete=models.PROTECT)
+    status = models.CharField(max_length=50)
+    error = models.ForeignKey('error.Error', blank=True, null=True, on_delete=models.PROTECT)
+    hour = models.DateTimeField(blank=True, db_index=True, null=True)
+
+    count = models.IntegerField(default=0)
+    first_status_change = models.DateTimeField(blank=True, null=True)
+    last_status_change = models.DateTimeField(blank=True, null=True)
+
+    objects = JobTypeStatusSummaryManager()
+
+    class Meta(object):
+        """meta information for the db"""
+        db_table = 'job_type_status_summary'
+        # The unique index on (job_type, status, error, hour) is created by a migration since error and hour may be null
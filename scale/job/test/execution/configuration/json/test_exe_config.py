@@ -74,6 +74,22 @@ class TestExecutionConfiguration(TestCase):
         copy = exe_config.create_copy()
         self.assertDictEqual(copy.get_dict(), config)
 
+    def test_get_input_file_ids(self):
+        """Tests the get_input_file_ids() method"""
+
+        file_dict = {'type': 'SOURCE', 'workspace_name': 'wksp-name', 'workspace_path': 'the/path', 'is_deleted': False}
+        config = {
+            'version': '2.0',
+            'input_files': {
+                'INPUT_1': [dict(file_dict, id=1), dict(file_dict, id=2)],
+                'INPUT_2': [dict(file_dict, id=2), dict(file_dict, id=3)],
+            },
+        }
+        exe_config = ExecutionConfiguration(config)
+
+        self.assertSetEqual(set(exe_config.get_input_file_ids()), {1, 2, 3})
+        self.assertListEqual(ExecutionConfiguration().get_input_file_ids(), [])
+
 
 class TestExecutionConfigurationConvert(TestCase):
     """Tests performing conversion from lower to higher minor versions of configuration schema."""
@@ -62,6 +62,28 @@ class TestCompletedJobs(TransactionTestCase):
         self.assertEqual(jobs[2].status, 'PENDING')
         self.assertEqual(jobs[2].num_exes, 0)
 
+    def test_merge(self):
+        """Tests merging CompletedJobs messages"""
+
+        when = now()
+        message_1 = CompletedJobs()
+        message_1.ended = when
+        message_1.add_completed_job(CompletedJob(1, 1))
+        message_2 = CompletedJobs()
+        message_2.ended = when
+        message_2.add_completed_job(CompletedJob(1, 1))
+        message_2.add_completed_job(CompletedJob(2, 3))
+
+        self.assertTrue(message_1.merge(message_2))
+        self.assertListEqual(message_1.to_json()['jobs'], [{'id': 1, 'exe_num': 1}, {'id': 2, 'exe_num': 3}])
+
+        # Messages with a different end time cannot be merged
+        message_3 = CompletedJobs()
+        message_3.ended = when + datetime.timedelta(seconds=1)
+        message_3.add_completed_job(CompletedJob(4, 1))
+        self.assertFalse(message_1.merge(message_3))
+        self.assertEqual(len(message_1.to_json()['jobs']), 2)
+
     def test_execute(self):
         """Tests calling CompletedJobs.execute() successfully"""
 
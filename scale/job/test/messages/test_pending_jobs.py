@@ -61,6 +61,29 @@ class TestPendingJobs(TransactionTestCase):
         self.assertEqual(jobs[4].status, 'QUEUED')
         self.assertEqual(jobs[4].last_status_change, original_status_change)
 
+    def test_merge(self):
+        """Tests merging PendingJobs messages"""
+
+        when = now()
+        message_1 = PendingJobs()
+        message_1.status_change = when
+        message_1.add_job(1)
+        message_1.add_job(2)
+        message_2 = PendingJobs()
+        message_2.status_change = when
+        message_2.add_job(2)
+        message_2.add_job(3)
+
+        self.assertTrue(message_1.merge(message_2))
+        self.assertListEqual(message_1.to_json()['job_ids'], [1, 2, 3])
+
+        # Messages with a different status change time cannot be merged
+        message_3 = PendingJobs()
+        message_3.status_change = when + datetime.timedelta(seconds=1)
+        message_3.add_job(4)
+        self.assertFalse(message_1.merge(message_3))
+        self.assertListEqual(message_1.to_json()['job_ids'], [1, 2, 3])
+
     def test_execute(self):
         """Tests calling PendingJobs.execute() successfully"""
 
@@ -1,5 +1,7 @@
 from __future__ import unicode_literals
 
+import datetime
+
 import django
 from django.utils.timezone import now
 from django.test import TransactionTestCase
@@ -64,6 +66,31 @@ class TestRunningJobs(TransactionTestCase):
         self.assertEqual(jobs[4].started, started)
         self.assertEqual(jobs[4].node_id, node_2.id)
 
+    def test_merge(self):
+        """Tests merging RunningJobs messages"""
+
+        started = now()
+        message_1 = RunningJobs(started)
+        message_1.add_running_job(1, 1, 10)
+        message_2 = RunningJobs(started)
+        message_2.add_running_job(1, 1, 10)
+        message_2.add_running_job(2, 1, 20)
+
+        self.assertTrue(message_1.merge(message_2))
+        self.assertEqual(message_1._count, 2)
+        self.assertDictEqual(message_1._running_jobs, {10: [(1, 1)], 20: [(2, 1)]})
+
+        # The same job execution on a different node cannot be merged
+        message_3 = RunningJobs(started)
+        message_3.add_running_job(2, 1, 30)
+        self.assertFalse(message_1.merge(message_3))
+
+        # Messages with a different start time cannot be merged
+        message_4 = RunningJobs(started + datetime.timedelta(seconds=1))
+        message_4.add_running_job(3, 1, 10)
+        self.assertFalse(message_1.merge(message_4))
+        self.assertEqual(message_1._count, 2)
+
     def test_execute(self):
         """Tests calling RunningJobs.execute() successfully"""
 
@@ -8,7 +8,9 @@ import time
 
 import django
 import django.utils.timezone as timezone
+from django.db import IntegrityError
 from django.test import TestCase, TransactionTestCase
+from mock import patch
 
 import error.test.utils as error_test_utils
 import job.test.utils as job_test_utils
@@ -23,7 +25,8 @@ from job.configuration.interface.job_interface import JobInterface
 from job.configuration.results.job_results import JobResults
 from job.error.mapping import create_legacy_error_mapping
 from job.seed.results.job_results import JobResults as SeedJobResults
-from job.models import Job, JobExecution, JobExecutionOutput, JobInputFile, JobType, JobTypeRevision, JobTypeTag
+from job.models import (Job, JobExecution, JobExecutionOutput, JobInputFile, JobLoadCount, JobType, JobTypeRevision,
+                        JobTypeStatusSummary, JobTypeTag)
 from node.resources.json.resources import Resources
 
 
@@ -470,6 +473,119 @@ class TestJobManager(TransactionTestCase):
         self.assertIsNotNone(job.ended)
 
 
+class TestJobLoadCountManager(TransactionTestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.job_type = job_test_utils.create_job_type()
+
+    def test_status_changes(self):
+        """Tests that the job load counts follow job status changes"""
+
+        job_1 = job_test_utils.create_job(job_type=self.job_type, status='PENDING', input=JobData().get_dict())
+        job_2 = job_test_utils.create_job(job_type=self.job_type, status='PENDING', input=JobData().get_dict())
+        self.assertDictEqual(JobLoadCount.objects.get_counts(), {self.job_type.id: {'PENDING': 2}})
+
+        when = timezone.now()
+        Job.objects.update_jobs_to_queued(Job.objects.get_locked_jobs([job_1.id, job_2.id]), when)
+        self.assertDictEqual(JobLoadCount.objects.get_counts(), {self.job_type.id: {'QUEUED': 2}})
+
+        Job.objects.update_jobs_to_running(Job.objects.get_locked_jobs([job_1.id]), when)
+        Job.objects.update_jobs_to_completed(Job.objects.get_locked_jobs([job_1.id]), when)
+        Job.objects.update_jobs_to_canceled(Job.objects.get_locked_jobs([job_2.id]), when)
+        self.assertDictEqual(JobLoadCount.objects.get_counts(), {})
+
+    def test_reconcile(self):
+        """Tests that reconciling corrects job load counts that have drifted from the job table"""
+
+        job_test_utils.create_job(job_type=self.job_type, status='RUNNING')
+        job = job_test_utils.create_job(job_type=self.job_type, status='QUEUED')
+        Job.objects.filter(id=job.id).update(status='RUNNING')  # Change the status without updating the counts
+        self.assertDictEqual(JobLoadCount.objects.get_counts(), {self.job_type.id: {'QUEUED': 1, 'RUNNING': 1}})
+
+        self.assertEqual(JobLoadCount.objects.reconcile(), 2)
+        self.assertDictEqual(JobLoadCount.objects.get_counts(), {self.job_type.id: {'RUNNING': 2}})
+        self.assertEqual(JobLoadCount.objects.reconcile(), 0)
+
+    def test_reconcile_concurrent_create(self):
+        """Tests that reconciling leaves a count that a concurrent status change created for the next reconciliation"""
+
+        job_test_utils.create_job(job_type=self.job_type, status='RUNNING')
+        JobLoadCount.objects.all().delete()
+
+        with patch.object(JobLoadCount.objects, 'create', side_effect=IntegrityError):
+            self.assertEqual(JobLoadCount.objects.reconcile(), 0)
+        self.assertEqual(JobLoadCount.objects.reconcile(), 1)
+        self.assertDictEqual(JobLoadCount.objects.get_counts(), {self.job_type.id: {'RUNNING': 1}})
+
+
+class TestJobTypeStatusSummaryManager(TransactionTestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.job_type = job_test_utils.create_job_type()
+        self.error = error_test_utils.create_error(category='SYSTEM')
+
+    def _get_summaries(self):
+        """Returns the non-empty summaries as tuples of (status, error ID, hour, count, first, last)"""
+
+        summaries = JobTypeStatusSummary.objects.get_summaries().filter(job_type_id=self.job_type.id)
+        return set(summaries.values_list('status', 'error_id', 'hour', 'count', 'first_status_change',
+                                         'last_status_change'))
+
+    def test_status_changes(self):
+        """Tests that the job type status summaries follow job status changes"""
+
+        hour = datetime.datetime(2015, 1, 1, 10, tzinfo=timezone.utc)
+        first = hour + datetime.timedelta(minutes=5)
+        last = hour + datetime.timedelta(minutes=40)
+        job_1 = job_test_utils.create_job(job_type=self.job_type, status='PENDING', input=JobData().get_dict(),
+                                          last_status_change=first)
+        job_2 = job_test_utils.create_job(job_type=self.job_type, status='PENDING', input=JobData().get_dict(),
+                                          last_status_change=last)
+        self.assertSetEqual(self._get_summaries(), {('PENDING', None, hour, 2, first, last)})
+
+        when = hour + datetime.timedelta(hours=2, minutes=30)
+        when_hour = hour + datetime.timedelta(hours=2)
+        Job.objects.update_jobs_to_queued(Job.objects.get_locked_jobs([job_1.id, job_2.id]), when)
+        self.assertSetEqual(self._get_summaries(), {('QUEUED', None, when_hour, 2, when, when)})
+
+        Job.objects.update_jobs_to_failed(Job.objects.get_locked_jobs([job_1.id]), self.error.id, when)
+        self.assertSetEqual(self._get_summaries(), {('QUEUED', None, when_hour, 1, when, when),
+                                                    ('FAILED', self.error.id, when_hour, 1, when, when)})
+
+        status = JobType.objects.get_failed_status()
+        self.assertEqual(len(status), 1)
+        self.assertEqual(status[0].error.id, self.error.id)
+        self.assertEqual(status[0].count, 1)
+
+    def test_reconcile(self):
+        """Tests that reconciling corrects job type status summaries that have drifted from the job table"""
+
+        when = datetime.datetime(2015, 1, 1, 10, 30, tzinfo=timezone.utc)
+        hour = datetime.datetime(2015, 1, 1, 10, tzinfo=timezone.utc)
+        job = job_test_utils.create_job(job_type=self.job_type, status='RUNNING', last_status_change=when)
+        Job.objects.filter(id=job.id).update(status='COMPLETED')  # Change the status without updating the summaries
+        self.assertSetEqual(self._get_summaries(), {('RUNNING', None, hour, 1, when, when)})
+
+        self.assertEqual(JobTypeStatusSummary.objects.reconcile(), 2)
+        self.assertSetEqual(self._get_summaries(), {('COMPLETED', None, hour, 1, when, when)})
+        self.assertEqual(JobTypeStatusSummary.objects.reconcile(), 0)
+
+    def test_reconcile_concurrent_create(self):
+        """Tests that reconciling leaves a summary that a concurrent status change created for the next reconciliation"""
+
+        when = datetime.datetime(2015, 1, 1, 10, 30, tzinfo=timezone.utc)
+        job_test_utils.create_job(job_type=self.job_type, status='RUNNING', last_status_change=when)
+        JobTypeStatusSummary.objects.all().delete()
+
+        with patch.object(JobTypeStatusSummary.objects, 'create', side_effect=IntegrityError):
+            self.assertEqual(JobTypeStatusSummary.objects.reconcile(), 0)
+        self.assertEqual(JobTypeStatusSummary.objects.reconcile(), 1)
+
+
 class TestJob(TestCase):
 
     def setUp(self):
@@ -553,6 +553,47 @@ class TestJobsViewV6(TestCase):
         self.assertEqual(result['results'][2]['job_type']['id'], self.job_type1.id)
         self.assertEqual(result['results'][3]['job_type']['id'], self.job_type2.id)
 
+    def test_cursor_pagination(self):
+        """Tests paging through the jobs view with cursors."""
+
+        job_ids = [self.job1.id, self.job2.id, self.job3.id]
+
+        url = '/%s/jobs/?pagination=cursor&page_size=2&order=-id' % self.api
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertEqual(result['count'], 3)
+        self.assertListEqual([entry['id'] for entry in result['results']], sorted(job_ids, reverse=True)[:2])
+        self.assertIsNone(result['previous'])
+        self.assertIsNotNone(result['next'])
+
+        response = self.client.generic('GET', result['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertListEqual([entry['id'] for entry in result['results']], [min(job_ids)])
+        self.assertIsNotNone(result['previous'])
+        self.assertIsNone(result['next'])
+
+        response = self.client.generic('GET', result['previous'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertListEqual([entry['id'] for entry in result['results']], sorted(job_ids, reverse=True)[:2])
+        self.assertIsNone(result['previous'])
+
+    def test_cursor_pagination_invalid(self):
+        """Tests calling the jobs view with an invalid cursor or an unsupported sort field."""
+
+        url = '/%s/jobs/?cursor=invalid' % self.api
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.content)
+
+        url = '/%s/jobs/?pagination=cursor&order=started' % self.api
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.content)
+
 class TestJobsPostViewV6(TestCase):
 
     api = "v6"
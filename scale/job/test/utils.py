@@ -15,7 +15,7 @@ from job.execution.configuration.json.exe_config import ExecutionConfiguration
 from job.configuration.results.job_results import JobResults
 from job.execution.job_exe import RunningJobExecution
 from job.execution.tasks.json.results.task_results import TaskResults
-from job.models import Job, JobExecution, JobExecutionEnd, JobExecutionOutput, JobInputFile, JobType, JobTypeRevision, TaskUpdate
+from job.models import Job, JobExecution, JobExecutionEnd, JobExecutionOutput, JobInputFile, JobLoadCount, JobType, JobTypeRevision, JobTypeStatusSummary, TaskUpdate
 from job.seed.manifest import SeedManifest
 from job.tasks.update import TaskStatusUpdate
 from node.test import utils as node_utils
@@ -256,6 +256,8 @@ def create_job(job_type=None, event=None, status='PENDING', error=None, input=No
     job.input_file_size = input_file_size
     if save:
         job.save()
+        JobLoadCount.objects.add_new_jobs([job])
+        JobTypeStatusSummary.objects.add_new_jobs([job])
     return job
 
 
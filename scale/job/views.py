@@ -1061,6 +1061,7 @@ class JobTypesStatusView(ListAPIView):
 class JobsView(ListAPIView):
     """This view is the endpoint for retrieving a list of all available jobs."""
     queryset = Job.objects.all()
+    pagination_class = rest_util.KeysetPagination
 
     # TODO: remove this class and un-comment serializer declaration when REST API v5 is removed
     # serializer_class = JobSerializer
@@ -1635,6 +1636,7 @@ class JobsWithExecutionView(ListAPIView):
 class JobExecutionsView(ListAPIView):
     """This view is the endpoint for viewing job executions and their associated job_type id, name, and version"""
     queryset = JobExecution.objects.all()
+    pagination_class = rest_util.KeysetPagination
 
     # TODO: remove this class and un-comment serializer declaration when REST API v5 is removed
     # serializer_class = JobExecutionSerializer
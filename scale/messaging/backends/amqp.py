@@ -6,7 +6,9 @@ from __future__ import unicode_literals
 
 import Queue
 import logging
-from contextlib import closing
+import os
+import threading
+from contextlib import closing, contextmanager
 
 from kombu import Connection
 
@@ -16,7 +18,11 @@ logger = logging.getLogger(__name__)
 
 
 class AMQPMessagingBackend(MessagingBackend):
-    """Backend supporting message passing via AMQP 0.9.1 broker, targeting RabbitMQ"""
+    """Backend supporting message passing via AMQP 0.9.1 broker, targeting RabbitMQ
+
+    Broker connections are pooled and persist across calls for the life of the process. A connection is verified
+    before each use and transparently re-established if the broker dropped it.
+    """
 
     def __init__(self):
         super(AMQPMessagingBackend, self).__init__('amqp')
@@ -24,26 +30,124 @@ class AMQPMessagingBackend(MessagingBackend):
         # Message retrieval timeout
         self._timeout = 1
 
-    def send_messages(self, messages):
+        # Maximum number of pooled broker connections held open by this process
+        self._pool_limit = 10
+
+        # Number of attempts made to (re)establish a broker connection before failing
+        self._max_retries = 3
+
+        # The connection pool is created lazily so that no broker I/O occurs at registration and so that forked
+        # processes never share sockets with their parent
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._pool_pid = None
+
+    def send_messages(self, messages, queue_name=None):
         """See :meth:`messaging.backends.backend.MessagingBackend.send_messages`"""
-        with Connection(self._broker_url) as connection:
-            with closing(connection.SimpleQueue(self._queue_name)) as simple_queue:
-                for message in messages:
-                    logger.debug('Sending message of type: %s', message['type'])
-                    simple_queue.put(message)
 
-    def receive_messages(self, batch_size):
+        queue_name = queue_name or self._queue_name
+        index = 0
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with self._acquire_connection() as connection:
+                    # Sending has no consumer state, so the connection's long-lived default channel is reused
+                    with closing(connection.SimpleQueue(queue_name)) as simple_queue:
+                        while index < len(messages):
+                            message = messages[index]
+                            logger.debug('Sending message of type: %s', message['type'])
+                            content_type, content_encoding, body, compression = self._serialize(message)
+                            simple_queue.put(body, content_type=content_type, content_encoding=content_encoding,
+                                             compression=compression)
+                            index += 1
+                return
+            except self._get_connection_errors():
+                if attempt > self._max_retries:
+                    raise
+                logger.warning('Lost connection to broker while sending messages, reconnecting...')
+
+    def get_queue_depth(self, queue_name=None):
+        """See :meth:`messaging.backends.backend.MessagingBackend.get_queue_depth`"""
+
+        with self._acquire_connection() as connection:
+            with closing(connection.SimpleQueue(queue_name or self._queue_name)) as simple_queue:
+                return simple_queue.qsize()
+
+    def receive_messages(self, batch_size, process_messages, queue_name=None, wait=True):
         """See :meth:`messaging.backends.backend.MessagingBackend.receive_messages`"""
-        with Connection(self._broker_url) as connection:
-            with closing(connection.SimpleQueue(self._queue_name)) as simple_queue:
-                for _ in range(batch_size):
-                    try:
-                        message = simple_queue.get(timeout=self._timeout)
-
-                        # Accept success back via generator send
-                        success = yield message.payload
+
+        queue_name = queue_name or self._queue_name
+        with self._acquire_connection() as connection:
+            # Each batch consumes on its own channel. Closing the channel at the end of the batch returns any delivered
+            # but unacknowledged messages to the queue, just as closing the whole connection used to.
+            with closing(connection.channel()) as channel:
+                # Limit deliveries to this batch so the rest of the queue stays available to other consumers
+                channel.basic_qos(0, batch_size, False)
+                with closing(connection.SimpleQueue(queue_name, channel=channel)) as simple_queue:
+                    messages = []
+                    for _ in range(batch_size):
+                        try:
+                            if wait or messages:
+                                messages.append(simple_queue.get(timeout=self._timeout))
+                            else:
+                                messages.append(simple_queue.get_nowait())
+                        except Queue.Empty:
+                            # We've reached the end of the queue... exit loop
+                            break
+
+                    if not messages:
+                        return 0
+
+                    # Payloads are decoded (and decompressed) according to each message's own content headers
+                    results = process_messages([message.payload for message in messages])
+                    for message, success in zip(messages, results):
                         if success:
                             message.ack()
-                    except Queue.Empty:
-                        # We've reached the end of the queue... exit loop
-                        break
+                        else:
+                            # Release the message right away so another consumer may pick it up
+                            message.requeue()
+
+        return len(messages)
+
+    @contextmanager
+    def _acquire_connection(self):
+        """Acquires a healthy pooled broker connection, returning it to the pool when finished. A connection that fails
+        during use is reset so that it reconnects the next time it is acquired.
+
+        :return: The broker connection
+        :rtype: :class:`kombu.Connection`
+        """
+
+        with self._get_pool().acquire(block=True) as connection:
+            connection.ensure_connection(max_retries=self._max_retries)
+            try:
+                yield connection
+            except connection.connection_errors + connection.channel_errors:
+                logger.exception('Broker connection failed, it will be re-established on next use')
+                connection.collect()
+                raise
+
+    def _get_connection_errors(self):
+        """Returns the exception types that indicate a broken broker connection
+
+        :return: The connection exception types
+        :rtype: tuple
+        """
+
+        pool = self._get_pool()
+        return pool.connection.connection_errors + pool.connection.channel_errors
+
+    def _get_pool(self):
+        """Returns the broker connection pool for the current process, creating it if necessary
+
+        :return: The connection pool
+        :rtype: :class:`kombu.connection.ConnectionPool`
+        """
+
+        with self._pool_lock:
+            pid = os.getpid()
+            if self._pool is None or self._pool_pid != pid:
+                self._pool = Connection(self._broker_url).Pool(limit=self._pool_limit)
+                self._pool_pid = pid
+            return self._pool
@@ -1,9 +1,17 @@
+import logging
 from abc import ABCMeta, abstractmethod
 
 from django.conf import settings
+from kombu.exceptions import SerializerNotInstalled
+from kombu.serialization import dumps
 
 from util.broker import BrokerDetails
 
+# Compression method applied to serialized messages larger than the compression threshold
+COMPRESSION = 'zlib'
+
+logger = logging.getLogger(__name__)
+
 
 class MessagingBackend(object):
     __metaclass__ = ABCMeta
@@ -19,33 +27,81 @@ class MessagingBackend(object):
         self._broker_url = settings.BROKER_URL
         self._broker = BrokerDetails.from_broker_url(settings.BROKER_URL)
 
-        # TODO: Transition to more advanced message routing per command message type
+        # Default queue, used when no queue is specified. Messages are routed to other queues by the manager.
         self._queue_name = settings.QUEUE_NAME
 
+        # Wire format for sent messages, received messages are decoded according to their own format
+        self._serializer = settings.MESSAGE_SERIALIZER
+        self._compression_threshold = settings.MESSAGE_COMPRESSION_THRESHOLD
+        try:
+            dumps({}, serializer=self._serializer)
+        except SerializerNotInstalled:
+            logger.warning('Message serializer %s is not available, falling back to json', self._serializer)
+            self._serializer = 'json'
+
     @abstractmethod
-    def send_messages(self, messages):
+    def send_messages(self, messages, queue_name=None):
         """Send a collection of messages to the backend
         
-        Connections are not persisted across send_messages calls. It is recommended that if a large
-        number of messages are to be sent it be done directly in a single function call.
+        Implementations should persist broker connections across calls, but it is still recommended that if a
+        large number of messages are to be sent it be done directly in a single function call.
 
         :param messages: JSON payload of messages
         :type messages: [dict]
+        :param queue_name: The name of the queue to send to, defaults to the configured queue
+        :type queue_name: string
+        """
+
+    @abstractmethod
+    def get_queue_depth(self, queue_name=None):
+        """Returns the (possibly approximate) number of messages waiting in a queue, excluding messages that have been
+        received but not yet acknowledged
+
+        :param queue_name: The name of the queue, defaults to the configured queue
+        :type queue_name: string
+        :return: The number of waiting messages
+        :rtype: int
         """
 
     @abstractmethod
-    def receive_messages(self, batch_size):
-        """Receive a batch of messages from the backend
+    def receive_messages(self, batch_size, process_messages, queue_name=None, wait=True):
+        """Receive a batch of messages from the backend and hand them off for processing
 
-        Connections are not persisted across receive_messages calls. It is recommended that if a large
-        number of messages are to be retrieved it be done directly in a single function call.
+        Implementations should persist broker connections across calls, but it is still recommended that if a
+        large number of messages are to be retrieved it be done directly in a single function call.
 
-        Implementing function must yield messages from backend. Messages must be
-        in dict form. It is also the responsibility of the function to handle a boolean response
-        and appropriately acknowledge / delete message on True
+        Implementing function must retrieve up to batch_size messages from the backend and pass them, in dict form,
+        to process_messages in a single call. Messages remain unacknowledged while process_messages runs, so that
+        related messages can be processed together. It is the responsibility of the function to acknowledge / delete
+        each message for which process_messages returned True and to leave the others for redelivery.
 
         :param batch_size: Number of messages to be processed
         :type batch_size: int
-        :return: Yielded list of messages
-        :rtype: Generator[dict]
+        :param process_messages: Function that processes the messages and returns a success flag for each one
+        :type process_messages: func([dict]) -> [bool]
+        :param queue_name: The name of the queue to receive from, defaults to the configured queue
+        :type queue_name: string
+        :param wait: Whether to wait for messages to arrive if the queue is empty
+        :type wait: bool
+        :return: The number of messages received
+        :rtype: int
         """
+
+    def _serialize(self, message):
+        """Serializes the given message with the configured serializer. Messages whose serialized size exceeds the
+        compression threshold are marked for compression.
+
+        :param message: JSON payload of the message
+        :type message: dict
+        :return: The content type, the content encoding, the serialized body and the compression method (None if the
+            body should not be compressed)
+        :rtype: tuple
+        """
+
+        content_type, content_encoding, body = dumps(message, serializer=self._serializer)
+
+        compression = None
+        if self._compression_threshold is not None and len(body) > self._compression_threshold:
+            compression = COMPRESSION
+
+        return content_type, content_encoding, body, compression
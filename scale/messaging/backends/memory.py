@@ -0,0 +1,104 @@
+"""Backend supporting in-process message passing, used as a local broker stand-in for benchmarks"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+import threading
+from collections import deque
+
+from kombu.compression import compress, decompress
+from kombu.serialization import loads
+
+from messaging.backends.backend import MessagingBackend
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryMessagingBackend(MessagingBackend):
+    """Backend supporting message passing within a single process. It is not registered as a broker type, instead the
+    message benchmark command creates it and gives it to the message manager directly.
+
+    Messages are serialized and compressed exactly as they would be for a real broker, so that benchmarks include the
+    cost of the wire format. Messages are lost when the process exits.
+    """
+
+    def __init__(self):
+        super(MemoryMessagingBackend, self).__init__('memory')
+
+        # Message retrieval timeout
+        self._timeout = 1
+
+        # Serialized messages waiting in each queue
+        self._queues = {}
+        self._condition = threading.Condition()
+
+    def send_messages(self, messages, queue_name=None):
+        """See :meth:`messaging.backends.backend.MessagingBackend.send_messages`"""
+
+        queue_name = queue_name or self._queue_name
+
+        encoded_messages = []
+        for message in messages:
+            logger.debug('Sending message of type: %s', message['type'])
+            content_type, content_encoding, body, compression = self._serialize(message)
+            if compression:
+                body, compression = compress(body, compression)
+            encoded_messages.append((content_type, content_encoding, body, compression))
+
+        with self._condition:
+            self._queues.setdefault(queue_name, deque()).extend(encoded_messages)
+            self._condition.notify_all()
+
+    def receive_messages(self, batch_size, process_messages, queue_name=None, wait=True):
+        """See :meth:`messaging.backends.backend.MessagingBackend.receive_messages`"""
+
+        queue_name = queue_name or self._queue_name
+
+        with self._condition:
+            queue = self._queues.setdefault(queue_name, deque())
+            if not queue and wait:
+                self._condition.wait(self._timeout)
+            encoded_messages = [queue.popleft() for _ in range(min(batch_size, len(queue)))]
+
+        if not encoded_messages:
+            return 0
+
+        results = process_messages([self._decode(encoded_message) for encoded_message in encoded_messages])
+
+        # Unsuccessful messages go back to the front of the queue, as a broker would redeliver them
+        failed_messages = [message for message, success in zip(encoded_messages, results) if not success]
+        if failed_messages:
+            with self._condition:
+                self._queues[queue_name].extendleft(reversed(failed_messages))
+                self._condition.notify_all()
+
+        return len(encoded_messages)
+
+    def get_queue_depth(self, queue_name=None):
+        """See :meth:`messaging.backends.backend.MessagingBackend.get_queue_depth`"""
+
+        with self._condition:
+            return len(self._queues.get(queue_name or self._queue_name, ()))
+
+    def purge(self):
+        """Discards all messages in every queue"""
+
+        with self._condition:
+            self._queues.clear()
+
+    @staticmethod
+    def _decode(encoded_message):
+        """Decodes the given serialized message
+
+        :param encoded_message: The content type, content encoding, body and compression method of the message
+        :type encoded_message: tuple
+        :return: JSON payload of the message
+        :rtype: dict
+        """
+
+        content_type, content_encoding, body, compression = encoded_message
+        if compression:
+            body = decompress(body, compression)
+        return loads(body, content_type, content_encoding)
@@ -4,18 +4,35 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import base64
 import json
 import logging
+import threading
 import uuid
 
+from botocore.exceptions import BotoCoreError, ClientError
+from kombu.compression import compress, decompress
+from kombu.serialization import loads
+
 from messaging.backends.backend import MessagingBackend
 from util.aws import AWSCredentials, SQSClient
 
 logger = logging.getLogger(__name__)
 
+# Prefix of message bodies that are not plain JSON, followed by the content type, content encoding, compression method
+# and base64 encoded body, separated by ';'
+ENCODED_BODY_PREFIX = 'scale-message/1;'
+
+# Maximum number of messages SQS accepts in a single send request
+SEND_BATCH_SIZE = 10
+
 
 class SQSMessagingBackend(MessagingBackend):
-    """Backend supporting message passing via Amazon SQS"""
+    """Backend supporting message passing via Amazon SQS
+
+    The boto3 session, client and queue URL lookup persist across calls. Since boto3 sessions and resources are not
+    thread-safe, each thread holds its own client, which is discarded and rebuilt if a request fails.
+    """
 
     def __init__(self):
         super(SQSMessagingBackend, self).__init__('sqs')
@@ -25,22 +42,125 @@ class SQSMessagingBackend(MessagingBackend):
         self._credentials = AWSCredentials(self._broker.get_user_name(),
                                            self._broker.get_password())
 
-    def send_messages(self, messages):
+        self._local = threading.local()
+
+        # Long-poll duration when waiting for messages
+        self._wait_time_seconds = 20
+
+    def send_messages(self, messages, queue_name=None):
         """See:meth:`messaging.backends.backend.MessagingBackend.send_messages`"""
-        with SQSClient(self._credentials, self._region_name) as client:
-            encoded_messages = []
-            for message in messages:
-                encoded_messages.append({'Id': str(uuid.uuid4()), 'MessageBody': json.dumps(message)})
 
-            client.send_messages(self._queue_name, encoded_messages)
+        queue_name = queue_name or self._queue_name
+        encoded_messages = []
+        for message in messages:
+            encoded_messages.append({'Id': str(uuid.uuid4()), 'MessageBody': self._encode_body(message)})
+        batches = [encoded_messages[i:i + SEND_BATCH_SIZE] for i in xrange(0, len(encoded_messages), SEND_BATCH_SIZE)]
+
+        num_sent = 0
+        try:
+            client = self._get_client()
+            for batch in batches:
+                client.send_messages(queue_name, batch)
+                num_sent += 1
+        except (BotoCoreError, ClientError):
+            # Rebuild the client once in case the cached session or queue URL went stale, only resending the batches
+            # that were not already sent
+            logger.warning('Failed to send messages to SQS, reconnecting...')
+            self._reset_client()
+            client = self._get_client()
+            for batch in batches[num_sent:]:
+                client.send_messages(queue_name, batch)
 
-    def receive_messages(self, batch_size):
+    def get_queue_depth(self, queue_name=None):
+        """See :meth:`messaging.backends.backend.MessagingBackend.get_queue_depth`"""
+
+        try:
+            return self._get_client().get_queue_depth(queue_name or self._queue_name)
+        except (BotoCoreError, ClientError):
+            logger.exception('Failed to get SQS queue depth, client will be rebuilt on next use')
+            self._reset_client()
+            raise
+
+    def receive_messages(self, batch_size, process_messages, queue_name=None, wait=True):
         """See :meth:`messaging.backends.backend.MessagingBackend.receive_messages`"""
 
-        with SQSClient(self._credentials, self._region_name) as client:
-            for message in client.receive_messages(self._queue_name, batch_size=batch_size):
-                # Accept success back via generator send
-                success = yield json.loads(message.body)
-                if success:
-                    message.delete()
+        queue_name = queue_name or self._queue_name
+        wait_time_seconds = self._wait_time_seconds if wait else 0
+
+        client = self._get_client()
+        try:
+            messages = list(client.receive_messages(queue_name, batch_size=batch_size,
+                                                    wait_time_seconds=wait_time_seconds))
+        except (BotoCoreError, ClientError):
+            logger.exception('Failed to receive messages from SQS, client will be rebuilt on next use')
+            self._reset_client()
+            raise
+
+        if not messages:
+            return 0
+
+        results = process_messages([self._decode_body(message.body) for message in messages])
+
+        # Messages that were not successful are left to reappear once their visibility timeout expires
+        successful_messages = [message for message, success in zip(messages, results) if success]
+        if successful_messages:
+            client.delete_messages(queue_name, successful_messages)
+
+        return len(messages)
+
+    def _decode_body(self, body):
+        """Decodes the given SQS message body, which is either plain JSON or carries an encoded body header
+
+        :param body: The SQS message body
+        :type body: string
+        :return: JSON payload of the message
+        :rtype: dict
+        """
+
+        if not body.startswith(ENCODED_BODY_PREFIX):
+            return json.loads(body)
+
+        content_type, content_encoding, compression, data = body[len(ENCODED_BODY_PREFIX):].split(';', 3)
+        data = base64.b64decode(data)
+        if compression:
+            data = decompress(data, compression)
+        return loads(data, content_type, content_encoding)
+
+    def _encode_body(self, message):
+        """Encodes the given message as an SQS message body. SQS bodies must be text, so JSON messages that do not need
+        compression are sent as plain JSON while all other messages are base64 encoded behind a header.
+
+        :param message: JSON payload of the message
+        :type message: dict
+        :return: The SQS message body
+        :rtype: string
+        """
+
+        content_type, content_encoding, body, compression = self._serialize(message)
+        if content_type == 'application/json' and not compression:
+            return body
+
+        if compression:
+            body, compression = compress(body, compression)
+        elif not isinstance(body, bytes):
+            body = body.encode(content_encoding)
+        return ';'.join([ENCODED_BODY_PREFIX[:-1], content_type, content_encoding, compression or '',
+                         base64.b64encode(body).decode('ascii')])
+
+    def _get_client(self):
+        """Returns the SQS client for the current thread, creating it if necessary
+
+        :return: The SQS client
+        :rtype: :class:`util.aws.SQSClient`
+        """
+
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = SQSClient(self._credentials, self._region_name).__enter__()
+            self._local.client = client
+        return client
+
+    def _reset_client(self):
+        """Discards the SQS client for the current thread so that it is rebuilt on next use"""
 
+        self._local.client = None
@@ -0,0 +1,410 @@
+"""Defines the command for benchmarking end-to-end message throughput and latency"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import now
+
+from messaging.backends.memory import MemoryMessagingBackend
+from messaging.exceptions import CommandMessageExecuteFailure
+from messaging.manager import CommandMessageManager
+from messaging.messages.echo import EchoCommandMessage
+from messaging.metrics import QueryCounter
+from util.database import separate_test_database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIX = 'create_jobs:1,process_job_input:1,pending_jobs:1,update_recipe:1,update_recipe_metrics:1,echo:1'
+
+PERCENTILES = [50, 95, 99]
+
+
+class Command(BaseCommand):
+    """Command for benchmarking end-to-end message throughput and latency
+    """
+
+    help = 'Benchmarks message throughput and latency by running a mix of real messages through an in-process broker ' \
+           'against fixture data. The benchmark runs against a separate test database (test_<NAME>, created from the ' \
+           'migrations and destroyed afterwards unless --keepdb is given) and never sends messages to the configured ' \
+           'broker, so it does not touch the data or messages of a running Scale cluster.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-c', '--count', action='store', type=int, default=100,
+                            help='Total number of messages to generate.')
+        parser.add_argument('-m', '--mix', action='store', default=DEFAULT_MIX,
+                            help='Comma-delimited message types with relative weights, e.g. create_jobs:2,echo:1. '
+                                 'Available types: %s' % ', '.join(sorted(MESSAGE_GENERATORS)))
+        parser.add_argument('-b', '--batch-size', action='store', type=int, default=settings.MESSAGE_HANDLER_PREFETCH,
+                            help='Number of messages retrieved and processed at a time.')
+        parser.add_argument('-t', '--timeout', action='store', type=int, default=300,
+                            help='Maximum number of seconds to spend processing messages.')
+        parser.add_argument('-k', '--keepdb', action='store_true', dest='keepdb', default=False,
+                            help='Reuse and keep the test database between runs.')
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive', default=True,
+                            help='Replace an existing test database without asking.')
+
+    def handle(self, *args, **options):
+        """See :meth:`django.core.management.base.BaseCommand.handle`.
+
+        This method starts the command.
+        """
+
+        count = max(options.get('count') or 1, 1)
+        batch_size = max(options.get('batch_size') or 1, 1)
+        timeout = options.get('timeout')
+        mix = self._parse_mix(options.get('mix') or DEFAULT_MIX)
+
+        logger.info('Command starting: scale_message_benchmark - %i message(s)', count)
+
+        test_database = separate_test_database(options.get('keepdb'), options.get('interactive'),
+                                               options.get('verbosity'))
+        manager = CommandMessageManager()
+        with test_database, transaction.atomic(), self._use_memory_backend(manager):
+            logger.info('Creating fixture data and messages...')
+            messages = []
+            for message_type, type_count in self._split_count(count, mix).items():
+                messages.extend(MESSAGE_GENERATORS[message_type](type_count))
+
+            results = BenchmarkResults()
+            with self._measure_executions(manager, results):
+                started = time.time()
+                manager.send_messages(messages)
+                results.send_seconds = time.time() - started
+
+                started = time.time()
+                while manager.get_queue_depth() and time.time() - started < timeout:
+                    manager.receive_messages(batch_size)
+                results.process_seconds = time.time() - started
+                results.messages_left = manager.get_queue_depth()
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(results.get_report(len(messages)))
+
+        logger.info('Command completed: scale_message_benchmark')
+
+    @contextmanager
+    def _measure_executions(self, manager, results):
+        """Records the duration and query count of every command executed by the given manager
+
+        :param manager: The message manager
+        :type manager: :class:`messaging.manager.CommandMessageManager`
+        :param results: The results to record executions in
+        :type results: :class:`messaging.management.commands.scale_message_benchmark.BenchmarkResults`
+        """
+
+        execute_command = manager._execute_command
+
+        def measured_execute_command(command):
+            with QueryCounter() as query_counter:
+                started = time.time()
+                try:
+                    execute_command(command)
+                except CommandMessageExecuteFailure:
+                    results.add_execution(command.type, time.time() - started, query_counter.count, False)
+                    raise
+            results.add_execution(command.type, time.time() - started, query_counter.count, True)
+
+        manager._execute_command = measured_execute_command
+        try:
+            yield
+        finally:
+            del manager._execute_command
+
+    @staticmethod
+    @contextmanager
+    def _use_memory_backend(manager):
+        """Sends and receives the messages of the given manager, including the messages sent by executed commands,
+        through an in-process backend instead of the configured broker
+
+        :param manager: The message manager
+        :type manager: :class:`messaging.manager.CommandMessageManager`
+        """
+
+        backend = manager._backend
+        manager._backend = MemoryMessagingBackend()
+        try:
+            yield
+        finally:
+            manager._backend = backend
+
+    @staticmethod
+    def _parse_mix(mix):
+        """Parses the given message mix
+
+        :param mix: Comma-delimited message types, each with an optional weight
+        :type mix: string
+        :return: The weight of each message type
+        :rtype: :class:`collections.OrderedDict`
+        """
+
+        weights = OrderedDict()
+        for entry in mix.split(','):
+            message_type, _, weight = entry.strip().partition(':')
+            if message_type not in MESSAGE_GENERATORS:
+                raise CommandError('Unsupported message type: %s' % message_type)
+            try:
+                weights[message_type] = int(weight) if weight else 1
+            except ValueError:
+                raise CommandError('Invalid weight for message type %s: %s' % (message_type, weight))
+            if weights[message_type] < 1:
+                raise CommandError('Weight for message type %s must be a positive integer: %s' % (message_type, weight))
+        return weights
+
+    @staticmethod
+    def _split_count(count, weights):
+        """Splits the total message count between message types in proportion to their weights
+
+        :param count: The total number of messages
+        :type count: int
+        :param weights: The weight of each message type
+        :type weights: :class:`collections.OrderedDict`
+        :return: The number of messages of each type
+        :rtype: :class:`collections.OrderedDict`
+        """
+
+        total_weight = sum(weights.values())
+        counts = OrderedDict()
+        remaining = count
+        for message_type, weight in weights.items():
+            counts[message_type] = min(int(math.ceil(count * weight / total_weight)), remaining)
+            remaining -= counts[message_type]
+        return counts
+
+
+class BenchmarkResults(object):
+    """Collects the measurements of a message benchmark"""
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self.send_seconds = 0.0
+        self.process_seconds = 0.0
+        self.messages_left = 0
+
+        # {Message type: ([Execution seconds], [Query count], Failure count)}
+        self._executions = OrderedDict()
+
+    def add_execution(self, message_type, seconds, num_queries, success):
+        """Records the execution of a command
+
+        :param message_type: The type of the executed command
+        :type message_type: string
+        :param seconds: The duration of the execution in seconds
+        :type seconds: float
+        :param num_queries: The number of database queries issued by the execution
+        :type num_queries: int
+        :param success: Whether the execution succeeded
+        :type success: bool
+        """
+
+        durations, queries, failures = self._executions.setdefault(message_type, ([], [], [0]))
+        durations.append(seconds)
+        queries.append(num_queries)
+        if not success:
+            failures[0] += 1
+
+    def get_report(self, num_sent):
+        """Returns a human readable report of the results
+
+        :param num_sent: The number of messages that were sent
+        :type num_sent: int
+        :return: The report
+        :rtype: string
+        """
+
+        header = '%-28s %8s %8s %10s' % ('Message type', 'Executed', 'Failed', 'Mean ms')
+        header += ''.join(' %8s' % ('p%i ms' % p) for p in PERCENTILES) + ' %10s' % 'Queries'
+        lines = [header, '-' * len(header)]
+
+        num_executed = 0
+        for message_type, (durations, queries, failures) in self._executions.items():
+            num_executed += len(durations)
+            line = '%-28s %8i %8i %10.2f' % (message_type, len(durations), failures[0],
+                                             1000.0 * sum(durations) / len(durations))
+            line += ''.join(' %8.2f' % (1000.0 * _percentile(durations, p)) for p in PERCENTILES)
+            line += ' %10.1f' % (sum(queries) / len(queries))
+            lines.append(line)
+
+        lines.append('')
+        lines.append('Sent %i messages in %.3f seconds (%.1f msgs/sec)' %
+                     (num_sent, self.send_seconds, _rate(num_sent, self.send_seconds)))
+        lines.append('Executed %i commands (including downstream and merged messages) in %.3f seconds (%.1f msgs/sec)'
+                     % (num_executed, self.process_seconds, _rate(num_executed, self.process_seconds)))
+        if self.messages_left:
+            lines.append('Timed out with %i messages left on queue' % self.messages_left)
+        return '\n'.join(lines) + '\n'
+
+
+def _percentile(values, percentile):
+    """Returns the given percentile of the values using the nearest-rank method
+
+    :param values: The values, must not be empty
+    :type values: list
+    :param percentile: The percentile between 0 and 100
+    :type percentile: int
+    :return: The percentile value
+    """
+
+    ordered = sorted(values)
+    rank = int(math.ceil(percentile / 100.0 * len(ordered)))
+    return ordered[max(rank, 1) - 1]
+
+
+def _rate(count, seconds):
+    """Returns the given count per second, or 0.0 if no time elapsed
+
+    :rtype: float
+    """
+
+    return count / seconds if seconds else 0.0
+
+
+# Fixture data is created with the test utilities of each app, which are imported within each generator so that they
+# are only loaded when the benchmark runs
+
+def _generate_create_jobs(count):
+    """Returns create_jobs messages that each create one job without inputs"""
+
+    from data.data.data import Data
+    from job.messages.create_jobs import create_jobs_message
+    from job.test import utils as job_test_utils
+    from trigger.test import utils as trigger_test_utils
+
+    manifest = {
+        'seedVersion': '1.0.0',
+        'job': {
+            'name': 'scale-message-benchmark',
+            'jobVersion': '1.0.0',
+            'packageVersion': '1.0.0',
+            'title': 'Message Benchmark',
+            'description': 'Job type created by the message benchmark',
+            'maintainer': {'name': 'Scale', 'email': 'scale@example.com'},
+            'timeout': 10,
+            'interface': {'command': 'true'}
+        }
+    }
+    job_type = job_test_utils.create_seed_job_type(manifest=manifest)
+    event = trigger_test_utils.create_trigger_event()
+
+    return [create_jobs_message(job_type.name, job_type.version, job_type.revision_num, event.id, input_data=Data())
+            for _ in range(count)]
+
+
+def _generate_echo(count):
+    """Returns echo messages, which measure messaging overhead without any database work"""
+
+    return [EchoCommandMessage.from_json({'message': 'Benchmark echo #%i' % (i + 1)}) for i in range(count)]
+
+
+def _generate_pending_jobs(count):
+    """Returns pending_jobs messages that each update one blocked job"""
+
+    from job.messages.pending_jobs import create_pending_jobs_messages
+    from job.test import utils as job_test_utils
+
+    job_type = job_test_utils.create_seed_job_type()
+    when = now()
+
+    messages = []
+    for _ in range(count):
+        job = job_test_utils.create_job(job_type=job_type, status='BLOCKED')
+        messages.extend(create_pending_jobs_messages([job.id], when))
+    return messages
+
+
+def _generate_process_job_input(count):
+    """Returns process_job_input messages for pending jobs that already have their input data"""
+
+    from data.data.json.data_v6 import DataV6
+    from job.messages.process_job_input import create_process_job_input_messages
+    from job.test import utils as job_test_utils
+
+    job_type = job_test_utils.create_job_type()
+
+    job_ids = []
+    for _ in range(count):
+        job = job_test_utils.create_job(job_type=job_type, num_exes=0, status='PENDING', input_file_size=None,
+                                        input=DataV6().get_dict())
+        job_ids.append(job.id)
+    return create_process_job_input_messages(job_ids)
+
+
+def _generate_update_recipe(count):
+    """Returns update_recipe messages for recipes with a failed job and a pending job that depends on it"""
+
+    from data.data.data import Data
+    from data.data.json.data_v6 import convert_data_to_v6_json
+    from data.interface.interface import Interface
+    from job.test import utils as job_test_utils
+    from recipe.definition.definition import RecipeDefinition
+    from recipe.definition.json.definition_v6 import convert_recipe_definition_to_v6_json
+    from recipe.messages.update_recipe import create_update_recipe_message
+    from recipe.test import utils as recipe_test_utils
+
+    job_type = job_test_utils.create_seed_job_type()
+    definition = RecipeDefinition(Interface())
+    definition.add_job_node('job_a', job_type.name, job_type.version, job_type.revision_num)
+    definition.add_job_node('job_b', job_type.name, job_type.version, job_type.revision_num)
+    definition.add_dependency('job_a', 'job_b')
+    definition_dict = convert_recipe_definition_to_v6_json(definition).get_dict()
+    recipe_type = recipe_test_utils.create_recipe_type_v6(definition=definition_dict)
+    data_dict = convert_data_to_v6_json(Data()).get_dict()
+
+    messages = []
+    for _ in range(count):
+        recipe = recipe_test_utils.create_recipe(recipe_type=recipe_type)
+        job_a = job_test_utils.create_job(job_type=job_type, status='FAILED', input=data_dict)
+        job_b = job_test_utils.create_job(job_type=job_type, status='PENDING')
+        recipe_test_utils.create_recipe_job(recipe=recipe, job_name='job_a', job=job_a)
+        recipe_test_utils.create_recipe_job(recipe=recipe, job_name='job_b', job=job_b)
+        messages.append(create_update_recipe_message(recipe.id))
+    return messages
+
+
+def _generate_update_recipe_metrics(count):
+    """Returns update_recipe_metrics messages for recipes with jobs in various states"""
+
+    from job.test import utils as job_test_utils
+    from recipe.messages.update_recipe_metrics import create_update_recipe_metrics_messages
+    from recipe.models import RecipeNode
+    from recipe.test import utils as recipe_test_utils
+
+    job_type = job_test_utils.create_seed_job_type()
+
+    recipe_ids = []
+    recipe_nodes = []
+    for _ in range(count):
+        recipe = recipe_test_utils.create_recipe()
+        for status in ['BLOCKED', 'COMPLETED', 'FAILED']:
+            job = job_test_utils.create_job(job_type=job_type, status=status)
+            recipe_nodes.append(recipe_test_utils.create_recipe_node(recipe=recipe, job=job))
+        recipe_ids.append(recipe.id)
+    RecipeNode.objects.bulk_create(recipe_nodes)
+
+    # One message per recipe so that coalescing within the handler is exercised
+    messages = []
+    for recipe_id in recipe_ids:
+        messages.extend(create_update_recipe_metrics_messages([recipe_id]))
+    return messages
+
+
+MESSAGE_GENERATORS = {
+    'create_jobs': _generate_create_jobs,
+    'echo': _generate_echo,
+    'pending_jobs': _generate_pending_jobs,
+    'process_job_input': _generate_process_job_input,
+    'update_recipe': _generate_update_recipe,
+    'update_recipe_metrics': _generate_update_recipe_metrics,
+}
@@ -5,15 +5,37 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import logging
+import os
 import signal
+import socket
+import sys
+import threading
+import time
+from datetime import timedelta
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils.timezone import now
 
 from error.models import Error
 from messaging.manager import CommandMessageManager
+from scheduler.models import MessageHandler
 
 logger = logging.getLogger(__name__)
 
+# Interval in seconds between checks of the running flag while waiting on worker threads
+WORKER_JOIN_TIMEOUT = 1
+
+# Interval in seconds between updates of the message metrics in the database
+METRICS_UPDATE_INTERVAL = 10
+
+# Maximum number of seconds to wait for the metrics thread when the command is halted
+METRICS_JOIN_TIMEOUT = 5
+
+# Metrics of message handlers that have not updated in this long are deleted
+METRICS_EXPIRATION = timedelta(hours=1)
+
 
 class Command(BaseCommand):
     """Command for retrieval and execution of CommandMessages from queue
@@ -21,6 +43,12 @@ class Command(BaseCommand):
 
     help = 'Command for retrieval and execution of CommandMessages from queue'
 
+    def add_arguments(self, parser):
+        parser.add_argument('-w', '--workers', action='store', type=int, default=settings.MESSAGE_HANDLER_WORKERS,
+                            help='Number of worker threads concurrently executing messages.')
+        parser.add_argument('-p', '--prefetch', action='store', type=int, default=settings.MESSAGE_HANDLER_PREFETCH,
+                            help='Number of messages each worker retrieves from the broker at a time.')
+
     def handle(self, *args, **options):
         """See :meth:`django.core.management.base.BaseCommand.handle`.
 
@@ -30,20 +58,46 @@ class Command(BaseCommand):
         logger.info('Command starting: scale_message_handler')
 
         self.running = True
+        self._worker_failed = False
+        self._prefetch = max(options.get('prefetch') or 1, 1)
+        num_workers = max(options.get('workers') or 1, 1)
 
         logger.info('Initializing message handler')
         logger.info('Caching builtin errors...')
         Error.objects.cache_builtin_errors()
         logger.info('Initialization complete, ready to process messages')
-        
+
         # Set the signal handler
         signal.signal(signal.SIGINT, self.interupt)
         signal.signal(signal.SIGTERM, self.interupt)
 
-        manager = CommandMessageManager()
-
-        while self.running:
-            manager.receive_messages()
+        metrics_thread = threading.Thread(target=self._run_metrics, name='Message Metrics')
+        metrics_thread.daemon = True
+        metrics_thread.start()
+
+        if num_workers == 1:
+            self._run_worker()
+        else:
+            # At most one message per worker is executing at any time, while each worker holds up to prefetch
+            # unacknowledged messages. Each worker thread gets its own broker channel and database connection.
+            logger.info('Starting %i message worker threads with a prefetch of %i', num_workers, self._prefetch)
+            workers = []
+            for i in range(num_workers):
+                worker = threading.Thread(target=self._run_worker, name='Message Worker %i' % (i + 1))
+                worker.daemon = True
+                worker.start()
+                workers.append(worker)
+
+            # Join with a timeout so that the main thread continues to receive signals
+            while any(worker.is_alive() for worker in workers):
+                for worker in workers:
+                    worker.join(WORKER_JOIN_TIMEOUT)
+
+            if self._worker_failed:
+                sys.exit(1)
+
+        # Give the metrics thread a chance to remove this handler's metrics
+        metrics_thread.join(METRICS_JOIN_TIMEOUT)
 
         logger.info('Command completed: scale_message_handler')
 
@@ -51,3 +105,44 @@ class Command(BaseCommand):
 
         logger.info('Halting queue processing as a result of signal: {}'.format(signum))
         self.running = False
+
+    def _run_worker(self):
+        """Retrieves and executes batches of messages until the command is halted"""
+
+        manager = CommandMessageManager()
+
+        try:
+            while self.running:
+                manager.receive_messages(self._prefetch)
+        except Exception:
+            logger.exception('Message worker %s failed, halting message handler', threading.current_thread().name)
+            self._worker_failed = True
+            self.running = False
+            raise
+        finally:
+            connection.close()
+
+    def _run_metrics(self):
+        """Periodically stores the message metrics of this process in the database until the command is halted"""
+
+        name = '%s:%i' % (socket.gethostname(), os.getpid())
+        started = now()
+        manager = CommandMessageManager()
+        next_update = time.time() + METRICS_UPDATE_INTERVAL
+
+        try:
+            while self.running:
+                time.sleep(WORKER_JOIN_TIMEOUT)
+                if time.time() < next_update:
+                    continue
+                next_update = time.time() + METRICS_UPDATE_INTERVAL
+                try:
+                    MessageHandler.objects.update_handler(name, started, manager.get_metrics(),
+                                                          now() - METRICS_EXPIRATION)
+                except Exception:
+                    logger.exception('Failed to update message metrics')
+            MessageHandler.objects.delete_handler(name)
+        except Exception:
+            logger.exception('Failed to delete message metrics')
+        finally:
+            connection.close()
@@ -3,13 +3,18 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import itertools
 import logging
+import threading
+import time
+from collections import OrderedDict
 
 from django.conf import settings
 from django.utils.timezone import now
 from six import raise_from
 
 from messaging.messages.factory import get_message_type
+from messaging.metrics import MessageMetrics, QueryCounter
 from util.broker import BrokerDetails
 from .backends.factory import get_message_backend
 from .exceptions import CommandMessageExecuteFailure, InvalidCommandMessage
@@ -18,21 +23,40 @@ logger = logging.getLogger(__name__)
 
 
 class CommandMessageManager(object):
+
+    # Count of receive calls made within this process, used to select the queue each batch is taken from. It is shared
+    # by all threads.
+    _receive_count = itertools.count()
+
+    # Execution metrics for each message type processed within this process
+    _metrics = MessageMetrics()
+
+    # Guards the creation of the singleton
+    _instance_lock = threading.Lock()
+
     def __new__(cls):
-        """Singleton support for manager"""
+        """Singleton support for manager. The manager is initialized only when it is first created, so that threads
+        sending and receiving messages never see it partially initialized.
+        """
         if not hasattr(cls, 'instance'):
-            cls.instance = super(CommandMessageManager, cls).__new__(cls)
+            with cls._instance_lock:
+                if not hasattr(cls, 'instance'):
+                    instance = super(CommandMessageManager, cls).__new__(cls)
+                    instance._initialize()
+                    cls.instance = instance
 
         return cls.instance
 
-    def __init__(self):
-        """Instantiate CommandMessageManager based on setting values"""
+    def _initialize(self):
+        """Initializes CommandMessageManager based on setting values"""
 
         # Set up the backend message passing... right now its just RabbitMQ or SQS
         broker_type = BrokerDetails.from_broker_url(settings.BROKER_URL).get_type()
 
         self._backend = get_message_backend(broker_type)
 
+        self._init_queues(settings.QUEUE_NAME, settings.MESSAGE_QUEUE_ROUTES, settings.MESSAGE_QUEUE_WEIGHTS)
+
     def send_messages(self, commands):
         """Serialize CommandMessages and send via configured message broker
 
@@ -43,42 +67,69 @@ class CommandMessageManager(object):
         :type command: [`messaging.messages.message.CommandMessage`]
         """
 
-        messages = [{"type": x.type, "body": x.to_json()} for x in commands]
-        self._backend.send_messages(messages)
+        messages_by_queue = OrderedDict()
+        for command in commands:
+            queue_name = self._queue_routes.get(command.type, self._queue_name)
+            messages_by_queue.setdefault(queue_name, []).append({"type": command.type, "body": command.to_json()})
+
+        for queue_name, messages in messages_by_queue.items():
+            self._backend.send_messages(messages, queue_name=queue_name)
 
-    def receive_messages(self):
+    def get_queue_depth(self):
+        """Returns the total number of messages waiting in all of the queues that messages are routed to
+
+        :return: The number of waiting messages
+        :rtype: int
+        """
+
+        return sum(self._backend.get_queue_depth(queue_name) for queue_name in self._queue_names)
+
+    def get_metrics(self):
+        """Returns a snapshot of the execution metrics for each message type processed within this process
+
+        :return: The metrics, see :meth:`messaging.metrics.MessageMetrics.get_status`
+        :rtype: dict
+        """
+
+        return self._metrics.get_status()
+
+    def receive_messages(self, batch_size=10):
         """Main entry point to message processing.
 
-        This will process up to a batch of 10 messages at a time. Behavior may
+        This will process up to a batch of messages at a time. Behavior may
         differ slightly based on message backend. RabbitMQ will immediately
-        iterate over up to 10 messages, process and return. SQS will long-poll
-        up to 20 seconds or until 10 messages have been processed, process and
+        retrieve up to batch_size messages, process and return. SQS will long-poll
+        up to 20 seconds or until batch_size messages have been retrieved, process and
         then return.
 
+        Compatible messages of the same type within the batch are merged and executed together, see
+        :meth:`messaging.messages.message.CommandMessage.merge`.
+
+        When messages are routed to multiple queues, each batch is taken from a single queue. Queues are chosen in
+        rotation in proportion to their weights, skipping any queue that is empty, so that latency sensitive messages
+        are not held up behind large amounts of bulk work. Queues are only polled without waiting in this case, so when
+        every queue is empty the call sleeps for settings.MESSAGE_QUEUE_IDLE_WAIT seconds instead of long-polling a
+        single queue, which bounds the latency of new messages on every queue.
+
         New messages will potentially be sent within this method, if CommandMessage populates
-        the new_messages list.
+        the new_messages list. This method is thread-safe, so multiple threads may each process their own batches.
+
+        :param batch_size: The maximum number of messages to retrieve and process
+        :type batch_size: int
         """
 
-        message_generator = self._backend.receive_messages(10)
+        if len(self._queue_names) == 1:
+            self._backend.receive_messages(batch_size, self._process_messages, queue_name=self._queue_names[0])
+            return
 
-        # Manually control iteration, so we can pass back success/failure to co-routine
-        try:
-            # Seed message to start processing
-            message = message_generator.next()
-            while True:
-                success = False
-                try:
-                    self._process_message(message)
-                    success = True
-                except InvalidCommandMessage:
-                    logger.exception('Exception encountered processing message payload. Message remains on queue.')
-                except CommandMessageExecuteFailure:
-                    logger.exception('CommandMessage failure during execute call. Message remains on queue.')
+        scheduled_queue_name = self._receive_schedule[next(self._receive_count) % len(self._receive_schedule)]
+        queue_names = [scheduled_queue_name] + [name for name in self._queue_names if name != scheduled_queue_name]
+        for queue_name in queue_names:
+            if self._backend.receive_messages(batch_size, self._process_messages, queue_name=queue_name, wait=False):
+                return
 
-                # Feed boolean to backend generator and grab next message
-                message = message_generator.send(success)
-        except StopIteration:
-            pass
+        # Every queue is empty, so back off briefly before the next rotation polls them again
+        time.sleep(settings.MESSAGE_QUEUE_IDLE_WAIT)
 
     @staticmethod
     def _extract_command(message):
@@ -103,20 +154,109 @@ class CommandMessageManager(object):
         except KeyError as ex:
             raise_from(InvalidCommandMessage('No message type handler available.'), ex)
 
-    def _process_message(self, message):
-        """Inspects message for type and then attempts to launch execution
+    def _init_queues(self, default_queue_name, routes, weights):
+        """Initializes the message routing to queues and the weighted rotation of queues to receive from. The new
+        values are built first and then swapped in, never leaving them partially populated.
 
-        This function will potentially fire off new messages as required by
-        execution logic within CommandMessage extending class. These messages
-        will only be sent if command execution is successful.
+        :param default_queue_name: The name of the queue for message types without a route
+        :type default_queue_name: string
+        :param routes: The message types routed to each priority queue, keyed by priority
+        :type routes: {string: [string]}
+        :param weights: The weight of each priority queue, where the '' key is the weight of the default queue
+        :type weights: {string: int}
+        """
 
-        :param message: message payload
-        :type message: dict
-        :raises InvalidCommandMessage:
+        queue_weights = {default_queue_name: weights.get('', 1)}
+        queue_routes = {}
+        for priority, message_types in routes.items():
+            queue_name = '%s-%s' % (default_queue_name, priority)
+            queue_weights[queue_name] = weights.get(priority, 1)
+            for message_type in message_types:
+                queue_routes[message_type] = queue_name
+
+        queue_names = sorted(queue_weights, key=lambda name: (-queue_weights[name], name))
+
+        # Smooth weighted round robin, which spreads each queue's turns evenly across the rotation
+        total_weight = sum(queue_weights.values())
+        current_weights = dict.fromkeys(queue_names, 0)
+        receive_schedule = []
+        for _ in range(total_weight):
+            for queue_name in queue_names:
+                current_weights[queue_name] += queue_weights[queue_name]
+            queue_name = max(queue_names, key=lambda name: current_weights[name])
+            current_weights[queue_name] -= total_weight
+            receive_schedule.append(queue_name)
+
+        if not receive_schedule:
+            receive_schedule = queue_names[:1]
+
+        # Default queue, queues ordered by descending weight, message types routed to queues other than the default
+        # queue and the weighted rotation of queues that batches are received from
+        queues = (default_queue_name, queue_names, queue_routes, receive_schedule)
+        self._queue_name, self._queue_names, self._queue_routes, self._receive_schedule = queues
+
+    def _process_messages(self, messages):
+        """Processes a batch of messages. Messages are grouped by type and each message is merged into an earlier
+        message of its group when possible, so that every group of merged messages is executed only once.
+
+        :param messages: The message payloads
+        :type messages: [dict]
+        :return: Whether each message was successfully processed, in the same order as the given messages
+        :rtype: [bool]
+        """
+
+        results = [False] * len(messages)
+        merged_commands = []  # [(CommandMessage, [Message index])]
+        commands_by_type = {}  # {Message type: [(CommandMessage, [Message index])]}
+
+        for index, message in enumerate(messages):
+            try:
+                command = self._extract_command(message)
+            except InvalidCommandMessage:
+                logger.exception('Exception encountered processing message payload. Message remains on queue.')
+                self._metrics.add_invalid_message(message.get('type') if isinstance(message, dict) else None)
+                continue
+
+            type_commands = commands_by_type.setdefault(command.type, [])
+            for merged_command in type_commands:
+                if merged_command[0].merge(command):
+                    merged_command[1].append(index)
+                    break
+            else:
+                merged_command = (command, [index])
+                type_commands.append(merged_command)
+                merged_commands.append(merged_command)
+
+        for command, indexes in merged_commands:
+            if len(indexes) > 1:
+                logger.info('Merged %i messages of type %s', len(indexes), command.type)
+            success = True
+            started = now()
+            with QueryCounter() as query_counter:
+                try:
+                    self._execute_command(command)
+                except CommandMessageExecuteFailure:
+                    logger.exception('CommandMessage failure during execute call. Message remains on queue.')
+                    success = False
+            duration = now() - started
+            self._metrics.add_execution(command.type, len(indexes), duration.total_seconds(), success, query_counter.count,
+                                        len(command.new_messages))
+            if not success:
+                continue
+
+            for index in indexes:
+                results[index] = True
+
+        return results
+
+    def _execute_command(self, command):
+        """Executes the given command, sending any downstream messages if execution is successful
+
+        :param command: The command to execute
+        :type command: `messaging.messages.message.CommandMessage`
         :raises CommandMessageExecuteFailure: Failure during CommandMessage.execute
         """
 
-        command = self._extract_command(message)
         start_time = now()
         logger.info('Processing message of type %s', command.type)
         try:
@@ -36,6 +36,19 @@ class CommandMessage(object):
         :rtype: `messaging.messages.CommandMessage`
         """
 
+    def merge(self, message):
+        """Attempts to merge the given message of the same type into this one, so that a single execution of this
+        message performs the work of both. Message types that can be batched should override this method; the merged
+        message must be equivalent to executing both messages. By default messages are never merged.
+
+        :param message: The message to merge into this one
+        :type message: `messaging.messages.CommandMessage`
+        :return: True if the given message was merged into this one, False otherwise
+        :rtype: bool
+        """
+
+        return False
+
     @abstractmethod
     def execute(self):
         """Processing logic for all command messages should be implemented within this method.
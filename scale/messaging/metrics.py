@@ -0,0 +1,259 @@
+"""Defines the class that collects execution metrics for each command message type"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import bisect
+import threading
+
+from django.db import connections, DEFAULT_DB_ALIAS
+
+# Upper bounds in seconds of the execution time histogram buckets, a final bucket collects all longer executions
+HISTOGRAM_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+
+# Counters kept for each message type
+COUNTERS = ['messages', 'executed', 'failed', 'retried', 'queries', 'downstream']
+
+PERCENTILES = [50, 95, 99]
+
+
+class MessageMetrics(object):
+    """Collects in-process counters and execution time histograms for each command message type. This class is
+    thread-safe.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._lock = threading.Lock()
+        self._metrics = {}  # {Message type: dict}
+
+    def add_execution(self, message_type, num_messages, seconds, success, num_queries, num_downstream):
+        """Records the execution of a command
+
+        :param message_type: The type of the executed command
+        :type message_type: string
+        :param num_messages: The number of messages that were merged into the command
+        :type num_messages: int
+        :param seconds: The duration of the execution in seconds
+        :type seconds: float
+        :param success: Whether the execution succeeded
+        :type success: bool
+        :param num_queries: The number of database queries issued by the execution
+        :type num_queries: int
+        :param num_downstream: The number of downstream messages produced by the execution
+        :type num_downstream: int
+        """
+
+        bucket = bisect.bisect_left(HISTOGRAM_BUCKETS, seconds)
+
+        with self._lock:
+            metrics = self._get_type_metrics(message_type)
+            metrics['messages'] += num_messages
+            metrics['executed'] += 1
+            metrics['queries'] += num_queries
+            if success:
+                metrics['downstream'] += num_downstream
+            else:
+                metrics['failed'] += 1
+                metrics['retried'] += num_messages
+            metrics['total_seconds'] += seconds
+            metrics['max_seconds'] = max(metrics['max_seconds'], seconds)
+            metrics['histogram'][bucket] += 1
+
+    def add_invalid_message(self, message_type):
+        """Records a message that could not be processed and was returned to the queue to be retried
+
+        :param message_type: The type of the message, possibly None
+        :type message_type: string
+        """
+
+        with self._lock:
+            metrics = self._get_type_metrics(message_type or 'unknown')
+            metrics['messages'] += 1
+            metrics['retried'] += 1
+
+    def get_status(self):
+        """Returns a snapshot of the metrics that can be converted to JSON and combined with the snapshots of other
+        processes using :meth:`messaging.metrics.summarize_metrics`
+
+        :return: The metrics for each message type
+        :rtype: dict
+        """
+
+        with self._lock:
+            status = {}
+            for message_type, metrics in self._metrics.items():
+                status[message_type] = dict(metrics, histogram=list(metrics['histogram']))
+            return status
+
+    def _get_type_metrics(self, message_type):
+        """Returns the metrics for the given message type, creating them if necessary. The caller must hold the lock.
+
+        :param message_type: The message type
+        :type message_type: string
+        :return: The metrics
+        :rtype: dict
+        """
+
+        if message_type not in self._metrics:
+            metrics = dict.fromkeys(COUNTERS, 0)
+            metrics['total_seconds'] = 0.0
+            metrics['max_seconds'] = 0.0
+            metrics['histogram'] = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+            self._metrics[message_type] = metrics
+        return self._metrics[message_type]
+
+
+class QueryCounter(object):
+    """Context manager that counts the database queries issued on the current thread's connection while it is active.
+    Unlike :class:`django.test.utils.CaptureQueriesContext`, it does not turn on query logging, so no SQL is formatted
+    or kept. This class is NOT thread-safe; each thread should use its own instance.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        """Constructor
+
+        :param using: The alias of the database connection
+        :type using: string
+        """
+
+        self.count = 0
+        self._using = using
+        self._connection = None
+        self._saved_methods = {}
+
+    def __enter__(self):
+        """Wraps the cursors created by the connection so that their queries are counted"""
+
+        self._connection = connections[self._using]
+        for name in ('make_cursor', 'make_debug_cursor'):
+            self._saved_methods[name] = self._connection.__dict__.get(name)
+            setattr(self._connection, name, self._wrap_cursor_method(getattr(self._connection, name)))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Restores the connection's cursor methods"""
+
+        for name, saved_method in self._saved_methods.items():
+            if saved_method is None:
+                delattr(self._connection, name)
+            else:
+                setattr(self._connection, name, saved_method)
+        self._saved_methods = {}
+
+    def _wrap_cursor_method(self, make_cursor):
+        """Returns a cursor method that wraps the cursors of the given method so that their queries are counted
+
+        :param make_cursor: The connection's method for creating a cursor
+        :type make_cursor: function
+        :return: The wrapping method
+        :rtype: function
+        """
+
+        def make_counting_cursor(cursor):
+            return _CountingCursor(make_cursor(cursor), self)
+        return make_counting_cursor
+
+
+class _CountingCursor(object):
+    """Database cursor wrapper that counts each executed query for a :class:`messaging.metrics.QueryCounter`"""
+
+    def __init__(self, cursor, counter):
+        """Constructor
+
+        :param cursor: The wrapped cursor
+        :type cursor: :class:`django.db.backends.utils.CursorWrapper`
+        :param counter: The query counter
+        :type counter: :class:`messaging.metrics.QueryCounter`
+        """
+
+        self.cursor = cursor
+        self.counter = counter
+
+    def __getattr__(self, attr):
+        return getattr(self.cursor, attr)
+
+    def __iter__(self):
+        return iter(self.cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self.cursor.__exit__(exc_type, exc_value, traceback)
+
+    def callproc(self, *args, **kwargs):
+        self.counter.count += 1
+        return self.cursor.callproc(*args, **kwargs)
+
+    def execute(self, *args, **kwargs):
+        self.counter.count += 1
+        return self.cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self.counter.count += 1
+        return self.cursor.executemany(*args, **kwargs)
+
+
+def summarize_metrics(statuses):
+    """Combines metric snapshots from one or more processes into a summary for each message type, ordered by
+    descending total execution time
+
+    :param statuses: The metric snapshots returned by :meth:`messaging.metrics.MessageMetrics.get_status`
+    :type statuses: [dict]
+    :return: The summary of each message type
+    :rtype: [dict]
+    """
+
+    combined = {}
+    for status in statuses:
+        for message_type, metrics in status.items():
+            if message_type not in combined:
+                combined[message_type] = dict(metrics, histogram=list(metrics['histogram']))
+                continue
+            totals = combined[message_type]
+            for counter in COUNTERS + ['total_seconds']:
+                totals[counter] += metrics[counter]
+            totals['max_seconds'] = max(totals['max_seconds'], metrics['max_seconds'])
+            totals['histogram'] = [a + b for a, b in zip(totals['histogram'], metrics['histogram'])]
+
+    summaries = []
+    for message_type, metrics in combined.items():
+        summary = {'type': message_type}
+        for counter in COUNTERS:
+            summary[counter] = metrics[counter]
+        summary['total_seconds'] = metrics['total_seconds']
+        summary['mean_seconds'] = metrics['total_seconds'] / metrics['executed'] if metrics['executed'] else 0.0
+        summary['max_seconds'] = metrics['max_seconds']
+        for percentile in PERCENTILES:
+            summary['p%i_seconds' % percentile] = _get_percentile(metrics, percentile)
+        summaries.append(summary)
+
+    return sorted(summaries, key=lambda summary: (-summary['total_seconds'], summary['type']))
+
+
+def _get_percentile(metrics, percentile):
+    """Returns the approximate percentile of execution time from the histogram, as the upper bound of the bucket that
+    contains it
+
+    :param metrics: The metrics of a message type
+    :type metrics: dict
+    :param percentile: The percentile between 0 and 100
+    :type percentile: int
+    :return: The percentile in seconds
+    :rtype: float
+    """
+
+    histogram = metrics['histogram']
+    rank = percentile / 100.0 * sum(histogram)
+    count = 0
+    for bucket, bucket_count in enumerate(histogram):
+        count += bucket_count
+        if count and count >= rank:
+            if bucket < len(HISTOGRAM_BUCKETS):
+                return min(HISTOGRAM_BUCKETS[bucket], metrics['max_seconds'])
+            break
+    return metrics['max_seconds']
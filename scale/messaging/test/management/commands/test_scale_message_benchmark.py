@@ -0,0 +1,85 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+import django
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase
+from django.utils.six import StringIO
+from mock import patch
+
+from messaging.management.commands.scale_message_benchmark import BenchmarkResults, Command, MESSAGE_GENERATORS
+from messaging.manager import CommandMessageManager
+
+
+class TestScaleMessageBenchmark(TransactionTestCase):
+
+    def setUp(self):
+        django.setup()
+
+    # The tests already run against a test database
+    @patch('messaging.management.commands.scale_message_benchmark.separate_test_database')
+    def test_echo_benchmark(self, mock_test_database):
+        """Validate that a benchmark of echo messages executes every message and reports on them"""
+
+        backend = CommandMessageManager()._backend
+        out = StringIO()
+        call_command('scale_message_benchmark', count=5, mix='echo', batch_size=2, keepdb=True, stdout=out)
+
+        mock_test_database.assert_called_once_with(True, True, 1)
+        self.assertIs(CommandMessageManager()._backend, backend)  # The configured backend is restored
+        report = out.getvalue()
+        self.assertIn('Sent 5 messages', report)
+        self.assertIn('Executed 5 commands', report)
+        self.assertNotIn('left on queue', report)
+        echo_line = [line for line in report.splitlines() if line.startswith('echo')][0]
+        self.assertEqual(echo_line.split()[1:3], ['5', '0'])
+
+    @patch('messaging.management.commands.scale_message_benchmark.separate_test_database')
+    def test_generators(self, mock_test_database):
+        """Validate that the messages of every generator execute successfully against their fixture data"""
+
+        for message_type in sorted(MESSAGE_GENERATORS):
+            out = StringIO()
+            call_command('scale_message_benchmark', count=2, mix=message_type, stdout=out)
+
+            report = out.getvalue()
+            self.assertIn('Sent 2 messages', report, message_type)
+            self.assertNotIn('left on queue', report, message_type)
+            lines = [line.split() for line in report.splitlines() if line.startswith(message_type + ' ')]
+            self.assertEqual(len(lines), 1, message_type)
+            self.assertGreaterEqual(int(lines[0][1]), 1, message_type)  # Merged messages execute together
+            self.assertEqual(lines[0][2], '0', message_type)
+
+    def test_parse_mix(self):
+        """Validate parsing of message mixes"""
+
+        self.assertEqual(Command._parse_mix('echo:3, create_jobs'), OrderedDict([('echo', 3), ('create_jobs', 1)]))
+        with self.assertRaises(CommandError):
+            Command._parse_mix('unknown:1')
+        with self.assertRaises(CommandError):
+            Command._parse_mix('echo:x')
+        with self.assertRaises(CommandError):
+            Command._parse_mix('echo:0')
+        with self.assertRaises(CommandError):
+            Command._parse_mix('echo:2,create_jobs:-1')
+
+    def test_split_count(self):
+        """Validate that the message count is split between message types in proportion to their weights"""
+
+        counts = Command._split_count(10, OrderedDict([('echo', 3), ('create_jobs', 1), ('pending_jobs', 1)]))
+        self.assertEqual(counts, OrderedDict([('echo', 6), ('create_jobs', 2), ('pending_jobs', 2)]))
+
+    def test_report_percentiles(self):
+        """Validate the execution statistics in the benchmark report"""
+
+        results = BenchmarkResults()
+        for i in range(100):
+            results.add_execution('echo', (i + 1) / 1000.0, 2, i != 0)
+
+        line = [line for line in results.get_report(100).splitlines() if line.startswith('echo')][0]
+        self.assertEqual(line.split()[1:], ['100', '1', '50.50', '50.00', '95.00', '99.00', '2.0'])
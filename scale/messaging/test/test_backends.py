@@ -7,14 +7,18 @@ import Queue
 import json
 
 import django
+from botocore.exceptions import ClientError
 from django.conf import settings
 from django.test import TestCase
+from django.test.utils import override_settings
+from kombu.serialization import dumps
 from mock import MagicMock
 from mock import call, patch
 
 import messaging.backends.factory as backend_factory
 from messaging.backends.amqp import AMQPMessagingBackend
 from messaging.backends.backend import MessagingBackend
+from messaging.backends.memory import MemoryMessagingBackend
 from messaging.backends.sqs import SQSMessagingBackend
 
 
@@ -23,13 +27,57 @@ class DummyBackend(MessagingBackend):
     def __init__(self):
         super(DummyBackend, self).__init__('dummy')
 
+    def get_queue_depth(self, queue_name=None):  # pragma: no cover
+        pass
+
     def send_messages(self, message):  # pragma: no cover
         pass
 
-    def receive_messages(self, batch_size):  # pragma: no cover
+    def receive_messages(self, batch_size, process_messages):  # pragma: no cover
         pass
 
 
+def put_call(message):
+    """Returns the expected put call for sending the given message uncompressed as JSON"""
+
+    content_type, content_encoding, body = dumps(message, serializer='json')
+    return call(body, content_type=content_type, content_encoding=content_encoding, compression=None)
+
+
+class TestMessagingBackend(TestCase):
+    def setUp(self):
+        django.setup()
+
+    @override_settings(MESSAGE_SERIALIZER='missing')
+    def test_unavailable_serializer(self):
+        """Validate that an unavailable serializer falls back to JSON"""
+
+        backend = DummyBackend()
+        self.assertEqual(backend._serializer, 'json')
+
+    @override_settings(MESSAGE_COMPRESSION_THRESHOLD=100)
+    def test_serialize_compression(self):
+        """Validate that only messages larger than the compression threshold are compressed"""
+
+        backend = DummyBackend()
+
+        content_type, content_encoding, body, compression = backend._serialize({'type': 'echo', 'body': '1'})
+        self.assertEqual(content_type, 'application/json')
+        self.assertEqual(json.loads(body), {'type': 'echo', 'body': '1'})
+        self.assertIsNone(compression)
+
+        compression = backend._serialize({'type': 'echo', 'body': '1' * 100})[3]
+        self.assertEqual(compression, 'zlib')
+
+    @override_settings(MESSAGE_COMPRESSION_THRESHOLD=None)
+    def test_serialize_compression_disabled(self):
+        """Validate that compression can be disabled"""
+
+        backend = DummyBackend()
+        compression = backend._serialize({'type': 'echo', 'body': '1' * 10000})[3]
+        self.assertIsNone(compression)
+
+
 class TestAMQPBackend(TestCase):
     def setUp(self):
         django.setup()
@@ -39,6 +87,46 @@ class TestAMQPBackend(TestCase):
         backend = AMQPMessagingBackend()
         self.assertEqual(backend.type, 'amqp')
         self.assertEqual(backend._timeout, 1)
+        self.assertIsNone(backend._pool)
+
+    @patch('messaging.backends.amqp.Connection')
+    def test_connection_pool_reused(self, connection):
+        """Validate that the broker connection pool persists across send and receive calls"""
+
+        get_func = MagicMock(side_effect=Queue.Empty)
+        pooled_connection = connection.return_value.Pool.return_value.acquire.return_value.__enter__.return_value
+        pooled_connection.SimpleQueue.return_value.get = get_func
+
+        backend = AMQPMessagingBackend()
+        backend.send_messages([{'type': 'echo', 'body': '1'}])
+        backend.send_messages([{'type': 'echo', 'body': '2'}])
+        backend.receive_messages(5, MagicMock())
+
+        connection.assert_called_once_with(backend._broker_url)
+        connection.return_value.Pool.assert_called_once_with(limit=backend._pool_limit)
+        self.assertEqual(pooled_connection.ensure_connection.call_count, 3)
+
+    @patch('messaging.backends.amqp.Connection')
+    def test_send_messages_reconnect(self, connection):
+        """Validate that sending resumes on a fresh connection after the broker connection is lost"""
+
+        messages = [
+            {'type': 'echo', 'body': '1'},
+            {'type': 'echo', 'body': '2'}
+        ]
+
+        pooled_connection = connection.return_value.Pool.return_value.acquire.return_value.__enter__.return_value
+        pooled_connection.connection_errors = (IOError,)
+        pooled_connection.channel_errors = ()
+        connection.return_value.Pool.return_value.connection = pooled_connection
+        put = pooled_connection.SimpleQueue.return_value.put
+        put.side_effect = [None, IOError, None]
+
+        backend = AMQPMessagingBackend()
+        backend.send_messages(messages)
+
+        put.assert_has_calls([put_call(messages[0]), put_call(messages[1]), put_call(messages[1])])
+        pooled_connection.collect.assert_called_once()
 
     @patch('messaging.backends.amqp.Connection')
     def test_valid_send_message(self, connection):
@@ -50,8 +138,8 @@ class TestAMQPBackend(TestCase):
         backend.send_messages(messages)
 
         # Deep diving through context managers to assert put call
-        put = connection.return_value.__enter__.return_value.SimpleQueue.return_value.put
-        put.assert_called_with(messages[0])
+        put = connection.return_value.Pool.return_value.acquire.return_value.__enter__.return_value.SimpleQueue.return_value.put
+        self.assertEqual(put.call_args, put_call(messages[0]))
         self.assertEquals(put.call_count, 1)
 
     @patch('messaging.backends.amqp.Connection')
@@ -67,8 +155,8 @@ class TestAMQPBackend(TestCase):
         backend.send_messages(messages)
 
         # Deep diving through context managers to assert put call
-        put = connection.return_value.__enter__.return_value.SimpleQueue.return_value.put
-        put.assert_has_calls([call(x) for x in messages])
+        put = connection.return_value.Pool.return_value.acquire.return_value.__enter__.return_value.SimpleQueue.return_value.put
+        put.assert_has_calls([put_call(x) for x in messages])
         self.assertEquals(put.call_count, 2)
 
     @patch('messaging.backends.amqp.Connection')
@@ -80,19 +168,16 @@ class TestAMQPBackend(TestCase):
         get_func = MagicMock(side_effect=[message1, message2, Queue.Empty])
 
         # Deep diving through context managers to patch get call
-        connection.return_value.__enter__.return_value.SimpleQueue.return_value.get = get_func
+        pooled_connection = connection.return_value.Pool.return_value.acquire.return_value.__enter__.return_value
+        pooled_connection.SimpleQueue.return_value.get = get_func
+        process_messages = MagicMock(return_value=[True, True])
 
         backend = AMQPMessagingBackend()
-        generator = backend.receive_messages(5)
-        results = []
-        try:
-            results = [generator.next()]
-            while True:
-                results.append(generator.send(True))
-        except StopIteration:
-            pass
-
-        self.assertEqual(len(results), 2)
+        count = backend.receive_messages(5, process_messages)
+
+        self.assertEqual(count, 2)
+        process_messages.assert_called_once_with([message1.payload, message2.payload])
+        pooled_connection.channel.return_value.basic_qos.assert_called_with(0, 5, False)
         message1.ack.assert_called()
         message2.ack.assert_called()
 
@@ -103,48 +188,83 @@ class TestAMQPBackend(TestCase):
         message1 = MagicMock(payload={'type': 'echo', 'body': '1'})
         message2 = MagicMock(payload={'type': 'echo', 'body': '2'})
         message3 = MagicMock(payload={'type': 'echo', 'body': '3'})
-        get_func = MagicMock(side_effect=[message1, message2, Queue.Empty])
+        get_func = MagicMock(side_effect=[message1, message2, message3, Queue.Empty])
 
         # Deep diving through context managers to patch get call
-        connection.return_value.__enter__.return_value.SimpleQueue.return_value.get = get_func
+        connection.return_value.Pool.return_value.acquire.return_value.__enter__.return_value.SimpleQueue.return_value.get = get_func
+        process_messages = MagicMock(return_value=[True, True])
 
         backend = AMQPMessagingBackend()
-        generator = backend.receive_messages(2)
-        result = []
-        try:
-            results = [generator.next()]
-            while True:
-                results.append(generator.send(True))
-        except StopIteration:
-            pass
-
-        # wrap result in list to force generator iteration
-        self.assertEqual(len(results), 2)
+        backend.receive_messages(2, process_messages)
+
+        process_messages.assert_called_once_with([message1.payload, message2.payload])
         message1.ack.assert_called()
         message2.ack.assert_called()
         message3.ack.assert_not_called()
 
     @patch('messaging.backends.amqp.Connection')
-    def test_false_result_during_receive_message_yield(self, connection):
-        """Validate message ack is not done with yield returns False in AMQP backend"""
+    def test_false_result_during_receive_messages(self, connection):
+        """Validate message ack is not done when processing returns False in AMQP backend"""
 
-        message = MagicMock()
-        message.payload = 'test'
-        get_func = MagicMock(return_value=message)
+        message1 = MagicMock(payload='test1')
+        message2 = MagicMock(payload='test2')
+        get_func = MagicMock(side_effect=[message1, message2, Queue.Empty])
 
         # Deep diving through context managers to patch get call
-        connection.return_value.__enter__.return_value.SimpleQueue.return_value.get = get_func
+        connection.return_value.Pool.return_value.acquire.return_value.__enter__.return_value.SimpleQueue.return_value.get = get_func
+
+        backend = AMQPMessagingBackend()
+        backend.receive_messages(10, MagicMock(return_value=[False, True]))
+
+        message1.ack.assert_not_called()
+        message1.requeue.assert_called()
+        message2.ack.assert_called()
+        message2.requeue.assert_not_called()
+
+    @patch('messaging.backends.amqp.Connection')
+    def test_receive_messages_no_wait(self, connection):
+        """Validate that the AMQP backend polls the given queue without waiting when asked not to wait"""
+
+        message1 = MagicMock(payload={'type': 'echo', 'body': '1'})
+        pooled_connection = connection.return_value.Pool.return_value.acquire.return_value.__enter__.return_value
+        simple_queue = pooled_connection.SimpleQueue.return_value
+        simple_queue.get_nowait = MagicMock(return_value=message1)
+        simple_queue.get = MagicMock(side_effect=Queue.Empty)
+        process_messages = MagicMock(return_value=[True])
+
+        backend = AMQPMessagingBackend()
+        count = backend.receive_messages(5, process_messages, queue_name='other-queue', wait=False)
+
+        self.assertEqual(count, 1)
+        self.assertEqual(pooled_connection.SimpleQueue.call_args[0][0], 'other-queue')
+        simple_queue.get_nowait.assert_called_once()
+        process_messages.assert_called_once_with([message1.payload])
+
+    @patch('messaging.backends.amqp.Connection')
+    def test_empty_receive_messages(self, connection):
+        """Validate that processing is skipped when no messages are available in AMQP backend"""
+
+        get_func = MagicMock(side_effect=Queue.Empty)
+        connection.return_value.Pool.return_value.acquire.return_value.__enter__.return_value.SimpleQueue.return_value.get = get_func
+        process_messages = MagicMock()
 
         backend = AMQPMessagingBackend()
+        backend.receive_messages(10, process_messages)
 
-        generator = backend.receive_messages(10)
-        try:
-            for _ in generator:
-                generator.send(False)
-        except StopIteration:  # pragma: no cover
-            pass
+        process_messages.assert_not_called()
 
-        message.ack.assert_not_called()
+    @patch('messaging.backends.amqp.Connection')
+    def test_get_queue_depth(self, connection):
+        """Validate that the AMQP backend reports the number of messages in the given queue"""
+
+        simple_queue = connection.return_value.Pool.return_value.acquire.return_value.__enter__.return_value.SimpleQueue
+        simple_queue.return_value.qsize.return_value = 7
+
+        backend = AMQPMessagingBackend()
+
+        self.assertEqual(backend.get_queue_depth('other-queue'), 7)
+        simple_queue.assert_called_once_with('other-queue')
+        simple_queue.return_value.close.assert_called_once()
 
 
 class TestBackendsFactory(TestCase):
@@ -200,6 +320,66 @@ class TestMessagingBackend(TestCase):
         from_broker_url.assert_called_with(settings.BROKER_URL)
 
 
+class TestMemoryBackend(TestCase):
+    def setUp(self):
+        django.setup()
+
+    def test_send_receive_messages(self):
+        """Validate messages are passed through the queue they are sent to"""
+
+        messages = [{'type': 'echo', 'body': '1'}, {'type': 'echo', 'body': '2'}, {'type': 'echo', 'body': '3'}]
+        process_messages = MagicMock(return_value=[True, True])
+
+        backend = MemoryMessagingBackend()
+        backend.send_messages(messages, queue_name='other-queue')
+
+        self.assertEqual(backend.get_queue_depth(), 0)
+        self.assertEqual(backend.get_queue_depth('other-queue'), 3)
+        count = backend.receive_messages(2, process_messages, queue_name='other-queue')
+
+        self.assertEqual(count, 2)
+        process_messages.assert_called_once_with(messages[:2])
+        self.assertEqual(backend.get_queue_depth('other-queue'), 1)
+
+    @override_settings(MESSAGE_COMPRESSION_THRESHOLD=10)
+    def test_compressed_messages(self):
+        """Validate compressed messages are decoded on receipt"""
+
+        message = {'type': 'echo', 'body': '1' * 100}
+        process_messages = MagicMock(return_value=[True])
+
+        backend = MemoryMessagingBackend()
+        backend.send_messages([message])
+        backend.receive_messages(10, process_messages, wait=False)
+
+        process_messages.assert_called_once_with([message])
+
+    def test_failed_messages_requeued(self):
+        """Validate unsuccessful messages return to the front of the queue in order"""
+
+        messages = [{'type': 'echo', 'body': '1'}, {'type': 'echo', 'body': '2'}, {'type': 'echo', 'body': '3'}]
+
+        backend = MemoryMessagingBackend()
+        backend.send_messages(messages)
+        backend.receive_messages(2, MagicMock(return_value=[False, False]))
+        process_messages = MagicMock(return_value=[True, True, True])
+        backend.receive_messages(10, process_messages)
+
+        process_messages.assert_called_once_with(messages)
+        self.assertEqual(backend.get_queue_depth(), 0)
+
+    def test_empty_receive_messages(self):
+        """Validate that processing is skipped when no messages are available"""
+
+        process_messages = MagicMock()
+
+        backend = MemoryMessagingBackend()
+        count = backend.receive_messages(10, process_messages, wait=False)
+
+        self.assertEqual(count, 0)
+        process_messages.assert_not_called()
+
+
 class TestSQSBackend(TestCase):
     def setUp(self):
         django.setup()
@@ -251,6 +431,76 @@ class TestSQSBackend(TestCase):
             self.assertIn(json.dumps(message), str(put.mock_calls[0]))
         self.assertEquals(put.call_count, 1)
 
+    @override_settings(MESSAGE_COMPRESSION_THRESHOLD=100)
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_compressed_message_round_trip(self, client):
+        """Validate that a compressed message is encoded as text and decoded back to the original message"""
+
+        message = {'type': 'echo', 'body': '1' * 1000}
+
+        backend = SQSMessagingBackend()
+        body = backend._encode_body(message)
+
+        self.assertTrue(body.startswith('scale-message/1;application/json;utf-8;'))
+        self.assertLess(len(body), len(json.dumps(message)))
+        self.assertEqual(backend._decode_body(body), message)
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_plain_json_message(self, client):
+        """Validate that small JSON messages keep the plain JSON body format"""
+
+        message = {'type': 'echo', 'body': '1'}
+
+        backend = SQSMessagingBackend()
+        body = backend._encode_body(message)
+
+        self.assertEqual(json.loads(body), message)
+        self.assertEqual(backend._decode_body(json.dumps(message)), message)
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_client_reused(self, client):
+        """Validate that the SQS client persists across send calls"""
+
+        backend = SQSMessagingBackend()
+        backend.send_messages([{'type': 'echo', 'body': '1'}])
+        backend.send_messages([{'type': 'echo', 'body': '2'}])
+
+        client.assert_called_once()
+        self.assertEquals(client.return_value.__enter__.return_value.send_messages.call_count, 2)
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_send_messages_reconnect(self, client):
+        """Validate that the SQS client is rebuilt after a failed send"""
+
+        send_messages = client.return_value.__enter__.return_value.send_messages
+        send_messages.side_effect = [ClientError({'Error': {}}, 'SendMessageBatch'), None]
+
+        backend = SQSMessagingBackend()
+        backend.send_messages([{'type': 'echo', 'body': '1'}])
+
+        self.assertEquals(client.call_count, 2)
+        self.assertEquals(send_messages.call_count, 2)
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_send_messages_reconnect_later_batch(self, client):
+        """Validate that only the batches that were not sent are resent after a failed send"""
+
+        send_messages = client.return_value.__enter__.return_value.send_messages
+        send_messages.side_effect = [None, ClientError({'Error': {}}, 'SendMessageBatch'), None, None]
+        messages = [{'type': 'echo', 'body': str(i)} for i in range(25)]
+
+        backend = SQSMessagingBackend()
+        backend.send_messages(messages)
+
+        self.assertEquals(client.call_count, 2)
+        self.assertEquals(send_messages.call_count, 4)
+        batches = [mock_call[1][1] for mock_call in send_messages.mock_calls]
+        self.assertEquals([len(batch) for batch in batches], [10, 10, 10, 5])
+        # The failed second batch is resent, but the first batch is not
+        self.assertEquals(batches[1], batches[2])
+        sent_bodies = [json.loads(entry['MessageBody']) for batch in [batches[0]] + batches[2:] for entry in batch]
+        self.assertEquals(sent_bodies, messages)
+
     @patch('messaging.backends.sqs.SQSClient')
     def test_valid_receive_messages(self, client):
         """Validate successful message retrieval via SQS backend"""
@@ -260,43 +510,72 @@ class TestSQSBackend(TestCase):
         get_func = MagicMock(return_value=[message1, message2])
 
         client.return_value.__enter__.return_value.receive_messages = get_func
+        delete_messages = client.return_value.__enter__.return_value.delete_messages
+        process_messages = MagicMock(return_value=[True, True])
 
         backend = SQSMessagingBackend()
-        generator = backend.receive_messages(5)
-        results = []
-        try:
-            results = [generator.next()]
-            while True:
-                results.append(generator.send(True))
-        except StopIteration:
-            pass
-
-        # wrap result in list to force generator iteration
-        self.assertEqual(len(results), 2)
-        message1.delete.assert_called()
-        message2.delete.assert_called()
+        count = backend.receive_messages(5, process_messages)
+
+        self.assertEqual(count, 2)
+        get_func.assert_called_once_with(backend._queue_name, batch_size=5, wait_time_seconds=20)
+        process_messages.assert_called_once_with([{'type': 'echo', 'body': '1'}, {'type': 'echo', 'body': '2'}])
+        delete_messages.assert_called_once_with(backend._queue_name, [message1, message2])
 
     @patch('messaging.backends.sqs.SQSClient')
-    def test_exception_during_receive_messages(self, client):
-        """Validate exception handling during message consumption from SQS backend"""
+    def test_receive_messages_no_wait(self, client):
+        """Validate that the SQS backend polls the given queue without long-polling when asked not to wait"""
+
+        get_func = MagicMock(return_value=[])
+        client.return_value.__enter__.return_value.receive_messages = get_func
+        process_messages = MagicMock()
+
+        backend = SQSMessagingBackend()
+        count = backend.receive_messages(5, process_messages, queue_name='other-queue', wait=False)
+
+        self.assertEqual(count, 0)
+        get_func.assert_called_once_with('other-queue', batch_size=5, wait_time_seconds=0)
+        process_messages.assert_not_called()
 
-        message = MagicMock()
-        value = {'test': 'thing'}
-        message.body = json.dumps(value)
-        get_func = MagicMock(return_value=[message])
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_false_result_during_receive_messages(self, client):
+        """Validate unsuccessful messages are not deleted from SQS backend"""
+
+        message1 = MagicMock(body=json.dumps({'test': 'thing1'}))
+        message2 = MagicMock(body=json.dumps({'test': 'thing2'}))
+        get_func = MagicMock(return_value=[message1, message2])
 
         client.return_value.__enter__.return_value.receive_messages = get_func
+        delete_messages = client.return_value.__enter__.return_value.delete_messages
+
+        backend = SQSMessagingBackend()
+        backend.receive_messages(10, MagicMock(return_value=[False, True]))
+
+        delete_messages.assert_called_once_with(backend._queue_name, [message2])
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_exception_during_receive_messages(self, client):
+        """Validate the SQS client is rebuilt after a failed receive"""
+
+        get_func = MagicMock(side_effect=ClientError({'Error': {}}, 'ReceiveMessage'))
+        client.return_value.__enter__.return_value.receive_messages = get_func
+        process_messages = MagicMock()
+
+        backend = SQSMessagingBackend()
+        with self.assertRaises(ClientError):
+            backend.receive_messages(10, process_messages)
+        backend.send_messages([{'type': 'echo', 'body': '1'}])
+
+        process_messages.assert_not_called()
+        self.assertEquals(client.call_count, 2)
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_get_queue_depth(self, client):
+        """Validate that the SQS backend reports the depth of the default queue"""
+
+        get_queue_depth = client.return_value.__enter__.return_value.get_queue_depth
+        get_queue_depth.return_value = 12
 
         backend = SQSMessagingBackend()
 
-        generator = backend.receive_messages(10)
-        results = []
-        try:
-            results = [generator.next()]
-            while True:
-                results.append(generator.send(False))
-        except StopIteration:
-            pass
-
-        self.assertEquals(results, [value])
-        message.delete.assert_not_called()
+        self.assertEqual(backend.get_queue_depth(), 12)
+        get_queue_depth.assert_called_once_with(backend._queue_name)
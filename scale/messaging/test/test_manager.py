@@ -4,6 +4,7 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import django
+from django.conf import settings
 from django.test import TestCase
 from mock import MagicMock
 from mock import call, patch
@@ -25,7 +26,7 @@ class TestCommandMessageManager(TestCase):
             return super(CommandMessageManager, cls).__new__(cls)
             
         def manager_init(self):
-            pass
+            self._init_queues('queue', {}, {})
             
 
         self.new_patcher = patch('messaging.manager.CommandMessageManager.__new__', manager_new)
@@ -48,7 +49,26 @@ class TestCommandMessageManager(TestCase):
 
         manager.send_messages([command])
 
-        send_messages.assert_called_with([{'type': 'test', 'body': 'body_content'}])
+        send_messages.assert_called_with([{'type': 'test', 'body': 'body_content'}], queue_name='queue')
+
+    def test_send_messages_routed(self):
+        """Validate that messages are sent to the queue their type is routed to"""
+
+        commands = [MagicMock(type='a'), MagicMock(type='b'), MagicMock(type='a')]
+        for command in commands:
+            command.to_json.return_value = 'body_content'
+        manager = CommandMessageManager()
+        manager._init_queues('queue', {'high': ['a']}, {})
+        manager._backend = MagicMock()
+
+        manager.send_messages(commands)
+
+        manager._backend.send_messages.assert_has_calls([
+            call([{'type': 'a', 'body': 'body_content'}, {'type': 'a', 'body': 'body_content'}],
+                 queue_name='queue-high'),
+            call([{'type': 'b', 'body': 'body_content'}], queue_name='queue')
+        ])
+        self.assertEquals(manager._backend.send_messages.call_count, 2)
 
     def test_send_messages_no_type(self):
         """Validate that send_message raises AttributeError when message type is not available"""
@@ -77,73 +97,192 @@ class TestCommandMessageManager(TestCase):
             manager.send_messages([message])
 
     def test_receive_message(self):
-        """Validate the receive_message calls _process_message with each result"""
+        """Validate the receive_message executes each message and reports the results to the backend"""
+
+        commands = [MagicMock(type='test') for _ in range(10)]
+        for command in commands:
+            command.merge.return_value = False
+        messages = [MagicMock() for _ in range(10)]
+        results = []
+
+        manager = CommandMessageManager()
+        manager._backend = MagicMock()
+        manager._extract_command = MagicMock(side_effect=commands)
+        execute_command = manager._execute_command = MagicMock()
+        manager._backend.receive_messages.side_effect = lambda size, process, **kwargs: results.extend(process(messages))
+        manager.receive_messages()
+
+        execute_command.assert_has_calls([call(x) for x in commands])
+        self.assertEquals(execute_command.call_count, 10)
+        self.assertListEqual(results, [True] * 10)
+
+    def test_receive_message_batch_size(self):
+        """Validate the receive_message requests the given batch size from the backend"""
+
+        manager = CommandMessageManager()
+        manager._backend = MagicMock()
+
+        manager.receive_messages()
+        manager._backend.receive_messages.assert_called_with(10, manager._process_messages, queue_name='queue')
+
+        manager.receive_messages(25)
+        manager._backend.receive_messages.assert_called_with(25, manager._process_messages, queue_name='queue')
+
+    def test_init_queues(self):
+        """Validate that queues are received from in proportion to their weights"""
+
+        manager = CommandMessageManager()
+        manager._init_queues('queue', {'high': ['a'], 'bulk': ['b']}, {'high': 4, '': 2, 'bulk': 1})
+
+        self.assertListEqual(manager._queue_names, ['queue-high', 'queue', 'queue-bulk'])
+        self.assertDictEqual(manager._queue_routes, {'a': 'queue-high', 'b': 'queue-bulk'})
+        self.assertEquals(len(manager._receive_schedule), 7)
+        self.assertEquals(manager._receive_schedule.count('queue-high'), 4)
+        self.assertEquals(manager._receive_schedule.count('queue'), 2)
+        self.assertEquals(manager._receive_schedule.count('queue-bulk'), 1)
+        self.assertEquals(manager._receive_schedule[0], 'queue-high')
+
+    def test_get_queue_depth(self):
+        """Validate that the queue depth is summed over every routed queue"""
+
+        manager = CommandMessageManager()
+        manager._init_queues('queue', {'high': ['a']}, {'high': 2, '': 1})
+        manager._backend = MagicMock()
+        manager._backend.get_queue_depth.side_effect = lambda queue_name: {'queue-high': 3, 'queue': 4}[queue_name]
+
+        self.assertEqual(manager.get_queue_depth(), 7)
+
+    def test_receive_messages_skips_empty_queues(self):
+        """Validate that a batch is taken from the next queue in rotation with messages available"""
 
-        mocks = [MagicMock() for _ in range(10)]
+        manager = CommandMessageManager()
+        manager._init_queues('queue', {'high': ['a']}, {'high': 2, '': 1})
+        manager._receive_schedule = ['queue']
+        manager._backend = MagicMock()
+        manager._backend.receive_messages.side_effect = [0, 3]
+
+        manager.receive_messages()
 
-        def gen():
-            for mock in mocks:
-                yield mock
+        manager._backend.receive_messages.assert_has_calls([
+            call(10, manager._process_messages, queue_name='queue', wait=False),
+            call(10, manager._process_messages, queue_name='queue-high', wait=False)
+        ])
+        self.assertEquals(manager._backend.receive_messages.call_count, 2)
+
+    @patch('messaging.manager.time.sleep')
+    def test_receive_messages_all_queues_empty(self, mock_sleep):
+        """Validate that every queue is polled without waiting and the idle wait is bounded when all queues are empty"""
 
         manager = CommandMessageManager()
+        manager._init_queues('queue', {'high': ['a']}, {'high': 2, '': 1})
+        manager._receive_schedule = ['queue']
         manager._backend = MagicMock()
-        process_message = manager._process_message = MagicMock()
-        manager._backend.receive_messages = MagicMock(return_value=gen())
+        manager._backend.receive_messages.return_value = 0
+
         manager.receive_messages()
 
-        calls = [call(x) for x in mocks]
-        process_message.assert_has_calls(calls)
-        self.assertEquals(process_message.call_count, 10)
+        manager._backend.receive_messages.assert_has_calls([
+            call(10, manager._process_messages, queue_name='queue', wait=False),
+            call(10, manager._process_messages, queue_name='queue-high', wait=False)
+        ])
+        self.assertEquals(manager._backend.receive_messages.call_count, 2)
+        mock_sleep.assert_called_once_with(settings.MESSAGE_QUEUE_IDLE_WAIT)
 
+    def test_init_queues_keeps_previous_queues(self):
+        """Validate that re-initializing the queues replaces them without ever leaving them empty"""
+
+        manager = CommandMessageManager()
+        manager._init_queues('queue', {'high': ['a']}, {'high': 2, '': 1})
+        queue_names = manager._queue_names
+        receive_schedule = manager._receive_schedule
+
+        manager._init_queues('queue', {'high': ['a']}, {'high': 2, '': 1})
+
+        # The previous lists are replaced rather than cleared and refilled, so concurrent readers still see them whole
+        self.assertListEqual(queue_names, ['queue-high', 'queue'])
+        self.assertEquals(len(receive_schedule), 3)
+        self.assertListEqual(manager._queue_names, queue_names)
+        self.assertIsNot(manager._queue_names, queue_names)
+
+    @patch('messaging.manager.CommandMessageManager._execute_command')
     @patch('messaging.manager.CommandMessageManager._extract_command')
+    def test_process_messages_merge(self, extract_command, execute_command):
+        """Validate that compatible messages of the same type are merged and executed once"""
+
+        # Commands 1 and 3 merge, command 2 is a different type and command 4 cannot be merged
+        command_1 = MagicMock(type='a')
+        command_1.merge.side_effect = lambda command: command is command_3
+        command_2 = MagicMock(type='b')
+        command_3 = MagicMock(type='a')
+        command_4 = MagicMock(type='a')
+        command_4.merge.return_value = False
+        extract_command.side_effect = [command_1, command_2, InvalidCommandMessage, command_3, command_4]
+        execute_command.side_effect = [None, None, CommandMessageExecuteFailure]
+
+        manager = CommandMessageManager()
+        results = manager._process_messages([MagicMock() for _ in range(5)])
+
+        execute_command.assert_has_calls([call(command_1), call(command_2), call(command_4)])
+        self.assertEquals(execute_command.call_count, 3)
+        self.assertListEqual(results, [True, True, False, True, False])
+
+    @patch('messaging.manager.CommandMessageManager._metrics')
+    @patch('messaging.manager.CommandMessageManager._execute_command')
+    @patch('messaging.manager.CommandMessageManager._extract_command')
+    def test_process_messages_metrics(self, extract_command, execute_command, metrics):
+        """Validate that execution metrics are recorded for each executed command and invalid message"""
+
+        command_1 = MagicMock(type='a', new_messages=[MagicMock()])
+        command_1.merge.return_value = True
+        command_2 = MagicMock(type='a')
+        extract_command.side_effect = [command_1, command_2, InvalidCommandMessage]
+
+        manager = CommandMessageManager()
+        manager._process_messages([MagicMock(), MagicMock(), {'type': 'b'}])
+
+        metrics.add_execution.assert_called_once()
+        self.assertEqual(metrics.add_execution.call_args[0][0:2], ('a', 2))
+        self.assertEqual(metrics.add_execution.call_args[0][3], True)
+        self.assertEqual(metrics.add_execution.call_args[0][5], 1)
+        metrics.add_invalid_message.assert_called_once_with('b')
+
     @patch('messaging.manager.CommandMessageManager._send_downstream')
-    def test_successful_process_message(self, send_downstream, extract_command):
+    def test_successful_execute_command(self, send_downstream):
         """Validate logic for a successful command process """
 
-        message = {'type': 'test', 'body': 'payload'}
-
         manager = CommandMessageManager()
         command = MagicMock(execute=MagicMock(return_value=True))
         command.execute.return_value = True
         command.new_messages = []
-        extract_command.return_value = command
 
-        manager._process_message(message)
+        manager._execute_command(command)
 
         send_downstream.assert_called_with([])
 
-    @patch('messaging.manager.CommandMessageManager._extract_command')
     @patch('messaging.manager.CommandMessageManager._send_downstream')
-    def test_failing_process_message(self, send_downstream, extract_command):
+    def test_failing_execute_command(self, send_downstream):
         """Validate logic for a process message failing in process execution"""
 
-        message = {'type': 'test', 'body': 'payload'}
-
         manager = CommandMessageManager()
         command = MagicMock()
         command.execute = MagicMock(return_value=False)
-        extract_command.return_value = command
 
         with self.assertRaises(CommandMessageExecuteFailure):
-            manager._process_message(message)
+            manager._execute_command(command)
 
         self.assertFalse(send_downstream.called)
 
-    @patch('messaging.manager.CommandMessageManager._extract_command')
     @patch('messaging.manager.CommandMessageManager._send_downstream')
-    def test_process_message_exception(self, send_downstream, extract_command):
+    def test_execute_command_exception(self, send_downstream):
         """Validate logic for a process message throwing an exception in process execution"""
 
-        message = {'type': 'test', 'body': 'payload'}
-
         manager = CommandMessageManager()
         command = MagicMock()
         command.execute = MagicMock()
         command.execute.side_effect = Exception
-        extract_command.return_value = command
 
         with self.assertRaises(CommandMessageExecuteFailure):
-            manager._process_message(message)
+            manager._execute_command(command)
 
         self.assertFalse(send_downstream.called)
 
@@ -30,32 +30,40 @@ class TestSingletonCommandMessageManager(TestCase):
 
     @patch('messaging.manager.get_message_backend')
     @patch('messaging.manager.BrokerDetails')
-    @patch('messaging.manager.CommandMessageManager._process_message')
-    def test_receive_message_invalid_message(self, process, broker_details, get_message_backend):
-        """Exercise all exception code paths within receive_message"""
+    def test_initialized_once(self, broker_details, get_message_backend):
+        """Validate that the singleton is only initialized when it is first created"""
+
+        manager = CommandMessageManager()
+        backend = manager._backend
+        get_message_backend.reset_mock()
 
-        def gen():
-            yield MagicMock()
+        self.assertIs(CommandMessageManager()._backend, backend)
+        self.assertFalse(get_message_backend.called)
 
-        process.side_effect = InvalidCommandMessage
+    @patch('messaging.manager.get_message_backend')
+    @patch('messaging.manager.BrokerDetails')
+    @patch('messaging.manager.CommandMessageManager._extract_command')
+    def test_receive_message_invalid_message(self, extract, broker_details, get_message_backend):
+        """Exercise all exception code paths within receive_message"""
+
+        extract.side_effect = InvalidCommandMessage
         manager = CommandMessageManager()
         manager._backend = MagicMock()
-        manager._backend.receive_messages.return_value = gen()
+        manager._backend.receive_messages.side_effect = lambda size, process, **kwargs: process([MagicMock()])
 
         manager.receive_messages()
 
     @patch('messaging.manager.get_message_backend')
     @patch('messaging.manager.BrokerDetails')
-    @patch('messaging.manager.CommandMessageManager._process_message')
-    def test_receive_message_execute_failure(self, process, broker_details, get_message_backend):
+    @patch('messaging.manager.CommandMessageManager._execute_command')
+    @patch('messaging.manager.CommandMessageManager._extract_command')
+    def test_receive_message_execute_failure(self, extract, execute, broker_details, get_message_backend):
         """Exercise all exception code paths within receive_message"""
 
-        def gen():
-            yield MagicMock()
-
-        process.side_effect = CommandMessageExecuteFailure
+        extract.return_value.merge.return_value = False
+        execute.side_effect = CommandMessageExecuteFailure
         manager = CommandMessageManager()
         manager._backend = MagicMock()
-        manager._backend.receive_messages.return_value = gen()
+        manager._backend.receive_messages.side_effect = lambda size, process, **kwargs: process([MagicMock()])
 
-        manager.receive_messages()
\ No newline at end of file
+        manager.receive_messages()
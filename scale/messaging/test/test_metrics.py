@@ -0,0 +1,94 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import django
+from django.db import connection, connections, DEFAULT_DB_ALIAS
+from django.test import TestCase
+
+from messaging.metrics import MessageMetrics, QueryCounter, summarize_metrics
+
+
+class TestMessageMetrics(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_add_execution(self):
+        """Validate that executions are counted for their message type"""
+
+        metrics = MessageMetrics()
+        metrics.add_execution('echo', 2, 0.02, True, 3, 1)
+        metrics.add_execution('echo', 1, 0.2, False, 4, 5)
+
+        status = metrics.get_status()['echo']
+        self.assertEqual(status['messages'], 3)
+        self.assertEqual(status['executed'], 2)
+        self.assertEqual(status['failed'], 1)
+        self.assertEqual(status['retried'], 1)
+        self.assertEqual(status['queries'], 7)
+        self.assertEqual(status['downstream'], 1)
+        self.assertAlmostEqual(status['total_seconds'], 0.22)
+        self.assertEqual(status['max_seconds'], 0.2)
+        self.assertEqual(sum(status['histogram']), 2)
+
+    def test_add_invalid_message(self):
+        """Validate that invalid messages are counted as retried"""
+
+        metrics = MessageMetrics()
+        metrics.add_invalid_message(None)
+
+        status = metrics.get_status()['unknown']
+        self.assertEqual(status['messages'], 1)
+        self.assertEqual(status['retried'], 1)
+        self.assertEqual(status['executed'], 0)
+
+    def test_query_counter(self):
+        """Validate that queries are counted without turning on query logging"""
+
+        queries_logged = connection.queries_logged
+        with QueryCounter() as counter:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.execute('SELECT 2')
+            self.assertEqual(connection.queries_logged, queries_logged)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 3')
+
+        self.assertEqual(counter.count, 2)
+        self.assertNotIn('make_cursor', connections[DEFAULT_DB_ALIAS].__dict__)
+
+    def test_summarize_metrics(self):
+        """Validate that metrics from multiple processes are combined and ordered by total execution time"""
+
+        metrics_1 = MessageMetrics()
+        metrics_2 = MessageMetrics()
+        for _ in range(98):
+            metrics_1.add_execution('slow', 1, 0.04, True, 1, 0)
+        metrics_2.add_execution('slow', 1, 0.3, True, 1, 0)
+        metrics_2.add_execution('slow', 1, 100.0, True, 1, 0)
+        metrics_2.add_execution('fast', 1, 0.001, True, 0, 0)
+
+        summaries = summarize_metrics([metrics_1.get_status(), metrics_2.get_status()])
+
+        self.assertListEqual([summary['type'] for summary in summaries], ['slow', 'fast'])
+        slow = summaries[0]
+        self.assertEqual(slow['executed'], 100)
+        self.assertEqual(slow['queries'], 100)
+        self.assertAlmostEqual(slow['mean_seconds'], (98 * 0.04 + 100.3) / 100)
+        self.assertEqual(slow['p50_seconds'], 0.05)
+        self.assertEqual(slow['p95_seconds'], 0.05)
+        self.assertEqual(slow['p99_seconds'], 0.5)
+        self.assertEqual(slow['max_seconds'], 100.0)
+        self.assertEqual(summaries[1]['p99_seconds'], 0.001)
+
+    def test_summarize_no_executions(self):
+        """Validate summaries of message types with only invalid messages"""
+
+        metrics = MessageMetrics()
+        metrics.add_invalid_message('echo')
+
+        summary = summarize_metrics([metrics.get_status()])[0]
+        self.assertEqual(summary['mean_seconds'], 0.0)
+        self.assertEqual(summary['p50_seconds'], 0.0)
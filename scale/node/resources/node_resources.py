@@ -3,13 +3,27 @@ from __future__ import unicode_literals
 
 from util.exceptions import ScaleLogicBug
 
-from node.resources.resource import Cpus, Disk, Mem, Gpus
+from node.resources.resource import Cpus, Disk, Mem, Gpus, ScalarResource
+
+
+# The standard resources that are always defined, stored by index in a fixed-size list of values
+STANDARD_RESOURCES = (('cpus', Cpus), ('mem', Mem), ('disk', Disk), ('gpus', Gpus))
+STANDARD_INDEXES = {name: index for index, (name, _resource_class) in enumerate(STANDARD_RESOURCES)}
+_NUM_STANDARD = len(STANDARD_RESOURCES)
+_CPUS = STANDARD_INDEXES['cpus']
+_MEM = STANDARD_INDEXES['mem']
+_DISK = STANDARD_INDEXES['disk']
+_GPUS = STANDARD_INDEXES['gpus']
 
 
 class NodeResources(object):
-    """This class encapsulates a set of node resources
+    """This class encapsulates a set of node resources. The values of the standard resources are kept in a fixed-size
+    list indexed by resource name and any custom resources are kept in a dict that is only created when needed, so that
+    the arithmetic operations update values in place without creating any resource objects.
     """
 
+    __slots__ = ('_values', '_custom')
+
     def __init__(self, resources=None):
         """Constructor
 
@@ -17,22 +31,19 @@ class NodeResources(object):
         :type resources: list
         """
 
-        self._resources = {}  # {Name: Resource}
+        self._values = [0.0] * _NUM_STANDARD
+        self._custom = None  # {Name: Value}, None if there are no custom resources
         if resources:
             for resource in resources:
                 if resource.resource_type != 'SCALAR':
                     raise ScaleLogicBug('Resource type "%s" is not currently supported', resource.resource_type)
-                self._resources[resource.name] = resource
-
-        # Make sure standard resources are defined
-        if 'cpus' not in self._resources:
-            self._resources['cpus'] = Cpus(0.0)
-        if 'mem' not in self._resources:
-            self._resources['mem'] = Mem(0.0)
-        if 'disk' not in self._resources:
-            self._resources['disk'] = Disk(0.0)
-        if 'gpus' not in self._resources:
-            self._resources['gpus'] = Gpus(0.0)
+                index = STANDARD_INDEXES.get(resource.name)
+                if index is not None:
+                    self._values[index] = resource.value
+                elif self._custom is None:
+                    self._custom = {resource.name: resource.value}
+                else:
+                    self._custom[resource.name] = resource.value
 
     def __str__(self):
         """Converts the resource to a readable logging string
@@ -41,7 +52,7 @@ class NodeResources(object):
         :rtype: string
         """
 
-        logging_str = ', '.join(['%.2f %s' % (resource.value, resource.name) for resource in self._resources.values()])
+        logging_str = ', '.join(['%.2f %s' % (value, name) for name, value in self._items()])
         return '[%s]' % logging_str
 
     @property
@@ -52,7 +63,7 @@ class NodeResources(object):
         :rtype: float
         """
 
-        return self._resources['cpus'].value
+        return self._values[_CPUS]
 
     @property
     def disk(self):
@@ -62,7 +73,7 @@ class NodeResources(object):
         :rtype: float
         """
 
-        return self._resources['disk'].value
+        return self._values[_DISK]
 
     @property
     def mem(self):
@@ -72,7 +83,7 @@ class NodeResources(object):
         :rtype: float
         """
 
-        return self._resources['mem'].value
+        return self._values[_MEM]
 
     @property
     def gpus(self):
@@ -82,17 +93,21 @@ class NodeResources(object):
         :rtype: float
         """
 
-        return self._resources['gpus'].value
+        return self._values[_GPUS]
 
     @property
     def resources(self):
-        """The list of resources
+        """The list of resources. The resource objects are created on each call, so editing them will not affect these
+        resources.
 
         :returns: The list of resources
         :rtype: list
         """
 
-        return self._resources.values()
+        resources = [resource_class(value) for (_name, resource_class), value in zip(STANDARD_RESOURCES, self._values)]
+        if self._custom:
+            resources.extend(ScalarResource(name, value) for name, value in self._custom.items())
+        return resources
 
     def add(self, node_resources):
         """Adds the given resources
@@ -101,11 +116,18 @@ class NodeResources(object):
         :type node_resources: :class:`node.resources.NodeResources`
         """
 
-        for resource in node_resources.resources:
-            if resource.name in self._resources:
-                self._resources[resource.name].value += resource.value  # Assumes SCALAR type
-            else:
-                self._resources[resource.name] = resource.copy()
+        values = self._values
+        other_values = node_resources._values
+        for index in range(_NUM_STANDARD):
+            values[index] += other_values[index]
+
+        if node_resources._custom:
+            custom = self._get_custom()
+            for name, value in node_resources._custom.items():
+                if name in custom:
+                    custom[name] += value
+                else:
+                    custom[name] = value
 
     def copy(self):
         """Returns a deep copy of these resources. Editing one of the resources objects will not affect the other.
@@ -115,7 +137,9 @@ class NodeResources(object):
         """
 
         resources_copy = NodeResources()
-        resources_copy.add(self)
+        resources_copy._values[:] = self._values
+        if self._custom:
+            resources_copy._custom = dict(self._custom)
         return resources_copy
 
     def generate_status_json(self, resources_dict, key_name):
@@ -127,15 +151,15 @@ class NodeResources(object):
         :type key_name: string
         """
 
-        for resource in self._resources.values():
-            if resource.name in resources_dict:
-                resource_dict = resources_dict[resource.name]
+        for name, value in self._items():
+            if name in resources_dict:
+                resource_dict = resources_dict[name]
             else:
                 resource_dict = {}
-                resources_dict[resource.name] = resource_dict
+                resources_dict[name] = resource_dict
 
             # Assumes SCALAR type
-            resource_dict[key_name] = resource.value
+            resource_dict[key_name] = value
 
     def get_json(self):
         """Returns these resources as a JSON schema
@@ -145,11 +169,26 @@ class NodeResources(object):
         """
 
         from node.resources.json.resources import Resources
-        resources_dict = {}
-        for resource in self._resources.values():
-            resources_dict[resource.name] = resource.value  # Assumes SCALAR type
+        resources_dict = dict(self._items())
         return Resources({'resources': resources_dict}, do_validate=False)
 
+    def get_value(self, name):
+        """Returns the value of the resource with the given name, or None if these resources do not include it. The
+        standard resources are always included.
+
+        :param name: The name of the resource
+        :type name: string
+        :returns: The value of the resource, possibly None
+        :rtype: float
+        """
+
+        index = STANDARD_INDEXES.get(name)
+        if index is not None:
+            return self._values[index]
+        if self._custom:
+            return self._custom.get(name)
+        return None
+
     def increase_up_to(self, node_resources):
         """Increases each resource up to the value in the given node resources
 
@@ -157,12 +196,17 @@ class NodeResources(object):
         :type node_resources: :class:`node.resources.NodeResources`
         """
 
-        for resource in node_resources.resources:
-            if resource.name in self._resources:
-                if self._resources[resource.name].value < resource.value:  # Assumes SCALAR type
-                    self._resources[resource.name].value = resource.value
-            else:
-                self._resources[resource.name] = resource.copy()
+        values = self._values
+        other_values = node_resources._values
+        for index in range(_NUM_STANDARD):
+            if values[index] < other_values[index]:
+                values[index] = other_values[index]
+
+        if node_resources._custom:
+            custom = self._get_custom()
+            for name, value in node_resources._custom.items():
+                if name not in custom or custom[name] < value:
+                    custom[name] = value
 
     def is_equal(self, node_resources):
         """Indicates if these resources are equal. This should be used for testing only.
@@ -174,14 +218,13 @@ class NodeResources(object):
         """
 
         # Make sure they have the exact same set of resource names
-        names = set()
-        for resource in node_resources.resources:
-            names.add(resource.name)
-        if set(self._resources.keys()) != names:
+        custom = self._custom or {}
+        other_custom = node_resources._custom or {}
+        if set(custom.keys()) != set(other_custom.keys()):
             return False
 
-        for resource in node_resources.resources:
-            if round(self._resources[resource.name].value, 5) != round(resource.value, 5):  # Assumes SCALAR type
+        for name, value in node_resources._items():
+            if round(self.get_value(name), 5) != round(value, 5):  # Assumes SCALAR type
                 return False
 
         return True
@@ -195,13 +238,20 @@ class NodeResources(object):
         :rtype: bool
         """
 
-        for resource in node_resources.resources:
-            if resource.name in self._resources:
-                if self._resources[resource.name].value < resource.value:  # Assumes SCALAR type
-                    return False
-            else:
-                # Do not have this resource, not a problem if requesting 0.0
-                if resource.value > 0.0:
+        values = self._values
+        other_values = node_resources._values
+        for index in range(_NUM_STANDARD):
+            if values[index] < other_values[index]:
+                return False
+
+        if node_resources._custom:
+            custom = self._custom or {}
+            for name, value in node_resources._custom.items():
+                if name in custom:
+                    if custom[name] < value:  # Assumes SCALAR type
+                        return False
+                elif value > 0.0:
+                    # Do not have this resource, not a problem if requesting 0.0
                     return False
 
         return True
@@ -213,32 +263,45 @@ class NodeResources(object):
         :type node_resources: :class:`node.resources.NodeResources`
         """
 
-        for resource in self._resources.values():
-            if resource.name in node_resources._resources:
-                if resource.value > node_resources._resources[resource.name].value:  # Assumes SCALAR type
-                    resource.value = node_resources._resources[resource.name].value
-            else:
-                self.remove_resource(resource.name)
+        values = self._values
+        other_values = node_resources._values
+        for index in range(_NUM_STANDARD):
+            if values[index] > other_values[index]:
+                values[index] = other_values[index]
+
+        if self._custom:
+            other_custom = node_resources._custom or {}
+            for name in self._custom.keys():
+                if name in other_custom:
+                    if self._custom[name] > other_custom[name]:  # Assumes SCALAR type
+                        self._custom[name] = other_custom[name]
+                else:
+                    del self._custom[name]
 
     def remove_resource(self, name):
-        """Removes the resource with the given name
+        """Removes the resource with the given name. Standard resources cannot be removed, so their values are set to
+        zero instead.
 
         :param name: The name of the resource to remove
         :type name: string
         """
 
-        if name in self._resources:
-            if name in ['cpus', 'mem', 'disk']:
-                self._resources[name].value = 0.0
-            else:
-                del self._resources[name]
+        index = STANDARD_INDEXES.get(name)
+        if index is not None:
+            self._values[index] = 0.0
+        elif self._custom and name in self._custom:
+            del self._custom[name]
 
     def round_values(self):
         """Rounds all of the resource values
         """
 
-        for resource in self._resources.values():
-            resource.value = round(resource.value, 2)  # Assumes SCALAR type
+        values = self._values
+        for index in range(_NUM_STANDARD):
+            values[index] = round(values[index], 2)
+        if self._custom:
+            for name, value in self._custom.items():
+                self._custom[name] = round(value, 2)  # Assumes SCALAR type
 
     def subtract(self, node_resources):
         """Subtracts the given resources
@@ -247,6 +310,36 @@ class NodeResources(object):
         :type node_resources: :class:`node.resources.NodeResources`
         """
 
-        for resource in node_resources.resources:
-            if resource.name in self._resources:
-                self._resources[resource.name].value -= resource.value  # Assumes SCALAR type
+        values = self._values
+        other_values = node_resources._values
+        for index in range(_NUM_STANDARD):
+            values[index] -= other_values[index]
+
+        if node_resources._custom and self._custom:
+            custom = self._custom
+            for name, value in node_resources._custom.items():
+                if name in custom:
+                    custom[name] -= value  # Assumes SCALAR type
+
+    def _get_custom(self):
+        """Returns the dict of custom resource values, creating it if needed
+
+        :returns: The custom resource values by name
+        :rtype: dict
+        """
+
+        if self._custom is None:
+            self._custom = {}
+        return self._custom
+
+    def _items(self):
+        """Returns the name and value of each resource
+
+        :returns: The list of (name, value) tuples
+        :rtype: list
+        """
+
+        items = [(name, value) for (name, _resource_class), value in zip(STANDARD_RESOURCES, self._values)]
+        if self._custom:
+            items.extend(self._custom.items())
+        return items
@@ -0,0 +1,116 @@
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+
+from node.resources.node_resources import NodeResources
+from node.resources.resource import Cpus, Disk, Gpus, Mem, ScalarResource
+
+
+class TestNodeResources(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_add(self):
+        """Tests that add() adds values and copies custom resources that are missing"""
+
+        resources = NodeResources([Cpus(1.0), Mem(10.0), ScalarResource('foo', 1.0)])
+        other = NodeResources([Cpus(2.0), Disk(5.0), ScalarResource('foo', 2.0), ScalarResource('bar', 3.0)])
+        resources.add(other)
+
+        expected = NodeResources([Cpus(3.0), Mem(10.0), Disk(5.0), ScalarResource('foo', 3.0),
+                                  ScalarResource('bar', 3.0)])
+        self.assertTrue(resources.is_equal(expected))
+
+        # Adding to the resources did not change the other resources
+        other_expected = NodeResources([Cpus(2.0), Disk(5.0), ScalarResource('foo', 2.0), ScalarResource('bar', 3.0)])
+        self.assertTrue(other.is_equal(other_expected))
+
+    def test_copy(self):
+        """Tests that editing a copy does not affect the original resources"""
+
+        resources = NodeResources([Cpus(1.0), ScalarResource('foo', 1.0)])
+        resources_copy = resources.copy()
+        resources_copy.add(NodeResources([Cpus(1.0), ScalarResource('foo', 1.0)]))
+
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(1.0), ScalarResource('foo', 1.0)])))
+        self.assertTrue(resources_copy.is_equal(NodeResources([Cpus(2.0), ScalarResource('foo', 2.0)])))
+
+    def test_get_value(self):
+        """Tests that get_value() returns None only for custom resources that are not included"""
+
+        resources = NodeResources([Cpus(1.0), ScalarResource('foo', 2.0)])
+
+        self.assertEqual(resources.get_value('cpus'), 1.0)
+        self.assertEqual(resources.get_value('gpus'), 0.0)
+        self.assertEqual(resources.get_value('foo'), 2.0)
+        self.assertIsNone(resources.get_value('bar'))
+
+    def test_increase_up_to(self):
+        """Tests that increase_up_to() only increases values and copies custom resources that are missing"""
+
+        resources = NodeResources([Cpus(1.0), Mem(20.0), ScalarResource('foo', 1.0)])
+        resources.increase_up_to(NodeResources([Cpus(2.0), Mem(10.0), ScalarResource('bar', 3.0)]))
+
+        expected = NodeResources([Cpus(2.0), Mem(20.0), ScalarResource('foo', 1.0), ScalarResource('bar', 3.0)])
+        self.assertTrue(resources.is_equal(expected))
+
+    def test_is_equal(self):
+        """Tests that is_equal() compares both the resource names and values"""
+
+        resources = NodeResources([Cpus(1.0), ScalarResource('foo', 1.0)])
+
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(1.000001), ScalarResource('foo', 1.0)])))
+        self.assertFalse(resources.is_equal(NodeResources([Cpus(1.0)])))
+        self.assertFalse(resources.is_equal(NodeResources([Cpus(1.0), ScalarResource('bar', 1.0)])))
+        self.assertFalse(resources.is_equal(NodeResources([Cpus(2.0), ScalarResource('foo', 1.0)])))
+
+    def test_is_sufficient_to_meet(self):
+        """Tests that is_sufficient_to_meet() fails for missing custom resources unless requesting zero"""
+
+        resources = NodeResources([Cpus(2.0), Mem(10.0), ScalarResource('foo', 1.0)])
+
+        self.assertTrue(resources.is_sufficient_to_meet(NodeResources([Cpus(2.0), ScalarResource('foo', 1.0)])))
+        self.assertTrue(resources.is_sufficient_to_meet(NodeResources([Cpus(1.0), ScalarResource('bar', 0.0)])))
+        self.assertFalse(resources.is_sufficient_to_meet(NodeResources([Cpus(3.0)])))
+        self.assertFalse(resources.is_sufficient_to_meet(NodeResources([Gpus(1.0)])))
+        self.assertFalse(resources.is_sufficient_to_meet(NodeResources([ScalarResource('foo', 2.0)])))
+        self.assertFalse(resources.is_sufficient_to_meet(NodeResources([ScalarResource('bar', 1.0)])))
+
+    def test_limit_to(self):
+        """Tests that limit_to() lowers values and removes custom resources that the limit does not include"""
+
+        resources = NodeResources([Cpus(4.0), Mem(10.0), ScalarResource('foo', 3.0), ScalarResource('bar', 1.0)])
+        resources.limit_to(NodeResources([Cpus(2.0), Mem(20.0), ScalarResource('foo', 1.0)]))
+
+        expected = NodeResources([Cpus(2.0), Mem(10.0), ScalarResource('foo', 1.0)])
+        self.assertTrue(resources.is_equal(expected))
+
+    def test_remove_resource(self):
+        """Tests that remove_resource() zeroes standard resources and removes custom resources"""
+
+        resources = NodeResources([Cpus(4.0), Disk(10.0), ScalarResource('foo', 3.0)])
+        resources.remove_resource('disk')
+        resources.remove_resource('foo')
+        resources.remove_resource('bar')
+
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(4.0)])))
+        self.assertSetEqual({resource.name for resource in resources.resources}, {'cpus', 'mem', 'disk', 'gpus'})
+
+    def test_subtract(self):
+        """Tests that subtract() ignores custom resources that are missing"""
+
+        resources = NodeResources([Cpus(4.0), Mem(10.0), ScalarResource('foo', 3.0)])
+        resources.subtract(NodeResources([Cpus(1.0), ScalarResource('foo', 1.0), ScalarResource('bar', 1.0)]))
+
+        expected = NodeResources([Cpus(3.0), Mem(10.0), ScalarResource('foo', 2.0)])
+        self.assertTrue(resources.is_equal(expected))
+
+    def test_get_json(self):
+        """Tests that get_json() includes the standard and custom resources"""
+
+        resources = NodeResources([Cpus(1.0), ScalarResource('foo', 2.0)])
+        resources_dict = resources.get_json().get_dict()['resources']
+
+        self.assertDictEqual(resources_dict, {'cpus': 1.0, 'mem': 0.0, 'disk': 0.0, 'gpus': 0.0, 'foo': 2.0})
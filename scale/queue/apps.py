@@ -12,11 +12,12 @@ class QueueConfig(AppConfig):
     verbose_name = 'Queue'
 
     def ready(self):
-        """Registers the job load metrics processor with the clock system."""
+        """Registers the job load metrics processors with the clock system."""
         import job.clock as clock
-        from queue.job_load import JobLoadProcessor
+        from queue.job_load import JobLoadCountReconciliationProcessor, JobLoadProcessor
 
         clock.register_processor('scale-job-load', JobLoadProcessor)
+        clock.register_processor('scale-job-load-reconcile', JobLoadCountReconciliationProcessor)
 
         # Register queue message types
         from queue.messages.queued_jobs import QueuedJobs
@@ -12,25 +12,48 @@ logger = logging.getLogger(__name__)
 class QueuedJobExecution(object):
     """This class represents a queued job execution that is being considered for scheduling"""
 
-    def __init__(self, queue):
+    def __init__(self, queue, interface=None):
         """Constructor
 
         :param queue: The queue model
         :type queue: :class:`queue.models.Queue`
+        :param interface: The already parsed job interface of the queue model, possibly None to parse it here
+        :type interface: :class:`job.configuration.interface.job_interface.JobInterface` or
+                :class:`job.seed.manifest.SeedManifest`
         """
 
         self.id = queue.id
+        self.batch_id = queue.batch_id
         self.is_canceled = queue.is_canceled
         self.configuration = queue.get_execution_configuration()
-        self.interface = queue.get_job_interface()
+        self.docker_image = queue.docker_image
+        self.input_file_size = queue.input_file_size
+        self.interface = interface if interface else queue.get_job_interface()
+        self.job_type_id = queue.job_type_id
         self.priority = queue.priority
+        self.queued = queue.queued
+        self.recipe_id = queue.recipe_id
         self.required_resources = queue.get_resources()
+        self.shared_interface_id = queue.shared_interface_id
         self.scheduled_agent_id = None
 
-        self._queue = queue
+        # Only the fields needed to create the job execution model are kept, so the queue model itself is not retained
+        self._exe_num = queue.exe_num
+        self._job_id = queue.job_id
+        self._timeout = queue.timeout
         self._scheduled_node_id = None
         self._scheduled_resources = None
 
+    @property
+    def scheduled_node_id(self):
+        """The ID of the node this job execution has been scheduled on, possibly None
+
+        :returns: The scheduled node ID
+        :rtype: int
+        """
+
+        return self._scheduled_node_id
+
     def create_job_exe_model(self, framework_id, when):
         """Creates and returns a scheduled job execution model
 
@@ -43,16 +66,16 @@ class QueuedJobExecution(object):
         """
 
         job_exe = JobExecution()
-        job_exe.job_id = self._queue.job_id
-        job_exe.job_type_id = self._queue.job_type_id
-        job_exe.recipe_id = self._queue.recipe_id
-        job_exe.batch_id = self._queue.batch_id
-        job_exe.exe_num = self._queue.exe_num
-        job_exe.timeout = self._queue.timeout
-        job_exe.docker_image = self._queue.docker_image
-        job_exe.input_file_size = self._queue.input_file_size
+        job_exe.job_id = self._job_id
+        job_exe.job_type_id = self.job_type_id
+        job_exe.recipe_id = self.recipe_id
+        job_exe.batch_id = self.batch_id
+        job_exe.exe_num = self._exe_num
+        job_exe.timeout = self._timeout
+        job_exe.docker_image = self.docker_image
+        job_exe.input_file_size = self.input_file_size
         job_exe.configuration = self.configuration.get_dict()
-        job_exe.queued = self._queue.queued
+        job_exe.queued = self.queued
 
         if self.is_canceled:
             job_exe.node_id = None
@@ -63,7 +86,7 @@ class QueuedJobExecution(object):
             job_exe.resources = self._scheduled_resources.get_json().get_dict()
             job_exe.started = when
 
-        job_exe.set_cluster_id(framework_id, self._queue.job_id, self._queue.exe_num)
+        job_exe.set_cluster_id(framework_id, self._job_id, self._exe_num)
 
         if self.required_resources.gpus > 0:
             if not GPUManager.assign_gpus_for_job(job_exe.node_id,job_exe.job_id, self.required_resources.gpus):
@@ -1,5 +1,6 @@
-"""Defines the clock event processor for tracking historical job load."""
+"""Defines the clock event processors for tracking historical job load."""
 from job.clock import ClockEventProcessor
+from job.models import JobLoadCount, JobTypeStatusSummary
 from queue.models import JobLoad
 
 
@@ -12,3 +13,16 @@ class JobLoadProcessor(ClockEventProcessor):
         Calculates metrics for the job load over time.
         """
         JobLoad.objects.calculate()
+
+
+class JobLoadCountReconciliationProcessor(ClockEventProcessor):
+    """This class reconciles the job load counts and job type status summaries with the job table to correct any
+    drift."""
+
+    def process_event(self, event, last_event=None):
+        """See :meth:`job.clock.ClockEventProcessor.process_event`.
+
+        Corrects the job load counts and job type status summaries from the current job statuses.
+        """
+        JobLoadCount.objects.reconcile()
+        JobTypeStatusSummary.objects.reconcile()
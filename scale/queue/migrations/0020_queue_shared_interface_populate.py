@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import hashlib
+import json
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('queue', '0019_queueinterface'),
+    ]
+
+    def populate_queue_shared_interface(apps, schema_editor):
+        # Go through all of the queued jobs and move their interfaces into shared interface models
+        Queue = apps.get_model('queue', 'Queue')
+        QueueInterface = apps.get_model('queue', 'QueueInterface')
+
+        interface_ids = {}  # {Hash: Shared interface ID}
+        queue_count = 0
+        for queue in Queue.objects.all().only('id', 'interface').iterator():
+            interface_json = json.dumps(queue.interface, sort_keys=True, separators=(',', ':'))
+            interface_hash = hashlib.sha256(interface_json.encode('utf-8')).hexdigest()
+            if interface_hash not in interface_ids:
+                queue_interface, _ = QueueInterface.objects.get_or_create(hash=interface_hash,
+                                                                          defaults={'interface': queue.interface})
+                interface_ids[interface_hash] = queue_interface.id
+            Queue.objects.filter(id=queue.id).update(shared_interface_id=interface_ids[interface_hash])
+            queue_count += 1
+
+        print 'Updated queue models %s with %s shared interface(s).' % (str(queue_count), str(len(interface_ids)))
+
+    operations = [
+        migrations.RunPython(populate_queue_shared_interface),
+    ]
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('queue', '0020_queue_shared_interface_populate'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='queue',
+            name='interface',
+        ),
+        migrations.AlterField(
+            model_name='queue',
+            name='shared_interface',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='queue.QueueInterface'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 """Defines the database model for a queue entry"""
 from __future__ import unicode_literals
 
+import hashlib
+import json
 import logging
 
 import django.utils.timezone as timezone
@@ -14,7 +16,7 @@ from job.execution.configuration.json.exe_config import ExecutionConfiguration
 from job.data.job_data import JobData
 from job.deprecation import JobInterfaceSunset
 from job.seed.manifest import SeedManifest
-from job.models import Job, JobType
+from job.models import Job, JobLoadCount, JobType, JobTypeStatusSummary
 from job.models import JobExecution, JobTypeRevision
 from node.resources.json.resources import Resources
 from product.models import ProductFile
@@ -30,6 +32,9 @@ from util.rest import BadParameter
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of jobs to retrieve and queue at a time when queueing jobs
+QUEUE_JOBS_BATCH_SIZE = 1000
+
 QUEUE_ORDER_FIFO = 'FIFO'
 QUEUE_ORDER_LIFO = 'LIFO'
 DEFAULT_QUEUE_ORDER = QUEUE_ORDER_FIFO
@@ -59,42 +64,22 @@ class JobLoadManager(models.Manager):
 
     @transaction.atomic
     def calculate(self):
-        """Calculates and saves new job load models grouped by job type based on a current jobs snapshot."""
-
-        # Get a list of job counts grouped by type and status
-        jobs = Job.objects.filter(status__in=['PENDING', 'QUEUED', 'RUNNING'])
-        jobs = jobs.values('job_type_id', 'status')
-        jobs = jobs.annotate(count=models.Count('job_type'))
+        """Calculates and saves new job load models grouped by job type based on a snapshot of the job load counts."""
 
         # Create a new load model per job type
-        job_loads = {}
+        job_loads = []
         measured = timezone.now()
-        for job in jobs.iterator():
-            job_type_id = job['job_type_id']
-            if job_type_id not in job_loads:
-                job_load = JobLoad(job_type_id=job_type_id, measured=measured)
-                job_load.pending_count = 0
-                job_load.queued_count = 0
-                job_load.running_count = 0
-                job_load.total_count = 0
-                job_loads[job_type_id] = job_load
-            job_load = job_loads[job_type_id]
-
-            status = job['status']
-            count = job['count']
-            if status == 'PENDING':
-                job_load.pending_count += count
-            elif status == 'QUEUED':
-                job_load.queued_count += count
-            elif status == 'RUNNING':
-                job_load.running_count += count
-            else:
-                logger.error('Unexpected job discovered with status: %s', status)
-            job_load.total_count += count
+        for job_type_id, counts in JobLoadCount.objects.get_counts().items():
+            job_load = JobLoad(job_type_id=job_type_id, measured=measured)
+            job_load.pending_count = counts.get('PENDING', 0)
+            job_load.queued_count = counts.get('QUEUED', 0)
+            job_load.running_count = counts.get('RUNNING', 0)
+            job_load.total_count = job_load.pending_count + job_load.queued_count + job_load.running_count
+            job_loads.append(job_load)
 
         if job_loads:
             # Save all the database models
-            JobLoad.objects.bulk_create(job_loads.values())
+            JobLoad.objects.bulk_create(job_loads)
         else:
             # Save an empty record as a place holder
             JobLoad(measured=measured, pending_count=0, queued_count=0, running_count=0, total_count=0).save()
@@ -298,61 +283,89 @@ class QueueManager(models.Manager):
         if not queued_job_ids:
             return queued_job_ids  # Done if nothing was queued
 
-        # Retrieve the related job_type, job_type_rev, and batch models for the queued jobs
-        queued_jobs = Job.objects.get_jobs_with_related(queued_job_ids)
-
-        # Query for all input files of the queued jobs
-        input_files = {}
-        input_file_ids = set()
-        for job in queued_jobs:
-            input_file_ids.update(job.get_job_data().get_input_file_ids())
-        if input_file_ids:
-            for input_file in ScaleFile.objects.get_files_for_queued_jobs(input_file_ids):
-                input_files[input_file.id] = input_file
-
-        # Bulk create queue models
-        queues = []
-        job_ids = []
+        # Queue the jobs in chunks so that only one chunk of job and queue models is held in memory at a time. Anything
+        # that only depends on the job type, job type revision or batch is calculated once and reused for every job.
+        batch_priorities = {}  # {Batch ID: Priority from the batch configuration}
+        interface_ids = {}  # {Job type revision ID: Shared interface ID}
+        job_types = {}  # {Job type ID: (Timeout from the Seed manifest or None, resources, interface, configuration)}
+        input_files = {}  # Input files for the current chunk, which the configurator also uses
         configurator = QueuedExecutionConfigurator(input_files)
-        for job in queued_jobs:
-            job_ids.append(job.id)
-            config = configurator.configure_queued_job(job)
-
-            manifest = None
-            if JobInterfaceSunset.is_seed_dict(job.job_type.manifest):
-                manifest = SeedManifest(job.job_type.manifest)
-
-            if priority:
-                queued_priority = priority
-            elif job.priority:
-                queued_priority = job.priority
-            elif job.batch and self.batch.get_configuration().priority:
-                queued_priority = self.batch.get_configuration().priority
-            else:
-                queued_priority = job.get_job_configuration().priority
-
-            queue = Queue()
-            # select_related from get_jobs_with_related above will only make a single query
-            queue.docker_image = job.job_type_rev.docker_image
-            queue.job_type_id = job.job_type_id
-            queue.job_id = job.id
-            queue.recipe_id = job.recipe_id
-            queue.batch_id = job.batch_id
-            queue.exe_num = job.num_exes
-            queue.input_file_size = job.input_file_size if job.input_file_size else 0.0
-            queue.is_canceled = False
-            queue.priority = queued_priority
-            queue.timeout = manifest.get_timeout() if manifest else job.timeout
-            queue.interface = job.get_job_interface().get_dict()
-            queue.configuration = config.get_dict()
-            queue.resources = job.get_resources().get_json().get_dict()
-            queue.queued = when_queued
-            queues.append(queue)
-
-        self.cancel_queued_jobs(job_ids)
-
-        if queues:
-            self.bulk_create(queues)
+        for i in range(0, len(queued_job_ids), QUEUE_JOBS_BATCH_SIZE):
+            job_ids = queued_job_ids[i:i + QUEUE_JOBS_BATCH_SIZE]
+
+            # Retrieve the related job_type, job_type_rev, and batch models for the queued jobs
+            queued_jobs = list(Job.objects.get_jobs_with_related(job_ids))
+
+            # Query for all input files of the queued jobs
+            input_files.clear()
+            input_file_ids = set()
+            for job in queued_jobs:
+                input_file_ids.update(job.get_job_data().get_input_file_ids())
+            if input_file_ids:
+                for input_file in ScaleFile.objects.get_files_for_queued_jobs(input_file_ids):
+                    input_files[input_file.id] = input_file
+
+            # Queue models reference a shared interface instead of each storing a copy of it
+            interfaces = {}  # {Job type revision ID: Interface dict}
+            for job in queued_jobs:
+                if job.job_type_rev_id not in interface_ids and job.job_type_rev_id not in interfaces:
+                    interfaces[job.job_type_rev_id] = job.get_job_interface().get_dict()
+            if interfaces:
+                rev_ids = list(interfaces.keys())
+                new_interface_ids = QueueInterface.objects.get_interface_ids([interfaces[rev_id] for rev_id in rev_ids])
+                interface_ids.update(zip(rev_ids, new_interface_ids))
+
+            # Bulk create queue models
+            queues = []
+            for job in queued_jobs:
+                config = configurator.configure_queued_job(job)
+
+                if job.job_type_id not in job_types:
+                    timeout = None
+                    if JobInterfaceSunset.is_seed_dict(job.job_type.manifest):
+                        timeout = SeedManifest(job.job_type.manifest).get_timeout()
+                    job_types[job.job_type_id] = (timeout, job.job_type.get_resources(),
+                                                  job.job_type.get_job_interface(),
+                                                  job.job_type.get_job_configuration())
+                timeout, job_type_resources, job_type_interface, job_type_config = job_types[job.job_type_id]
+
+                if job.batch_id and job.batch_id not in batch_priorities:
+                    batch_priorities[job.batch_id] = job.batch.get_configuration().priority
+
+                if priority:
+                    queued_priority = priority
+                elif job.priority:
+                    queued_priority = job.priority
+                elif job.batch_id and batch_priorities[job.batch_id]:
+                    queued_priority = batch_priorities[job.batch_id]
+                elif job.configuration:
+                    queued_priority = job.get_job_configuration().priority
+                else:
+                    queued_priority = job_type_config.priority
+
+                queue = Queue()
+                # select_related from get_jobs_with_related above will only make a single query
+                queue.docker_image = job.job_type_rev.docker_image
+                queue.job_type_id = job.job_type_id
+                queue.job_id = job.id
+                queue.recipe_id = job.recipe_id
+                queue.batch_id = job.batch_id
+                queue.exe_num = job.num_exes
+                queue.input_file_size = job.input_file_size if job.input_file_size else 0.0
+                queue.is_canceled = False
+                queue.priority = queued_priority
+                queue.timeout = timeout if timeout is not None else job.timeout
+                queue.shared_interface_id = interface_ids[job.job_type_rev_id]
+                queue.configuration = config.get_dict()
+                resources = job.get_resources(job_type_resources, job_type_interface)
+                queue.resources = resources.get_json().get_dict()
+                queue.queued = when_queued
+                queues.append(queue)
+
+            self.cancel_queued_jobs(job_ids)
+
+            if queues:
+                self.bulk_create(queues)
 
         return queued_job_ids
 
@@ -397,6 +410,8 @@ class QueueManager(models.Manager):
 
         job = Job.objects.create_job_old(job_type, event.id)
         job.save()
+        JobLoadCount.objects.add_new_jobs([job])
+        JobTypeStatusSummary.objects.add_new_jobs([job])
 
         # No lock needed for this job since it doesn't exist outside this transaction yet
         Job.objects.populate_job_data_v5(job, data)
@@ -428,6 +443,8 @@ class QueueManager(models.Manager):
             with transaction.atomic():
                 job = Job.objects.create_job_v6(job_type_rev, event_id=event.id, input_data=data, job_config=job_configuration)
                 job.save()
+                JobLoadCount.objects.add_new_jobs([job])
+                JobTypeStatusSummary.objects.add_new_jobs([job])
                 CommandMessageManager().send_messages(create_process_job_input_messages([job.pk]))
         except InvalidData as ex:
             raise BadParameter(unicode(ex))
@@ -662,8 +679,8 @@ class Queue(models.Model):
     :keyword timeout: The maximum amount of time to allow this execution to run before being killed (in seconds)
     :type timeout: :class:`django.db.models.IntegerField`
 
-    :keyword interface: JSON description describing the job's interface
-    :type interface: :class:`django.contrib.postgres.fields.JSONField`
+    :keyword shared_interface: The job's interface, which is shared by all queue models with the same interface
+    :type shared_interface: :class:`django.db.models.ForeignKey`
     :keyword configuration: JSON description describing the execution configuration for how the job should be run
     :type configuration: :class:`django.contrib.postgres.fields.JSONField`
     :keyword resources: JSON description describing the resources required for this job
@@ -688,7 +705,7 @@ class Queue(models.Model):
     priority = models.IntegerField(db_index=True)
     timeout = models.IntegerField()
 
-    interface = django.contrib.postgres.fields.JSONField(default=dict)
+    shared_interface = models.ForeignKey('queue.QueueInterface', on_delete=models.PROTECT)
     configuration = django.contrib.postgres.fields.JSONField(default=dict)
     resources = django.contrib.postgres.fields.JSONField(default=dict)
 
@@ -715,7 +732,7 @@ class Queue(models.Model):
         :rtype: :class:`job.configuration.interface.job_interface.JobInterface`
         """
 
-        return JobInterfaceSunset.create(self.interface, do_validate=False)
+        return self.shared_interface.get_job_interface()
 
     def get_resources(self):
         """Returns the resources required by this queued job
@@ -729,3 +746,73 @@ class Queue(models.Model):
     class Meta(object):
         """meta information for the db"""
         db_table = 'queue'
+
+
+class QueueInterfaceManager(models.Manager):
+    """Provides additional methods for handling shared queue interfaces
+    """
+
+    def get_interface_ids(self, interfaces):
+        """Returns the IDs of the shared interface models for the given interface dicts, creating the models that do
+        not exist yet
+
+        :param interfaces: The list of interface dicts
+        :type interfaces: list
+        :returns: The list of shared interface IDs in the same order as the given interfaces
+        :rtype: list
+        """
+
+        hashes = [QueueInterface.calculate_hash(interface) for interface in interfaces]
+        interface_ids = dict(self.filter(hash__in=set(hashes)).values_list('hash', 'id'))
+        for interface_hash, interface in zip(hashes, interfaces):
+            if interface_hash not in interface_ids:
+                # Another process may be creating the same interface, so get_or_create() handles that race
+                queue_interface, _ = self.get_or_create(hash=interface_hash, defaults={'interface': interface})
+                interface_ids[interface_hash] = queue_interface.id
+        return [interface_ids[interface_hash] for interface_hash in hashes]
+
+
+class QueueInterface(models.Model):
+    """Represents a job interface that is shared by the queue models of jobs with the same interface. Interfaces are
+    content-addressed by the hash of their JSON, so each distinct interface is only stored once.
+
+    :keyword hash: The SHA-256 hash of the interface JSON
+    :type hash: :class:`django.db.models.CharField`
+    :keyword interface: JSON description describing the job's interface
+    :type interface: :class:`django.contrib.postgres.fields.JSONField`
+    :keyword created: When the shared interface model was created
+    :type created: :class:`django.db.models.DateTimeField`
+    """
+
+    hash = models.CharField(max_length=64, unique=True)
+    interface = django.contrib.postgres.fields.JSONField(default=dict)
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = QueueInterfaceManager()
+
+    @staticmethod
+    def calculate_hash(interface):
+        """Returns the hash of the given interface dict
+
+        :param interface: The interface dict
+        :type interface: dict
+        :returns: The SHA-256 hash as a hex string
+        :rtype: string
+        """
+
+        interface_json = json.dumps(interface, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(interface_json.encode('utf-8')).hexdigest()
+
+    def get_job_interface(self):
+        """Returns the parsed job interface
+
+        :returns: The job interface
+        :rtype: :class:`job.configuration.interface.job_interface.JobInterface` or
+                :class:`job.seed.manifest.SeedManifest`
+        """
+
+        return JobInterfaceSunset.create(self.interface, do_validate=False)
+
+    class Meta(object):
+        """meta information for the db"""
+        db_table = 'queue_interface'
@@ -4,8 +4,9 @@ import django
 from django.test import TestCase
 
 import job.test.utils as job_test_utils
+from job.models import Job, JobLoadCount, JobTypeStatusSummary
 from queue.models import JobLoad
-from queue.job_load import JobLoadProcessor
+from queue.job_load import JobLoadCountReconciliationProcessor, JobLoadProcessor
 
 
 class TestJobLoadProcessor(TestCase):
@@ -24,3 +25,24 @@ class TestJobLoadProcessor(TestCase):
 
         job_loads = JobLoad.objects.values()
         self.assertEqual(job_loads.count(), 1)
+
+
+class TestJobLoadCountReconciliationProcessor(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.processor = JobLoadCountReconciliationProcessor()
+
+        self.job = job_test_utils.create_job(status='QUEUED')
+
+    def test_process_event(self):
+        """Tests that the processor corrects drifted job load counts and job type status summaries"""
+        Job.objects.filter(id=self.job.id).update(status='RUNNING')
+
+        event = job_test_utils.create_clock_event()
+        self.processor.process_event(event)
+
+        self.assertDictEqual(JobLoadCount.objects.get_counts(), {self.job.job_type_id: {'RUNNING': 1}})
+        summaries = JobTypeStatusSummary.objects.get_summaries().values_list('status', 'count')
+        self.assertListEqual(list(summaries), [('RUNNING', 1)])
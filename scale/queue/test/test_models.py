@@ -23,8 +23,8 @@ from job.configuration.data.job_data import JobData
 
 from job.data.job_data import JobData as JobDataV6
 from job.configuration.results.job_results import JobResults
-from job.models import Job
-from queue.models import JobLoad, Queue, QUEUE_ORDER_FIFO, QUEUE_ORDER_LIFO
+from job.models import Job, JobType
+from queue.models import JobLoad, Queue, QueueInterface, QUEUE_ORDER_FIFO, QUEUE_ORDER_LIFO
 from recipe.configuration.data.recipe_data import LegacyRecipeData
 from recipe.configuration.definition.recipe_definition import LegacyRecipeDefinition as RecipeDefinition
 from recipe.models import Recipe, RecipeNode
@@ -149,6 +149,61 @@ class TestQueueManager(TransactionTestCase):
             else:
                 self.assertEqual(queue.id, queue_1.id)
 
+    def test_queue_jobs_shared_interface(self):
+        """Tests that QueueManager.queue_jobs() stores a single shared interface for jobs with the same interface"""
+
+        job_type = job_test_utils.create_job_type()
+        job_1 = job_test_utils.create_job(job_type=job_type, input=JobData().get_dict(), num_exes=0, status='PENDING')
+        job_2 = job_test_utils.create_job(job_type=job_type, input=JobData().get_dict(), num_exes=0, status='PENDING')
+
+        Queue.objects.queue_jobs([job_1, job_2])
+
+        queue_1 = Queue.objects.get(job_id=job_1.id)
+        queue_2 = Queue.objects.get(job_id=job_2.id)
+        self.assertEqual(queue_1.shared_interface_id, queue_2.shared_interface_id)
+        self.assertEqual(QueueInterface.objects.count(), 1)
+        self.assertDictEqual(queue_1.get_job_interface().get_dict(), job_1.get_job_interface().get_dict())
+
+    @patch('queue.models.QUEUE_JOBS_BATCH_SIZE', 2)
+    def test_queue_jobs_in_chunks(self):
+        """Tests that QueueManager.queue_jobs() queues jobs in chunks and calculates job type values only once"""
+
+        job_type = job_test_utils.create_job_type()
+        jobs = [job_test_utils.create_job(job_type=job_type, input=JobData().get_dict(), num_exes=0, status='PENDING',
+                                          priority=None) for _ in range(3)]
+
+        get_resources = JobType.get_resources
+        with patch.object(JobType, 'get_resources', autospec=True, side_effect=get_resources) as mock_get_resources:
+            queued_job_ids = Queue.objects.queue_jobs(jobs)
+
+        self.assertSetEqual(set(queued_job_ids), {job.id for job in jobs})
+        self.assertEqual(mock_get_resources.call_count, 1)
+        timeouts = {job.id: job.timeout for job in jobs}
+        for queue in Queue.objects.filter(job_id__in=queued_job_ids):
+            self.assertEqual(queue.priority, job_type.get_job_configuration().priority)
+            self.assertEqual(queue.timeout, timeouts[queue.job_id])
+
+
+class TestQueueInterfaceManager(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_get_interface_ids(self):
+        """Tests calling QueueInterfaceManager.get_interface_ids() with new and existing interfaces"""
+
+        interface_1 = {'version': '1.0', 'command': 'test', 'command_arguments': ''}
+        interface_2 = {'version': '1.0', 'command': 'other', 'command_arguments': ''}
+
+        interface_ids = QueueInterface.objects.get_interface_ids([interface_1, interface_2, interface_1])
+        self.assertEqual(interface_ids[0], interface_ids[2])
+        self.assertNotEqual(interface_ids[0], interface_ids[1])
+
+        # Key order does not change the hash, so the existing model is reused
+        reordered = dict(reversed(list(interface_1.items())))
+        self.assertListEqual(QueueInterface.objects.get_interface_ids([reordered]), [interface_ids[0]])
+        self.assertEqual(QueueInterface.objects.count(), 2)
+
 
 class TestQueueManagerHandleJobCancellation(TransactionTestCase):
 
@@ -3,7 +3,7 @@ import django.utils.timezone as timezone
 
 import job.test.utils as job_test_utils
 from job.execution.configuration.json.exe_config import ExecutionConfiguration
-from queue.models import JobLoad, Queue
+from queue.models import JobLoad, Queue, QueueInterface
 from node.resources.node_resources import NodeResources
 from node.resources.resource import Cpus, Disk, Mem, Gpus
 
@@ -58,8 +58,9 @@ def create_queue(job_type=None, priority=1, timeout=3600, resources=None, cpus_r
     if not resources:
         resources = NodeResources([Cpus(cpus_required), Mem(mem_required), Disk(disk_total_required), Gpus(gpus_required)])
 
+    shared_interface_id = QueueInterface.objects.get_interface_ids([job.get_job_interface().get_dict()])[0]
     return Queue.objects.create(job_type=job.job_type, job=job, exe_num=job.num_exes, priority=priority,
                                 timeout=timeout, input_file_size=disk_in_required,
-                                interface=job.get_job_interface().get_dict(),
+                                shared_interface_id=shared_interface_id,
                                 configuration=ExecutionConfiguration().get_dict(),
                                 resources=resources.get_json().get_dict(), queued=queued)
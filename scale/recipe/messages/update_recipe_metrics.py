@@ -95,6 +95,20 @@ class UpdateRecipeMetrics(CommandMessage):
 
         return len(self._recipe_ids) < MAX_NUM
 
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        new_recipe_ids = set(message._recipe_ids) - set(self._recipe_ids)
+        if len(self._recipe_ids) + len(new_recipe_ids) > MAX_NUM:
+            return False
+
+        for recipe_id in message._recipe_ids:
+            if recipe_id in new_recipe_ids:
+                self.add_recipe(recipe_id)
+                new_recipe_ids.remove(recipe_id)
+        return True
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
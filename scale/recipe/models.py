@@ -15,7 +15,7 @@ from data.data.json.data_v1 import convert_data_to_v1_json
 from data.data.json.data_v6 import convert_data_to_v6_json, DataV6
 from data.interface.interface import Interface
 from data.interface.parameter import FileParameter
-from job.models import Job, JobType
+from job.models import Job, JobLoadCount, JobType, JobTypeStatusSummary
 from messaging.manager import CommandMessageManager
 from recipe.configuration.definition.recipe_definition import LegacyRecipeDefinition
 from recipe.configuration.json.recipe_config_v6 import convert_config_to_v6_json
@@ -355,6 +355,8 @@ class RecipeManager(models.Manager):
             if priority is not None:
                 job.priority = priority
             job.save()
+            JobLoadCount.objects.add_new_jobs([job])
+            JobTypeStatusSummary.objects.add_new_jobs([job])
             recipe_job = RecipeNode()
             recipe_job.job = job
             recipe_job.node_name = job_name
@@ -8,7 +8,7 @@ from job.models import Job
 from job.test import utils as job_test_utils
 from recipe.diff.forced_nodes import ForcedNodes
 from recipe.diff.json.forced_nodes_v6 import convert_forced_nodes_to_v6
-from recipe.messages.update_recipe_metrics import UpdateRecipeMetrics
+from recipe.messages.update_recipe_metrics import MAX_NUM, UpdateRecipeMetrics
 from recipe.models import Recipe, RecipeNode
 from recipe.test import utils as recipe_test_utils
 
@@ -55,6 +55,25 @@ class TestUpdateRecipes(TestCase):
         self.assertEqual(recipe.jobs_completed, 1)
         self.assertEqual(recipe.jobs_canceled, 1)
 
+    def test_merge(self):
+        """Tests merging UpdateRecipeMetrics messages"""
+
+        message_1 = UpdateRecipeMetrics()
+        message_1.add_recipe(1)
+        message_1.add_recipe(2)
+        message_2 = UpdateRecipeMetrics()
+        message_2.add_recipe(2)
+        message_2.add_recipe(3)
+        message_2.add_recipe(3)
+
+        self.assertTrue(message_1.merge(message_2))
+        self.assertListEqual(message_1.to_json()['recipe_ids'], [1, 2, 3])
+
+        # Merging must not exceed the maximum message size
+        message_3 = UpdateRecipeMetrics.from_json({'recipe_ids': range(100, 100 + MAX_NUM)})
+        self.assertFalse(message_1.merge(message_3))
+        self.assertListEqual(message_1.to_json()['recipe_ids'], [1, 2, 3])
+
     def test_execute(self):
         """Tests calling UpdateRecipeMetrics.execute() successfully"""
 
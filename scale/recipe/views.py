@@ -558,6 +558,7 @@ class RecipeTypesValidationView(APIView):
 class RecipesView(ListAPIView):
     """This view is the endpoint for retrieving the list of all recipes"""
     queryset = Recipe.objects.all()
+    pagination_class = rest_util.KeysetPagination
 
     def get_serializer_class(self):
         """Returns the appropriate serializer based off the requests version of the REST API. """
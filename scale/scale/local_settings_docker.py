@@ -44,6 +44,11 @@ if ELASTICSEARCH_URLS:
 # Broker URL for connection to messaging backend. Bootstrap must populate.
 BROKER_URL = os.environ.get('SCALE_BROKER_URL', BROKER_URL)
 QUEUE_NAME = os.environ.get('SCALE_QUEUE_NAME', QUEUE_NAME)
+MESSAGE_HANDLER_WORKERS = int(os.environ.get('SCALE_MESSAGE_HANDLER_WORKERS', MESSAGE_HANDLER_WORKERS))
+MESSAGE_HANDLER_PREFETCH = int(os.environ.get('SCALE_MESSAGE_HANDLER_PREFETCH', MESSAGE_HANDLER_PREFETCH))
+MESSAGE_SERIALIZER = os.environ.get('SCALE_MESSAGE_SERIALIZER', MESSAGE_SERIALIZER)
+if os.environ.get('SCALE_MESSAGE_QUEUE_ROUTING', 'false').lower() in ('yes', 'true', 't', '1'):
+    MESSAGE_QUEUE_ROUTES = DEFAULT_MESSAGE_QUEUE_ROUTES
 
 # Mesos connection information. Default for -m
 # This can be something like "127.0.0.1:5050"
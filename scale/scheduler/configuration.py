@@ -2,6 +2,7 @@
 from __future__ import unicode_literals
 
 from queue.models import DEFAULT_QUEUE_ORDER
+from scheduler.models import FAIR_SHARE_NONE, SCHEDULING_MODE_GREEDY
 
 
 DEFAULT_NUM_MESSAGE_HANDLERS = 0
@@ -17,13 +18,21 @@ class SchedulerConfiguration(object):
         :type scheduler: :class:`scheduler.models.Scheduler`
         """
 
+        self.fair_share_mode = FAIR_SHARE_NONE
+        self.fair_share_weights = {}
         self.is_paused = True
         self.num_message_handlers = DEFAULT_NUM_MESSAGE_HANDLERS
+        self.max_message_handlers = None
         self.queue_mode = DEFAULT_QUEUE_ORDER
+        self.scheduling_mode = SCHEDULING_MODE_GREEDY
         self.system_logging_level = DEFAULT_LOGGING_LEVEL
 
         if scheduler:
+            self.fair_share_mode = scheduler.fair_share_mode
+            self.fair_share_weights = scheduler.fair_share_weights
             self.is_paused = scheduler.is_paused
             self.num_message_handlers = scheduler.num_message_handlers
+            self.max_message_handlers = scheduler.max_message_handlers
             self.queue_mode = scheduler.queue_mode
+            self.scheduling_mode = scheduler.scheduling_mode
             self.system_logging_level = scheduler.system_logging_level
@@ -0,0 +1,199 @@
+"""Defines the class that manages the Mesos calls that launch tasks and decline offers"""
+from __future__ import unicode_literals
+
+import datetime
+import logging
+import threading
+from collections import OrderedDict
+
+from django.utils.timezone import now
+
+
+CALL_WARN_THRESHOLD = datetime.timedelta(milliseconds=500)
+
+logger = logging.getLogger(__name__)
+
+
+class AgentLaunch(object):
+    """This class represents the pending launch of Mesos tasks on a single agent. Launches that are added for the same
+    agent before they are performed are combined into a single call. This class is NOT thread-safe and should be
+    protected by the launch manager's lock.
+    """
+
+    def __init__(self, client, agent_id, hostname):
+        """Constructor
+
+        :param client: The Mesos scheduler client
+        :type client: :class:`mesoshttp.client.MesosClient`
+        :param agent_id: The agent ID
+        :type agent_id: string
+        :param hostname: The agent's hostname
+        :type hostname: string
+        """
+
+        self.agent_id = agent_id
+        self.callbacks = []
+        self.client = client
+        self.hostname = hostname
+        self.mesos_offers = []
+        self.mesos_tasks = []
+
+    def add(self, mesos_offers, mesos_tasks, callback=None):
+        """Adds the given offers and tasks to this launch
+
+        :param mesos_offers: The Mesos offers to accept
+        :type mesos_offers: list
+        :param mesos_tasks: The Mesos tasks to launch
+        :type mesos_tasks: list
+        :param callback: The optional callback to invoke with the error (None on success) once the launch is performed
+        :type callback: function
+        """
+
+        self.mesos_offers.extend(mesos_offers)
+        self.mesos_tasks.extend(mesos_tasks)
+        if callback:
+            self.callbacks.append(callback)
+
+
+class LaunchManager(object):
+    """This class manages the Mesos calls that launch tasks and decline offers. The scheduling thread adds the calls and
+    returns right away, while the launch thread performs them, so that the round-trips to the Mesos master overlap with
+    the next scheduling cycle. This class is thread-safe.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._declines = []  # List of Mesos offers to decline
+        self._launches = OrderedDict()  # {(Client, Agent ID): Agent launch}
+        self._lock = threading.Lock()
+        self._wake_callback = None
+
+    def add_declines(self, mesos_offers):
+        """Adds Mesos offers that need to be declined
+
+        :param mesos_offers: The Mesos offers to decline
+        :type mesos_offers: list
+        """
+
+        if not mesos_offers:
+            return
+
+        with self._lock:
+            self._declines.extend(mesos_offers)
+        self._wake()
+
+    def add_launch(self, client, agent_id, hostname, mesos_offers, mesos_tasks, callback=None):
+        """Adds a launch of Mesos tasks on the given agent, combining it with any launch for the agent that has not
+        been performed yet
+
+        :param client: The Mesos scheduler client
+        :type client: :class:`mesoshttp.client.MesosClient`
+        :param agent_id: The agent ID
+        :type agent_id: string
+        :param hostname: The agent's hostname
+        :type hostname: string
+        :param mesos_offers: The Mesos offers to accept
+        :type mesos_offers: list
+        :param mesos_tasks: The Mesos tasks to launch
+        :type mesos_tasks: list
+        :param callback: The optional callback to invoke with the error (None on success) once the launch is performed
+        :type callback: function
+        """
+
+        key = (client, agent_id)
+        with self._lock:
+            if key in self._launches:
+                launch = self._launches[key]
+            else:
+                launch = AgentLaunch(client, agent_id, hostname)
+                self._launches[key] = launch
+            launch.add(mesos_offers, mesos_tasks, callback)
+        self._wake()
+
+    def clear(self):
+        """Clears all of the pending calls. This method is intended for testing only.
+        """
+
+        with self._lock:
+            self._declines = []
+            self._launches = OrderedDict()
+
+    def get_pending_counts(self):
+        """Returns the number of agents with pending launches and the number of pending offer declines
+
+        :returns: The number of pending launches and the number of pending declines
+        :rtype: tuple
+        """
+
+        with self._lock:
+            return len(self._launches), len(self._declines)
+
+    def perform_calls(self):
+        """Performs all of the pending launch and decline calls with the Mesos master, invoking the launch callbacks as
+        each launch completes
+
+        :returns: The number of launch calls and the number of declined offers
+        :rtype: tuple
+        """
+
+        with self._lock:
+            declines = self._declines
+            launches = self._launches.values()
+            self._declines = []
+            self._launches = OrderedDict()
+
+        if not launches and not declines:
+            return 0, 0
+
+        started = now()
+
+        for launch in launches:
+            error = None
+            try:
+                launch.client.combine_offers(launch.mesos_offers, launch.mesos_tasks)
+            except Exception as ex:
+                logger.exception('Error occurred while launching tasks on node %s', launch.hostname)
+                error = ex
+            for callback in launch.callbacks:
+                try:
+                    callback(error)
+                except Exception:
+                    logger.exception('Error occurred in the launch callback for node %s', launch.hostname)
+
+        for mesos_offer in declines:
+            try:
+                mesos_offer.decline()
+            except Exception:
+                logger.exception('Error occurred while declining offer')
+
+        duration = now() - started
+        msg = 'Launching tasks on %d node(s) and declining %d offer(s) took %.3f seconds'
+        if duration > CALL_WARN_THRESHOLD:
+            logger.warning(msg, len(launches), len(declines), duration.total_seconds())
+        else:
+            logger.debug(msg, len(launches), len(declines), duration.total_seconds())
+
+        return len(launches), len(declines)
+
+    def set_wake_callback(self, callback):
+        """Sets the callback to invoke whenever calls are added, so that the launch thread can perform them right away
+
+        :param callback: The wake callback, possibly None
+        :type callback: function
+        """
+
+        with self._lock:
+            self._wake_callback = callback
+
+    def _wake(self):
+        """Invokes the wake callback, if there is one
+        """
+
+        callback = self._wake_callback
+        if callback:
+            callback()
+
+
+launch_mgr = LaunchManager()
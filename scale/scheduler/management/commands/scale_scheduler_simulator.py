@@ -0,0 +1,405 @@
+"""Defines the command for benchmarking the scheduling manager against a simulated cluster"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import now
+
+from job.execution.manager import job_exe_mgr
+from node.resources.node_resources import NodeResources
+from node.resources.resource import Cpus, Disk, Mem, ScalarResource
+from scheduler.cleanup.manager import cleanup_mgr
+from scheduler.launch.manager import launch_mgr
+from scheduler.manager import scheduler_mgr
+from scheduler.models import Scheduler
+from scheduler.node.agent import Agent
+from scheduler.node.manager import node_mgr
+from scheduler.resources.manager import resource_mgr
+from scheduler.resources.offer import ResourceOffer
+from scheduler.scheduling.manager import SchedulingManager
+from scheduler.scheduling.profiler import scheduling_profiler
+from scheduler.sync.job_type_manager import job_type_mgr
+from scheduler.sync.workspace_manager import workspace_mgr
+from scheduler.tasks.manager import system_task_mgr
+from util.database import separate_test_database
+
+logger = logging.getLogger(__name__)
+
+# Framework ID used for the simulated offers and tasks
+FRAMEWORK_ID = 'scale-scheduler-simulator'
+
+# Node sizes are drawn from these multiples of the base node resources, so that the cluster is not uniform
+NODE_SIZE_MULTIPLIERS = [0.5, 1.0, 1.0, 2.0]
+
+# Job type resource requirements are drawn from these values
+JOB_CPUS = [0.5, 1.0, 2.0, 4.0, 8.0]
+JOB_MEM = [256.0, 1024.0, 2048.0, 4096.0, 16384.0]
+JOB_DISK = [128.0, 1024.0, 4096.0]
+
+# Queued job priorities are drawn from these values
+JOB_PRIORITIES = [50, 100, 100, 100, 200]
+
+# Maximum number of models to create in a single query
+BULK_CREATE_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """Command for benchmarking the scheduling manager against a simulated cluster
+    """
+
+    help = 'Benchmarks the scheduler by running scheduling cycles against synthetic nodes, resource offers, job ' \
+           'types and queued jobs, with a stub Mesos client that accepts every launched task. Launched tasks keep ' \
+           'their resources until the simulation ends. The simulation runs against a separate test database ' \
+           '(test_<NAME>, created from the migrations and destroyed afterwards unless --keepdb is given), so it never ' \
+           'touches or locks the configured database or interferes with a running scheduler.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--nodes', action='store', type=int, default=100,
+                            help='Number of simulated nodes.')
+        parser.add_argument('-t', '--job-types', action='store', type=int, default=10,
+                            help='Number of simulated job types.')
+        parser.add_argument('-q', '--queued', action='store', type=int, default=1000,
+                            help='Number of queued jobs.')
+        parser.add_argument('-c', '--cycles', action='store', type=int, default=10,
+                            help='Number of scheduling cycles to run.')
+        parser.add_argument('--node-cpus', action='store', type=float, default=32.0,
+                            help='Number of CPUs on a standard size node.')
+        parser.add_argument('--node-mem', action='store', type=float, default=131072.0,
+                            help='Memory in MiB on a standard size node.')
+        parser.add_argument('--node-disk', action='store', type=float, default=1048576.0,
+                            help='Disk space in MiB on a standard size node.')
+        parser.add_argument('-m', '--mode', action='store', choices=[mode for mode, _ in Scheduler.SCHEDULING_MODES],
+                            default=None,
+                            help='Scheduling mode to use, defaults to the configured mode.')
+        parser.add_argument('-s', '--seed', action='store', type=int, default=0,
+                            help='Seed for generating the synthetic cluster and queue.')
+        parser.add_argument('-k', '--keepdb', action='store_true', dest='keepdb', default=False,
+                            help='Reuse and keep the test database between runs.')
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive', default=True,
+                            help='Replace an existing test database without asking.')
+
+    def handle(self, *args, **options):
+        """See :meth:`django.core.management.base.BaseCommand.handle`.
+
+        This method starts the command.
+        """
+
+        num_nodes = options.get('nodes')
+        num_job_types = options.get('job_types')
+        num_queued = options.get('queued')
+        num_cycles = options.get('cycles')
+        if min(num_nodes, num_job_types, num_queued, num_cycles) < 1:
+            raise CommandError('The number of nodes, job types, queued jobs and cycles must all be positive')
+        node_resources = NodeResources([Cpus(options.get('node_cpus')), Mem(options.get('node_mem')),
+                                        Disk(options.get('node_disk'))])
+        rand = random.Random(options.get('seed'))
+
+        logger.info('Command starting: scale_scheduler_simulator - %i node(s), %i queued job(s)', num_nodes, num_queued)
+
+        test_database = separate_test_database(options.get('keepdb'), options.get('interactive'),
+                                               options.get('verbosity'))
+        with test_database, transaction.atomic():
+            self._initialize_scheduler(options.get('mode'))
+
+            logger.info('Creating simulated cluster and queue...')
+            client = SimulatedMesosClient(self._create_nodes(num_nodes, node_resources, rand))
+            self._create_queue(num_job_types, num_queued, rand)
+            job_type_mgr.sync_with_database()
+            workspace_mgr.sync_with_database()
+
+            results = SimulationResults(client.get_total_resources())
+            scheduling_profiler.clear()
+            scheduling_manager = SchedulingManager()
+            for _ in range(num_cycles):
+                resource_mgr.add_new_offers(client.create_offers(now()))
+                started = time.time()
+                scheduling_manager.perform_scheduling(client, now())
+                seconds = time.time() - started
+                # The launch thread is not running, so perform the cycle's Mesos calls before the next cycle's offers
+                launch_mgr.perform_calls()
+                results.add_cycle(seconds, scheduling_profiler.get_traces_json()[0], client.get_used_resources())
+
+            self._clear_managers()
+            transaction.set_rollback(True)
+
+        self.stdout.write(results.get_report())
+
+        logger.info('Command completed: scale_scheduler_simulator')
+
+    @staticmethod
+    def _clear_managers():
+        """Clears the simulated data from the scheduler's managers, since the models behind it are rolled back
+        """
+
+        job_exe_mgr.clear()
+        launch_mgr.clear()
+        node_mgr.clear()
+        resource_mgr.clear()
+        scheduling_profiler.clear()
+
+    @staticmethod
+    def _create_nodes(num_nodes, node_resources, rand):
+        """Registers the simulated nodes and makes them ready for new job executions
+
+        :param num_nodes: The number of nodes
+        :type num_nodes: int
+        :param node_resources: The resources on a standard size node
+        :type node_resources: :class:`node.resources.node_resources.NodeResources`
+        :param rand: The random number generator
+        :type rand: :class:`random.Random`
+        :returns: The total resources of each node stored by agent ID
+        :rtype: dict
+        """
+
+        agents = []
+        agent_resources = {}
+        for i in range(1, num_nodes + 1):
+            agent = Agent('sim-agent-%i' % i, 'sim-host-%i' % i)
+            agents.append(agent)
+            multiplier = rand.choice(NODE_SIZE_MULTIPLIERS)
+            agent_resources[agent.agent_id] = NodeResources([Cpus(node_resources.cpus * multiplier),
+                                                             Mem(node_resources.mem * multiplier),
+                                                             Disk(node_resources.disk * multiplier)])
+
+        node_mgr.clear()
+        node_mgr.register_agents(agents)
+        node_mgr.sync_with_database(scheduler_mgr.config)
+
+        # Skip the initial cleanup, health check and Scale image pull tasks, the same as the scheduling tests do
+        for node in node_mgr.get_nodes():
+            node._last_health_task = now()
+            node._initial_cleanup_completed()
+            node._is_image_pulled = True
+            node._update_state()
+        cleanup_mgr.update_nodes(node_mgr.get_nodes())
+
+        return agent_resources
+
+    @staticmethod
+    def _create_queue(num_job_types, num_queued, rand):
+        """Creates the simulated job types and queues the simulated jobs through the normal queueing path
+
+        :param num_job_types: The number of job types
+        :type num_job_types: int
+        :param num_queued: The number of queued jobs
+        :type num_queued: int
+        :param rand: The random number generator
+        :type rand: :class:`random.Random`
+        """
+
+        # Fixture data is created in the test database with the test utilities, which are only loaded when the
+        # simulation runs
+        from data.data.json.data_v6 import DataV6
+        from job.models import Job
+        from job.test import utils as job_test_utils
+        from queue.models import Queue
+        from trigger.test import utils as trigger_test_utils
+
+        job_types = []
+        for i in range(1, num_job_types + 1):
+            resources = [{'name': 'cpus', 'value': rand.choice(JOB_CPUS)},
+                         {'name': 'mem', 'value': rand.choice(JOB_MEM)},
+                         {'name': 'disk', 'value': rand.choice(JOB_DISK)}]
+            manifest = {
+                'seedVersion': '1.0.0',
+                'job': {
+                    'name': 'scale-scheduler-simulator-%i' % i,
+                    'jobVersion': '1.0.0',
+                    'packageVersion': '1.0.0',
+                    'title': 'Scheduler Simulator %i' % i,
+                    'description': 'Job type created by the scheduler simulator',
+                    'maintainer': {'name': 'Scale', 'email': 'scale@example.com'},
+                    'timeout': 3600,
+                    'interface': {'command': 'true'},
+                    'resources': {'scalar': resources}
+                }
+            }
+            job_types.append(job_test_utils.create_seed_job_type(manifest=manifest))
+        event = trigger_test_utils.create_trigger_event()
+        input_dict = DataV6().get_dict()
+
+        for offset in range(0, num_queued, BULK_CREATE_SIZE):
+            jobs = []
+            for _ in range(min(BULK_CREATE_SIZE, num_queued - offset)):
+                job = job_test_utils.create_job(job_type=rand.choice(job_types), event=event, num_exes=0,
+                                                input=input_dict, priority=rand.choice(JOB_PRIORITIES), save=False)
+                jobs.append(job)
+            Job.objects.bulk_create(jobs)
+            Queue.objects.queue_jobs(Job.objects.get_locked_jobs([job.id for job in jobs]))
+
+    @staticmethod
+    def _initialize_scheduler(mode):
+        """Initializes the scheduler model and manager for the simulation
+
+        :param mode: The scheduling mode to use, possibly None to use the configured mode
+        :type mode: string
+        """
+
+        Scheduler.objects.initialize_scheduler()
+        # Message handler tasks would otherwise be scheduled before any jobs
+        updates = {'num_message_handlers': 0}
+        if mode:
+            updates['scheduling_mode'] = mode
+        Scheduler.objects.update(**updates)
+        scheduler_mgr.sync_with_database()
+        scheduler_mgr.update_from_mesos(framework_id=FRAMEWORK_ID)
+        resource_mgr.clear()
+        job_exe_mgr.clear()
+        system_task_mgr._is_db_update_completed = True
+
+
+class SimulatedMesosClient(object):
+    """Stub Mesos client that accepts every launched task and offers each node's unused resources"""
+
+    def __init__(self, agent_resources):
+        """Constructor
+
+        :param agent_resources: The total resources of each node stored by agent ID
+        :type agent_resources: dict
+        """
+
+        self._agent_resources = agent_resources
+        self._next_offer_id = 1
+        self._used_resources = {agent_id: NodeResources() for agent_id in agent_resources}
+
+    def combine_offers(self, offers, tasks):
+        """Accepts the given offers and launches the given Mesos tasks, which keep their resources from then on
+
+        :param offers: The Mesos offers being accepted
+        :type offers: list
+        :param tasks: The Mesos tasks being launched
+        :type tasks: list
+        """
+
+        for task in tasks:
+            resources = [ScalarResource(task_resource['name'], task_resource['scalar']['value'])
+                         for task_resource in task['resources']]
+            self._used_resources[task['agent_id']['value']].add(NodeResources(resources))
+
+    def create_offers(self, when):
+        """Returns a resource offer for the unused resources of every node that has any
+
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        :returns: The resource offers
+        :rtype: list
+        """
+
+        offers = []
+        for agent_id, total_resources in self._agent_resources.items():
+            unused_resources = total_resources.copy()
+            unused_resources.subtract(self._used_resources[agent_id])
+            if unused_resources.cpus <= 0.0 or unused_resources.mem <= 0.0:
+                continue
+            offer_id = 'sim-offer-%i' % self._next_offer_id
+            self._next_offer_id += 1
+            offers.append(ResourceOffer(offer_id, agent_id, FRAMEWORK_ID, unused_resources, when, None))
+        return offers
+
+    def get_driver(self):
+        """Returns the Mesos driver, which is this stub client
+
+        :returns: This client
+        :rtype: :class:`scheduler.management.commands.scale_scheduler_simulator.SimulatedMesosClient`
+        """
+
+        return self
+
+    def get_total_resources(self):
+        """Returns the total resources of all nodes
+
+        :returns: The total resources
+        :rtype: :class:`node.resources.node_resources.NodeResources`
+        """
+
+        total_resources = NodeResources()
+        for resources in self._agent_resources.values():
+            total_resources.add(resources)
+        return total_resources
+
+    def get_used_resources(self):
+        """Returns the resources used by launched tasks across all nodes
+
+        :returns: The used resources
+        :rtype: :class:`node.resources.node_resources.NodeResources`
+        """
+
+        used_resources = NodeResources()
+        for resources in self._used_resources.values():
+            used_resources.add(resources)
+        return used_resources
+
+
+class SimulationResults(object):
+    """Collects the measurements of a scheduler simulation"""
+
+    def __init__(self, total_resources):
+        """Constructor
+
+        :param total_resources: The total resources of all simulated nodes
+        :type total_resources: :class:`node.resources.node_resources.NodeResources`
+        """
+
+        self._total_resources = total_resources
+        self._cycles = []  # [(Seconds, Trace JSON dict, CPU utilization, Memory utilization)]
+
+    def add_cycle(self, seconds, trace_dict, used_resources):
+        """Records a scheduling cycle
+
+        :param seconds: The duration of the cycle in seconds
+        :type seconds: float
+        :param trace_dict: The JSON dict of the cycle's trace
+        :type trace_dict: dict
+        :param used_resources: The resources used by launched tasks once the cycle finished
+        :type used_resources: :class:`node.resources.node_resources.NodeResources`
+        """
+
+        cpu_util = used_resources.cpus / self._total_resources.cpus if self._total_resources.cpus else 0.0
+        mem_util = used_resources.mem / self._total_resources.mem if self._total_resources.mem else 0.0
+        self._cycles.append((seconds, trace_dict, cpu_util, mem_util))
+
+    def get_report(self):
+        """Returns a human readable report of the results
+
+        :return: The report
+        :rtype: string
+        """
+
+        header = '%-6s %10s %10s %10s %8s %8s %8s' % ('Cycle', 'Seconds', 'Examined', 'Scheduled', 'Tasks', 'CPU %',
+                                                      'Mem %')
+        lines = [header, '-' * len(header)]
+
+        phases = {}  # {Phase name: Total seconds}
+        for i, (seconds, trace_dict, cpu_util, mem_util) in enumerate(self._cycles, 1):
+            lines.append('%-6i %10.3f %10i %10i %8i %8.1f %8.1f' % (i, seconds, trace_dict['queue_rows_examined'],
+                                                                    trace_dict['job_exes_scheduled'],
+                                                                    trace_dict['tasks_launched'], 100.0 * cpu_util,
+                                                                    100.0 * mem_util))
+            for name, phase_seconds in trace_dict['phases'].items():
+                phases[name] = phases.get(name, 0.0) + phase_seconds
+
+        num_cycles = len(self._cycles)
+        if not num_cycles:
+            return '\n'.join(lines) + '\n'
+
+        durations = [cycle[0] for cycle in self._cycles]
+        num_scheduled = sum(cycle[1]['job_exes_scheduled'] for cycle in self._cycles)
+        num_launched = sum(cycle[1]['tasks_launched'] for cycle in self._cycles)
+        lines.append('')
+        lines.append('Ran %i cycles: mean %.3f seconds, max %.3f seconds' %
+                     (num_cycles, sum(durations) / num_cycles, max(durations)))
+        lines.append('Scheduled %i job executions (%.1f per cycle) and launched %i tasks (%.1f per cycle)' %
+                     (num_scheduled, num_scheduled / num_cycles, num_launched, num_launched / num_cycles))
+        lines.append('Final utilization: %.1f%% CPU, %.1f%% memory' %
+                     (100.0 * self._cycles[-1][2], 100.0 * self._cycles[-1][3]))
+        lines.append('Mean seconds per phase:')
+        for name, total_seconds in sorted(phases.items(), key=lambda item: item[1], reverse=True):
+            lines.append('  %-34s %10.4f' % (name, total_seconds / num_cycles))
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0013_auto_20181220_2014'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MessageHandler',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=250, unique=True)),
+                ('started', models.DateTimeField()),
+                ('metrics', django.contrib.postgres.fields.jsonb.JSONField(default=dict)),
+                ('last_modified', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'message_handler',
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0014_messagehandler'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduler',
+            name='max_message_handlers',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
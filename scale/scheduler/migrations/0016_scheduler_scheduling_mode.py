@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0015_scheduler_max_message_handlers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduler',
+            name='scheduling_mode',
+            field=models.CharField(choices=[('GREEDY', 'GREEDY'), ('BATCH', 'BATCH')], default='GREEDY', max_length=50),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0016_scheduler_scheduling_mode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduler',
+            name='scheduling_traces',
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=dict),
+        ),
+    ]
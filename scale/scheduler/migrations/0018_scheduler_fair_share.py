@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0017_scheduler_scheduling_traces'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduler',
+            name='fair_share_mode',
+            field=models.CharField(choices=[('NONE', 'NONE'), ('JOB_TYPE', 'JOB_TYPE'), ('RECIPE_TYPE', 'RECIPE_TYPE'), ('BATCH', 'BATCH')], default='NONE', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='scheduler',
+            name='fair_share_weights',
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=dict),
+        ),
+    ]
@@ -4,6 +4,7 @@ import logging
 
 import django.contrib.postgres.fields
 import mesos_api.api as mesos_api
+from django.core.exceptions import ValidationError
 from django.db import models, transaction
 from mesos_api.api import MesosError
 
@@ -11,6 +12,81 @@ from queue.models import Queue, QUEUE_ORDER_FIFO, QUEUE_ORDER_LIFO
 
 logger = logging.getLogger(__name__)
 
+SCHEDULING_MODE_GREEDY = 'GREEDY'
+SCHEDULING_MODE_BATCH = 'BATCH'
+
+FAIR_SHARE_NONE = 'NONE'
+FAIR_SHARE_JOB_TYPE = 'JOB_TYPE'
+FAIR_SHARE_RECIPE_TYPE = 'RECIPE_TYPE'
+FAIR_SHARE_BATCH = 'BATCH'
+
+
+class MessageHandlerManager(models.Manager):
+    """Provides additional methods for handling the metrics of message handler processes
+    """
+
+    def delete_handler(self, name):
+        """Deletes the model for the message handler with the given name
+
+        :param name: The unique name of the message handler process
+        :type name: string
+        """
+
+        self.filter(name=name).delete()
+
+    def get_active_handlers(self, since):
+        """Returns the message handlers that have updated their metrics since the given time
+
+        :param since: Message handlers that have not updated since this time are considered inactive
+        :type since: :class:`datetime.datetime`
+        :returns: The active message handler models, ordered by name
+        :rtype: [:class:`scheduler.models.MessageHandler`]
+        """
+
+        return list(self.filter(last_modified__gte=since).order_by('name'))
+
+    def update_handler(self, name, started, metrics, expired):
+        """Creates or updates the model for the message handler with the given name and deletes the models of message
+        handlers that have not updated since the given expiration time
+
+        :param name: The unique name of the message handler process
+        :type name: string
+        :param started: When the message handler process started
+        :type started: :class:`datetime.datetime`
+        :param metrics: The message metrics of the handler, see :meth:`messaging.metrics.MessageMetrics.get_status`
+        :type metrics: dict
+        :param expired: Models not updated since this time are left by handlers that exited abnormally
+        :type expired: :class:`datetime.datetime`
+        """
+
+        self.update_or_create(name=name, defaults={'started': started, 'metrics': metrics})
+        self.filter(last_modified__lt=expired).delete()
+
+
+class MessageHandler(models.Model):
+    """Represents a running message handler process and the execution metrics it has collected for each message type
+
+    :keyword name: The unique name of the message handler process
+    :type name: :class:`django.db.models.CharField`
+    :keyword started: When the message handler process started
+    :type started: :class:`django.db.models.DateTimeField`
+    :keyword metrics: The execution metrics for each message type
+    :type metrics: :class:`django.contrib.postgres.fields.JSONField`
+    :keyword last_modified: When the metrics were last updated
+    :type last_modified: :class:`django.db.models.DateTimeField`
+    """
+
+    name = models.CharField(max_length=250, unique=True)
+    started = models.DateTimeField()
+    metrics = django.contrib.postgres.fields.JSONField(default=dict)
+    last_modified = models.DateTimeField(auto_now=True)
+
+    objects = MessageHandlerManager()
+
+    class Meta(object):
+        """meta information for the db"""
+        db_table = 'message_handler'
+
 
 class SchedulerManager(models.Manager):
     """Provides additional methods for handling scheduler db entry
@@ -23,7 +99,7 @@ class SchedulerManager(models.Manager):
         :rtype: :class:`scheduler.models.Scheduler`
         """
         try:
-            return Scheduler.objects.all().defer('status').get(pk=1)
+            return Scheduler.objects.all().defer('scheduling_traces', 'status').get(pk=1)
         except Scheduler.DoesNotExist:
             logger.exception('Initial database import missing master scheduler: 1')
             raise
@@ -57,8 +133,37 @@ class SchedulerManager(models.Manager):
 
         :param new_data: Updated data for the node
         :type new_data: dict
+
+        :raises :class:`django.core.exceptions.ValidationError`: If the fair share settings, the scheduling mode or the
+            maximum number of message handlers are invalid
         """
 
+        if 'fair_share_mode' in new_data:
+            if new_data['fair_share_mode'] not in [mode for mode, _ in Scheduler.FAIR_SHARE_MODES]:
+                raise ValidationError('Invalid fair share mode: %s' % new_data['fair_share_mode'])
+        if 'fair_share_weights' in new_data:
+            weights = new_data['fair_share_weights']
+            if not isinstance(weights, dict):
+                raise ValidationError('Fair share weights must be a JSON object')
+            for key, weight in weights.items():
+                if isinstance(weight, bool) or not isinstance(weight, (int, long, float)) or weight <= 0:
+                    raise ValidationError('Fair share weight for %s must be a positive number' % key)
+        if 'scheduling_mode' in new_data:
+            if new_data['scheduling_mode'] not in [mode for mode, _ in Scheduler.SCHEDULING_MODES]:
+                raise ValidationError('Invalid scheduling mode: %s' % new_data['scheduling_mode'])
+        if 'max_message_handlers' in new_data:
+            max_handlers = new_data['max_message_handlers']
+            if max_handlers is not None:
+                if isinstance(max_handlers, bool) or not isinstance(max_handlers, (int, long)) or max_handlers < 0:
+                    raise ValidationError('Maximum number of message handlers must be a non-negative integer or null')
+                if 'num_message_handlers' in new_data:
+                    num_handlers = new_data['num_message_handlers']
+                else:
+                    num_handlers = self.get_master().num_message_handlers
+                if max_handlers < num_handlers:
+                    raise ValidationError('Maximum number of message handlers (%d) must not be less than the number of '
+                                          'message handlers (%s)' % (max_handlers, num_handlers))
+
         self.all().update(**new_data)
 
 
@@ -66,22 +171,55 @@ class Scheduler(models.Model):
     """Represents a scheduler instance. There should only be a single instance of this and it's used for storing
     cluster-wide state related to scheduling in Mesos.
 
+    :keyword fair_share_mode: How queued job executions with the same priority are shared between groups of work,
+        either not at all (queue order) or by job type, recipe type or batch
+    :type fair_share_mode: :class:`django.db.models.CharField`
+    :keyword fair_share_weights: The fair share weight of each group stored by job type, recipe type or batch ID, groups
+        that are not listed have a weight of 1
+    :type fair_share_weights: :class:`django.contrib.postgres.fields.JSONField`
     :keyword is_paused: True if the entire cluster is currently paused and should not accept new jobs
     :type is_paused: :class:`django.db.models.BooleanField()`
-    :keyword num_message_handlers: The number of message handlers to have scheduled 
+    :keyword num_message_handlers: The number of message handlers to have scheduled, which is the minimum number when
+        message handlers are scaled automatically
     :type num_message_handlers: :class:`django.db.models.IntegerField`
+    :keyword max_message_handlers: The maximum number of message handlers to scale up to as messages back up, None (or
+        a value equal to num_message_handlers) disables scaling
+    :type max_message_handlers: :class:`django.db.models.IntegerField`
+    :keyword scheduling_mode: How queued job executions are placed on nodes, either greedily one at a time in queue
+        order or as a batch, largest first within each priority
+    :type scheduling_mode: :class:`django.db.models.CharField`
+    :keyword scheduling_traces: The traces of the most recent scheduling cycles, saved by the scheduler for diagnosing
+        slow scheduling
+    :type scheduling_traces: :class:`django.contrib.postgres.fields.JSONField`
     :keyword system_logging_level: The logging level for all scale system components
     :type system_logging_level: :class:`django.db.models.CharField`
     """
 
+    FAIR_SHARE_MODES = (
+        (FAIR_SHARE_NONE, FAIR_SHARE_NONE),
+        (FAIR_SHARE_JOB_TYPE, FAIR_SHARE_JOB_TYPE),
+        (FAIR_SHARE_RECIPE_TYPE, FAIR_SHARE_RECIPE_TYPE),
+        (FAIR_SHARE_BATCH, FAIR_SHARE_BATCH),
+    )
+
     QUEUE_MODES = (
         (QUEUE_ORDER_FIFO, QUEUE_ORDER_FIFO),
         (QUEUE_ORDER_LIFO, QUEUE_ORDER_LIFO),
     )
 
+    SCHEDULING_MODES = (
+        (SCHEDULING_MODE_GREEDY, SCHEDULING_MODE_GREEDY),
+        (SCHEDULING_MODE_BATCH, SCHEDULING_MODE_BATCH),
+    )
+
+    fair_share_mode = models.CharField(choices=FAIR_SHARE_MODES, default=FAIR_SHARE_NONE, max_length=50)
+    fair_share_weights = django.contrib.postgres.fields.JSONField(default=dict)
     is_paused = models.BooleanField(default=False)
     num_message_handlers = models.IntegerField(default=1)
+    max_message_handlers = models.IntegerField(blank=True, null=True)
     queue_mode = models.CharField(choices=QUEUE_MODES, default=QUEUE_ORDER_FIFO, max_length=50)
+    scheduling_mode = models.CharField(choices=SCHEDULING_MODES, default=SCHEDULING_MODE_GREEDY, max_length=50)
+    scheduling_traces = django.contrib.postgres.fields.JSONField(default=dict)
     status = django.contrib.postgres.fields.JSONField(default=dict)
     system_logging_level = models.CharField(max_length=10, default='INFO')
 
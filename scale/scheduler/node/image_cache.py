@@ -0,0 +1,52 @@
+"""Defines the class that estimates which Docker images are cached on a node"""
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+
+# Estimated number of job Docker images that a node keeps before older ones are removed to free up disk space
+MAX_CACHED_IMAGES = 10
+
+
+class ImageCache(object):
+    """This class estimates which Docker images are cached on a node from the images that have been pulled there. The
+    least recently pulled images are assumed to be evicted once there are more than the maximum number of images. This
+    class is NOT thread-safe and should be protected by its node's lock.
+    """
+
+    def __init__(self, max_images=MAX_CACHED_IMAGES):
+        """Constructor
+
+        :param max_images: The maximum number of images to assume are cached
+        :type max_images: int
+        """
+
+        self._images = OrderedDict()  # {Image name: True}, from least to most recently pulled
+        self._max_images = max_images
+
+    def add_image(self, image_name):
+        """Records that the given image was pulled, making it the most recently pulled image
+
+        :param image_name: The Docker image name
+        :type image_name: string
+        """
+
+        self._images.pop(image_name, None)
+        self._images[image_name] = True
+        while len(self._images) > self._max_images:
+            self._images.popitem(last=False)
+
+    def clear(self):
+        """Clears all of the cached images
+        """
+
+        self._images.clear()
+
+    def get_images(self):
+        """Returns the images that are estimated to be cached
+
+        :returns: The set of Docker image names
+        :rtype: set
+        """
+
+        return set(self._images.keys())
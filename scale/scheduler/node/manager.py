@@ -23,6 +23,21 @@ class NodeManager(object):
         self._nodes = {}  # {Hostname: SchedulerNode}
         self._lock = threading.Lock()
 
+    def add_pulled_image(self, agent_id, image_name):
+        """Records that the given job Docker image was pulled on the node with the given agent ID
+
+        :param agent_id: The agent ID of the node
+        :type agent_id: string
+        :param image_name: The Docker image name
+        :type image_name: string
+        """
+
+        with self._lock:
+            if agent_id not in self._agents:
+                return
+            hostname = self._agents[agent_id].hostname
+            self._nodes[hostname].add_pulled_image(image_name)
+
     def clear(self):
         """Clears all node data from the manager. This method is intended for testing only.
         """
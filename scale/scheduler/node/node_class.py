@@ -14,6 +14,7 @@ from job.tasks.update import TaskStatusUpdate
 from scheduler.cleanup.node import NodeCleanup
 from scheduler.manager import scheduler_mgr
 from scheduler.node.conditions import NodeConditions
+from scheduler.node.image_cache import ImageCache
 
 
 logger = logging.getLogger(__name__)
@@ -69,6 +70,7 @@ class Node(object):
         self._cleanup_task = None
         self._conditions = NodeConditions(self._hostname)
         self._health_task = None
+        self._image_cache = ImageCache()
         self._is_active = node.is_active
         self._is_image_pulled = False
         self._is_initial_cleanup_completed = False
@@ -132,6 +134,16 @@ class Node(object):
             self._cleanup.add_job_execution(job_exe)
             self._conditions.update_cleanup_count(self._cleanup.get_num_job_exes())
 
+    def add_pulled_image(self, image_name):
+        """Records that the given job Docker image was pulled on this node
+
+        :param image_name: The Docker image name
+        :type image_name: string
+        """
+
+        with self._lock:
+            self._image_cache.add_image(image_name)
+
     def generate_status_json(self, nodes_list):
         """Generates the portion of the status JSON that describes this node
 
@@ -146,6 +158,16 @@ class Node(object):
             self._conditions.generate_status_json(node_dict)
         nodes_list.append(node_dict)
 
+    def get_cached_images(self):
+        """Returns the job Docker images that are estimated to be cached on this node
+
+        :returns: The set of Docker image names
+        :rtype: set
+        """
+
+        with self._lock:
+            return self._image_cache.get_images()
+
     def get_next_tasks(self, when):
         """Returns the next node tasks to launch
 
@@ -488,6 +510,7 @@ class Node(object):
         self._cleanup = NodeCleanup()
         self._cleanup_task = None
         self._health_task = None
+        self._image_cache.clear()
         self._is_image_pulled = False
         self._is_initial_cleanup_completed = False
         self._last_health_task = None
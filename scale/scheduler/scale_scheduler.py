@@ -12,6 +12,7 @@ from django.conf import settings
 from error.models import reset_error_cache
 from job.execution.manager import job_exe_mgr
 from job.execution.tasks.exe_task import JOB_TASK_ID_PREFIX
+from job.execution.tasks.pull_task import PullTask
 from job.models import JobExecution
 from job.tasks.manager import task_mgr
 from job.tasks.update import TaskStatusUpdate
@@ -35,6 +36,7 @@ from scheduler.sync.job_type_manager import job_type_mgr
 from scheduler.sync.workspace_manager import workspace_mgr
 from scheduler.task.manager import task_update_mgr
 from scheduler.tasks.manager import system_task_mgr
+from scheduler.threads.launch import LaunchThread
 from scheduler.threads.messaging import MessagingThread
 from scheduler.threads.recon import ReconciliationThread
 from scheduler.threads.schedule import SchedulingThread
@@ -62,6 +64,7 @@ class ScaleScheduler(object):
         self._framework_id = None
         self._master_host_address = None
 
+        self._launch_thread = None
         self._messaging_thread = None
         self._recon_thread = None
         self._scheduler_status_thread = None
@@ -93,6 +96,12 @@ class ScaleScheduler(object):
         self._threads = []
 
         logger.info('Starting up background threads')
+        self._launch_thread = LaunchThread()
+        launch_thread = threading.Thread(target=self._launch_thread.run)
+        launch_thread.daemon = True
+        launch_thread.start()
+        self._threads.append(launch_thread)
+
         self._messaging_thread = MessagingThread()
         restart_msg = RestartScheduler()
         restart_msg.when = now()
@@ -280,6 +289,10 @@ class ScaleScheduler(object):
             logger.warning('Skipped offers from roles that are not marked as accepted: %s', ','.join(skipped_roles))
         scheduler_mgr.add_new_offer_count(num_offers)
 
+        # New resources are available, so schedule right away
+        if num_offers and self._scheduling_thread:
+            self._scheduling_thread.wake()
+
         duration = now() - started
         msg = 'Scheduler resourceOffers() took %.3f seconds'
         if duration > ScaleScheduler.NORMAL_WARN_THRESHOLD:
@@ -350,10 +363,14 @@ class ScaleScheduler(object):
         # Update task with latest status
         # This should happen before the job execution or node manager are updated, since they will assume that the task
         # has already been updated
+        task = task_mgr.get_task(task_id)  # Finished tasks are removed from the task manager
         task_mgr.handle_task_update(task_update)
 
         if task_id.startswith(JOB_TASK_ID_PREFIX):
             # Job task, so update the job execution
+            if isinstance(task, PullTask) and task_update.status == TaskStatusUpdate.FINISHED:
+                # The node now has the job's image cached
+                node_mgr.add_pulled_image(task.agent_id, task.pulled_image)
             try:
                 job_exe = job_exe_mgr.handle_task_update(task_update)
                 if job_exe and job_exe.is_finished():
@@ -376,6 +393,12 @@ class ScaleScheduler(object):
 
         scheduler_mgr.add_task_update_counts(was_task_finished, was_job_finished)
 
+        # Finished tasks free resources for scheduling and finished jobs produce messages that need to be sent
+        if was_task_finished and self._scheduling_thread:
+            self._scheduling_thread.wake()
+        if was_job_finished and self._messaging_thread:
+            self._messaging_thread.wake()
+
         duration = now() - started
         msg = 'Scheduler statusUpdate() took %.3f seconds'
         if duration > ScaleScheduler.NORMAL_WARN_THRESHOLD:
@@ -399,6 +422,7 @@ class ScaleScheduler(object):
         """
 
         logger.info('Scheduler shutdown invoked, stopping background threads')
+        self._launch_thread.shutdown()
         self._messaging_thread.shutdown()
         self._recon_thread.shutdown()
         self._scheduler_status_thread.shutdown()
@@ -0,0 +1,42 @@
+"""Defines the functions for placing a batch of queued job executions on nodes"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+
+def get_dominant_share(resources, max_resources):
+    """Returns the dominant share of the given resources, which is the largest fraction of any single resource that they
+    need relative to the most of that resource available on any node
+
+    :param resources: The resources
+    :type resources: :class:`node.resources.node_resources.NodeResources`
+    :param max_resources: The maximum resources available on any node
+    :type max_resources: :class:`node.resources.node_resources.NodeResources`
+    :returns: The dominant share
+    :rtype: float
+    """
+
+    share = 0.0
+    for resource in resources.resources:
+        max_value = max_resources.get_value(resource.name)
+        if max_value:
+            share = max(share, resource.value / max_value)
+    return share
+
+
+def order_for_batch_placement(job_exes, max_resources):
+    """Orders the given queued job executions for first-fit decreasing placement. The job executions are grouped into
+    tiers by priority and each tier is ordered from largest to smallest dominant share. Job executions with the same
+    priority and dominant share keep their queue order.
+
+    :param job_exes: The queued job executions in queue order
+    :type job_exes: list
+    :param max_resources: The maximum resources available on any node
+    :type max_resources: :class:`node.resources.node_resources.NodeResources`
+    :returns: The queued job executions in placement order
+    :rtype: list[:class:`queue.job_exe.QueuedJobExecution`]
+    """
+
+    # Sorts are stable, so equal job executions keep their queue order
+    return sorted(job_exes, key=lambda job_exe: (job_exe.priority,
+                                                 -get_dominant_share(job_exe.required_resources, max_resources)))
@@ -0,0 +1,104 @@
+"""Defines the class that tracks which nodes have recently used which input data"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import datetime
+import logging
+
+
+# Input data used on a node is considered to still be present (cached files or a warm workspace mount) for this long
+LOCALITY_PERIOD = datetime.timedelta(hours=1)
+
+# Job executions with less input data than this (in MiB) are placed by resource fit alone
+MIN_INPUT_FILE_SIZE = 1024.0
+
+# Period for removing expired input data from the index
+PRUNE_PERIOD = datetime.timedelta(minutes=1)
+
+logger = logging.getLogger(__name__)
+
+
+class DataLocality(object):
+    """This class tracks the input files and input workspaces used by the job executions recently scheduled on each
+    node, so that job executions with large inputs can be placed on nodes where their inputs are likely to already be
+    present. This class is NOT thread-safe and should only be used within the scheduling thread.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._files = {}  # {File ID: {Node ID: Last used}}
+        self._workspaces = {}  # {Workspace name: {Node ID: Last used}}
+        self._last_pruned = None
+
+    def add_scheduled_job_exes(self, job_exes, when):
+        """Records the input data of the given job executions on the nodes they were scheduled on
+
+        :param job_exes: The queued job executions that have been scheduled
+        :type job_exes: list
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        for job_exe in job_exes:
+            node_id = job_exe.scheduled_node_id
+            if job_exe.is_canceled or node_id is None:
+                continue
+            for file_id in job_exe.configuration.get_input_file_ids():
+                self._files.setdefault(file_id, {})[node_id] = when
+            for workspace_name in job_exe.configuration.get_input_workspace_names():
+                self._workspaces.setdefault(workspace_name, {})[node_id] = when
+
+    def get_node_locality(self, job_exe):
+        """Returns the locality of the given job execution's input data on each node where some of it was recently
+        used. Each locality is a tuple of the number of input files and the number of input workspaces recently used
+        on the node, where larger is better. Job executions with small inputs are not placed by locality, so an empty
+        dict is returned for them.
+
+        :param job_exe: The queued job execution
+        :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
+        :returns: The locality tuples stored by node ID
+        :rtype: dict
+        """
+
+        if not job_exe.input_file_size or job_exe.input_file_size < MIN_INPUT_FILE_SIZE:
+            return {}
+
+        num_files = {}  # {Node ID: Number of input files}
+        for file_id in job_exe.configuration.get_input_file_ids():
+            for node_id in self._files.get(file_id, {}):
+                num_files[node_id] = num_files.get(node_id, 0) + 1
+        num_workspaces = {}  # {Node ID: Number of input workspaces}
+        for workspace_name in job_exe.configuration.get_input_workspace_names():
+            for node_id in self._workspaces.get(workspace_name, {}):
+                num_workspaces[node_id] = num_workspaces.get(node_id, 0) + 1
+
+        locality = {}
+        for node_id in set(num_files.keys()) | set(num_workspaces.keys()):
+            locality[node_id] = (num_files.get(node_id, 0), num_workspaces.get(node_id, 0))
+        return locality
+
+    def prune(self, when):
+        """Removes input data that has not been used recently enough to still be present. This is only done
+        periodically, so input data may be kept slightly longer than the locality period.
+
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        if self._last_pruned and when - self._last_pruned < PRUNE_PERIOD:
+            return
+        self._last_pruned = when
+
+        expired = when - LOCALITY_PERIOD
+        num_files = len(self._files)
+        for index in (self._files, self._workspaces):
+            for key in index.keys():
+                nodes = index[key]
+                for node_id in [node_id for node_id, last_used in nodes.items() if last_used < expired]:
+                    del nodes[node_id]
+                if not nodes:
+                    del index[key]
+        if num_files != len(self._files):
+            logger.debug('Removed %d expired input file(s) from the data locality index', num_files - len(self._files))
@@ -0,0 +1,253 @@
+"""Defines the class that orders the queue so that groups of work with the same priority share the cluster fairly"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import datetime
+import heapq
+import itertools
+import logging
+from collections import deque
+from operator import attrgetter
+
+from recipe.models import Recipe
+from scheduler.models import FAIR_SHARE_BATCH, FAIR_SHARE_JOB_TYPE, FAIR_SHARE_NONE, FAIR_SHARE_RECIPE_TYPE
+from scheduler.scheduling.batch_placement import get_dominant_share
+
+
+# Recent usage is halved over this period, so a group's past usage stops counting against it after a while
+USAGE_HALF_LIFE = datetime.timedelta(minutes=10)
+
+# Decayed usage below this amount is dropped
+MIN_USAGE = 0.000001
+
+# Maximum number of recipe IDs to include in a single query
+QUERY_BATCH_SIZE = 500
+
+# Number of queued job executions of a priority that are grouped ahead of the job execution being ordered. A group whose
+# first job execution is further down the queue joins the ordering once the window reaches it, so the cost of ordering
+# is bounded by the part of the queue that is used plus this window, rather than the whole queue.
+GROUPING_WINDOW = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class FairShare(object):
+    """This class tracks the recent resource usage of each group of work (job type, recipe type or batch) and orders the
+    queue so that, within each priority, the group with the least usage for its weight goes next. Usage is measured as
+    the dominant share of the resources scheduled for the group and decays over time. This class is NOT thread-safe and
+    should only be used within the scheduling thread.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._last_decayed = None
+        self._mode = FAIR_SHARE_NONE
+        self._recipe_type_ids = {}  # {Recipe ID: Recipe type ID}
+        self._usage = {}  # {Group key: Decayed usage}
+
+    def add_scheduled_job_exes(self, job_exes, max_resources):
+        """Adds the usage of the given job executions that have been scheduled to their groups
+
+        :param job_exes: The queued job executions that have been scheduled
+        :type job_exes: list
+        :param max_resources: The maximum resources available on any node
+        :type max_resources: :class:`node.resources.node_resources.NodeResources`
+        """
+
+        if self._mode == FAIR_SHARE_NONE:
+            return
+
+        for job_exe in job_exes:
+            if job_exe.is_canceled:
+                continue
+            key = self._get_group_key(job_exe)
+            usage = self._usage.get(key, 0.0) + get_dominant_share(job_exe.required_resources, max_resources)
+            self._usage[key] = usage
+
+    def get_usage(self):
+        """Returns the current decayed usage of each group
+
+        :returns: The usage stored by group key (job type, recipe type or batch ID, None for work outside any group)
+        :rtype: dict
+        """
+
+        return dict(self._usage)
+
+    def order_queue(self, job_exes, mode, weights, max_resources, when):
+        """Returns the given queued job executions in fair share order. Priorities are kept, while the job executions
+        within each priority are interleaved by group so that the group with the least usage for its weight goes next.
+        Each group keeps its own job executions in queue order. The order is generated as it is iterated, so the given
+        job executions are only read up to GROUPING_WINDOW beyond the part of the queue that is used.
+
+        :param job_exes: The queued job executions in queue order
+        :type job_exes: iterable
+        :param mode: The fair share mode
+        :type mode: string
+        :param weights: The weight of each group stored by ID string, groups that are not listed have a weight of 1
+        :type weights: dict
+        :param max_resources: The maximum resources available on any node
+        :type max_resources: :class:`node.resources.node_resources.NodeResources`
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        :returns: The queued job executions in fair share order
+        :rtype: iterator
+        """
+
+        if mode != self._mode:
+            logger.info('Fair share mode changed from %s to %s, resetting usage', self._mode, mode)
+            self._mode = mode
+            self._recipe_type_ids = {}
+            self._usage = {}
+        if mode == FAIR_SHARE_NONE:
+            return iter(job_exes)
+
+        self._decay(when)
+        if mode == FAIR_SHARE_RECIPE_TYPE:
+            job_exes = self._resolve_recipe_types(job_exes)
+        return self._interleave(job_exes, weights or {}, max_resources)
+
+    def _decay(self, when):
+        """Decays the usage of every group by the time that has passed since the last decay
+
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        if self._last_decayed and when > self._last_decayed:
+            factor = 0.5 ** ((when - self._last_decayed).total_seconds() / USAGE_HALF_LIFE.total_seconds())
+            for key in self._usage.keys():
+                usage = self._usage[key] * factor
+                if usage < MIN_USAGE:
+                    del self._usage[key]
+                else:
+                    self._usage[key] = usage
+        self._last_decayed = when
+
+    def _get_group_key(self, job_exe):
+        """Returns the key of the group that the given job execution belongs to
+
+        :param job_exe: The queued job execution
+        :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
+        :returns: The job type, recipe type or batch ID, None if the job execution is not part of a recipe or batch
+        :rtype: int
+        """
+
+        if self._mode == FAIR_SHARE_JOB_TYPE:
+            return job_exe.job_type_id
+        elif self._mode == FAIR_SHARE_RECIPE_TYPE:
+            return self._recipe_type_ids.get(job_exe.recipe_id) if job_exe.recipe_id else None
+        elif self._mode == FAIR_SHARE_BATCH:
+            return job_exe.batch_id
+        return None
+
+    def _interleave(self, job_exes, weights, max_resources):
+        """Generates the given queued job executions interleaved by group, one priority at a time
+
+        :param job_exes: The queued job executions in queue order
+        :type job_exes: iterable
+        :param weights: The weight of each group stored by ID string
+        :type weights: dict
+        :param max_resources: The maximum resources available on any node
+        :type max_resources: :class:`node.resources.node_resources.NodeResources`
+        :returns: The generator of queued job executions in fair share order
+        :rtype: generator
+        """
+
+        for _, tier in itertools.groupby(job_exes, key=attrgetter('priority')):
+            for job_exe in self._interleave_tier(tier, weights, max_resources):
+                yield job_exe
+
+    def _interleave_tier(self, job_exes, weights, max_resources):
+        """Generates the given queued job executions with the same priority interleaved by group. The group with the
+        least usage for its weight goes next, and each job execution that goes adds to its group's usage for the rest of
+        the ordering. The job executions are grouped as they are read, keeping GROUPING_WINDOW of them read ahead, so
+        groups are only considered once the window reaches their first job execution.
+
+        :param job_exes: The queued job executions with the same priority in queue order
+        :type job_exes: iterator
+        :param weights: The weight of each group stored by ID string
+        :type weights: dict
+        :param max_resources: The maximum resources available on any node
+        :type max_resources: :class:`node.resources.node_resources.NodeResources`
+        :returns: The generator of queued job executions in fair share order
+        :rtype: generator
+        """
+
+        groups = {}  # {Group key: Deque of read job executions}
+        group_orders = {}  # {Group key: Order of the group's first job execution}, keeps ties in queue order
+        group_usages = {}  # {Group key: Usage / weight}
+        group_weights = {}  # {Group key: Weight}
+        # Heap of (usage / weight, group order, group key), holding each group that has read job executions
+        heap = []
+
+        def read(num_to_read):
+            """Reads up to the given number of job executions into their groups"""
+            for job_exe in itertools.islice(job_exes, num_to_read):
+                key = self._get_group_key(job_exe)
+                if key not in groups:
+                    weight = float(weights.get(unicode(key), 1.0)) if key is not None else 1.0
+                    groups[key] = deque()
+                    group_orders[key] = len(group_orders)
+                    group_weights[key] = weight
+                    group_usages[key] = self._usage.get(key, 0.0) / weight
+                if not groups[key]:
+                    heapq.heappush(heap, (group_usages[key], group_orders[key], key))
+                groups[key].append(job_exe)
+
+        read(GROUPING_WINDOW)
+        while heap:
+            weighted_usage, order, key = heapq.heappop(heap)
+            group = groups[key]
+            job_exe = group.popleft()
+            yield job_exe
+
+            weighted_usage += get_dominant_share(job_exe.required_resources, max_resources) / group_weights[key]
+            group_usages[key] = weighted_usage
+            if group:
+                heapq.heappush(heap, (weighted_usage, order, key))
+            read(1)  # Keep the window full
+
+    def _resolve_recipe_types(self, job_exes):
+        """Generates the given queued job executions, caching the recipe types of their recipes a batch at a time as
+        they are read. Recipes that are not read are dropped from the cache.
+
+        :param job_exes: The queued job executions
+        :type job_exes: iterable
+        :returns: The generator of queued job executions
+        :rtype: generator
+        """
+
+        cached_recipe_type_ids = self._recipe_type_ids
+        self._recipe_type_ids = {}
+        job_exes = iter(job_exes)
+        while True:
+            batch = list(itertools.islice(job_exes, QUERY_BATCH_SIZE))
+            if not batch:
+                return
+            self._update_recipe_type_ids(batch, cached_recipe_type_ids)
+            for job_exe in batch:
+                yield job_exe
+
+    def _update_recipe_type_ids(self, job_exes, cached_recipe_type_ids):
+        """Adds the recipe types of the given job executions to the cache, taking them from the previously cached recipe
+        types and querying the database only for recipes that were not cached
+
+        :param job_exes: The queued job executions
+        :type job_exes: list
+        :param cached_recipe_type_ids: The previously cached recipe type IDs stored by recipe ID
+        :type cached_recipe_type_ids: dict
+        """
+
+        recipe_ids = {job_exe.recipe_id for job_exe in job_exes if job_exe.recipe_id}
+        missing_recipe_ids = []
+        for recipe_id in recipe_ids:
+            if recipe_id in cached_recipe_type_ids:
+                self._recipe_type_ids[recipe_id] = cached_recipe_type_ids[recipe_id]
+            elif recipe_id not in self._recipe_type_ids:
+                missing_recipe_ids.append(recipe_id)
+        for i in range(0, len(missing_recipe_ids), QUERY_BATCH_SIZE):
+            batch_ids = missing_recipe_ids[i:i + QUERY_BATCH_SIZE]
+            self._recipe_type_ids.update(Recipe.objects.filter(id__in=batch_ids).values_list('id', 'recipe_type_id'))
@@ -4,6 +4,7 @@ from __future__ import unicode_literals
 
 import datetime
 import logging
+from functools import partial
 
 from django.db import transaction
 from django.db.utils import DatabaseError
@@ -18,13 +19,24 @@ from job.models import Job, JobExecution, JobExecutionEnd
 from job.tasks.manager import task_mgr
 from mesos_api.tasks import create_mesos_task
 from node.resources.node_resources import NodeResources
-from queue.job_exe import QueuedJobExecution
 from queue.models import Queue
 from scheduler.cleanup.manager import cleanup_mgr
+from scheduler.launch.manager import launch_mgr
 from scheduler.manager import scheduler_mgr, SchedulerWarning
+from scheduler.models import SCHEDULING_MODE_BATCH
 from scheduler.node.manager import node_mgr
+from scheduler.recon.manager import recon_mgr
 from scheduler.resources.agent import ResourceSet
 from scheduler.resources.manager import resource_mgr
+from scheduler.scheduling import resource_matrix
+from scheduler.scheduling.batch_placement import order_for_batch_placement
+from scheduler.scheduling.data_locality import DataLocality
+from scheduler.scheduling.fair_share import FairShare
+from scheduler.scheduling.profiler import (scheduling_profiler, SchedulingCycleTrace, SKIPPED_JOB_TYPE_LIMIT,
+                                           SKIPPED_MISSING_WORKSPACE, SKIPPED_NO_NODE, SKIPPED_UNKNOWN_JOB_TYPE,
+                                           SKIPPED_UNMET_RESOURCES)
+from scheduler.scheduling.queue_index import QueueIndex
+from scheduler.scheduling.resource_matrix import ResourceMatrix
 from scheduler.scheduling.scheduling_node import SchedulingNode
 from scheduler.sync.job_type_manager import job_type_mgr
 from scheduler.sync.workspace_manager import workspace_mgr
@@ -33,7 +45,8 @@ from util.retry import retry_database_query
 
 # Warning threshold for queue processing duration
 PROCESS_QUEUE_WARN_THRESHOLD = datetime.timedelta(milliseconds=300)
-# Maximum number of jobs to grab off of the queue at one time
+# Maximum number of queued jobs to try to schedule at one time, jobs that are skipped because they cannot currently be
+# scheduled do not count against the limit
 QUEUE_LIMIT = 500
 # Warning threshold for scheduling query duration
 SCHEDULE_QUERY_WARN_THRESHOLD = datetime.timedelta(milliseconds=300)
@@ -65,6 +78,10 @@ class SchedulingManager(object):
         """Constructor
         """
 
+        self._data_locality = DataLocality()
+        self._fair_share = FairShare()
+        self._queue_index = QueueIndex()
+        self._trace = SchedulingCycleTrace(now())  # Trace of the current scheduling cycle
         self._waiting_tasks = {}  # {Task ID: int}
 
     def perform_scheduling(self, client, when):
@@ -84,36 +101,51 @@ class SchedulingManager(object):
             logger.warning('Scheduler not connected to Mesos. Scheduling delayed until connection established.')
             return 0
 
-        job_types = job_type_mgr.get_job_types()
-        job_type_resources = job_type_mgr.get_job_type_resources()
-        tasks = task_mgr.get_all_tasks()
-        running_job_exes = job_exe_mgr.get_running_job_exes()
-        workspaces = workspace_mgr.get_workspaces()
-        nodes = self._prepare_nodes(tasks, running_job_exes, when)
-        fulfilled_nodes = self._schedule_waiting_tasks(nodes, running_job_exes, when)
-
-        sys_tasks_scheduled = self._schedule_system_tasks(fulfilled_nodes, job_type_resources, when)
-
-        job_exe_count = 0
-        if sys_tasks_scheduled:
-            # Only schedule new job executions if all needed system tasks have been scheduled
-            job_type_limits = self._calculate_job_type_limits(job_types, running_job_exes)
-            job_exe_count = self._schedule_new_job_exes(framework_id, fulfilled_nodes, job_types, job_type_limits,
-                                                        job_type_resources, workspaces)
-        else:
-            logger.warning('No new jobs scheduled due to waiting system tasks')
-            scheduler_mgr.warning_active(WAITING_SYSTEM_TASKS)
-
-        if framework_id != scheduler_mgr.framework_id:
-            logger.warning('Scheduler framework ID changed, skipping task launch')
-            return 0
+        # Record a trace of this scheduling cycle, even if it fails part way through
+        trace = SchedulingCycleTrace(when)
+        self._trace = trace
+        try:
+            job_types = job_type_mgr.get_job_types()
+            job_type_resources = job_type_mgr.get_job_type_resources()
+            tasks = task_mgr.get_all_tasks()
+            running_job_exes = job_exe_mgr.get_running_job_exes()
+            workspaces = workspace_mgr.get_workspaces()
+            with trace.phase('prepare_nodes'):
+                nodes = self._prepare_nodes(tasks, running_job_exes, when)
+            trace.num_nodes = len(nodes)
+            with trace.phase('schedule_waiting_tasks'):
+                fulfilled_nodes = self._schedule_waiting_tasks(nodes, running_job_exes, when)
+
+            with trace.phase('schedule_system_tasks'):
+                sys_tasks_scheduled = self._schedule_system_tasks(fulfilled_nodes, job_type_resources, when)
 
-        self._allocate_offers(nodes)
-        declined = resource_mgr.decline_offers()
-        self._decline_offers(declined)
-        task_count, offer_count = self._launch_tasks(client, nodes)
-        scheduler_mgr.add_scheduling_counts(job_exe_count, task_count, offer_count)
-        return task_count
+            job_exe_count = 0
+            if sys_tasks_scheduled:
+                # Only schedule new job executions if all needed system tasks have been scheduled
+                job_type_limits = self._calculate_job_type_limits(job_types, running_job_exes)
+                job_exe_count = self._schedule_new_job_exes(framework_id, fulfilled_nodes, job_types, job_type_limits,
+                                                            job_type_resources, workspaces)
+            else:
+                logger.warning('No new jobs scheduled due to waiting system tasks')
+                scheduler_mgr.warning_active(WAITING_SYSTEM_TASKS)
+            trace.num_job_exes_scheduled = job_exe_count
+
+            if framework_id != scheduler_mgr.framework_id:
+                logger.warning('Scheduler framework ID changed, skipping task launch')
+                return 0
+
+            with trace.phase('allocate_offers'):
+                self._allocate_offers(nodes)
+                declined = resource_mgr.decline_offers()
+                self._decline_offers(declined)
+            with trace.phase('launch_tasks'):
+                task_count, offer_count = self._launch_tasks(client, nodes)
+            trace.num_tasks_launched = task_count
+            scheduler_mgr.add_scheduling_counts(job_exe_count, task_count, offer_count)
+            return task_count
+        finally:
+            trace.finished(now())
+            scheduling_profiler.add_trace(trace)
 
     def _allocate_offers(self, nodes):
         """Allocates resource offers to the node
@@ -182,22 +214,41 @@ class SchedulingManager(object):
         return ignore_job_type_ids
 
     def _decline_offers(self, offers):
-        """Declines offers that have not been allocated
+        """Declines offers that have not been allocated. The declines are performed by the launch thread.
 
-        :param offers: The Mesos offers
-        :type offers: :class:`mesoshttp.offers.Offer`
+        :param offers: The resource offers
+        :type offers: list
         """
 
+        mesos_offers = []
         for offer in offers:
             if offer.mesos_offer:
-                offer.mesos_offer.decline()
+                mesos_offers.append(offer.mesos_offer)
             else:
                 logger.debug("Trying to decline offer without original mesos_offer object")
-        
+        launch_mgr.add_declines(mesos_offers)
+
         logger.debug("Declined %d offers" % len(offers))
 
+    def _handle_launch_completed(self, hostname, tasks, error):
+        """Handles the completion of a launch of tasks on a node. This is called by the launch thread.
+
+        :param hostname: The node's hostname
+        :type hostname: string
+        :param tasks: The tasks that were launched
+        :type tasks: list
+        :param error: The error that caused the launch to fail, None if the launch succeeded
+        :type error: :class:`exceptions.Exception`
+        """
+
+        if error:
+            # The tasks may never have reached Mesos, so reconcile them right away to find out
+            logger.warning('Reconciling %d task(s) from failed launch on node %s', len(tasks), hostname)
+            recon_mgr.add_tasks(tasks)
+
     def _launch_tasks(self, client, nodes):
-        """Launches all of the tasks that have been scheduled on the given nodes
+        """Launches all of the tasks that have been scheduled on the given nodes. The calls to Mesos are performed by
+        the launch thread, so the tasks are launched in the task manager before Mesos has received them.
 
         :param client: The Mesos scheduler client
         :type client: :class:`mesoshttp.client.MesosClient`
@@ -241,10 +292,8 @@ class SchedulingManager(object):
                 node_count += 1
             if mesos_offers:
                 total_node_count += 1
-                try:
-                    client.combine_offers(mesos_offers, mesos_tasks)
-                except Exception:
-                    logger.exception('Error occurred while launching tasks on node %s', node.hostname)
+                callback = partial(self._handle_launch_completed, node.hostname, tasks)
+                launch_mgr.add_launch(client, node.agent_id, node.hostname, mesos_offers, mesos_tasks, callback)
 
         duration = now() - started
         msg = 'Launching tasks took %.3f seconds'
@@ -316,6 +365,37 @@ class SchedulingManager(object):
             scheduling_nodes[scheduling_node.node_id] = scheduling_node
         return scheduling_nodes
 
+    def _get_best_local_node(self, job_exe, nodes, job_type_resources):
+        """Returns the node that can schedule the given job execution and has the most of its input data already
+        present. Ties go to the node with the best scheduling score. If the job execution's inputs are too small to be
+        placed by locality or no such node can schedule it, None is returned.
+
+        :param job_exe: The job execution to schedule
+        :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
+        :param nodes: The dict of available scheduling nodes stored by node ID
+        :type nodes: dict
+        :param job_type_resources: The list of all of the job type resource requirements
+        :type job_type_resources: list
+        :returns: The best local node, possibly None
+        :rtype: :class:`scheduler.scheduling.scheduling_node.SchedulingNode`
+        """
+
+        best_node = None
+        best_key = None
+        for node_id, locality in self._data_locality.get_node_locality(job_exe).items():
+            if node_id not in nodes:
+                continue
+            node = nodes[node_id]
+            score = node.score_job_exe_for_scheduling(job_exe, job_type_resources)
+            if score is None:
+                continue
+            key = (-locality[0], -locality[1], score)
+            if best_key is None or key < best_key:
+                best_node = node
+                best_key = key
+
+        return best_node
+
     def _process_queue(self, nodes, job_types, job_type_limits, job_type_resources, workspaces):
         """Retrieves the top of the queue and schedules new job executions on available nodes as resources and limits
         allow
@@ -335,38 +415,69 @@ class SchedulingManager(object):
         """
 
         scheduled_job_executions = []
-        ignore_job_type_ids = self._calculate_job_types_to_ignore(job_types, job_type_limits)
+        ignore_job_type_ids = set(self._calculate_job_types_to_ignore(job_types, job_type_limits))
         started = now()
 
+        self._queue_index.sync_with_database(started)
+        self._data_locality.prune(started)
         max_cluster_resources = resource_mgr.get_max_available_resources()
-        for queue in Queue.objects.get_queue(scheduler_mgr.config.queue_mode, ignore_job_type_ids)[:QUEUE_LIMIT]:
-            job_exe = QueuedJobExecution(queue)
-            
+        num_considered = 0
+        unmet_resources = {}  # {Job type ID: Unmet resources or None}, saved once the queue has been processed
+        unmet_job_type_ids = set()  # Job types to skip for the rest of this cycle due to unmet resources
+        warnings = {}  # {Job type ID: SchedulerWarning}
+        matrix = ResourceMatrix(nodes.values(), job_type_resources) if resource_matrix.is_available() else None
+        is_batch = scheduler_mgr.config.scheduling_mode == SCHEDULING_MODE_BATCH
+        batch_job_exes = []  # Job executions to place together once the top of the queue has been gathered
+        queue = self._queue_index.get_queue(scheduler_mgr.config.queue_mode, ignore_job_type_ids)
+        queue = self._fair_share.order_queue(queue, scheduler_mgr.config.fair_share_mode,
+                                             scheduler_mgr.config.fair_share_weights, max_cluster_resources, started)
+        for job_exe in queue:
+            if num_considered >= QUEUE_LIMIT:
+                break
+            self._trace.num_queue_rows += 1
+
             # Canceled job executions get processed as scheduled executions
             if job_exe.is_canceled:
                 scheduled_job_executions.append(job_exe)
+                num_considered += 1
                 continue
 
             # If there are no longer any available nodes, break
             if not nodes:
                 break
 
-            jt = job_type_mgr.get_job_type(queue.job_type.id)
-            name = INVALID_RESOURCES.name + jt.name
-            title = INVALID_RESOURCES.title % jt.name
-            warning = SchedulerWarning(name=name, title=title, description=None)
-            if jt.unmet_resources and scheduler_mgr.is_warning_active(warning):
-                # previously checked this job type and found we lacked resources; wait until warning is inactive to check again
+            # Make sure execution's job type has been synced to the scheduler
+            job_type_id = job_exe.job_type_id
+            if job_type_id not in job_types:
+                scheduler_mgr.warning_active(UNKNOWN_JOB_TYPE, description=UNKNOWN_JOB_TYPE.description % job_type_id)
+                self._trace.add_skipped(SKIPPED_UNKNOWN_JOB_TYPE)
                 continue
-            
+
+            if job_type_id in unmet_job_type_ids:
+                self._trace.add_skipped(SKIPPED_UNMET_RESOURCES)
+                continue
+
+            jt = job_types[job_type_id]
+            if job_type_id not in warnings:
+                name = INVALID_RESOURCES.name + jt.name
+                title = INVALID_RESOURCES.title % jt.name
+                warnings[job_type_id] = SchedulerWarning(name=name, title=title, description=None)
+                if jt.unmet_resources and scheduler_mgr.is_warning_active(warnings[job_type_id]):
+                    # previously checked this job type and found we lacked resources; wait until warning is inactive to check again
+                    unmet_job_type_ids.add(job_type_id)
+                    self._trace.add_skipped(SKIPPED_UNMET_RESOURCES)
+                    continue
+            warning = warnings[job_type_id]
+
             invalid_resources = []
             insufficient_resources = []
             # get resource names offered and compare to job type resources
             for resource in job_exe.required_resources.resources:
-                if resource.name not in max_cluster_resources._resources:
+                max_value = max_cluster_resources.get_value(resource.name)
+                if max_value is None:
                     # resource does not exist in cluster
                     invalid_resources.append(resource.name)
-                elif resource.value > max_cluster_resources._resources[resource.name].value:
+                elif resource.value > max_value:
                     # resource exceeds the max available from any node
                     insufficient_resources.append(resource.name)
 
@@ -381,20 +492,15 @@ class SchedulingManager(object):
 
             if invalid_resources or insufficient_resources:
                 invalid_resources.extend(insufficient_resources)
-                jt.unmet_resources = ','.join(invalid_resources)
-                jt.save()
+                unmet_resources[job_type_id] = ','.join(invalid_resources)
+                unmet_job_type_ids.add(job_type_id)
+                self._trace.add_skipped(SKIPPED_UNMET_RESOURCES)
                 continue
             else:
                 # reset unmet_resources flag
-                jt.unmet_resources = None
-                jt.save()
-            
-            # Make sure execution's job type and workspaces have been synced to the scheduler
-            job_type_id = queue.job_type_id
-            if job_type_id not in job_types:
-                scheduler_mgr.warning_active(UNKNOWN_JOB_TYPE, description=UNKNOWN_JOB_TYPE.description % job_type_id)
-                continue
+                unmet_resources[job_type_id] = None
 
+            # Make sure execution's workspaces have been synced to the scheduler
             workspace_names = job_exe.configuration.get_input_workspace_names()
             workspace_names.extend(job_exe.configuration.get_output_workspace_names())
             
@@ -402,17 +508,33 @@ class SchedulingManager(object):
             for name in workspace_names:
                 missing_workspace = missing_workspace or name not in workspaces
             if missing_workspace:
+                self._trace.add_skipped(SKIPPED_MISSING_WORKSPACE)
                 continue
 
             # Check limit for this execution's job type
             if job_type_id in job_type_limits and job_type_limits[job_type_id] < 1:
+                self._trace.add_skipped(SKIPPED_JOB_TYPE_LIMIT)
                 continue
 
             # Try to schedule job execution and adjust job type limit if needed
-            if self._schedule_new_job_exe(job_exe, nodes, job_type_resources):
+            num_considered += 1
+            if is_batch:
+                batch_job_exes.append(job_exe)
+                continue
+            if self._schedule_new_job_exe(job_exe, nodes, job_types, job_type_resources, matrix):
                 scheduled_job_executions.append(job_exe)
                 if job_type_id in job_type_limits:
                     job_type_limits[job_type_id] -= 1
+            else:
+                self._trace.add_skipped(SKIPPED_NO_NODE)
+
+        if batch_job_exes:
+            scheduled_job_executions.extend(self._schedule_new_job_exe_batch(batch_job_exes, nodes, job_types,
+                                                                             job_type_limits, job_type_resources,
+                                                                             max_cluster_resources, matrix))
+
+        self._fair_share.add_scheduled_job_exes(scheduled_job_executions, max_cluster_resources)
+        job_type_mgr.update_unmet_resources(unmet_resources)
 
         duration = now() - started
         msg = 'Processing queue took %.3f seconds'
@@ -445,6 +567,19 @@ class SchedulingManager(object):
         configurator = ScheduledExecutionConfigurator(workspaces)
 
         with transaction.atomic():
+            # The queue index may lag behind the queue table, so skip queue models that have since been deleted and
+            # pick up any recent cancellations
+            queue_ids = [queued_job_exe.id for queued_job_exe in queued_job_executions]
+            current_queue_models = dict(Queue.objects.filter(id__in=queue_ids).values_list('id', 'is_canceled'))
+            deleted_queue_ids = [queue_id for queue_id in queue_ids if queue_id not in current_queue_models]
+            if deleted_queue_ids:
+                logger.warning('Skipping %d queued job execution(s) that are no longer queued', len(deleted_queue_ids))
+                queued_job_executions = [queued_job_exe for queued_job_exe in queued_job_executions
+                                         if queued_job_exe.id in current_queue_models]
+            for queued_job_exe in queued_job_executions:
+                if current_queue_models[queued_job_exe.id]:
+                    queued_job_exe.is_canceled = True
+
             # Bulk create the job execution models
             job_exe_models = []
             scheduled_models = {}  # {queue ID: (job_exe model, config)}
@@ -463,10 +598,8 @@ class SchedulingManager(object):
             JobExecution.objects.bulk_create(job_exe_models)
 
             # Create running and canceled job executions
-            queue_ids = []
             canceled_job_exe_end_models = []
             for queued_job_exe in queued_job_executions:
-                queue_ids.append(queued_job_exe.id)
                 if queued_job_exe.is_canceled:
                     job_exe_model = canceled_models[queued_job_exe.id]
                     canceled_job_exe_end_models.append(job_exe_model.create_canceled_job_exe_end_model(started))
@@ -488,6 +621,7 @@ class SchedulingManager(object):
 
             # Delete queue models
             Queue.objects.filter(id__in=queue_ids).delete()
+        self._queue_index.remove_queued_job_exes(queue_ids)
 
         duration = now() - started
         msg = 'Queries to process scheduled jobs took %.3f seconds'
@@ -498,64 +632,141 @@ class SchedulingManager(object):
 
         return running_job_exes
 
-    def _schedule_new_job_exe(self, job_exe, nodes, job_type_resources):
+    def _schedule_new_job_exe(self, job_exe, nodes, job_types, job_type_resources, matrix=None):
         """Schedules the given job execution on the queue on one of the available nodes, if possible
 
         :param job_exe: The job execution to schedule
         :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
         :param nodes: The dict of available scheduling nodes stored by node ID
         :type nodes: dict
+        :param job_types: The dict of job type models stored by job type ID
+        :type job_types: dict
         :param job_type_resources: The list of all of the job type resource requirements
         :type job_type_resources: list
+        :param matrix: The resource matrix of the available nodes for scoring them all at once, possibly None
+        :type matrix: :class:`scheduler.scheduling.resource_matrix.ResourceMatrix`
         :returns: True if scheduled, False otherwise
         :rtype: bool
         """
 
+        # Prefer the node that already has the most of the job execution's input data, if one can schedule it
+        local_node = self._get_best_local_node(job_exe, nodes, job_type_resources)
+        if local_node and local_node.accept_new_job_exe(job_exe):
+            if matrix:
+                matrix.update_node(local_node)
+            return True
+
         best_scheduling_node = None
         best_scheduling_score = None
+        best_scheduling_is_cached = False
         best_reservation_node = None
         best_reservation_score = None
 
-        for node in nodes.values():
-            # Check node for scheduling this job execution
-            score = node.score_job_exe_for_scheduling(job_exe, job_type_resources)
-            if score is not None:
-                # Job execution could be scheduled on this node, check its score
-                if best_scheduling_node is None or score < best_scheduling_score:
-                    # This is the best node for scheduling so far
-                    best_scheduling_node = node
-                    best_scheduling_score = score
-                    best_reservation_node = None  # No need to reserve a node if we can schedule the job execution
-                    best_reservation_score = None  # No need to reserve a node if we can schedule the job execution
+        if matrix:
+            best_scheduling_node, best_scheduling_score = matrix.get_best_node(job_exe.required_resources,
+                                                                               job_exe.docker_image)
             if best_scheduling_node is None:
-                # No nodes yet to schedule this job execution on, check whether we should reserve this node
-                score = node.score_job_exe_for_reservation(job_exe, job_type_resources)
-                if score is not None:
-                    # Job execution could reserve this node, check its score
-                    if best_reservation_node is None or score < best_reservation_score:
-                        # This is the best node to reserve so far
+                # No node can schedule this job execution, so find the best node to reserve
+                for node in nodes.values():
+                    score = node.score_job_exe_for_reservation(job_exe, job_type_resources)
+                    if score is not None and (best_reservation_node is None or score < best_reservation_score):
                         best_reservation_node = node
                         best_reservation_score = score
+        else:
+            for node in nodes.values():
+                # Check node for scheduling this job execution
+                score = node.score_job_exe_for_scheduling(job_exe, job_type_resources)
+                if score is not None:
+                    # Job execution could be scheduled on this node, prefer nodes with its image cached and then check
+                    # its score
+                    is_cached = node.has_cached_image(job_exe.docker_image)
+                    if best_scheduling_node is None or (not is_cached, score) < (not best_scheduling_is_cached,
+                                                                                 best_scheduling_score):
+                        # This is the best node for scheduling so far
+                        best_scheduling_node = node
+                        best_scheduling_score = score
+                        best_scheduling_is_cached = is_cached
+                        best_reservation_node = None  # No need to reserve a node if we can schedule the job execution
+                        best_reservation_score = None  # No need to reserve a node if we can schedule the job execution
+                if best_scheduling_node is None:
+                    # No nodes yet to schedule this job execution on, check whether we should reserve this node
+                    score = node.score_job_exe_for_reservation(job_exe, job_type_resources)
+                    if score is not None:
+                        # Job execution could reserve this node, check its score
+                        if best_reservation_node is None or score < best_reservation_score:
+                            # This is the best node to reserve so far
+                            best_reservation_node = node
+                            best_reservation_score = score
 
         # Schedule the job execution on the best node
         if best_scheduling_node:
             if best_scheduling_node.accept_new_job_exe(job_exe):
+                if matrix:
+                    matrix.update_node(best_scheduling_node)
                 return True
 
         # Could not schedule job execution, reserve a node to run this execution if possible
         if best_reservation_node:
             del nodes[best_reservation_node.node_id]
+            if matrix:
+                matrix.remove_node(best_reservation_node.node_id)
 
         # No nodes could reserve this
         if best_reservation_score is None:
-            name = INVALID_RESOURCES.name + job_exe._queue.job_type.name
-            title = INVALID_RESOURCES.title % job_exe._queue.job_type.name
+            job_type_name = job_types[job_exe.job_type_id].name
+            name = INVALID_RESOURCES.name + job_type_name
+            title = INVALID_RESOURCES.title % job_type_name
             resource_names = [r.name for r in job_exe.required_resources.resources]
             description = INVALID_RESOURCES.description % resource_names
             scheduler_mgr.warning_active(SchedulerWarning(name=name, title=title, description=None), description)
 
         return False
 
+    def _schedule_new_job_exe_batch(self, job_exes, nodes, job_types, job_type_limits, job_type_resources,
+                                    max_resources, matrix=None):
+        """Schedules the given batch of job executions from the top of the queue on the available nodes. The job
+        executions are placed one priority tier at a time, largest first within each tier (first-fit decreasing), so
+        that smaller job executions fill in around larger ones instead of fragmenting the nodes they need.
+
+        :param job_exes: The queued job executions to schedule in queue order
+        :type job_exes: list
+        :param nodes: The dict of available scheduling nodes stored by node ID
+        :type nodes: dict
+        :param job_types: The dict of job type models stored by job type ID
+        :type job_types: dict
+        :param job_type_limits: The dict of job type IDs mapping to job type limits
+        :type job_type_limits: dict
+        :param job_type_resources: The list of all of the job type resource requirements
+        :type job_type_resources: list
+        :param max_resources: The maximum resources available on any node
+        :type max_resources: :class:`node.resources.node_resources.NodeResources`
+        :param matrix: The resource matrix of the available nodes for scoring them all at once, possibly None
+        :type matrix: :class:`scheduler.scheduling.resource_matrix.ResourceMatrix`
+        :returns: The list of queued job executions that were scheduled
+        :rtype: list
+        """
+
+        scheduled_job_executions = []
+        for job_exe in order_for_batch_placement(job_exes, max_resources):
+            # If there are no longer any available nodes, break
+            if not nodes:
+                break
+
+            # Job type limits are only checked when gathering the batch, so check them again as the batch is placed
+            job_type_id = job_exe.job_type_id
+            if job_type_id in job_type_limits and job_type_limits[job_type_id] < 1:
+                self._trace.add_skipped(SKIPPED_JOB_TYPE_LIMIT)
+                continue
+
+            if self._schedule_new_job_exe(job_exe, nodes, job_types, job_type_resources, matrix):
+                scheduled_job_executions.append(job_exe)
+                if job_type_id in job_type_limits:
+                    job_type_limits[job_type_id] -= 1
+            else:
+                self._trace.add_skipped(SKIPPED_NO_NODE)
+
+        return scheduled_job_executions
+
     def _schedule_new_job_exes(self, framework_id, nodes, job_types, job_type_limits, job_type_resources, workspaces):
         """Schedules new job executions from the queue and adds them to the appropriate node
 
@@ -581,11 +792,15 @@ class SchedulingManager(object):
             if node.is_ready_for_new_job:
                 available_nodes[node.node_id] = node
 
+        self._trace.num_available_nodes = len(available_nodes)
         try:
-            scheduled_job_exes = self._process_queue(available_nodes, job_types, job_type_limits, job_type_resources,
-                                                     workspaces)
-            running_job_exes = self._process_scheduled_job_executions(framework_id, scheduled_job_exes, job_types,
-                                                                      workspaces)
+            with self._trace.phase('process_queue'):
+                scheduled_job_exes = self._process_queue(available_nodes, job_types, job_type_limits,
+                                                         job_type_resources, workspaces)
+            with self._trace.phase('process_scheduled_job_executions'):
+                running_job_exes = self._process_scheduled_job_executions(framework_id, scheduled_job_exes,
+                                                                          job_types, workspaces)
+            self._data_locality.add_scheduled_job_exes(scheduled_job_exes, now())
             all_running_job_exes = []
             for node_id in running_job_exes:
                 all_running_job_exes.extend(running_job_exes[node_id])
@@ -0,0 +1,135 @@
+"""Defines the classes that record a trace of each scheduling cycle"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from django.utils.timezone import now
+
+from util.parse import datetime_to_string
+
+
+# Number of the most recent scheduling cycle traces to keep
+MAX_TRACES = 100
+
+# Reasons that queued job executions are skipped during a scheduling cycle
+SKIPPED_JOB_TYPE_LIMIT = 'job_type_limit'
+SKIPPED_MISSING_WORKSPACE = 'missing_workspace'
+SKIPPED_NO_NODE = 'no_node'
+SKIPPED_UNKNOWN_JOB_TYPE = 'unknown_job_type'
+SKIPPED_UNMET_RESOURCES = 'unmet_resources'
+
+
+class SchedulingCycleTrace(object):
+    """This class records where the time was spent during a single scheduling cycle, how much work was considered, and
+    why queued job executions were skipped. This class is NOT thread-safe and should only be used within the scheduling
+    thread.
+    """
+
+    def __init__(self, started):
+        """Constructor
+
+        :param started: When the scheduling cycle started
+        :type started: :class:`datetime.datetime`
+        """
+
+        self.num_available_nodes = 0
+        self.num_job_exes_scheduled = 0
+        self.num_nodes = 0
+        self.num_queue_rows = 0
+        self.num_tasks_launched = 0
+
+        self._finished = None
+        self._phases = {}  # {Phase name: Seconds}
+        self._skipped = {}  # {Reason: Number of job executions}
+        self._started = started
+
+    def add_skipped(self, reason):
+        """Records that a queued job execution was skipped for the given reason
+
+        :param reason: The reason the job execution was skipped
+        :type reason: string
+        """
+
+        self._skipped[reason] = self._skipped.get(reason, 0) + 1
+
+    def finished(self, when):
+        """Records that the scheduling cycle has finished
+
+        :param when: When the scheduling cycle finished
+        :type when: :class:`datetime.datetime`
+        """
+
+        self._finished = when
+
+    def get_json(self):
+        """Returns this trace as a JSON dict
+
+        :returns: The trace as a JSON dict
+        :rtype: dict
+        """
+
+        duration = (self._finished - self._started).total_seconds() if self._finished else None
+        return {'started': datetime_to_string(self._started), 'duration_seconds': duration,
+                'phases': dict(self._phases), 'nodes': self.num_nodes, 'available_nodes': self.num_available_nodes,
+                'queue_rows_examined': self.num_queue_rows, 'job_exes_scheduled': self.num_job_exes_scheduled,
+                'tasks_launched': self.num_tasks_launched, 'skipped': dict(self._skipped)}
+
+    @contextmanager
+    def phase(self, name):
+        """Returns a context manager that adds the time spent within it to the phase with the given name
+
+        :param name: The name of the phase
+        :type name: string
+        """
+
+        started = now()
+        try:
+            yield
+        finally:
+            seconds = (now() - started).total_seconds()
+            self._phases[name] = self._phases.get(name, 0.0) + seconds
+
+
+class SchedulingProfiler(object):
+    """This class keeps the traces of the most recent scheduling cycles. This class is thread-safe."""
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._lock = threading.Lock()
+        self._traces = deque(maxlen=MAX_TRACES)  # Trace JSON dicts from oldest to newest
+
+    def add_trace(self, trace):
+        """Adds the trace of a scheduling cycle, dropping the oldest trace if needed
+
+        :param trace: The scheduling cycle trace
+        :type trace: :class:`scheduler.scheduling.profiler.SchedulingCycleTrace`
+        """
+
+        trace_json = trace.get_json()
+        with self._lock:
+            self._traces.append(trace_json)
+
+    def clear(self):
+        """Clears all of the traces. This method is intended for testing only.
+        """
+
+        with self._lock:
+            self._traces.clear()
+
+    def get_traces_json(self):
+        """Returns the traces of the most recent scheduling cycles, newest first
+
+        :returns: The list of trace JSON dicts
+        :rtype: list
+        """
+
+        with self._lock:
+            return list(reversed(self._traces))
+
+
+scheduling_profiler = SchedulingProfiler()
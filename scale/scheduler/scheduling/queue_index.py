@@ -0,0 +1,207 @@
+"""Defines the class that maintains an in-memory index of the queue for scheduling"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import bisect
+import datetime
+import logging
+
+from django.utils.timezone import utc
+
+from queue.job_exe import QueuedJobExecution
+from queue.models import Queue, QueueInterface, QUEUE_ORDER_LIFO
+
+
+# Period for fully reconciling the index with the queue table, which picks up rows committed out of ID order, rows
+# deleted outside of the scheduler, and priority and cancellation changes
+RECONCILE_PERIOD = datetime.timedelta(seconds=30)
+
+# Maximum number of queue IDs to include in a single query
+QUERY_BATCH_SIZE = 500
+
+EPOCH = datetime.datetime.utcfromtimestamp(0).replace(tzinfo=utc)
+
+logger = logging.getLogger(__name__)
+
+
+class QueueIndex(object):
+    """This class maintains an in-memory index of the queued job executions so that each queue model is only retrieved
+    and parsed once. The index is kept in sync incrementally by retrieving models with IDs beyond the highest ID seen,
+    and fully reconciled with the queue table periodically. The shared interfaces of the queue models are cached, so
+    each distinct interface is only retrieved and parsed once. The queue order is kept as a sorted list of keys that
+    job executions are inserted into and removed from as the index changes, so the queue is only fully sorted when the
+    queue mode changes. This class is NOT thread-safe and should only be used within the scheduling thread.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._interfaces = {}  # {Shared interface ID: Parsed job interface}
+        self._job_exes = {}  # {Queue ID: QueuedJobExecution}
+        self._last_reconciled = None
+        self._max_queue_id = 0
+        self._order_keys = None  # Sorted list of the order key of every queued job execution, None until requested
+        self._order_mode = None
+
+    def __len__(self):
+        """Returns the number of queued job executions in the index
+
+        :returns: The number of queued job executions
+        :rtype: int
+        """
+
+        return len(self._job_exes)
+
+    def get_queue(self, order_mode, ignore_job_type_ids=None):
+        """Returns the queued job executions sorted according to their priority first, and then according to the
+        provided mode, the same order as :meth:`queue.models.QueueManager.get_queue`. The job executions are generated
+        from the index as they are iterated, so the iterator must be used before the index is next changed.
+
+        :param order_mode: The mode determining how to order the queue (FIFO or LIFO)
+        :type order_mode: string
+        :param ignore_job_type_ids: The set of job type IDs to ignore
+        :type ignore_job_type_ids: set
+        :returns: The queued job executions
+        :rtype: iterator
+        """
+
+        if self._order_keys is None or order_mode != self._order_mode:
+            self._order_mode = order_mode
+            self._order_keys = sorted(self._get_order_key(job_exe) for job_exe in self._job_exes.values())
+
+        job_exes = (self._job_exes[key[-1]] for key in self._order_keys)
+        if not ignore_job_type_ids:
+            return job_exes
+        return (job_exe for job_exe in job_exes if job_exe.job_type_id not in ignore_job_type_ids)
+
+    def remove_queued_job_exes(self, queue_ids):
+        """Removes the queued job executions with the given queue IDs from the index, such as after their queue models
+        have been deleted
+
+        :param queue_ids: The queue IDs
+        :type queue_ids: list
+        """
+
+        for queue_id in queue_ids:
+            job_exe = self._job_exes.pop(queue_id, None)
+            if job_exe is not None:
+                self._remove_order_key(job_exe)
+
+    def sync_with_database(self, when):
+        """Syncs the index with the queue table. New queue models are retrieved every time, while a full reconciliation
+        is performed periodically.
+
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        if self._last_reconciled is None or when - self._last_reconciled >= RECONCILE_PERIOD:
+            self._reconcile()
+            self._last_reconciled = when
+        else:
+            self._add_queue_models(Queue.objects.filter(id__gt=self._max_queue_id).order_by('id'))
+
+    def _add_queue_models(self, queue_query):
+        """Retrieves the queue models from the given query and adds them to the index
+
+        :param queue_query: The query for the queue models
+        :type queue_query: :class:`django.db.models.QuerySet`
+        """
+
+        count = 0
+        for queue in queue_query.iterator():
+            interface = self._get_interface(queue.shared_interface_id)
+            job_exe = QueuedJobExecution(queue, interface)
+            old_job_exe = self._job_exes.get(queue.id)
+            if old_job_exe is not None:
+                self._remove_order_key(old_job_exe)
+            self._job_exes[queue.id] = job_exe
+            if self._order_keys is not None:
+                bisect.insort(self._order_keys, self._get_order_key(job_exe))
+            self._max_queue_id = max(self._max_queue_id, queue.id)
+            count += 1
+
+        if count:
+            logger.debug('Added %d queued job execution(s) to the queue index', count)
+
+    def _get_order_key(self, job_exe):
+        """Returns the key that orders the given queued job execution within the queue for the current queue mode. The
+        key ends with the queue ID so that every key is unique.
+
+        :param job_exe: The queued job execution
+        :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
+        :returns: The order key
+        :rtype: tuple
+        """
+
+        queued = job_exe.queued - EPOCH
+        queued = (queued.days * 86400 + queued.seconds) * 1000000 + queued.microseconds
+        if self._order_mode == QUEUE_ORDER_LIFO:
+            return job_exe.priority, -queued, -job_exe.id, job_exe.id
+        return job_exe.priority, queued, job_exe.id, job_exe.id
+
+    def _get_interface(self, interface_id):
+        """Returns the parsed job interface for the given shared interface ID, retrieving and parsing it if it is not
+        cached yet
+
+        :param interface_id: The shared interface ID
+        :type interface_id: int
+        :returns: The job interface
+        :rtype: :class:`job.configuration.interface.job_interface.JobInterface` or
+                :class:`job.seed.manifest.SeedManifest`
+        """
+
+        interface = self._interfaces.get(interface_id)
+        if interface is None:
+            interface = QueueInterface.objects.get(id=interface_id).get_job_interface()
+            self._interfaces[interface_id] = interface
+        return interface
+
+    def _remove_order_key(self, job_exe):
+        """Removes the order key of the given queued job execution from the sorted keys, if the keys have been built
+
+        :param job_exe: The queued job execution
+        :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
+        """
+
+        if self._order_keys is None:
+            return
+        key = self._get_order_key(job_exe)
+        index = bisect.bisect_left(self._order_keys, key)
+        if index < len(self._order_keys) and self._order_keys[index] == key:
+            del self._order_keys[index]
+
+    def _reconcile(self):
+        """Fully reconciles the index with the queue table, retrieving only the ID, priority, and cancellation of the
+        models that are already indexed
+        """
+
+        queue_ids_to_add = []
+        current_queue_ids = set()
+        for queue_id, priority, is_canceled in Queue.objects.values_list('id', 'priority', 'is_canceled').iterator():
+            current_queue_ids.add(queue_id)
+            job_exe = self._job_exes.get(queue_id)
+            if job_exe is None:
+                queue_ids_to_add.append(queue_id)
+                continue
+            job_exe.is_canceled = is_canceled
+            if job_exe.priority != priority:
+                # Move the job execution to its new place in the queue order
+                self._remove_order_key(job_exe)
+                job_exe.priority = priority
+                if self._order_keys is not None:
+                    bisect.insort(self._order_keys, self._get_order_key(job_exe))
+
+        queue_ids_to_remove = [queue_id for queue_id in self._job_exes if queue_id not in current_queue_ids]
+        if queue_ids_to_remove:
+            logger.debug('Removing %d deleted queued job execution(s) from the queue index', len(queue_ids_to_remove))
+            self.remove_queued_job_exes(queue_ids_to_remove)
+
+        for i in range(0, len(queue_ids_to_add), QUERY_BATCH_SIZE):
+            self._add_queue_models(Queue.objects.filter(id__in=queue_ids_to_add[i:i + QUERY_BATCH_SIZE]))
+
+        # Drop the cached interfaces that are no longer used by any queued job execution
+        interface_ids = {job_exe.shared_interface_id for job_exe in self._job_exes.values()}
+        for interface_id in [interface_id for interface_id in self._interfaces if interface_id not in interface_ids]:
+            del self._interfaces[interface_id]
@@ -0,0 +1,165 @@
+"""Defines the class that scores job executions against all scheduling nodes at once"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+    logger.warning('NumPy not available, scheduling nodes will be scored one at a time')
+
+
+def is_available():
+    """Indicates whether vectorized scoring is available, which requires NumPy
+
+    :returns: True if vectorized scoring is available, False otherwise
+    :rtype: bool
+    """
+
+    return numpy is not None
+
+
+class ResourceMatrix(object):
+    """This class holds the resources of a set of scheduling nodes and the job type resource requirements as matrices
+    (nodes x resource names and job types x resource names) so that a job execution can be scored against every node in
+    a single vectorized operation. The scores are the same as those of
+    :meth:`scheduler.scheduling.scheduling_node.SchedulingNode.score_job_exe_for_scheduling`.
+
+    A node's row must be refreshed with :meth:`update_node` whenever resources are allocated on it. This class is NOT
+    thread-safe and should only be used within the scheduling thread.
+    """
+
+    def __init__(self, nodes, job_type_resources):
+        """Constructor
+
+        :param nodes: The scheduling nodes
+        :type nodes: list
+        :param job_type_resources: The list of all of the job type resource requirements
+        :type job_type_resources: list
+        """
+
+        self._nodes = list(nodes)
+        self._rows = {node.node_id: row for row, node in enumerate(self._nodes)}  # {Node ID: Row}
+        self._image_masks = {}  # {Image name: Mask of nodes with the image cached}
+
+        names = set()
+        for node in self._nodes:
+            names.update(resource.name for resource in node.remaining_resources.resources)
+            names.update(resource.name for resource in node.get_available_resources().resources)
+        for resources in job_type_resources:
+            names.update(resource.name for resource in resources.resources)
+        self._columns = {name: column for column, name in enumerate(sorted(names))}  # {Resource name: Column}
+
+        num_rows = len(self._nodes)
+        num_columns = len(self._columns)
+        self._is_active = numpy.ones(num_rows, dtype=bool)
+        self._remaining = numpy.zeros((num_rows, num_columns))
+        self._available = numpy.zeros((num_rows, num_columns))
+        self._is_available_present = numpy.zeros((num_rows, num_columns), dtype=bool)
+        for node in self._nodes:
+            self.update_node(node)
+
+        self._job_types = numpy.zeros((len(job_type_resources), num_columns))
+        for row, resources in enumerate(job_type_resources):
+            self._job_types[row] = self._to_vector(resources)[0]
+
+    def get_best_node(self, resources, docker_image=None):
+        """Returns the node with the best (lowest) scheduling score for the given resources, along with the score. If a
+        Docker image is given, nodes that have the image cached are preferred over those that do not. If no node can
+        schedule the resources, (None, None) is returned. Ties go to the node that was given first.
+
+        :param resources: The resources to score
+        :type resources: :class:`node.resources.node_resources.NodeResources`
+        :param docker_image: The Docker image needed by the resources, possibly None
+        :type docker_image: string
+        :returns: The best node and its score, possibly (None, None)
+        :rtype: tuple
+        """
+
+        request, is_unknown_requested = self._to_vector(resources)
+        if is_unknown_requested:
+            # A resource that no node has is being requested
+            return None, None
+
+        is_feasible = self._is_active & (self._remaining >= request).all(axis=1)
+        feasible_rows = numpy.flatnonzero(is_feasible)
+        if not len(feasible_rows):
+            return None, None
+        if docker_image:
+            cached_rows = feasible_rows[self._get_image_mask(docker_image)[feasible_rows]]
+            if len(cached_rows):
+                feasible_rows = cached_rows
+
+        # Resources that a node does not have are never subtracted, matching NodeResources.subtract()
+        available = self._available[feasible_rows]
+        available = numpy.where(self._is_available_present[feasible_rows], available - request, available)
+
+        # Score is the number of job types that can fit within the estimated resources on each node still available to
+        # Scale. A better (lower) score indicates a higher utilization of the node, reducing resource fragmentation.
+        fits = (available[:, numpy.newaxis, :] >= self._job_types[numpy.newaxis, :, :]).all(axis=2)
+        scores = fits.sum(axis=1)
+        best = numpy.argmin(scores)
+        return self._nodes[feasible_rows[best]], int(scores[best])
+
+    def remove_node(self, node_id):
+        """Removes the node with the given ID from consideration
+
+        :param node_id: The node ID
+        :type node_id: int
+        """
+
+        if node_id in self._rows:
+            self._is_active[self._rows[node_id]] = False
+
+    def update_node(self, node):
+        """Refreshes the row for the given node from its current resources
+
+        :param node: The scheduling node
+        :type node: :class:`scheduler.scheduling.scheduling_node.SchedulingNode`
+        """
+
+        row = self._rows[node.node_id]
+        self._remaining[row] = self._to_vector(node.remaining_resources)[0]
+        self._available[row] = 0.0
+        self._is_available_present[row] = False
+        for resource in node.get_available_resources().resources:
+            if resource.name in self._columns:
+                column = self._columns[resource.name]
+                self._available[row, column] = resource.value
+                self._is_available_present[row, column] = True
+
+    def _get_image_mask(self, docker_image):
+        """Returns the mask of the nodes that have the given Docker image cached
+
+        :param docker_image: The Docker image name
+        :type docker_image: string
+        :returns: The boolean mask by row
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        if docker_image not in self._image_masks:
+            is_cached = [node.has_cached_image(docker_image) for node in self._nodes]
+            self._image_masks[docker_image] = numpy.array(is_cached, dtype=bool)
+        return self._image_masks[docker_image]
+
+    def _to_vector(self, resources):
+        """Converts the given resources to a vector of values by column. Resources that are missing are zero.
+
+        :param resources: The resources
+        :type resources: :class:`node.resources.node_resources.NodeResources`
+        :returns: The vector and whether a positive amount of a resource without a column was included
+        :rtype: tuple
+        """
+
+        vector = numpy.zeros(len(self._columns))
+        is_unknown_requested = False
+        for resource in resources.resources:
+            if resource.name in self._columns:
+                vector[self._columns[resource.name]] = resource.value
+            elif resource.value > 0.0:
+                is_unknown_requested = True
+        return vector, is_unknown_requested
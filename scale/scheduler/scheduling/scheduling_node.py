@@ -42,6 +42,7 @@ class SchedulingNode(object):
         self.allocated_resources = NodeResources()
         self.allocated_tasks = []  # Tasks that have been allocated resources from this node
 
+        self._cached_images = node.get_cached_images()  # Cache this for consistency
         self._node = node
         self._allocated_queued_job_exes = []  # New queued job executions that have been allocated resources
         self._allocated_running_job_exes = []  # Running job executions that have been allocated resources
@@ -204,6 +205,42 @@ class SchedulingNode(object):
         self._allocated_queued_job_exes = []
         self._allocated_running_job_exes.extend(job_exes)
 
+    @property
+    def remaining_resources(self):
+        """The resources remaining on this node that have been offered but not yet allocated
+
+        :returns: The remaining resources
+        :rtype: :class:`node.resources.node_resources.NodeResources`
+        """
+
+        return self._remaining_resources
+
+    def get_available_resources(self):
+        """Returns our best guess of the total resources still available to Scale on this node, starting with the
+        watermark resource level and subtracting resources for currently running and allocated tasks
+
+        :returns: The estimated available resources
+        :rtype: :class:`node.resources.node_resources.NodeResources`
+        """
+
+        available_resources = NodeResources()
+        available_resources.add(self._watermark_resources)
+        available_resources.subtract(self._task_resources)
+        available_resources.subtract(self.allocated_resources)
+        return available_resources
+
+    def has_cached_image(self, image_name):
+        """Indicates whether the given Docker image is estimated to already be cached on this node, so pulling it will
+        be quick
+
+        :param image_name: The Docker image name
+        :type image_name: string
+        :returns: True if the image is cached on this node, False otherwise
+        :rtype: bool
+        """
+
+        return image_name in self._cached_images
+
     def reset_new_job_exes(self):
         """Resets the allocated new job executions and deallocates any resources associated with them
         """
@@ -318,12 +355,7 @@ class SchedulingNode(object):
         if not self._remaining_resources.is_sufficient_to_meet(resources):
             return None
 
-        # Calculate our best guess of the total resources still available to Scale on this node by starting with the
-        # watermark resource level and subtracting resources for currently running and allocated tasks
-        total_resources_available = NodeResources()
-        total_resources_available.add(self._watermark_resources)
-        total_resources_available.subtract(self._task_resources)
-        total_resources_available.subtract(self.allocated_resources)
+        total_resources_available = self.get_available_resources()
         total_resources_available.subtract(resources)
 
         # Score is the number of job types that can fit within the estimated resources on this node still available to
@@ -20,4 +20,5 @@ class SchedulerSerializerV6(serializers.ModelSerializer):
     class Meta(object):
         """Meta class used to define what is serialized and how"""
         model = Scheduler
-        fields = ('is_paused', 'num_message_handlers', 'system_logging_level')
\ No newline at end of file
+        fields = ('fair_share_mode', 'fair_share_weights', 'is_paused', 'num_message_handlers',
+                  'max_message_handlers', 'scheduling_mode', 'system_logging_level')
\ No newline at end of file
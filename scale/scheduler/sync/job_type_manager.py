@@ -69,6 +69,25 @@ class JobTypeManager(object):
         with self._lock:
             return dict(self._job_types)
 
+    def update_unmet_resources(self, unmet_resources):
+        """Updates the unmet resources of the given job types, saving them to the database only for the job types where
+        they have changed
+
+        :param unmet_resources: The unmet resources (possibly None) stored by job type ID
+        :type unmet_resources: dict
+        """
+
+        changed_job_type_ids = {}  # {Unmet resources: [Job type ID]}
+        with self._lock:
+            for job_type_id, resources in unmet_resources.items():
+                job_type = self._job_types.get(job_type_id)
+                if job_type and job_type.unmet_resources != resources:
+                    job_type.unmet_resources = resources
+                    changed_job_type_ids.setdefault(resources, []).append(job_type_id)
+
+        for resources, job_type_ids in changed_job_type_ids.items():
+            JobType.objects.filter(id__in=job_type_ids).update(unmet_resources=resources)
+
     def sync_with_database(self):
         """Syncs with the database to retrieve updated job type models
         """
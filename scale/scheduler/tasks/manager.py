@@ -8,7 +8,9 @@ import threading
 from django.utils.timezone import now
 
 from job.tasks.update import TaskStatusUpdate
+from messaging.manager import CommandMessageManager
 from scheduler.manager import scheduler_mgr
+from scheduler.models import MessageHandler
 from scheduler.tasks.db_update_task import DatabaseUpdateTask
 from scheduler.tasks.services.messaging.messaging_service import MessagingService
 from util.parse import datetime_to_string
@@ -22,6 +24,9 @@ class SystemTaskManager(object):
 
     DATABASE_UPDATE_ERR_THRESHOLD = datetime.timedelta(minutes=2)
 
+    # Message handlers that have not reported their metrics within this time are not counted when sampling the backlog
+    MESSAGE_HANDLER_FRESHNESS_THRESHOLD = datetime.timedelta(seconds=30)
+
     def __init__(self):
         """Constructor
         """
@@ -31,7 +36,8 @@ class SystemTaskManager(object):
         self._last_db_update_task_failure = None
         self._when_db_update_completed = None
 
-        self._services = [MessagingService()]
+        self._messaging_service = MessagingService()
+        self._services = [self._messaging_service]
 
         self._lock = threading.Lock()
 
@@ -125,5 +131,33 @@ class SystemTaskManager(object):
                 for service in self._services:
                     service.handle_task_update(task_update)
 
+    def sync_with_messaging(self, when):
+        """Samples the message backlog and processing rate so that the number of message handlers can be scaled
+        automatically. Does nothing unless automatic scaling of message handlers is configured.
+
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        queue_depth = 0
+        handler_counts = {}
+        with self._lock:
+            is_autoscaling = self._messaging_service.is_autoscaling()
+
+        # Query the broker and database outside of the lock
+        if is_autoscaling:
+            try:
+                queue_depth = CommandMessageManager().get_queue_depth()
+            except Exception:
+                logger.exception('Failed to retrieve message queue depth, message handlers will not be scaled')
+                return
+            since = when - SystemTaskManager.MESSAGE_HANDLER_FRESHNESS_THRESHOLD
+            for handler in MessageHandler.objects.get_active_handlers(since):
+                handler_counts[handler.name] = sum(metrics['messages'] - metrics['retried']
+                                                   for metrics in handler.metrics.values())
+
+        with self._lock:
+            self._messaging_service.update_backlog(queue_depth, handler_counts, when)
+
 
 system_task_mgr = SystemTaskManager()
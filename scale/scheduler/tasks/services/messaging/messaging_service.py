@@ -1,13 +1,29 @@
 """Defines the messaging service that handles the backend messaging"""
+from __future__ import division
 from __future__ import unicode_literals
 
+import datetime
 import logging
+import math
 
 from scheduler.manager import scheduler_mgr
 from scheduler.tasks.services.messaging.message_handler_task import MessageHandlerTask
 from scheduler.tasks.services.service import Service
 
 
+# The messages in the queue should be processed within this many seconds at the current processing rate
+TARGET_DRAIN_SECONDS = 60.0
+
+# The backlog is considered low when it would be drained within this fraction of the target
+LOW_WATERMARK = 0.25
+
+# The number of consecutive low backlog samples required before removing a message handler
+SCALE_DOWN_SAMPLES = 6
+
+# Minimum time between adding message handlers, giving newly launched handlers time to affect the processing rate
+SCALE_UP_COOLDOWN = datetime.timedelta(seconds=30)
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,12 +39,127 @@ class MessagingService(Service):
         self._title = 'Messaging'
         self._description = 'Processes the backend messaging system'
 
+        # Autoscaling state, the desired count is None until the backlog has called for a change
+        self._desired_count = None
+        self._handler_counts = {}  # {Handler name: Messages processed}
+        self._last_sample = None
+        self._last_scale_up = None
+        self._low_samples = 0
+
+    def generate_status_json(self):
+        """See :meth:`scheduler.tasks.services.service.Service.generate_status_json`"""
+
+        status_json = super(MessagingService, self).generate_status_json()
+        if self.is_autoscaling():
+            status_json['min_count'] = scheduler_mgr.config.num_message_handlers
+            status_json['max_count'] = scheduler_mgr.config.max_message_handlers
+        return status_json
+
     def get_desired_task_count(self):
         """See :meth:`scheduler.tasks.services.service.Service.get_desired_task_count`"""
 
-        return scheduler_mgr.config.num_message_handlers
+        min_count = scheduler_mgr.config.num_message_handlers
+        if not self.is_autoscaling() or self._desired_count is None:
+            return min_count
+
+        return min(max(self._desired_count, min_count), scheduler_mgr.config.max_message_handlers)
+
+    def is_autoscaling(self):
+        """Indicates whether the number of message handlers is scaled automatically, which is the case when the maximum
+        number of message handlers is greater than the minimum
+
+        :returns: True if the number of message handlers is scaled automatically, False otherwise
+        :rtype: bool
+        """
+
+        max_count = scheduler_mgr.config.max_message_handlers
+        return max_count is not None and max_count > scheduler_mgr.config.num_message_handlers
+
+    def update_backlog(self, queue_depth, handler_counts, when):
+        """Updates the desired number of message handlers from a sample of the message backlog. The processing rate is
+        measured from the change in each handler's processed message count since the previous sample, and the time to
+        drain the queue at that rate is used to decide whether handlers should be added or removed.
+
+        :param queue_depth: The number of messages waiting in the queues
+        :type queue_depth: int
+        :param handler_counts: The total number of messages processed by each active message handler, by name
+        :type handler_counts: dict
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        if not self.is_autoscaling():
+            self._desired_count = None
+            self._reset_sample(handler_counts, when)
+            return
+
+        if self._last_sample is None or when <= self._last_sample:
+            self._reset_sample(handler_counts, when)
+            return
+
+        # Handlers seen for the first time only provide the baseline for the next sample
+        processed = 0
+        for name, count in handler_counts.items():
+            if name in self._handler_counts:
+                processed += max(count - self._handler_counts[name], 0)
+        num_handlers = len([name for name in handler_counts if name in self._handler_counts])
+        rate = processed / (when - self._last_sample).total_seconds()
+        self._reset_sample(handler_counts, when)
+
+        if rate:
+            drain_seconds = queue_depth / rate
+        else:
+            drain_seconds = float('inf') if queue_depth else 0.0
+
+        current_count = self.get_desired_task_count()
+        if drain_seconds > TARGET_DRAIN_SECONDS:
+            self._low_samples = 0
+            if self._last_scale_up and when - self._last_scale_up < SCALE_UP_COOLDOWN:
+                return
+            desired_count = current_count + 1
+            if rate and num_handlers:
+                handler_rate = rate / num_handlers
+                needed_count = int(math.ceil(queue_depth / (handler_rate * TARGET_DRAIN_SECONDS)))
+                desired_count = max(desired_count, needed_count)
+            self._set_desired_count(desired_count)
+            if self.get_desired_task_count() > current_count:
+                self._last_scale_up = when
+                logger.info('Message backlog of %d will take %.0f seconds to drain, scaling up to %d message handlers',
+                            queue_depth, drain_seconds, self.get_desired_task_count())
+        elif drain_seconds < TARGET_DRAIN_SECONDS * LOW_WATERMARK:
+            self._low_samples += 1
+            if self._low_samples >= SCALE_DOWN_SAMPLES:
+                self._low_samples = 0
+                self._set_desired_count(current_count - 1)
+                if self.get_desired_task_count() < current_count:
+                    logger.info('Message backlog is low, scaling down to %d message handlers',
+                                self.get_desired_task_count())
+        else:
+            self._low_samples = 0
 
     def _create_service_task(self):
         """See :meth:`scheduler.tasks.services.service.Service._create_service_task`"""
 
         return MessageHandlerTask(scheduler_mgr.framework_id)
+
+    def _reset_sample(self, handler_counts, when):
+        """Records the given handler counts as the baseline for the next backlog sample
+
+        :param handler_counts: The total number of messages processed by each active message handler, by name
+        :type handler_counts: dict
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        self._handler_counts = dict(handler_counts)
+        self._last_sample = when
+
+    def _set_desired_count(self, desired_count):
+        """Sets the desired number of message handlers, clamped to the configured minimum and maximum
+
+        :param desired_count: The desired number of message handlers
+        :type desired_count: int
+        """
+
+        min_count = scheduler_mgr.config.num_message_handlers
+        self._desired_count = min(max(desired_count, min_count), scheduler_mgr.config.max_message_handlers)
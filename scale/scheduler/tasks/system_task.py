@@ -59,5 +59,12 @@ class SystemTask(Task):
             messaging_params.append(DockerParameter('env', 'SCALE_BROKER_URL=%s' % broker_url))
         if queue_name:
             messaging_params.append(DockerParameter('env', 'SCALE_QUEUE_NAME=%s' % queue_name))
+        messaging_params.append(DockerParameter('env', 'SCALE_MESSAGE_HANDLER_WORKERS=%d' %
+                                                settings.MESSAGE_HANDLER_WORKERS))
+        messaging_params.append(DockerParameter('env', 'SCALE_MESSAGE_HANDLER_PREFETCH=%d' %
+                                                settings.MESSAGE_HANDLER_PREFETCH))
+        messaging_params.append(DockerParameter('env', 'SCALE_MESSAGE_SERIALIZER=%s' % settings.MESSAGE_SERIALIZER))
+        messaging_params.append(DockerParameter('env', 'SCALE_MESSAGE_QUEUE_ROUTING=%s' %
+                                                ('true' if settings.MESSAGE_QUEUE_ROUTES else 'false')))
 
         self._docker_params.extend(messaging_params)
@@ -0,0 +1,65 @@
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+from mock import MagicMock
+
+from scheduler.launch.manager import LaunchManager
+
+
+class TestLaunchManager(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_launches_combined_per_agent(self):
+        """Tests that launches added for the same agent are performed with a single call"""
+
+        client = MagicMock()
+        callback_1 = MagicMock()
+        callback_2 = MagicMock()
+        manager = LaunchManager()
+        manager.add_launch(client, 'agent_1', 'host_1', ['offer_1'], ['task_1'], callback_1)
+        manager.add_launch(client, 'agent_2', 'host_2', ['offer_2'], ['task_2'])
+        manager.add_launch(client, 'agent_1', 'host_1', ['offer_3'], ['task_3'], callback_2)
+        self.assertEqual(manager.get_pending_counts(), (2, 0))
+
+        self.assertEqual(manager.perform_calls(), (2, 0))
+        self.assertEqual(client.combine_offers.call_count, 2)
+        client.combine_offers.assert_any_call(['offer_1', 'offer_3'], ['task_1', 'task_3'])
+        client.combine_offers.assert_any_call(['offer_2'], ['task_2'])
+        callback_1.assert_called_once_with(None)
+        callback_2.assert_called_once_with(None)
+        self.assertEqual(manager.get_pending_counts(), (0, 0))
+
+    def test_failed_launch(self):
+        """Tests that a failed launch passes its error to the callbacks and does not stop the other calls"""
+
+        error = Exception('Master unavailable')
+        client = MagicMock()
+        client.combine_offers.side_effect = [error, None]
+        callback_1 = MagicMock()
+        callback_2 = MagicMock()
+        mesos_offer = MagicMock()
+        manager = LaunchManager()
+        manager.add_launch(client, 'agent_1', 'host_1', ['offer_1'], ['task_1'], callback_1)
+        manager.add_launch(client, 'agent_2', 'host_2', ['offer_2'], ['task_2'], callback_2)
+        manager.add_declines([mesos_offer])
+
+        self.assertEqual(manager.perform_calls(), (2, 1))
+        callback_1.assert_called_once_with(error)
+        callback_2.assert_called_once_with(None)
+        mesos_offer.decline.assert_called_once_with()
+
+    def test_wake_callback(self):
+        """Tests that the wake callback is invoked when calls are added"""
+
+        wake = MagicMock()
+        manager = LaunchManager()
+        manager.set_wake_callback(wake)
+        manager.add_declines([])
+        self.assertFalse(wake.called)
+
+        manager.add_declines([MagicMock()])
+        manager.add_launch(MagicMock(), 'agent_1', 'host_1', ['offer_1'], ['task_1'])
+        self.assertEqual(wake.call_count, 2)
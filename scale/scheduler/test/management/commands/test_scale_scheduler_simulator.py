@@ -0,0 +1,91 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import django
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+from django.utils.six import StringIO
+from django.utils.timezone import now
+from mock import patch
+
+from node.resources.node_resources import NodeResources
+from node.resources.resource import Cpus, Disk, Mem
+from scheduler.management.commands.scale_scheduler_simulator import SimulatedMesosClient, SimulationResults
+from scheduler.node.manager import node_mgr
+
+
+class TestScaleSchedulerSimulator(TransactionTestCase):
+
+    def setUp(self):
+        django.setup()
+
+    # The tests already run against a test database
+    @patch('scheduler.management.commands.scale_scheduler_simulator.separate_test_database')
+    def test_simulation(self, mock_test_database):
+        """Validate that a simulation schedules queued jobs on the simulated nodes and reports on each cycle"""
+
+        out = StringIO()
+        call_command('scale_scheduler_simulator', nodes=2, job_types=2, queued=5, cycles=2, node_cpus=256.0,
+                     node_mem=1048576.0, keepdb=True, stdout=out)
+
+        mock_test_database.assert_called_once_with(True, True, 1)
+        self.assertTrue(mock_test_database.return_value.__enter__.called)
+
+        report = out.getvalue()
+        cycle_lines = [line for line in report.splitlines() if line.split() and line.split()[0] in ('1', '2')]
+        self.assertEqual(len(cycle_lines), 2)
+        self.assertEqual(int(cycle_lines[0].split()[3]), 5)  # All queued jobs fit in the first cycle
+        self.assertIn('Ran 2 cycles', report)
+        self.assertListEqual(node_mgr.get_nodes(), [])  # Simulated nodes are cleared
+
+    def test_invalid_count(self):
+        """Validate that the simulation requires positive counts"""
+
+        with self.assertRaises(CommandError):
+            call_command('scale_scheduler_simulator', nodes=0)
+
+
+class TestSimulatedMesosClient(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_create_offers(self):
+        """Validate that each node offers the resources not used by launched tasks"""
+
+        client = SimulatedMesosClient({'agent_1': NodeResources([Cpus(4.0), Mem(1024.0), Disk(1024.0)]),
+                                       'agent_2': NodeResources([Cpus(2.0), Mem(512.0), Disk(512.0)])})
+        task = {'agent_id': {'value': 'agent_2'},
+                'resources': [{'name': 'cpus', 'type': 'SCALAR', 'scalar': {'value': 2.0}},
+                              {'name': 'mem', 'type': 'SCALAR', 'scalar': {'value': 256.0}}]}
+        client.combine_offers([], [task])
+
+        offers = client.create_offers(now())
+        self.assertEqual(len(offers), 1)  # agent_2 has no CPUs left
+        self.assertEqual(offers[0].agent_id, 'agent_1')
+        self.assertTrue(offers[0].resources.is_equal(NodeResources([Cpus(4.0), Mem(1024.0), Disk(1024.0)])))
+        self.assertTrue(client.get_used_resources().is_equal(NodeResources([Cpus(2.0), Mem(256.0)])))
+
+
+class TestSimulationResults(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_report(self):
+        """Validate the cycle statistics in the simulation report"""
+
+        results = SimulationResults(NodeResources([Cpus(10.0), Mem(1000.0)]))
+        trace_dict = {'queue_rows_examined': 8, 'job_exes_scheduled': 4, 'tasks_launched': 6,
+                      'phases': {'process_queue': 0.5}}
+        results.add_cycle(1.0, trace_dict, NodeResources([Cpus(2.5), Mem(500.0)]))
+        results.add_cycle(3.0, trace_dict, NodeResources([Cpus(5.0), Mem(500.0)]))
+
+        lines = results.get_report().splitlines()
+        self.assertEqual(lines[2].split(), ['1', '1.000', '8', '4', '6', '25.0', '50.0'])
+        self.assertIn('Ran 2 cycles: mean 2.000 seconds, max 3.000 seconds', lines)
+        self.assertIn('Scheduled 8 job executions (4.0 per cycle) and launched 12 tasks (6.0 per cycle)', lines)
+        self.assertIn('Final utilization: 50.0% CPU, 50.0% memory', lines)
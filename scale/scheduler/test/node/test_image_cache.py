@@ -0,0 +1,32 @@
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+
+from scheduler.node.image_cache import ImageCache
+
+
+class TestImageCache(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_add_image(self):
+        """Tests that the least recently pulled images are evicted"""
+
+        cache = ImageCache(max_images=2)
+        cache.add_image('image_1')
+        cache.add_image('image_2')
+        cache.add_image('image_1')  # Pulling again makes image 1 the most recent
+        cache.add_image('image_3')
+
+        self.assertSetEqual(cache.get_images(), {'image_1', 'image_3'})
+
+    def test_clear(self):
+        """Tests that clear() removes all of the images"""
+
+        cache = ImageCache()
+        cache.add_image('image_1')
+        cache.clear()
+
+        self.assertSetEqual(cache.get_images(), set())
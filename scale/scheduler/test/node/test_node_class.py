@@ -605,3 +605,14 @@ class TestNode(TestCase):
         # No pull task due to node not cleaned yet
         for task in tasks:
             self.assertFalse(task.id.startswith(PULL_TASK_ID_PREFIX))
+
+    def test_cached_images(self):
+        """Tests that pulled job images are cached until the node goes offline"""
+
+        node = Node(self.node_agent, self.node, self.scheduler)
+        node.add_pulled_image('image_1')
+        node.add_pulled_image('image_2')
+        self.assertSetEqual(node.get_cached_images(), {'image_1', 'image_2'})
+
+        node.update_from_mesos(is_online=False)
+        self.assertSetEqual(node.get_cached_images(), set())
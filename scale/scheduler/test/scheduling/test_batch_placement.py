@@ -0,0 +1,41 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+from mock import MagicMock
+
+from node.resources.node_resources import NodeResources
+from node.resources.resource import Cpus, Gpus, Mem
+from scheduler.scheduling.batch_placement import get_dominant_share, order_for_batch_placement
+
+
+class TestBatchPlacement(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.max_resources = NodeResources([Cpus(10.0), Mem(1000.0)])
+
+    def test_get_dominant_share(self):
+        """Tests that get_dominant_share() returns the largest fraction of any resource"""
+
+        self.assertEqual(get_dominant_share(NodeResources([Cpus(1.0), Mem(500.0)]), self.max_resources), 0.5)
+        self.assertEqual(get_dominant_share(NodeResources([Cpus(4.0), Mem(100.0)]), self.max_resources), 0.4)
+        # Resources that no node has do not count
+        self.assertEqual(get_dominant_share(NodeResources([Gpus(1.0)]), self.max_resources), 0.0)
+
+    def test_order_for_batch_placement(self):
+        """Tests that job executions are ordered by priority and then from largest to smallest"""
+
+        small = MagicMock(priority=1, required_resources=NodeResources([Cpus(1.0), Mem(10.0)]))
+        large = MagicMock(priority=1, required_resources=NodeResources([Cpus(8.0), Mem(10.0)]))
+        medium = MagicMock(priority=1, required_resources=NodeResources([Cpus(1.0), Mem(500.0)]))
+        medium_2 = MagicMock(priority=1, required_resources=NodeResources([Cpus(5.0), Mem(10.0)]))
+        low_priority_large = MagicMock(priority=2, required_resources=NodeResources([Cpus(10.0), Mem(1000.0)]))
+
+        job_exes = [low_priority_large, small, medium, large, medium_2]
+        ordered = order_for_batch_placement(job_exes, self.max_resources)
+
+        # Job executions of the same size keep their queue order
+        self.assertListEqual(ordered, [large, medium, medium_2, small, low_priority_large])
@@ -0,0 +1,68 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import datetime
+
+import django
+from django.test import TestCase
+from django.utils.timezone import now
+from mock import MagicMock
+
+from scheduler.scheduling.data_locality import DataLocality, LOCALITY_PERIOD, MIN_INPUT_FILE_SIZE
+
+
+def create_job_exe(file_ids, workspace_names, input_file_size=MIN_INPUT_FILE_SIZE, node_id=None):
+    """Creates a queued job execution with the given input data"""
+
+    job_exe = MagicMock(is_canceled=False, input_file_size=input_file_size, scheduled_node_id=node_id)
+    job_exe.configuration.get_input_file_ids.return_value = file_ids
+    job_exe.configuration.get_input_workspace_names.return_value = workspace_names
+    return job_exe
+
+
+class TestDataLocality(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_get_node_locality(self):
+        """Tests that get_node_locality() counts the input files and workspaces recently used on each node"""
+
+        when = now()
+        locality = DataLocality()
+        locality.add_scheduled_job_exes([create_job_exe([1, 2], ['wksp_1'], node_id=1),
+                                         create_job_exe([2, 3], ['wksp_2'], node_id=2),
+                                         create_job_exe([4], ['wksp_1'], node_id=3)], when)
+
+        job_exe = create_job_exe([2, 3], ['wksp_1', 'wksp_2'])
+        self.assertDictEqual(locality.get_node_locality(job_exe), {1: (1, 1), 2: (2, 1), 3: (0, 1)})
+
+        # Job executions with small inputs are not placed by locality
+        job_exe = create_job_exe([2, 3], ['wksp_1', 'wksp_2'], input_file_size=1.0)
+        self.assertDictEqual(locality.get_node_locality(job_exe), {})
+
+    def test_canceled_job_exe(self):
+        """Tests that canceled job executions do not record any input data"""
+
+        job_exe = create_job_exe([1], ['wksp_1'], node_id=1)
+        job_exe.is_canceled = True
+        locality = DataLocality()
+        locality.add_scheduled_job_exes([job_exe], now())
+
+        self.assertDictEqual(locality.get_node_locality(create_job_exe([1], ['wksp_1'])), {})
+
+    def test_prune(self):
+        """Tests that prune() removes input data that has not been used within the locality period"""
+
+        when = now()
+        locality = DataLocality()
+        locality.add_scheduled_job_exes([create_job_exe([1], ['wksp_1'], node_id=1)], when - LOCALITY_PERIOD)
+        locality.add_scheduled_job_exes([create_job_exe([1], [], node_id=2)], when)
+
+        locality.prune(when - datetime.timedelta(seconds=1))
+        job_exe = create_job_exe([1], ['wksp_1'])
+        self.assertDictEqual(locality.get_node_locality(job_exe), {1: (1, 1), 2: (1, 0)})
+
+        # Pruning is periodic, so wait a while before pruning again
+        locality.prune(when + LOCALITY_PERIOD + datetime.timedelta(seconds=1))
+        self.assertDictEqual(locality.get_node_locality(job_exe), {})
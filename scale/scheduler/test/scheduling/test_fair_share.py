@@ -0,0 +1,126 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+from django.utils.timezone import now
+from mock import MagicMock, patch
+
+from node.resources.node_resources import NodeResources
+from node.resources.resource import Cpus, Mem
+from recipe.test import utils as recipe_test_utils
+from scheduler.models import FAIR_SHARE_BATCH, FAIR_SHARE_JOB_TYPE, FAIR_SHARE_NONE, FAIR_SHARE_RECIPE_TYPE
+from scheduler.scheduling.fair_share import FairShare, USAGE_HALF_LIFE
+
+MAX_RESOURCES = NodeResources([Cpus(10.0), Mem(10240.0)])
+
+
+def create_job_exe(name, job_type_id=1, priority=100, batch_id=None, recipe_id=None, cpus=1.0):
+    """Creates a queued job execution for the given group"""
+
+    return MagicMock(name=name, is_canceled=False, job_type_id=job_type_id, priority=priority, batch_id=batch_id,
+                     recipe_id=recipe_id, required_resources=NodeResources([Cpus(cpus), Mem(1024.0)]))
+
+
+class TestFairShare(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_none_mode(self):
+        """Tests that the queue order is kept when fair share is disabled"""
+
+        queue = [create_job_exe('a1', job_type_id=1), create_job_exe('a2', job_type_id=1),
+                 create_job_exe('b1', job_type_id=2)]
+
+        fair_share = FairShare()
+        self.assertListEqual(list(fair_share.order_queue(queue, FAIR_SHARE_NONE, {}, MAX_RESOURCES, now())), queue)
+
+    def test_interleave_job_types(self):
+        """Tests that job types with the same priority are interleaved"""
+
+        a1, a2, a3, a4 = [create_job_exe('a%i' % i, job_type_id=1) for i in range(1, 5)]
+        b1, b2 = [create_job_exe('b%i' % i, job_type_id=2) for i in range(1, 3)]
+        queue = [a1, a2, a3, a4, b1, b2]
+
+        fair_share = FairShare()
+        order = list(fair_share.order_queue(queue, FAIR_SHARE_JOB_TYPE, {}, MAX_RESOURCES, now()))
+        self.assertListEqual(order, [a1, b1, a2, b2, a3, a4])
+
+    @patch('scheduler.scheduling.fair_share.GROUPING_WINDOW', 2)
+    def test_grouping_window(self):
+        """Tests that the queue is only read as far as needed and that groups join once the window reaches them"""
+
+        a1, a2, a3, a4 = [create_job_exe('a%i' % i, job_type_id=1) for i in range(1, 5)]
+        b1, b2 = [create_job_exe('b%i' % i, job_type_id=2) for i in range(1, 3)]
+        queue = [a1, a2, a3, a4, b1, b2]
+        read = []
+
+        def generate_queue():
+            for job_exe in queue:
+                read.append(job_exe)
+                yield job_exe
+
+        fair_share = FairShare()
+        order = fair_share.order_queue(generate_queue(), FAIR_SHARE_JOB_TYPE, {}, MAX_RESOURCES, now())
+        self.assertListEqual([next(order), next(order)], [a1, a2])
+        self.assertListEqual(read, [a1, a2, a3])
+        self.assertListEqual(list(order), [a3, b1, b2, a4])
+
+    def test_priority_kept(self):
+        """Tests that fair share only interleaves job executions with the same priority"""
+
+        a1, a2 = [create_job_exe('a%i' % i, batch_id=1, priority=50) for i in range(1, 3)]
+        b1 = create_job_exe('b1', batch_id=2, priority=50)
+        c1 = create_job_exe('c1', batch_id=2, priority=100)
+        queue = [a1, a2, b1, c1]
+
+        fair_share = FairShare()
+        order = list(fair_share.order_queue(queue, FAIR_SHARE_BATCH, {}, MAX_RESOURCES, now()))
+        self.assertListEqual(order, [a1, b1, a2, c1])
+
+    def test_usage_and_weights(self):
+        """Tests that recent usage and weights determine which group goes first"""
+
+        when = now()
+        fair_share = FairShare()
+        list(fair_share.order_queue([], FAIR_SHARE_BATCH, {}, MAX_RESOURCES, when))
+        fair_share.add_scheduled_job_exes([create_job_exe('a0', batch_id=1, cpus=5.0)], MAX_RESOURCES)
+        self.assertDictEqual(fair_share.get_usage(), {1: 0.5})
+
+        a1, a2, a3 = [create_job_exe('a%i' % i, batch_id=1) for i in range(1, 4)]
+        b1, b2, b3 = [create_job_exe('b%i' % i, batch_id=None) for i in range(1, 4)]
+        queue = [a1, a2, a3, b1, b2, b3]
+
+        # Batch 1 has used 0.5 while work outside of a batch has used nothing
+        order = list(fair_share.order_queue(queue, FAIR_SHARE_BATCH, {}, MAX_RESOURCES, when))
+        self.assertListEqual(order[:5], [b1, b2, b3, a1, a2])
+
+        # Batch 1 has 10 times the weight, so its usage counts for a tenth as much
+        order = list(fair_share.order_queue(queue, FAIR_SHARE_BATCH, {'1': 10.0}, MAX_RESOURCES, when))
+        self.assertListEqual(order[:3], [b1, a1, a2])
+
+        # Usage is halved after the half life
+        list(fair_share.order_queue([], FAIR_SHARE_BATCH, {}, MAX_RESOURCES, when + USAGE_HALF_LIFE))
+        self.assertAlmostEqual(fair_share.get_usage()[1], 0.25)
+
+        # Changing the mode resets usage
+        list(fair_share.order_queue([], FAIR_SHARE_JOB_TYPE, {}, MAX_RESOURCES, when + USAGE_HALF_LIFE))
+        self.assertDictEqual(fair_share.get_usage(), {})
+
+    def test_recipe_types(self):
+        """Tests that recipes of the same recipe type are grouped together"""
+
+        recipe_type_1 = recipe_test_utils.create_recipe_type_v6()
+        recipe_type_2 = recipe_test_utils.create_recipe_type_v6()
+        recipe_1 = recipe_test_utils.create_recipe(recipe_type=recipe_type_1)
+        recipe_2 = recipe_test_utils.create_recipe(recipe_type=recipe_type_1)
+        recipe_3 = recipe_test_utils.create_recipe(recipe_type=recipe_type_2)
+        a1 = create_job_exe('a1', recipe_id=recipe_1.id)
+        a2 = create_job_exe('a2', recipe_id=recipe_2.id)
+        b1 = create_job_exe('b1', recipe_id=recipe_3.id)
+        queue = [a1, a2, b1]
+
+        fair_share = FairShare()
+        order = list(fair_share.order_queue(queue, FAIR_SHARE_RECIPE_TYPE, {}, MAX_RESOURCES, now()))
+        self.assertListEqual(order, [a1, b1, a2])
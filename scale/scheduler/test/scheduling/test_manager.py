@@ -16,13 +16,14 @@ from node.resources.resource import Cpus, Disk, Mem
 from queue.models import Queue
 from queue.test import utils as queue_test_utils
 from scheduler.cleanup.manager import cleanup_mgr
-from scheduler.manager import scheduler_mgr
-from scheduler.models import Scheduler
+from scheduler.launch.manager import launch_mgr
+from scheduler.manager import scheduler_mgr, SchedulerWarning
+from scheduler.models import Scheduler, SCHEDULING_MODE_BATCH
 from scheduler.node.agent import Agent
 from scheduler.node.manager import node_mgr
 from scheduler.resources.manager import resource_mgr
 from scheduler.resources.offer import ResourceOffer
-from scheduler.scheduling.manager import SchedulingManager
+from scheduler.scheduling.manager import INVALID_RESOURCES, SchedulingManager
 from scheduler.sync.job_type_manager import job_type_mgr
 from scheduler.tasks.manager import system_task_mgr
 
@@ -44,6 +45,7 @@ class TestSchedulingManager(TestCase):
         scheduler_mgr.update_from_mesos(framework_id=self.framework_id)
         resource_mgr.clear()
         job_exe_mgr.clear()
+        launch_mgr.clear()
 
         self.agent_1 = Agent('agent_1', 'host_1')
         self.agent_2 = Agent('agent_2', 'host_2')
@@ -89,6 +91,24 @@ class TestSchedulingManager(TestCase):
         self.assertEqual(JobExecution.objects.filter(job_id=self.queue_large.job_id).count(), 0)
         self.assertEqual(Queue.objects.filter(id__in=[self.queue_1.id, self.queue_2.id]).count(), 0)
 
+    def test_launch_performed_by_launch_manager(self):
+        """Tests that perform_scheduling() leaves the Mesos launch calls to the launch manager"""
+        offer_1 = ResourceOffer('offer_1', self.agent_1.agent_id, self.framework_id,
+                                NodeResources([Cpus(2.0), Mem(1024.0), Disk(1024.0)]), now(), None)
+        offer_2 = ResourceOffer('offer_2', self.agent_2.agent_id, self.framework_id,
+                                NodeResources([Cpus(25.0), Mem(2048.0), Disk(2048.0)]), now(), None)
+        resource_mgr.add_new_offers([offer_1, offer_2])
+        scheduling_manager = SchedulingManager()
+        num_tasks = scheduling_manager.perform_scheduling(self._client, now())
+
+        self.assertEqual(num_tasks, 2)
+        self.assertFalse(self._client.combine_offers.called)
+        num_launches, _ = launch_mgr.perform_calls()
+        self.assertGreater(num_launches, 0)
+        self.assertEqual(self._client.combine_offers.call_count, num_launches)
+        num_mesos_tasks = sum(len(call[0][1]) for call in self._client.combine_offers.call_args_list)
+        self.assertEqual(num_mesos_tasks, 2)
+
     def test_increased_resources(self):
         """Tests calling perform_scheduling() with more resources"""
         offer_1 = ResourceOffer('offer_1', self.agent_1.agent_id, self.framework_id,
@@ -106,6 +126,61 @@ class TestSchedulingManager(TestCase):
         self.assertEqual(JobExecution.objects.filter(job_id=self.queue_large.job_id).count(), 1)
         self.assertEqual(Queue.objects.filter(id__in=[self.queue_1.id, self.queue_2.id, self.queue_large.id]).count(), 0)
 
+    def test_no_node_fits(self):
+        """Tests calling perform_scheduling() when a queued job execution is within the cluster's max resources but
+        does not fit on any single node"""
+        # The large job execution fits within the cluster's max of each resource, but no node has enough of all three
+        offer_1 = ResourceOffer('offer_1', self.agent_1.agent_id, self.framework_id,
+                                NodeResources([Cpus(225.0), Mem(1024.0), Disk(22048.0)]), now(), None)
+        offer_2 = ResourceOffer('offer_2', self.agent_2.agent_id, self.framework_id,
+                                NodeResources([Cpus(2.0), Mem(22048.0), Disk(22048.0)]), now(), None)
+        resource_mgr.add_new_offers([offer_1, offer_2])
+        job_type_name = self.queue_large.job_type.name
+        warning = SchedulerWarning(name=INVALID_RESOURCES.name + job_type_name,
+                                   title=INVALID_RESOURCES.title % job_type_name, description=None)
+        scheduling_manager = SchedulingManager()
+        scheduling_manager.perform_scheduling(self._client, now())
+
+        self.assertEqual(JobExecution.objects.filter(job_id=self.queue_large.job_id).count(), 0)
+        self.assertEqual(Queue.objects.filter(id=self.queue_large.id).count(), 1)
+        self.assertTrue(scheduler_mgr.is_warning_active(warning))
+
+    def test_batch_scheduling_mode(self):
+        """Tests calling perform_scheduling() in batch scheduling mode"""
+        Scheduler.objects.update(scheduling_mode=SCHEDULING_MODE_BATCH)
+        scheduler_mgr.sync_with_database()
+        offer_1 = ResourceOffer('offer_1', self.agent_1.agent_id, self.framework_id,
+                                NodeResources([Cpus(2.0), Mem(1024.0), Disk(1024.0)]), now(), None)
+        offer_2 = ResourceOffer('offer_2', self.agent_2.agent_id, self.framework_id,
+                                NodeResources([Cpus(225.0), Mem(22048.0), Disk(22048.0)]), now(), None)
+        resource_mgr.add_new_offers([offer_1, offer_2])
+        scheduling_manager = SchedulingManager()
+        num_tasks = scheduling_manager.perform_scheduling(self._client, now())
+
+        self.assertEqual(num_tasks, 3)  # Schedule all queued job executions
+        self.assertEqual(JobExecution.objects.filter(job_id=self.queue_large.job_id).count(), 1)
+        self.assertEqual(Queue.objects.filter(id__in=[self.queue_1.id, self.queue_2.id, self.queue_large.id]).count(), 0)
+
+    def test_batch_scheduling_mode_job_type_limit(self):
+        """Tests calling perform_scheduling() in batch scheduling mode with a job type limit"""
+        Scheduler.objects.update(scheduling_mode=SCHEDULING_MODE_BATCH)
+        scheduler_mgr.sync_with_database()
+        Queue.objects.all().delete()
+        job_type_with_limit = job_test_utils.create_job_type()
+        job_type_with_limit.max_scheduled = 2
+        job_type_with_limit.save()
+        for _ in range(4):
+            queue_test_utils.create_queue(job_type=job_type_with_limit)
+        job_type_mgr.sync_with_database()
+
+        offer_1 = ResourceOffer('offer_1', self.agent_1.agent_id, self.framework_id,
+                                NodeResources([Cpus(25.0), Mem(2048.0), Disk(2048.0)]), now(), None)
+        resource_mgr.add_new_offers([offer_1])
+
+        scheduling_manager = SchedulingManager()
+        num_tasks = scheduling_manager.perform_scheduling(self._client, now())
+        self.assertEqual(num_tasks, 2)  # All four fit, but only two are allowed to be scheduled
+
     def test_node_with_new_agent_id(self):
         """Tests successfully calling perform_scheduling() when a node get a new agent ID"""
         # Host 2 gets new agent ID of agent_3
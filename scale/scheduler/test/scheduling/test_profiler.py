@@ -0,0 +1,79 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import datetime
+
+import django
+from django.test import TestCase
+from django.utils.timezone import now
+
+from scheduler.scheduling.profiler import (MAX_TRACES, SKIPPED_NO_NODE, SKIPPED_UNMET_RESOURCES, SchedulingCycleTrace,
+                                           SchedulingProfiler)
+from util.parse import datetime_to_string
+
+
+class TestSchedulingCycleTrace(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_get_json(self):
+        """Tests that get_json() returns the recorded phases, counts and skip reasons"""
+
+        started = now()
+        trace = SchedulingCycleTrace(started)
+        with trace.phase('process_queue'):
+            pass
+        with trace.phase('process_queue'):
+            pass
+        trace.num_nodes = 3
+        trace.num_queue_rows = 10
+        trace.add_skipped(SKIPPED_NO_NODE)
+        trace.add_skipped(SKIPPED_NO_NODE)
+        trace.add_skipped(SKIPPED_UNMET_RESOURCES)
+        trace.finished(started + datetime.timedelta(seconds=2))
+
+        trace_json = trace.get_json()
+        self.assertEqual(trace_json['started'], datetime_to_string(started))
+        self.assertEqual(trace_json['duration_seconds'], 2.0)
+        self.assertListEqual(trace_json['phases'].keys(), ['process_queue'])
+        self.assertEqual(trace_json['nodes'], 3)
+        self.assertEqual(trace_json['queue_rows_examined'], 10)
+        self.assertDictEqual(trace_json['skipped'], {SKIPPED_NO_NODE: 2, SKIPPED_UNMET_RESOURCES: 1})
+
+    def test_phase_with_exception(self):
+        """Tests that a phase records its time even when an exception is raised within it"""
+
+        trace = SchedulingCycleTrace(now())
+        try:
+            with trace.phase('launch_tasks'):
+                raise ValueError()
+        except ValueError:
+            pass
+
+        self.assertIn('launch_tasks', trace.get_json()['phases'])
+        self.assertIsNone(trace.get_json()['duration_seconds'])
+
+
+class TestSchedulingProfiler(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_get_traces_json(self):
+        """Tests that get_traces_json() returns the most recent traces, newest first"""
+
+        profiler = SchedulingProfiler()
+        started = now()
+        for i in range(MAX_TRACES + 5):
+            trace = SchedulingCycleTrace(started + datetime.timedelta(seconds=i))
+            trace.num_nodes = i
+            profiler.add_trace(trace)
+
+        traces_json = profiler.get_traces_json()
+        self.assertEqual(len(traces_json), MAX_TRACES)
+        self.assertEqual(traces_json[0]['nodes'], MAX_TRACES + 4)
+        self.assertEqual(traces_json[-1]['nodes'], 5)
+
+        profiler.clear()
+        self.assertListEqual(profiler.get_traces_json(), [])
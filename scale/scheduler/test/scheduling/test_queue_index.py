@@ -0,0 +1,121 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import datetime
+
+import django
+from django.test import TestCase
+from django.utils.timezone import now
+from mock import ANY, patch
+
+from queue.models import Queue, QUEUE_ORDER_FIFO, QUEUE_ORDER_LIFO
+from queue.test import utils as queue_test_utils
+from scheduler.scheduling.queue_index import QueueIndex, RECONCILE_PERIOD
+
+
+class TestQueueIndex(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        when = now()
+        self.queue_1 = queue_test_utils.create_queue(priority=2, queued=when - datetime.timedelta(minutes=3))
+        self.queue_2 = queue_test_utils.create_queue(priority=1, queued=when - datetime.timedelta(minutes=2))
+        self.queue_3 = queue_test_utils.create_queue(priority=1, queued=when - datetime.timedelta(minutes=1))
+
+    def test_get_queue(self):
+        """Tests that get_queue() orders the queue by priority and then by the queue mode"""
+
+        index = QueueIndex()
+        index.sync_with_database(now())
+
+        fifo_ids = [job_exe.id for job_exe in index.get_queue(QUEUE_ORDER_FIFO)]
+        self.assertListEqual(fifo_ids, [self.queue_2.id, self.queue_3.id, self.queue_1.id])
+        lifo_ids = [job_exe.id for job_exe in index.get_queue(QUEUE_ORDER_LIFO)]
+        self.assertListEqual(lifo_ids, [self.queue_3.id, self.queue_2.id, self.queue_1.id])
+
+        ignore_ids = {self.queue_2.job_type_id}
+        fifo_ids = [job_exe.id for job_exe in index.get_queue(QUEUE_ORDER_FIFO, ignore_ids)]
+        self.assertListEqual(fifo_ids, [self.queue_3.id, self.queue_1.id])
+
+    def test_sync_new_queue_models(self):
+        """Tests that only new queue models are retrieved between reconciliations"""
+
+        when = now()
+        index = QueueIndex()
+        index.sync_with_database(when)
+        self.assertEqual(len(index), 3)
+
+        queue_4 = queue_test_utils.create_queue(priority=0)
+        with patch('scheduler.scheduling.queue_index.QueuedJobExecution') as mock_job_exe:
+            mock_job_exe.return_value.priority = 0
+            index.sync_with_database(when + datetime.timedelta(seconds=1))
+
+        # Only the new queue model was parsed
+        mock_job_exe.assert_called_once_with(queue_4, ANY)
+        self.assertEqual(len(index), 4)
+
+    def test_shared_interface_parsed_once(self):
+        """Tests that each shared interface is only retrieved and parsed once"""
+
+        self.assertEqual(len({self.queue_1.shared_interface_id, self.queue_2.shared_interface_id,
+                              self.queue_3.shared_interface_id}), 1)
+
+        index = QueueIndex()
+        with patch('queue.models.QueueInterface.get_job_interface') as mock_get_job_interface:
+            index.sync_with_database(now())
+
+        self.assertEqual(mock_get_job_interface.call_count, 1)
+        interfaces = {id(job_exe.interface) for job_exe in index.get_queue(QUEUE_ORDER_FIFO)}
+        self.assertEqual(len(interfaces), 1)
+
+    def test_sync_reconcile(self):
+        """Tests that a reconciliation picks up deleted queue models and priority and cancellation changes"""
+
+        when = now()
+        index = QueueIndex()
+        index.sync_with_database(when)
+
+        Queue.objects.filter(id=self.queue_2.id).delete()
+        Queue.objects.filter(id=self.queue_1.id).update(priority=0, is_canceled=True)
+
+        # Not yet reconciled
+        index.sync_with_database(when + datetime.timedelta(seconds=1))
+        self.assertEqual(len(index), 3)
+
+        index.sync_with_database(when + RECONCILE_PERIOD)
+        job_exes = list(index.get_queue(QUEUE_ORDER_FIFO))
+        self.assertListEqual([job_exe.id for job_exe in job_exes], [self.queue_1.id, self.queue_3.id])
+        self.assertTrue(job_exes[0].is_canceled)
+
+    def test_get_queue_incremental(self):
+        """Tests that the queue order is kept as queued job executions are added, reprioritized and removed"""
+
+        when = now()
+        index = QueueIndex()
+        index.sync_with_database(when)
+        self.assertListEqual([job_exe.id for job_exe in index.get_queue(QUEUE_ORDER_FIFO)],
+                             [self.queue_2.id, self.queue_3.id, self.queue_1.id])
+
+        queue_4 = queue_test_utils.create_queue(priority=1, queued=when - datetime.timedelta(minutes=4))
+        index.sync_with_database(when + datetime.timedelta(seconds=1))
+        self.assertListEqual([job_exe.id for job_exe in index.get_queue(QUEUE_ORDER_FIFO)],
+                             [queue_4.id, self.queue_2.id, self.queue_3.id, self.queue_1.id])
+
+        Queue.objects.filter(id=self.queue_1.id).update(priority=0)
+        index.sync_with_database(when + RECONCILE_PERIOD)
+        index.remove_queued_job_exes([self.queue_2.id])
+        self.assertListEqual([job_exe.id for job_exe in index.get_queue(QUEUE_ORDER_FIFO)],
+                             [self.queue_1.id, queue_4.id, self.queue_3.id])
+        self.assertListEqual([job_exe.id for job_exe in index.get_queue(QUEUE_ORDER_LIFO)],
+                             [self.queue_1.id, self.queue_3.id, queue_4.id])
+
+    def test_remove_queued_job_exes(self):
+        """Tests that removed queued job executions are no longer returned"""
+
+        index = QueueIndex()
+        index.sync_with_database(now())
+        index.remove_queued_job_exes([self.queue_2.id])
+
+        job_exe_ids = [job_exe.id for job_exe in index.get_queue(QUEUE_ORDER_FIFO)]
+        self.assertListEqual(job_exe_ids, [self.queue_3.id, self.queue_1.id])
@@ -0,0 +1,121 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import random
+from unittest import skipUnless
+
+import django
+from django.test import TestCase
+from mock import MagicMock
+
+from node.resources.node_resources import NodeResources
+from node.resources.resource import Cpus, Disk, Mem, ScalarResource
+from scheduler.resources.agent import ResourceSet
+from scheduler.scheduling import resource_matrix
+from scheduler.scheduling.resource_matrix import ResourceMatrix
+from scheduler.scheduling.scheduling_node import SchedulingNode
+
+
+def create_scheduling_node(node_id, offered_resources, task_resources, watermark_resources):
+    """Creates a scheduling node that is ready for new job executions"""
+
+    node = MagicMock()
+    node.hostname = 'host_%d' % node_id
+    node.id = node_id
+    node.is_ready_for_new_job.return_value = True
+    node.is_ready_for_next_job_task.return_value = True
+    resource_set = ResourceSet(offered_resources, task_resources, watermark_resources)
+    return SchedulingNode('agent_%d' % node_id, node, [], [], resource_set)
+
+
+@skipUnless(resource_matrix.is_available(), 'NumPy is not installed')
+class TestResourceMatrix(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.job_type_resources = [NodeResources([Cpus(1.0), Mem(10.0)]), NodeResources([Cpus(4.0), Mem(100.0)]),
+                                   NodeResources([Cpus(16.0), Mem(1024.0)]),
+                                   NodeResources([Cpus(1.0), Mem(10.0), ScalarResource('foo', 1.0)])]
+
+    def test_get_best_node(self):
+        """Tests that get_best_node() picks the node with the lowest score"""
+
+        # Node 1 would be left with room for the two small job types, node 2 only the smallest
+        node_1 = create_scheduling_node(1, NodeResources([Cpus(10.0), Mem(200.0)]), NodeResources(),
+                                        NodeResources([Cpus(10.0), Mem(200.0)]))
+        node_2 = create_scheduling_node(2, NodeResources([Cpus(4.0), Mem(100.0)]), NodeResources(),
+                                        NodeResources([Cpus(4.0), Mem(100.0)]))
+        matrix = ResourceMatrix([node_1, node_2], self.job_type_resources)
+
+        node, score = matrix.get_best_node(NodeResources([Cpus(2.0), Mem(20.0)]))
+        self.assertEqual(node, node_2)
+        self.assertEqual(score, 1)
+
+        # Too big for either node
+        self.assertEqual(matrix.get_best_node(NodeResources([Cpus(20.0)])), (None, None))
+        # Resource that no node has
+        self.assertEqual(matrix.get_best_node(NodeResources([ScalarResource('bar', 1.0)])), (None, None))
+
+        # Once node 2 is removed, node 1 is the only choice
+        matrix.remove_node(2)
+        node, score = matrix.get_best_node(NodeResources([Cpus(2.0), Mem(20.0)]))
+        self.assertEqual(node, node_1)
+        self.assertEqual(score, 2)
+
+    def test_get_best_node_cached_image(self):
+        """Tests that get_best_node() prefers nodes that have the Docker image cached"""
+
+        node_1 = create_scheduling_node(1, NodeResources([Cpus(10.0), Mem(200.0)]), NodeResources(),
+                                        NodeResources([Cpus(10.0), Mem(200.0)]))
+        node_2 = create_scheduling_node(2, NodeResources([Cpus(4.0), Mem(100.0)]), NodeResources(),
+                                        NodeResources([Cpus(4.0), Mem(100.0)]))
+        node_1._cached_images = {'image_1'}
+        node_2._cached_images = set()
+        matrix = ResourceMatrix([node_1, node_2], self.job_type_resources)
+        resources = NodeResources([Cpus(2.0), Mem(20.0)])
+
+        self.assertEqual(matrix.get_best_node(resources, 'image_1'), (node_1, 2))
+        # Without a node that has the image cached, the best score wins
+        self.assertEqual(matrix.get_best_node(resources, 'image_2'), (node_2, 1))
+        self.assertEqual(matrix.get_best_node(NodeResources([Cpus(12.0)]), 'image_1'), (None, None))
+
+    def test_update_node(self):
+        """Tests that allocating resources on a node is reflected once the node is updated"""
+
+        node_1 = create_scheduling_node(1, NodeResources([Cpus(4.0), Mem(100.0)]), NodeResources(),
+                                        NodeResources([Cpus(4.0), Mem(100.0)]))
+        matrix = ResourceMatrix([node_1], self.job_type_resources)
+        job_exe = MagicMock(priority=1, required_resources=NodeResources([Cpus(3.0), Mem(50.0)]))
+
+        self.assertTrue(node_1.accept_new_job_exe(job_exe))
+        matrix.update_node(node_1)
+
+        self.assertEqual(matrix.get_best_node(NodeResources([Cpus(2.0)])), (None, None))
+        self.assertEqual(matrix.get_best_node(NodeResources([Cpus(1.0), Mem(10.0)])), (node_1, 0))
+
+    def test_scores_match_scheduling_node(self):
+        """Tests that the matrix scores match those calculated by each scheduling node"""
+
+        rand = random.Random(5)
+        nodes = []
+        for node_id in range(50):
+            watermark = [Cpus(rand.choice([8.0, 16.0, 32.0])), Mem(rand.choice([1024.0, 4096.0])), Disk(1024.0)]
+            if rand.random() < 0.3:
+                watermark.append(ScalarResource('foo', 2.0))
+            tasks = NodeResources([Cpus(rand.uniform(0.0, 8.0)), Mem(rand.uniform(0.0, 1024.0))])
+            offered = NodeResources([Cpus(rand.uniform(0.0, 8.0)), Mem(rand.uniform(0.0, 1024.0)), Disk(512.0)])
+            nodes.append(create_scheduling_node(node_id, offered, tasks, NodeResources(watermark)))
+        matrix = ResourceMatrix(nodes, self.job_type_resources)
+
+        for _ in range(100):
+            resources = NodeResources([Cpus(rand.uniform(0.5, 6.0)), Mem(rand.uniform(10.0, 800.0))])
+            expected_node = None
+            expected_score = None
+            for node in nodes:
+                score = node._score_resources_for_scheduling(resources, self.job_type_resources)
+                if score is not None and (expected_node is None or score < expected_score):
+                    expected_node = node
+                    expected_score = score
+
+            self.assertEqual(matrix.get_best_node(resources), (expected_node, expected_score))
@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 import django
 from django.test import TestCase
 
+from job.models import JobType
 from scheduler.sync.job_type_manager import JobTypeManager
 
 
@@ -22,3 +23,23 @@ class TestJobTypeManager(TestCase):
         manager.generate_status_json(status_dict)
 
         self.assertEqual(len(status_dict['job_types']), 1)
+
+    def test_update_unmet_resources(self):
+        """Tests that unmet resources are only saved to the database when they change"""
+
+        manager = JobTypeManager()
+        manager.sync_with_database()
+        job_type_id = manager.get_job_types().keys()[0]
+
+        manager.update_unmet_resources({job_type_id: 'gpus'})
+        self.assertEqual(manager.get_job_type(job_type_id).unmet_resources, 'gpus')
+        self.assertEqual(JobType.objects.get(id=job_type_id).unmet_resources, 'gpus')
+
+        # Unchanged resources are not saved again
+        JobType.objects.filter(id=job_type_id).update(unmet_resources='cpus')
+        manager.update_unmet_resources({job_type_id: 'gpus'})
+        self.assertEqual(JobType.objects.get(id=job_type_id).unmet_resources, 'cpus')
+
+        manager.update_unmet_resources({job_type_id: None})
+        self.assertIsNone(manager.get_job_type(job_type_id).unmet_resources)
+        self.assertIsNone(JobType.objects.get(id=job_type_id).unmet_resources)
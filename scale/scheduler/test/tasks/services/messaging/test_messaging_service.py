@@ -1,5 +1,7 @@
 from __future__ import unicode_literals
 
+import datetime
+
 import django
 from django.test import TestCase
 from django.utils.timezone import now
@@ -8,7 +10,7 @@ from job.tasks.manager import task_mgr
 from job.tasks.update import TaskStatusUpdate
 from job.test import utils as job_test_utils
 from scheduler.manager import scheduler_mgr
-from scheduler.tasks.services.messaging.messaging_service import MessagingService
+from scheduler.tasks.services.messaging.messaging_service import MessagingService, SCALE_DOWN_SAMPLES
 
 
 class TestMessagingService(TestCase):
@@ -16,6 +18,8 @@ class TestMessagingService(TestCase):
     def setUp(self):
         django.setup()
 
+        scheduler_mgr.config.max_message_handlers = None
+
     def test_generate_status_json(self):
         """Tests calling generate_status_json() successfully"""
 
@@ -92,3 +96,88 @@ class TestMessagingService(TestCase):
         # Should get one new task to schedule
         tasks = service.get_tasks_to_schedule()
         self.assertEqual(len(tasks), 1)
+
+    def test_autoscaling_disabled(self):
+        """Tests that the backlog does not change the desired count when autoscaling is disabled"""
+
+        scheduler_mgr.config.num_message_handlers = 2
+        scheduler_mgr.config.max_message_handlers = None
+        service = MessagingService()
+        when = now()
+
+        service.update_backlog(0, {'handler_1': 0}, when)
+        service.update_backlog(100000, {'handler_1': 10}, when + datetime.timedelta(seconds=10))
+
+        self.assertFalse(service.is_autoscaling())
+        self.assertEqual(service.get_desired_task_count(), 2)
+
+    def test_autoscaling_scale_up(self):
+        """Tests that handlers are added when the backlog would take too long to drain"""
+
+        scheduler_mgr.config.num_message_handlers = 2
+        scheduler_mgr.config.max_message_handlers = 10
+        service = MessagingService()
+        when = now()
+
+        # First sample only records the baseline
+        service.update_backlog(2500, {'handler_1': 0, 'handler_2': 0}, when)
+        self.assertEqual(service.get_desired_task_count(), 2)
+
+        # Each handler processes 5 messages/s, so 2500 messages need 9 handlers to drain within 60 seconds
+        when += datetime.timedelta(seconds=10)
+        service.update_backlog(2500, {'handler_1': 50, 'handler_2': 50}, when)
+        self.assertEqual(service.get_desired_task_count(), 9)
+        self.assertEqual(len(service.get_tasks_to_schedule()), 9)
+
+        # No further scale up during the cooldown, and never beyond the maximum
+        when += datetime.timedelta(seconds=10)
+        service.update_backlog(50000, {'handler_1': 100, 'handler_2': 100}, when)
+        self.assertEqual(service.get_desired_task_count(), 9)
+        when += datetime.timedelta(seconds=30)
+        service.update_backlog(50000, {'handler_1': 250, 'handler_2': 250}, when)
+        self.assertEqual(service.get_desired_task_count(), 10)
+
+    def test_autoscaling_scale_up_stalled(self):
+        """Tests that a handler is added when messages are waiting but none are being processed"""
+
+        scheduler_mgr.config.num_message_handlers = 1
+        scheduler_mgr.config.max_message_handlers = 4
+        service = MessagingService()
+        when = now()
+
+        service.update_backlog(10, {}, when)
+        service.update_backlog(10, {}, when + datetime.timedelta(seconds=10))
+
+        self.assertEqual(service.get_desired_task_count(), 2)
+
+    def test_autoscaling_scale_down(self):
+        """Tests that handlers are removed one at a time after the backlog has stayed low"""
+
+        scheduler_mgr.config.num_message_handlers = 1
+        scheduler_mgr.config.max_message_handlers = 4
+        service = MessagingService()
+        service._desired_count = 3
+        when = now()
+        count = 0
+
+        service.update_backlog(0, {'handler_1': count}, when)
+        for _ in range(SCALE_DOWN_SAMPLES - 1):
+            when += datetime.timedelta(seconds=10)
+            count += 10
+            service.update_backlog(0, {'handler_1': count}, when)
+            self.assertEqual(service.get_desired_task_count(), 3)
+
+        when += datetime.timedelta(seconds=10)
+        count += 10
+        service.update_backlog(0, {'handler_1': count}, when)
+        self.assertEqual(service.get_desired_task_count(), 2)
+
+        # A sample within the target resets the low backlog samples
+        when += datetime.timedelta(seconds=10)
+        count += 10
+        service.update_backlog(30, {'handler_1': count}, when)
+        for _ in range(SCALE_DOWN_SAMPLES - 1):
+            when += datetime.timedelta(seconds=10)
+            count += 10
+            service.update_backlog(0, {'handler_1': count}, when)
+        self.assertEqual(service.get_desired_task_count(), 2)
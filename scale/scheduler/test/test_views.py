@@ -11,7 +11,9 @@ from rest_framework import status
 
 import util.rest as rest_util
 from mesos_api.api import HardwareResources, MesosError
-from scheduler.models import Scheduler
+from messaging.metrics import MessageMetrics
+from scheduler.models import MessageHandler, Scheduler
+from scheduler.scheduling.profiler import scheduling_profiler, SchedulingCycleTrace
 from scheduler.threads.scheduler_status import SchedulerStatusThread
 from util.parse import datetime_to_string
 
@@ -86,6 +88,15 @@ class TestSchedulerViewV5(TestCase):
         response = self.client.patch(url, json.dumps(json_data), 'application/json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.content)
 
+    def test_update_scheduler_v6_fields(self):
+        """Test calling the Update Scheduler method with fields that are only available in v6."""
+
+        url = '/v5/scheduler/'
+        for json_data in ({'fair_share_mode': 'BATCH'}, {'fair_share_weights': {'3': 2.0}},
+                          {'max_message_handlers': 5}, {'scheduling_mode': 'BATCH'}):
+            response = self.client.patch(url, json.dumps(json_data), 'application/json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.content)
+
 class TestSchedulerViewV6(TestCase):
 
     def setUp(self):
@@ -131,6 +142,69 @@ class TestSchedulerViewV6(TestCase):
         response = self.client.patch(url, json.dumps(json_data), 'application/json')
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT, response.content)
 
+    def test_update_scheduler_fair_share(self):
+        """Test successfully updating the fair share settings."""
+
+        json_data = {
+            'fair_share_mode': 'BATCH',
+            'fair_share_weights': {'3': 2.0}
+        }
+
+        url = '/v6/scheduler/'
+        response = self.client.patch(url, json.dumps(json_data), 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT, response.content)
+
+        scheduler = Scheduler.objects.get_master()
+        self.assertEqual(scheduler.fair_share_mode, 'BATCH')
+        self.assertDictEqual(scheduler.fair_share_weights, {'3': 2.0})
+
+    def test_update_scheduler_invalid_fair_share(self):
+        """Test calling the Update Scheduler method with invalid fair share settings."""
+
+        url = '/v6/scheduler/'
+        json_data = {'fair_share_mode': 'BAD'}
+        response = self.client.patch(url, json.dumps(json_data), 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.content)
+
+        json_data = {'fair_share_weights': {'3': 0}}
+        response = self.client.patch(url, json.dumps(json_data), 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.content)
+
+    def test_update_scheduler_max_message_handlers(self):
+        """Test updating the maximum number of message handlers, which must not be less than the number of handlers."""
+
+        url = '/v6/scheduler/'
+        json_data = {'num_message_handlers': 2, 'max_message_handlers': 5}
+        response = self.client.patch(url, json.dumps(json_data), 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT, response.content)
+        self.assertEqual(Scheduler.objects.get_master().max_message_handlers, 5)
+
+        json_data = {'max_message_handlers': None}
+        response = self.client.patch(url, json.dumps(json_data), 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT, response.content)
+        self.assertIsNone(Scheduler.objects.get_master().max_message_handlers)
+
+        for json_data in ({'max_message_handlers': -1}, {'max_message_handlers': 2.5},
+                          {'max_message_handlers': '5'}, {'max_message_handlers': 1},
+                          {'num_message_handlers': 6, 'max_message_handlers': 5}):
+            response = self.client.patch(url, json.dumps(json_data), 'application/json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.content)
+        self.assertIsNone(Scheduler.objects.get_master().max_message_handlers)
+
+    def test_update_scheduler_scheduling_mode(self):
+        """Test updating the scheduling mode, which must be a valid mode."""
+
+        url = '/v6/scheduler/'
+        json_data = {'scheduling_mode': 'BATCH'}
+        response = self.client.patch(url, json.dumps(json_data), 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT, response.content)
+        self.assertEqual(Scheduler.objects.get_master().scheduling_mode, 'BATCH')
+
+        json_data = {'scheduling_mode': 'BAD'}
+        response = self.client.patch(url, json.dumps(json_data), 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.content)
+        self.assertEqual(Scheduler.objects.get_master().scheduling_mode, 'BATCH')
+
     def test_update_scheduler_no_fields(self):
         """Test calling the Update Scheduler method with no fields."""
 
@@ -219,6 +293,99 @@ class TestStatusView(TestCase):
         self.assertDictEqual(result['vault'], {u'status': u'Secrets Not Configured', u'message': u'', u'sealed': False})
 
 
+class TestMessagingStatusView(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_invalid_version(self):
+        """Tests calling the messaging status view with an invalid REST API version"""
+
+        url = '/v5/status/messaging/'
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, response.content)
+
+    def test_no_handlers(self):
+        """Tests getting messaging status when no message handlers are running"""
+
+        url = '/v6/status/messaging/'
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertListEqual(result['handlers'], [])
+        self.assertListEqual(result['message_types'], [])
+
+    def test_successful(self):
+        """Tests getting messaging status combined from the active message handlers"""
+
+        metrics_1 = MessageMetrics()
+        metrics_1.add_execution('running_jobs', 3, 0.2, True, 10, 1)
+        metrics_2 = MessageMetrics()
+        metrics_2.add_execution('running_jobs', 1, 0.1, False, 5, 0)
+        metrics_2.add_execution('echo', 1, 0.001, True, 0, 0)
+        MessageHandler.objects.update_handler('host:1', now(), metrics_1.get_status(), now())
+        MessageHandler.objects.update_handler('host:2', now(), metrics_2.get_status(), now())
+
+        url = '/v6/status/messaging/'
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertListEqual([handler['name'] for handler in result['handlers']], ['host:1', 'host:2'])
+        self.assertListEqual([message_type['type'] for message_type in result['message_types']],
+                             ['running_jobs', 'echo'])
+        running_jobs = result['message_types'][0]
+        self.assertEqual(running_jobs['messages'], 4)
+        self.assertEqual(running_jobs['executed'], 2)
+        self.assertEqual(running_jobs['failed'], 1)
+        self.assertEqual(running_jobs['retried'], 1)
+        self.assertEqual(running_jobs['queries'], 15)
+        self.assertEqual(running_jobs['downstream'], 1)
+
+
+class TestSchedulingStatusView(TestCase):
+
+    def setUp(self):
+        django.setup()
+        Scheduler.objects.create(id=1)
+        scheduling_profiler.clear()
+
+    def test_invalid_version(self):
+        """Tests calling the scheduling status view with an invalid REST API version"""
+
+        url = '/v5/status/scheduling/'
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, response.content)
+
+    def test_empty_dict(self):
+        """Tests getting scheduling status before the scheduler has saved any traces"""
+
+        url = '/v6/status/scheduling/'
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT, response.content)
+
+    def test_successful(self):
+        """Tests getting the scheduling cycle traces saved by the scheduler status thread"""
+
+        when = now()
+        trace = SchedulingCycleTrace(when)
+        trace.num_nodes = 2
+        trace.finished(when)
+        scheduling_profiler.add_trace(trace)
+        status_thread = SchedulerStatusThread()
+        status_thread._generate_status_json(when)
+
+        url = '/v6/status/scheduling/'
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertEqual(result['timestamp'], datetime_to_string(when))
+        self.assertEqual(len(result['traces']), 1)
+        self.assertEqual(result['traces'][0]['nodes'], 2)
+
+
 class TestVersionView(TestCase):
 
     def setUp(self):
@@ -0,0 +1,49 @@
+from __future__ import unicode_literals
+
+import datetime
+import threading
+import time
+
+import django
+from django.test import TestCase
+
+from scheduler.threads.base_thread import BaseSchedulerThread
+
+
+class CountingThread(BaseSchedulerThread):
+    """Thread that counts its loops"""
+
+    def __init__(self, throttle):
+        super(CountingThread, self).__init__('Counting', throttle, datetime.timedelta(seconds=1))
+        self.count = 0
+        self.looped = threading.Event()
+
+    def _execute(self):
+        self.count += 1
+        self.looped.set()
+
+
+class TestBaseSchedulerThread(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_wake(self):
+        """Tests that waking a thread starts its next loop before the throttle duration has passed"""
+
+        scheduler_thread = CountingThread(datetime.timedelta(minutes=10))
+        thread = threading.Thread(target=scheduler_thread.run)
+        thread.daemon = True
+        thread.start()
+
+        self.assertTrue(scheduler_thread.looped.wait(5))
+        scheduler_thread.looped.clear()
+        scheduler_thread.wake()
+        self.assertTrue(scheduler_thread.looped.wait(5))
+        self.assertEqual(scheduler_thread.count, 2)
+
+        started = time.time()
+        scheduler_thread.shutdown()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertLess(time.time() - started, 5)
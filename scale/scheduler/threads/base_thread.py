@@ -2,8 +2,7 @@
 from __future__ import unicode_literals
 
 import logging
-import math
-import time
+import threading
 from abc import ABCMeta
 
 from django.db.utils import InterfaceError
@@ -14,7 +13,9 @@ logger = logging.getLogger(__name__)
 
 
 class BaseSchedulerThread(object):
-    """This is the abstract base class for scheduler background threads"""
+    """This is the abstract base class for scheduler background threads. A thread loops at least once per throttle
+    duration and is woken early to loop again immediately when :meth:`wake` is called.
+    """
 
     __metaclass__ = ABCMeta
 
@@ -23,7 +24,8 @@ class BaseSchedulerThread(object):
 
         :param name: The name of this thread
         :type name: string
-        :param throttle: A loop of this thread should occur no more than once per this duration
+        :param throttle: A loop of this thread should occur no more than once per this duration unless the thread is
+            woken
         :type throttle: :class:`datetime.timedelta`
         :param warning_threshold: A warning is logged if loop execution exceeds this duration
         :type warning_threshold: :class:`datetime.timedelta`
@@ -33,6 +35,7 @@ class BaseSchedulerThread(object):
         self._running = True
         self._throttle = throttle
         self._warning_threshold = warning_threshold
+        self._wake_event = threading.Event()
 
     def run(self):
         """The main run loop of the thread
@@ -44,6 +47,9 @@ class BaseSchedulerThread(object):
 
             started = now()
 
+            # Clear before executing so that a wake up during the loop causes the next loop to start right away
+            self._wake_event.clear()
+
             try:
                 self._execute()
             except InterfaceError as err:
@@ -65,11 +71,11 @@ class BaseSchedulerThread(object):
             else:
                 logger.debug(msg, self._name, duration.total_seconds())
 
-            # If time takes less than threshold, throttle
-            if duration < self._throttle:
-                # Delay until full throttle time reached
-                delay = math.ceil(self._throttle.total_seconds() - duration.total_seconds())
-                time.sleep(delay)
+            # If time takes less than threshold, throttle until full throttle time is reached or the thread is woken
+            if duration < self._throttle and self._running:
+                delay = self._throttle.total_seconds() - duration.total_seconds()
+                if self._wake_event.wait(delay):
+                    logger.debug('%s thread woken', self._name)
 
         logger.info('%s thread stopped', self._name)
 
@@ -79,6 +85,14 @@ class BaseSchedulerThread(object):
 
         logger.info('%s thread is shutting down', self._name)
         self._running = False
+        self._wake_event.set()
+
+    def wake(self):
+        """Wakes the thread so that it performs its next loop immediately instead of waiting for the rest of its
+        throttle duration. This method is thread-safe.
+        """
+
+        self._wake_event.set()
 
     def _execute(self):
         """Executes a single loop of this thread
@@ -0,0 +1,42 @@
+"""Defines the class that manages the launch background thread"""
+from __future__ import unicode_literals
+
+import datetime
+import logging
+
+from scheduler.launch.manager import launch_mgr
+from scheduler.threads.base_thread import BaseSchedulerThread
+
+
+THROTTLE = datetime.timedelta(seconds=1)
+WARN_THRESHOLD = datetime.timedelta(milliseconds=500)
+
+logger = logging.getLogger(__name__)
+
+
+class LaunchThread(BaseSchedulerThread):
+    """This class manages the launch background thread for the scheduler. The thread is woken whenever task launches or
+    offer declines are added, so they are sent to the Mesos master right away.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        super(LaunchThread, self).__init__('Launch', THROTTLE, WARN_THRESHOLD)
+        launch_mgr.set_wake_callback(self.wake)
+
+    def shutdown(self):
+        """See :meth:`scheduler.threads.base_thread.BaseSchedulerThread.shutdown`
+        """
+
+        launch_mgr.set_wake_callback(None)
+        super(LaunchThread, self).shutdown()
+
+    def _execute(self):
+        """See :meth:`scheduler.threads.base_thread.BaseSchedulerThread._execute`
+        """
+
+        logger.debug('Entering %s _execute...', __name__)
+
+        launch_mgr.perform_calls()
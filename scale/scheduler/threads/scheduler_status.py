@@ -12,6 +12,7 @@ from scheduler.manager import scheduler_mgr
 from scheduler.models import Scheduler
 from scheduler.node.manager import node_mgr
 from scheduler.resources.manager import resource_mgr
+from scheduler.scheduling.profiler import scheduling_profiler
 from scheduler.sync.job_type_manager import job_type_mgr
 from scheduler.tasks.manager import system_task_mgr
 from scheduler.threads.base_thread import BaseSchedulerThread
@@ -58,4 +59,5 @@ class SchedulerStatusThread(BaseSchedulerThread):
         task_mgr.generate_status_json(status_dict['nodes'])
         job_type_mgr.generate_status_json(status_dict)
         secrets_mgr.generate_status_json(status_dict)
-        Scheduler.objects.all().update(status=status_dict)
+        traces_dict = {'timestamp': datetime_to_string(when), 'traces': scheduling_profiler.get_traces_json()}
+        Scheduler.objects.all().update(status=status_dict, scheduling_traces=traces_dict)
@@ -5,6 +5,7 @@ import datetime
 import logging
 
 from django.conf import settings
+from django.utils.timezone import now
 
 from job.execution.manager import job_exe_mgr
 from scheduler.cleanup.manager import cleanup_mgr
@@ -13,6 +14,7 @@ from scheduler.node.manager import node_mgr
 from scheduler.resources.manager import resource_mgr
 from scheduler.sync.job_type_manager import job_type_mgr
 from scheduler.sync.workspace_manager import workspace_mgr
+from scheduler.tasks.manager import system_task_mgr
 from scheduler.threads.base_thread import BaseSchedulerThread
 from scheduler.vault.manager import secrets_mgr
 
@@ -80,3 +82,5 @@ class SyncThread(BaseSchedulerThread):
 
         if settings.SECRETS_URL:
             secrets_mgr.sync_with_backend()
+
+        system_task_mgr.sync_with_messaging(now())
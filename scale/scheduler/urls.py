@@ -8,5 +8,7 @@ import views
 urlpatterns = [
     url(r'^scheduler/$', views.SchedulerView.as_view(), name='scheduler_view'),
     url(r'^status/$', views.StatusView.as_view(), name='status_view'),
+    url(r'^status/messaging/$', views.MessagingStatusView.as_view(), name='messaging_status_view'),
+    url(r'^status/scheduling/$', views.SchedulingStatusView.as_view(), name='scheduling_status_view'),
     url(r'^version/$', views.VersionView.as_view(), name='version_view'),
 ]
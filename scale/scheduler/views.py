@@ -2,6 +2,7 @@
 from __future__ import unicode_literals
 
 import logging
+from datetime import timedelta
 
 import rest_framework.status as status
 from django.conf import settings
@@ -12,7 +13,8 @@ from django.utils.timezone import now
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 
-from scheduler.models import Scheduler
+from messaging.metrics import summarize_metrics
+from scheduler.models import MessageHandler, Scheduler
 from scheduler.serializers import SchedulerSerializerV5, SchedulerSerializerV6
 
 
@@ -22,7 +24,9 @@ logger = logging.getLogger(__name__)
 class SchedulerView(GenericAPIView):
     """This view is the endpoint for viewing and modifying the scheduler"""
     queryset = Scheduler.objects.all()
-    update_fields = ('is_paused', 'num_message_handlers', 'system_logging_level')
+    update_fields = ('fair_share_mode', 'fair_share_weights', 'is_paused', 'num_message_handlers',
+                     'max_message_handlers', 'scheduling_mode', 'system_logging_level')
+    update_fields_v5 = ('is_paused', 'num_message_handlers', 'system_logging_level')
     
     def get_serializer_class(self):
         """Returns the appropriate serializer based off the requests version of the REST API"""
@@ -106,7 +110,7 @@ class SchedulerView(GenericAPIView):
         :rtype: :class:`rest_framework.response.Response`
         :returns: the HTTP response to send back to the user
         """
-        extra = filter(lambda x, y=self.update_fields: x not in y, request.data.keys())
+        extra = filter(lambda x, y=self.update_fields_v5: x not in y, request.data.keys())
         if len(extra) > 0:
             return Response('Unexpected fields: %s' % ', '.join(extra), status=status.HTTP_400_BAD_REQUEST)
         if len(request.data) == 0:
@@ -116,6 +120,8 @@ class SchedulerView(GenericAPIView):
             scheduler = Scheduler.objects.get_master()
         except Scheduler.DoesNotExist:
             raise Http404
+        except ValidationError as e:
+            return Response('Validation Error: %s' % str(e), status=status.HTTP_400_BAD_REQUEST)
 
         serializer = self.get_serializer(scheduler)
         return Response(serializer.data)
@@ -143,6 +149,63 @@ class SchedulerView(GenericAPIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class MessagingStatusView(GenericAPIView):
+    """This view is the endpoint for viewing the execution metrics of the message handlers"""
+
+    # Message handlers are considered offline if their metrics are older than this threshold
+    HANDLER_FRESHNESS_THRESHOLD = 30.0  # seconds
+
+    def get(self, request):
+        """Gets the execution metrics for each message type, combined across all active message handlers
+
+        :param request: the HTTP GET request
+        :type request: :class:`rest_framework.request.Request`
+        :rtype: :class:`rest_framework.response.Response`
+        :returns: the HTTP response to send back to the user
+        """
+
+        if request.version != 'v6':
+            raise Http404()
+
+        when = now()
+        since = when - timedelta(seconds=MessagingStatusView.HANDLER_FRESHNESS_THRESHOLD)
+        handlers = MessageHandler.objects.get_active_handlers(since)
+
+        status_dict = {
+            'timestamp': when,
+            'handlers': [{'name': h.name, 'started': h.started, 'last_modified': h.last_modified} for h in handlers],
+            'message_types': summarize_metrics([h.metrics for h in handlers]),
+        }
+        return Response(status_dict)
+
+
+class SchedulingStatusView(GenericAPIView):
+    """This view is the endpoint for downloading the traces of the most recent scheduling cycles"""
+
+    def get(self, request):
+        """Gets the traces of the most recent scheduling cycles, newest first
+
+        :param request: the HTTP GET request
+        :type request: :class:`rest_framework.request.Request`
+        :rtype: :class:`rest_framework.response.Response`
+        :returns: the HTTP response to send back to the user
+        """
+
+        if request.version != 'v6':
+            raise Http404()
+
+        try:
+            traces_dict = Scheduler.objects.get_master().scheduling_traces
+        except Scheduler.DoesNotExist:
+            raise Http404
+
+        if not traces_dict:  # Empty dict from model initialization
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        # Traces are returned even if the scheduler is down, since they may explain why
+        return Response(traces_dict)
+
+
 class StatusView(GenericAPIView):
     """This view is the endpoint for viewing overall system information"""
 
@@ -34,6 +34,7 @@ logger = logging.getLogger(__name__)
 class FilesView(ListAPIView):
     """This view is the endpoint for retrieving source/product files"""
     queryset = ScaleFile.objects.all()
+    pagination_class = rest_util.KeysetPagination
     
     def get_serializer_class(self):
         """Returns the appropriate serializer based off the requests version of the REST API"""
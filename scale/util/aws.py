@@ -103,8 +103,16 @@ class SQSClient(AWSClient):
         """
         AWSClient.__init__(self, 'sqs', None, credentials, region_name)
 
+        self._queues = {}  # {Queue name: Queue resource}
+
+    def __enter__(self):
+        """Callback handles creating a new client for AWS access."""
+
+        self._queues = {}
+        return AWSClient.__enter__(self)
+
     def get_queue_by_name(self, queue_name):
-        """Gets a SQS queue by the given name
+        """Gets a SQS queue by the given name. The queue URL lookup is cached for the life of the client.
 
         :param queue_name: The unique name of the SQS queue
         :type queue_name: string
@@ -112,7 +120,25 @@ class SQSClient(AWSClient):
         :rtype: :class:`boto3.sqs.Queue`
         """
 
-        return self._resource.get_queue_by_name(QueueName=queue_name)
+        if queue_name not in self._queues:
+            self._queues[queue_name] = self._resource.get_queue_by_name(QueueName=queue_name)
+        return self._queues[queue_name]
+
+    def get_queue_depth(self, queue_name):
+        """Gets the approximate number of messages waiting in a SQS queue, excluding messages currently received by
+        consumers.
+
+        :param queue_name: The unique name of the SQS queue
+        :type queue_name: string
+        :return: The approximate number of waiting messages
+        :rtype: int
+        """
+
+        queue = self.get_queue_by_name(queue_name)
+
+        # Queue attributes are loaded once per resource, so reload them to get the current value
+        queue.reload()
+        return int(queue.attributes['ApproximateNumberOfMessages'])
 
     def send_message(self, queue_name, message):
         """Send a message to SQS queue.
@@ -143,6 +169,23 @@ class SQSClient(AWSClient):
         for batch in batches:
             queue.send_messages(Entries=batch)
 
+    def delete_messages(self, queue_name, messages):
+        """Delete a batch of received messages from SQS queue.
+
+        :param queue_name: The unique name of the SQS queue
+        :type queue_name: string
+        :param messages: Messages previously received from SQS queue
+        :type messages: [`boto3.sqs.Message`]
+        """
+
+        queue = self.get_queue_by_name(queue_name)
+
+        entries = [{'Id': str(i), 'ReceiptHandle': message.receipt_handle} for i, message in enumerate(messages)]
+        batches = [entries[i:i + 10] for i in xrange(0, len(entries), 10)]
+
+        for batch in batches:
+            queue.delete_messages(Entries=batch)
+
     def receive_messages(self,
                          queue_name,
                          batch_size=100,
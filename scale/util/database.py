@@ -0,0 +1,33 @@
+"""Defines utility functions for working with the database"""
+from __future__ import unicode_literals
+
+import logging
+from contextlib import contextmanager
+
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def separate_test_database(keepdb=False, interactive=True, verbosity=1):
+    """Runs the enclosed block against a separate test database instead of the configured database, the same way the
+    test runner does. The test database is created and migrated on entry and destroyed on exit, unless it is kept. This
+    lets commands that generate synthetic data run without touching, or taking locks in, the configured database.
+
+    :param keepdb: Whether to reuse an existing test database and keep it afterwards
+    :type keepdb: bool
+    :param interactive: Whether to ask before replacing an existing test database
+    :type interactive: bool
+    :param verbosity: The verbosity of the database creation output
+    :type verbosity: int
+    """
+
+    old_name = connection.settings_dict['NAME']
+    test_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=not interactive, serialize=False,
+                                                   keepdb=keepdb)
+    logger.info('Using separate test database %s', test_name)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity, keepdb=keepdb)
@@ -1,8 +1,12 @@
 """Defines utilities for building RESTful APIs."""
 from __future__ import unicode_literals
 
+import base64
 import datetime
+import decimal
+import json
 import uuid
+from collections import OrderedDict
 
 from django.template.defaultfilters import slugify
 import django.utils.timezone as timezone
@@ -12,8 +16,13 @@ import rest_framework.serializers as serializers
 import rest_framework.status as status
 from django.conf import settings
 from django.conf.urls import include, url
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q
 from rest_framework.exceptions import APIException
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 
 import util.parse as parse_util
 
@@ -25,6 +34,254 @@ class DefaultPagination(pagination.PageNumberPagination):
     max_page_size = 1000
 
 
+class KeysetPagination(DefaultPagination):
+    """Configuration class for the paging system of large result sets. Pages are found by page number by default, and
+    clients can opt in to keyset (cursor) pagination by passing pagination=cursor. In cursor mode, each page is found by
+    filtering on the sort fields of the first or last row of the adjacent page and the count is estimated from the
+    query plan, so every page takes the same amount of time no matter how deep it is. The sort fields must not be
+    nullable, and the primary key is appended to them to break ties.
+    """
+    cursor_query_param = 'cursor'
+    pagination_query_param = 'pagination'
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self.is_cursor_mode = False
+        self.count = None
+        self.next_cursor = None
+        self.previous_cursor = None
+
+    def get_next_link(self):
+        """See :meth:`rest_framework.pagination.PageNumberPagination.get_next_link`"""
+
+        if not self.is_cursor_mode:
+            return super(KeysetPagination, self).get_next_link()
+        return self._get_cursor_link(self.next_cursor)
+
+    def get_paginated_response(self, data):
+        """See :meth:`rest_framework.pagination.PageNumberPagination.get_paginated_response`"""
+
+        if not self.is_cursor_mode:
+            return super(KeysetPagination, self).get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_previous_link(self):
+        """See :meth:`rest_framework.pagination.PageNumberPagination.get_previous_link`"""
+
+        if not self.is_cursor_mode:
+            return super(KeysetPagination, self).get_previous_link()
+        return self._get_cursor_link(self.previous_cursor)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """See :meth:`rest_framework.pagination.PageNumberPagination.paginate_queryset`"""
+
+        mode = parse_string(request, self.pagination_query_param, 'page', required=False,
+                            accepted_values=['page', 'cursor'])
+        self.is_cursor_mode = mode == 'cursor' or self.cursor_query_param in request.query_params
+        if not self.is_cursor_mode:
+            return super(KeysetPagination, self).paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        ordering = self._get_ordering(queryset)
+        cursor = self._decode_cursor(request, ordering)
+        is_reverse = cursor is not None and cursor[1]
+
+        # Page in the opposite direction to find the rows before a cursor
+        order_by = []
+        for name, is_descending, _field in ordering:
+            order_by.append('-' + name if is_descending != is_reverse else name)
+        page_qry = queryset.order_by(*order_by)
+        if cursor:
+            page_qry = page_qry.filter(self._get_keyset_filter(ordering, cursor[0], is_reverse))
+
+        # Fetch one extra row to find out whether there is another page
+        results = list(page_qry[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if is_reverse:
+            results.reverse()
+
+        self.next_cursor = None
+        self.previous_cursor = None
+        if results:
+            if has_more or is_reverse:
+                self.next_cursor = self._encode_cursor(ordering, results[-1], False)
+            if cursor and (has_more or not is_reverse):
+                self.previous_cursor = self._encode_cursor(ordering, results[0], True)
+
+        if not cursor and not has_more:
+            self.count = len(results)
+        else:
+            self.count = self._estimate_count(queryset)
+        return results
+
+    def _decode_cursor(self, request, ordering):
+        """Decodes the cursor in the given request
+
+        :param request: The context of an active HTTP request.
+        :type request: :class:`rest_framework.request.Request`
+        :param ordering: The sort fields as tuples of (name, is descending, model field)
+        :type ordering: list
+        :returns: A tuple of the sort field values and whether to page in reverse, possibly None
+        :rtype: tuple
+
+        :raises :class:`util.rest.BadParameter`: If the cursor is invalid.
+        """
+
+        encoded_cursor = request.query_params.get(self.cursor_query_param)
+        if not encoded_cursor:
+            return None
+
+        try:
+            cursor_dict = json.loads(base64.urlsafe_b64decode(encoded_cursor.encode('ascii')))
+            values = cursor_dict['v']
+            if len(values) != len(ordering):
+                raise ValueError('Cursor does not match the sort fields')
+            values = [field.to_python(value) for (_name, _is_descending, field), value in zip(ordering, values)]
+            return values, bool(cursor_dict['r'])
+        except (KeyError, TypeError, ValueError, ValidationError):
+            raise BadParameter('Invalid cursor: %s' % encoded_cursor)
+
+    def _encode_cursor(self, ordering, obj, is_reverse):
+        """Encodes a cursor that pages from the given model
+
+        :param ordering: The sort fields as tuples of (name, is descending, model field)
+        :type ordering: list
+        :param obj: The model to page from
+        :type obj: :class:`django.db.models.Model`
+        :param is_reverse: Whether the cursor pages to the rows before the model
+        :type is_reverse: bool
+        :returns: The encoded cursor
+        :rtype: string
+        """
+
+        values = []
+        for name, _is_descending, _field in ordering:
+            value = obj
+            for attr in name.split('__'):
+                value = getattr(value, attr)
+
+            # Keep the full precision of the values since they are compared for equality
+            if isinstance(value, (datetime.date, datetime.time)):
+                value = value.isoformat()
+            elif isinstance(value, (decimal.Decimal, uuid.UUID)):
+                value = unicode(value)
+            values.append(value)
+
+        return base64.urlsafe_b64encode(json.dumps({'v': values, 'r': is_reverse}))
+
+    def _estimate_count(self, queryset):
+        """Estimates the number of rows in the given query from its query plan, falling back to an exact count for
+        databases other than PostgreSQL
+
+        :param queryset: The query to count
+        :type queryset: :class:`django.db.models.QuerySet`
+        :returns: The estimated number of rows
+        :rtype: int
+        """
+
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return queryset.count()
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, basestring):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def _get_cursor_link(self, cursor):
+        """Returns the link to the page for the given cursor
+
+        :param cursor: The encoded cursor, possibly None
+        :type cursor: string
+        :returns: The link, possibly None
+        :rtype: string
+        """
+
+        if not cursor:
+            return None
+        link = self.request.build_absolute_uri()
+        link = replace_query_param(link, self.pagination_query_param, 'cursor')
+        return replace_query_param(link, self.cursor_query_param, cursor)
+
+    def _get_keyset_filter(self, ordering, values, is_reverse):
+        """Returns the filter for the rows that come after the given sort field values
+
+        :param ordering: The sort fields as tuples of (name, is descending, model field)
+        :type ordering: list
+        :param values: The sort field values of the cursor
+        :type values: list
+        :param is_reverse: Whether to filter for the rows that come before the values instead
+        :type is_reverse: bool
+        :returns: The keyset filter
+        :rtype: :class:`django.db.models.Q`
+        """
+
+        # (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z) ...
+        keyset_filter = Q()
+        equal_filter = Q()
+        for (name, is_descending, _field), value in zip(ordering, values):
+            lookup = '%s__lt' if is_descending != is_reverse else '%s__gt'
+            keyset_filter |= equal_filter & Q(**{lookup % name: value})
+            equal_filter &= Q(**{name: value})
+        return keyset_filter
+
+    def _get_ordering(self, queryset):
+        """Returns the sort fields of the given query, with the primary key appended to break ties
+
+        :param queryset: The query to paginate
+        :type queryset: :class:`django.db.models.QuerySet`
+        :returns: The sort fields as tuples of (name, is descending, model field)
+        :rtype: list
+
+        :raises :class:`util.rest.BadParameter`: If the query is sorted in a way that cursors do not support.
+        """
+
+        pk_name = queryset.model._meta.pk.name
+        order_by = queryset.query.order_by or queryset.model._meta.ordering
+        ordering = []
+        for order in order_by:
+            if not isinstance(order, basestring) or order == '?':
+                raise BadParameter('Cursor pagination does not support the sort order: %s' % order)
+            is_descending = order.startswith('-')
+            name = order.lstrip('-')
+            if name == 'pk':
+                name = pk_name
+
+            # Follow the related models to the sorted field, rejecting fields that can be null
+            model = queryset.model
+            is_nullable = False
+            field = None
+            for part in name.split('__'):
+                if field:
+                    if not field.is_relation:
+                        raise BadParameter('Invalid sort field: %s' % name)
+                    model = field.related_model
+                try:
+                    field = model._meta.get_field(part)
+                except FieldDoesNotExist:
+                    raise BadParameter('Invalid sort field: %s' % name)
+                is_nullable = is_nullable or field.null
+            if field.is_relation or is_nullable:
+                raise BadParameter('Cursor pagination does not support the sort field: %s' % name)
+            ordering.append((name, is_descending, field))
+
+        if pk_name not in [name for name, _is_descending, _field in ordering]:
+            ordering.append((pk_name, False, queryset.model._meta.pk))
+        return ordering
+
+
 class ModelIdSerializer(serializers.Serializer):
     """Converts a model to a lightweight place holder object with only an identifier to REST output"""
     id = serializers.IntegerField()
@@ -152,6 +152,32 @@ class TestSQSClient(TestCase):
 
         django.setup()
 
+    @patch('util.aws.Session')
+    def test_get_queue_by_name_cached(self, session):
+        """Validate that the queue lookup is only performed once per client"""
+
+        get_queue_by_name = session.return_value.resource.return_value.get_queue_by_name
+
+        with SQSClient(self.credentials, self.region_name) as client:
+            queue_1 = client.get_queue_by_name('queue')
+            queue_2 = client.get_queue_by_name('queue')
+
+        self.assertIs(queue_1, queue_2)
+        get_queue_by_name.assert_called_once_with(QueueName='queue')
+
+    @patch('util.aws.SQSClient.get_queue_by_name')
+    def test_get_queue_depth(self, get_queue_by_name):
+        """Validate that the queue attributes are reloaded before reading the queue depth"""
+
+        queue = get_queue_by_name.return_value
+        queue.attributes = {'ApproximateNumberOfMessages': '42'}
+
+        with SQSClient(self.credentials, self.region_name) as client:
+            depth = client.get_queue_depth('queue')
+
+        self.assertEqual(depth, 42)
+        queue.reload.assert_called_once()
+
     @patch('util.aws.SQSClient.get_queue_by_name')
     def test_send_messages(self, get_queue_by_name):
         inputs = [x for x in range(0,25)]
@@ -167,6 +193,20 @@ class TestSQSClient(TestCase):
 
         send_messages.assert_has_calls(calls)
 
+    @patch('util.aws.SQSClient.get_queue_by_name')
+    def test_delete_messages(self, get_queue_by_name):
+        messages = [MagicMock(receipt_handle='handle%d' % x) for x in range(0, 12)]
+        calls = [call(Entries=[{'Id': str(x), 'ReceiptHandle': 'handle%d' % x} for x in range(0, 10)]),
+                 call(Entries=[{'Id': str(x), 'ReceiptHandle': 'handle%d' % x} for x in range(10, 12)])]
+
+        delete_messages = MagicMock()
+        get_queue_by_name.return_value.delete_messages = delete_messages
+
+        with SQSClient(self.credentials, self.region_name) as client:
+            client.delete_messages('queue', messages)
+
+        delete_messages.assert_has_calls(calls)
+
     @patch('util.aws.SQSClient.get_queue_by_name')
     def test_receive_messages_1_batch_size_1(self, get_queue_by_name):
         outputs = [1]
@@ -0,0 +1,26 @@
+from __future__ import unicode_literals
+
+from django.test import SimpleTestCase
+from mock import patch
+
+from util.database import separate_test_database
+
+
+class TestSeparateTestDatabase(SimpleTestCase):
+    """Tests the separate_test_database context manager"""
+
+    @patch('util.database.connection')
+    def test_separate_test_database(self, mock_connection):
+        """Tests that the test database is created on entry and destroyed on exit, even after an error"""
+
+        mock_connection.settings_dict = {'NAME': 'scale'}
+        creation = mock_connection.creation
+
+        with self.assertRaises(ValueError):
+            with separate_test_database(keepdb=True, interactive=False, verbosity=0):
+                creation.create_test_db.assert_called_once_with(verbosity=0, autoclobber=True, serialize=False,
+                                                                keepdb=True)
+                self.assertFalse(creation.destroy_test_db.called)
+                raise ValueError()
+
+        creation.destroy_test_db.assert_called_once_with('scale', verbosity=0, keepdb=True)